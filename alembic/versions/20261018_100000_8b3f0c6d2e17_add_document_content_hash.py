@@ -0,0 +1,31 @@
+"""add_document_content_hash
+
+Revision ID: 8b3f0c6d2e17
+Revises: 5d1e7a3c9b42
+Create Date: 2026-10-18 10:00:00.000000+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3f0c6d2e17"
+down_revision: str | None = "5d1e7a3c9b42"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the uploaded file's SHA-256, used to detect duplicate uploads."""
+    op.add_column("documents", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.create_index(op.f("ix_documents_content_hash"), "documents", ["content_hash"], unique=False)
+
+
+def downgrade() -> None:
+    """Remove the content hash column."""
+    op.drop_index(op.f("ix_documents_content_hash"), table_name="documents")
+    op.drop_column("documents", "content_hash")
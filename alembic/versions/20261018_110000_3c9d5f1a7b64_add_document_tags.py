@@ -0,0 +1,65 @@
+"""add_document_tags
+
+Revision ID: 3c9d5f1a7b64
+Revises: 8b3f0c6d2e17
+Create Date: 2026-10-18 11:00:00.000000+00:00
+
+"""
+
+import json
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9d5f1a7b64"
+down_revision: str | None = "8b3f0c6d2e17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade() -> None:
+    """Create the normalized document tag table and backfill it from documents.tags."""
+    document_tags = op.create_table(
+        "document_tags",
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("tag", sa.String(255), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["document_id"],
+            ["documents.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("document_id", "tag"),
+    )
+    op.create_index("ix_document_tags_tag_document_id", "document_tags", ["tag", "document_id"])
+
+    # Backfill: parse each JSON array once, normalizing like the API does
+    conn = op.get_bind()
+    documents = sa.table("documents", sa.column("id", sa.Integer), sa.column("tags", sa.Text))
+    rows = []
+    for document_id, raw in conn.execute(
+        sa.select(documents.c.id, documents.c.tags).where(documents.c.tags.isnot(None))
+    ):
+        try:
+            tags = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if not isinstance(tags, list):
+            continue
+        normalized = dict.fromkeys(
+            tag.strip().lower()[:255] for tag in tags if isinstance(tag, str) and tag.strip()
+        )
+        rows.extend({"document_id": document_id, "tag": tag} for tag in normalized)
+
+    for start in range(0, len(rows), BACKFILL_BATCH):
+        op.bulk_insert(document_tags, rows[start : start + BACKFILL_BATCH])
+
+
+def downgrade() -> None:
+    """Drop the document tag table (documents.tags still holds the tags)."""
+    op.drop_index("ix_document_tags_tag_document_id", table_name="document_tags")
+    op.drop_table("document_tags")
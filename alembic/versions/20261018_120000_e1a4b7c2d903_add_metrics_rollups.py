@@ -0,0 +1,71 @@
+"""add_metrics_rollups
+
+Revision ID: e1a4b7c2d903
+Revises: 3c9d5f1a7b64
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1a4b7c2d903"
+down_revision: str | None = "3c9d5f1a7b64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the analytics rollup, watermark and normalized tool call tables.
+
+    The rollup job backfills them from the existing history on its first run.
+    """
+    op.create_table(
+        "metrics_rollups",
+        sa.Column("metric", sa.String(50), nullable=False),
+        sa.Column("granularity", sa.String(10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("event_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("value_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("value_sum", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("value_min", sa.Integer(), nullable=True),
+        sa.Column("value_max", sa.Integer(), nullable=True),
+        sa.Column("rows_sum", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("sketch", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("metric", "granularity", "bucket_start"),
+    )
+    op.create_table(
+        "metrics_rollup_watermarks",
+        sa.Column("source", sa.String(50), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("source"),
+    )
+    op.create_table(
+        "tool_calls",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("message_id", sa.Integer(), nullable=False),
+        sa.Column("tool_name", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["message_id"],
+            ["messages.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tool_calls_created_at_tool_name", "tool_calls", ["created_at", "tool_name"])
+    op.create_index(op.f("ix_tool_calls_message_id"), "tool_calls", ["message_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_tool_calls_message_id"), table_name="tool_calls")
+    op.drop_index("ix_tool_calls_created_at_tool_name", table_name="tool_calls")
+    op.drop_table("tool_calls")
+    op.drop_table("metrics_rollup_watermarks")
+    op.drop_table("metrics_rollups")
@@ -4,10 +4,13 @@ import type { Layout } from 'react-grid-layout';
 import 'react-grid-layout/css/styles.css';
 import 'react-resizable/css/styles.css';
 import { useDashboardStore } from '@/stores/dashboardStore';
+import { useDashboardSocket } from '@/hooks/useDashboardData';
 import { DashboardWidgetComponent } from './DashboardWidget';
 
 export function DashboardGrid() {
-  const { widgets, isEditing, updateWidgetPosition } = useDashboardStore();
+  const { widgets, isEditing, updateWidgetPosition, currentDashboard } = useDashboardStore();
+  // Widget results are pushed while the dashboard is open
+  const { isLive } = useDashboardSocket(currentDashboard?.id ?? null);
   const containerRef = useRef<HTMLDivElement>(null);
   const [containerWidth, setContainerWidth] = useState(1200);
 
@@ -92,7 +95,7 @@ export function DashboardGrid() {
       >
         {widgets.map((widget) => (
           <div key={widget.id} className="h-full">
-            <DashboardWidgetComponent widget={widget} />
+            <DashboardWidgetComponent widget={widget} isLive={isLive} />
           </div>
         ))}
       </GridLayout>
@@ -1,5 +1,5 @@
 import { useState, useCallback } from 'react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useMutation, useQueryClient } from '@tanstack/react-query';
 import { GripHorizontal, Trash2, Settings, RefreshCw } from 'lucide-react';
 import { api } from '@/api/client';
 import type { DashboardWidget } from '@/types/dashboard';
@@ -8,48 +8,38 @@ import { ChartRenderer } from '@/components/charts/ChartRenderer';
 import { ChartWrapper } from '@/components/charts/ChartWrapper';
 import { Button } from '@/components/ui/Button';
 import { useDashboardStore } from '@/stores/dashboardStore';
+import { useWidgetData } from '@/hooks/useDashboardData';
 import * as Dialog from '@radix-ui/react-dialog';
 import { X } from 'lucide-react';
 
 interface DashboardWidgetComponentProps {
   widget: DashboardWidget;
+  /** Whether the dashboard's push channel is connected (disables polling) */
+  isLive?: boolean;
 }
 
-interface QueryResult {
-  data: Record<string, unknown>[];
-  columns: string[];
-  row_count: number;
-  execution_time_ms: number;
+function errorMessage(error: unknown): string {
+  if (error instanceof Error) return error.message;
+  if (error && typeof error === 'object' && 'detail' in error) return String(error.detail);
+  return 'Unknown error';
 }
 
-export function DashboardWidgetComponent({ widget }: DashboardWidgetComponentProps) {
+export function DashboardWidgetComponent({ widget, isLive = false }: DashboardWidgetComponentProps) {
   const queryClient = useQueryClient();
   const { isEditing, removeWidget, currentDashboard } = useDashboardStore();
   const [showDeleteConfirm, setShowDeleteConfirm] = useState(false);
 
-  // Fetch widget data
-  const {
-    data,
-    isLoading,
-    refetch,
-    isRefetching,
-    error,
-  } = useQuery({
-    queryKey: ['widget-data', widget.id, widget.query],
-    queryFn: async () => {
-      const response = await api.post<QueryResult>('/queries/execute', {
-        query: widget.query,
-      });
-      return response;
-    },
-    refetchInterval: widget.refresh_interval ? widget.refresh_interval * 1000 : false,
-    staleTime: 30000, // Consider data fresh for 30 seconds
-    retry: 1,
-  });
+  // Cached widget results, pushed by the server while the dashboard is open
+  const { data, isLoading, isRefreshing, error: loadError, refresh } = useWidgetData(
+    widget,
+    isLive
+  );
+  // A failed query comes back as a result carrying its error
+  const error = loadError ?? (data?.error ? new Error(data.error) : null);
 
   const handleRefresh = useCallback(() => {
-    refetch();
-  }, [refetch]);
+    refresh();
+  }, [refresh]);
 
   // Delete widget mutation
   const deleteMutation = useMutation({
@@ -84,7 +74,7 @@ export function DashboardWidgetComponent({ widget }: DashboardWidgetComponentPro
       <ChartWrapper
         title={widget.title}
         onRefresh={handleRefresh}
-        isRefreshing={isLoading || isRefetching}
+        isRefreshing={isLoading || isRefreshing}
       >
         <div className={isEditing ? 'pt-4' : ''}>
           {isLoading ? (
@@ -95,7 +85,7 @@ export function DashboardWidgetComponent({ widget }: DashboardWidgetComponentPro
             <div className="flex h-full flex-col items-center justify-center text-destructive">
               <p className="font-medium">Error loading data</p>
               <p className="text-sm text-muted-foreground">
-                {error instanceof Error ? error.message : 'Unknown error'}
+                {errorMessage(error)}
               </p>
               <Button
                 variant="outline"
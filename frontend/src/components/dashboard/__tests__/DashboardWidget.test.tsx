@@ -1,6 +1,7 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { render, screen, waitFor } from '@/test/test-utils';
 import { DashboardWidgetComponent } from '../DashboardWidget';
+import { api } from '@/api/client';
 import type { DashboardWidget } from '@/types/dashboard';
 
 // Mock the dashboard store
@@ -15,12 +16,22 @@ vi.mock('@/stores/dashboardStore', () => ({
 // Mock the API client
 vi.mock('@/api/client', () => ({
   api: {
-    post: vi.fn().mockResolvedValue({
-      data: [{ name: 'A', value: 100 }],
-      columns: ['name', 'value'],
-      row_count: 1,
-      execution_time_ms: 50,
+    get: vi.fn().mockResolvedValue({
+      dashboard_id: 1,
+      widgets: [
+        {
+          widget_id: 1,
+          query_hash: 'abc',
+          data: [{ name: 'A', value: 100 }],
+          columns: ['name', 'value'],
+          row_count: 1,
+          execution_time_ms: 50,
+          refreshed_at: new Date().toISOString(),
+          error: null,
+        },
+      ],
     }),
+    post: vi.fn(),
     delete: vi.fn().mockResolvedValue({}),
   },
 }));
@@ -106,4 +117,13 @@ describe('DashboardWidgetComponent', () => {
 
     expect(screen.queryByText(/Auto-refresh/)).not.toBeInTheDocument();
   });
+
+  it('loads data from the cached dashboard data endpoint', async () => {
+    render(<DashboardWidgetComponent widget={mockWidget} />);
+
+    await waitFor(() => {
+      expect(api.get).toHaveBeenCalledWith('/dashboards/1/data');
+    });
+    expect(api.post).not.toHaveBeenCalled();
+  });
 });
@@ -0,0 +1,188 @@
+/**
+ * Dashboard Data Hooks
+ * Phase 2.3: Dashboard widget data from the server-side widget cache
+ *
+ * Widget results come from GET /dashboards/{id}/data (one request for the
+ * whole dashboard) and are kept current by the /ws/dashboards/{id} push
+ * channel, which sends a `widget_snapshot` on connect and a `widget_data`
+ * message whenever the server refreshes a widget. Widgets only poll the
+ * per-widget endpoint while the push channel is unavailable.
+ */
+
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import type { QueryClient } from '@tanstack/react-query';
+import { api } from '@/api/client';
+import type { DashboardWidget } from '@/types/dashboard';
+
+export interface WidgetData {
+  widget_id: number;
+  query_hash: string;
+  data: Record<string, unknown>[];
+  columns: string[];
+  row_count: number;
+  execution_time_ms: number;
+  refreshed_at: string;
+  error: string | null;
+}
+
+export interface DashboardData {
+  dashboard_id: number;
+  widgets: WidgetData[];
+}
+
+type DashboardSocketMessage =
+  | { type: 'widget_snapshot'; dashboard_id: number; widgets: WidgetData[] }
+  | { type: 'widget_data'; dashboard_id: number; widget: WidgetData };
+
+export const dashboardDataKey = (dashboardId: number) => ['dashboard-data', dashboardId];
+
+function fetchDashboardData(dashboardId: number) {
+  return api.get<DashboardData>(`/dashboards/${dashboardId}/data`);
+}
+
+/**
+ * Merge widget results into the cached dashboard data
+ */
+function mergeWidgetData(
+  queryClient: QueryClient,
+  dashboardId: number,
+  widgets: WidgetData[]
+) {
+  queryClient.setQueryData<DashboardData>(dashboardDataKey(dashboardId), (current) => {
+    const byId = new Map((current?.widgets ?? []).map((w) => [w.widget_id, w]));
+    widgets.forEach((w) => byId.set(w.widget_id, w));
+    return { dashboard_id: dashboardId, widgets: Array.from(byId.values()) };
+  });
+}
+
+/**
+ * Subscribe to pushed widget results for a dashboard.
+ * Reconnects after a delay unless closed by the client.
+ */
+export function useDashboardSocket(dashboardId: number | null) {
+  const queryClient = useQueryClient();
+  const [isLive, setIsLive] = useState(false);
+  const wsRef = useRef<WebSocket | null>(null);
+  const reconnectTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const connectRef = useRef<() => void>(() => {});
+
+  const connect = useCallback(() => {
+    if (dashboardId === null) return;
+
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const wsUrl = `${protocol}//${window.location.host}/ws/dashboards/${dashboardId}`;
+
+    try {
+      const ws = new WebSocket(wsUrl);
+      wsRef.current = ws;
+
+      ws.onmessage = (event) => {
+        if (event.data === 'pong') return;
+        try {
+          const data: DashboardSocketMessage = JSON.parse(event.data);
+          if (data.type === 'widget_snapshot') {
+            // Complete state on connect: replaces whatever was fetched or pushed before
+            queryClient.setQueryData<DashboardData>(dashboardDataKey(dashboardId), {
+              dashboard_id: dashboardId,
+              widgets: data.widgets,
+            });
+            setIsLive(true);
+          } else if (data.type === 'widget_data') {
+            mergeWidgetData(queryClient, dashboardId, [data.widget]);
+          }
+        } catch (e) {
+          console.error('Failed to parse dashboard message:', e);
+        }
+      };
+
+      ws.onclose = (event) => {
+        setIsLive(false);
+        wsRef.current = null;
+
+        // 1013 = refresh service unavailable; retry later like any other drop
+        if (event.code !== 1000) {
+          reconnectTimeoutRef.current = setTimeout(() => connectRef.current(), 5000);
+        }
+      };
+
+      ws.onerror = (error) => {
+        console.error('Dashboard WebSocket error:', error);
+      };
+    } catch (error) {
+      console.error('Failed to create dashboard WebSocket:', error);
+    }
+  }, [dashboardId, queryClient]);
+
+  useEffect(() => {
+    connectRef.current = connect;
+  }, [connect]);
+
+  useEffect(() => {
+    connect();
+
+    return () => {
+      if (reconnectTimeoutRef.current) {
+        clearTimeout(reconnectTimeoutRef.current);
+      }
+      if (wsRef.current) {
+        wsRef.current.close(1000, 'Client disconnect');
+        wsRef.current = null;
+      }
+      setIsLive(false);
+    };
+  }, [connect]);
+
+  return { isLive };
+}
+
+/**
+ * Cached query results for a single widget.
+ *
+ * All widgets of a dashboard share one GET /dashboards/{id}/data request.
+ * `refresh` (and the fallback polling used while `isLive` is false) load
+ * just this widget from GET /dashboards/{id}/widgets/{widget_id}/data.
+ */
+export function useWidgetData(widget: DashboardWidget, isLive = false) {
+  const queryClient = useQueryClient();
+  const dashboardId = widget.dashboard_id;
+
+  const query = useQuery({
+    queryKey: dashboardDataKey(dashboardId),
+    queryFn: () => fetchDashboardData(dashboardId),
+    select: (dashboard: DashboardData) =>
+      dashboard.widgets.find((w) => w.widget_id === widget.id),
+    // Kept current by pushes and explicit refreshes
+    staleTime: Infinity,
+    retry: 1,
+  });
+
+  const { mutate: refresh, ...refreshState } = useMutation({
+    mutationFn: () =>
+      api.get<WidgetData>(`/dashboards/${dashboardId}/widgets/${widget.id}/data`),
+    onSuccess: (result) => mergeWidgetData(queryClient, dashboardId, [result]),
+  });
+
+  // Widgets added after the dashboard data was loaded are fetched on their own
+  const missing = query.isSuccess && !query.data && Boolean(widget.query);
+  useEffect(() => {
+    if (missing && refreshState.isIdle) {
+      refresh();
+    }
+  }, [missing, refreshState.isIdle, refresh]);
+
+  // Poll only while the push channel is down
+  useEffect(() => {
+    if (isLive || !widget.refresh_interval) return;
+    const timer = setInterval(() => refresh(), widget.refresh_interval * 1000);
+    return () => clearInterval(timer);
+  }, [isLive, widget.refresh_interval, refresh]);
+
+  return {
+    data: query.data,
+    isLoading: query.isLoading || (missing && refreshState.isPending),
+    isRefreshing: refreshState.isPending,
+    error: query.error ?? refreshState.error,
+    refresh,
+  };
+}
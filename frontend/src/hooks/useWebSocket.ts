@@ -1,9 +1,10 @@
 import { useEffect, useRef, useCallback, useState } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
 import { useChatStore } from '@/stores/chatStore';
 import type { Message } from '@/types';
 
 interface WebSocketMessage {
-  type: 'chunk' | 'complete' | 'error' | 'tool_call' | 'warning';
+  type: 'chunk' | 'complete' | 'error' | 'tool_call' | 'warning' | 'provider_status';
   content?: string;
   message?: Message;
   tool_name?: string;
@@ -11,6 +12,7 @@ interface WebSocketMessage {
   error?: string;
   warning?: string;
   warning_type?: string;
+  providers?: unknown[];
 }
 
 // Queue for messages waiting to be sent
@@ -25,6 +27,7 @@ export function useAgentWebSocket(conversationId: number | null) {
   const pendingMessagesRef = useRef<PendingMessage[]>([]);
   const [isConnected, setIsConnected] = useState(false);
   const [lastWarning, setLastWarning] = useState<{ message: string; type: string } | null>(null);
+  const queryClient = useQueryClient();
   const {
     appendStreamingContent,
     clearStreamingContent,
@@ -115,6 +118,12 @@ export function useAgentWebSocket(conversationId: number | null) {
             type: data.warning_type || 'unknown',
           });
           break;
+        case 'provider_status':
+          // Pushed when provider availability changes; same shape as GET /settings/providers
+          if (data.providers) {
+            queryClient.setQueryData(['providers'], data.providers);
+          }
+          break;
         case 'error':
           console.error('Agent error:', data.error);
           clearStreamingContent();
@@ -134,7 +143,7 @@ export function useAgentWebSocket(conversationId: number | null) {
       console.log('WebSocket closed');
       setIsConnected(false);
     };
-  }, [conversationId, appendStreamingContent, clearStreamingContent, setIsStreaming, addMessage, processPendingMessages, setToolCall, clearToolCall, setAgentActive]);
+  }, [conversationId, appendStreamingContent, clearStreamingContent, setIsStreaming, addMessage, processPendingMessages, setToolCall, clearToolCall, setAgentActive, queryClient]);
 
   const sendMessage = useCallback((content: string): Promise<void> => {
     return new Promise((resolve, reject) => {
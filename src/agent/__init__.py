@@ -1,28 +1,57 @@
 """Research agent for SQL Server data analytics."""
 
-# Core agent components
-from src.agent.cache import AgentCache
-from src.agent.context import ResearchAgentContext
-from src.agent.core import (
-    OllamaConnectionError,
-    ProviderConnectionError,
-    ResearchAgent,
-    ResearchAgentError,
-    create_research_agent,
-)
-from src.agent.prompts import (
-    SYSTEM_PROMPT,
-    SYSTEM_PROMPT_MINIMAL,
-    SYSTEM_PROMPT_READONLY,
-    get_system_prompt,
-)
-from src.agent.stats import AgentStats
-from src.agent.tools import (
-    DocumentContent,
-    KnowledgeSource,
-    RAGTools,
-    SearchResult,
-    create_rag_tools,
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    # Core agent components
+    from src.agent.cache import AgentCache
+    from src.agent.context import ResearchAgentContext
+    from src.agent.core import (
+        OllamaConnectionError,
+        ProviderConnectionError,
+        ResearchAgent,
+        ResearchAgentError,
+        create_research_agent,
+    )
+    from src.agent.prompts import (
+        SYSTEM_PROMPT,
+        SYSTEM_PROMPT_MINIMAL,
+        SYSTEM_PROMPT_READONLY,
+        get_system_prompt,
+    )
+    from src.agent.stats import AgentStats
+    from src.agent.tools import (
+        DocumentContent,
+        KnowledgeSource,
+        RAGTools,
+        SearchResult,
+        create_rag_tools,
+    )
+
+# Imported on first access so importing one submodule does not load them all
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AgentCache": "src.agent.cache",
+        "ResearchAgentContext": "src.agent.context",
+        "OllamaConnectionError": "src.agent.core",
+        "ProviderConnectionError": "src.agent.core",
+        "ResearchAgent": "src.agent.core",
+        "ResearchAgentError": "src.agent.core",
+        "create_research_agent": "src.agent.core",
+        "SYSTEM_PROMPT": "src.agent.prompts",
+        "SYSTEM_PROMPT_MINIMAL": "src.agent.prompts",
+        "SYSTEM_PROMPT_READONLY": "src.agent.prompts",
+        "get_system_prompt": "src.agent.prompts",
+        "AgentStats": "src.agent.stats",
+        "DocumentContent": "src.agent.tools",
+        "KnowledgeSource": "src.agent.tools",
+        "RAGTools": "src.agent.tools",
+        "SearchResult": "src.agent.tools",
+        "create_rag_tools": "src.agent.tools",
+    },
 )
 
 __all__ = [
@@ -39,7 +39,7 @@ class ResearchAgentContext:
     async def __aenter__(self) -> "ResearchAgent":
         from src.agent.core import create_research_agent
 
-        self._agent = create_research_agent(
+        self._agent = await create_research_agent(
             provider_type=self.provider_type,
             readonly=self.readonly,
         )
@@ -9,11 +9,14 @@ import time
 from collections.abc import AsyncIterator
 
 from pydantic_ai import Agent
+from pydantic_ai.models import Model
 
 from src.agent.cache import AgentCache
+from src.agent.history import HistoryWindow
 from src.agent.prompts import format_mcp_servers_info, get_system_prompt
 from src.agent.stats import AgentStats
 from src.agent.tools import RAGTools, WebSearchTools, create_rag_tools, create_web_search_tools
+from src.agent.tracing import TracingModel, TracingToolset
 from src.mcp.client import MCPClientManager
 from src.models.chat import AgentResponse, ChatMessage, Conversation, ConversationTurn, TokenUsage
 from src.providers import LLMProvider, ProviderType, create_provider
@@ -21,7 +24,9 @@ from src.utils.cache import ResponseCache, get_response_cache
 from src.utils.config import settings
 from src.utils.logger import get_logger
 from src.utils.rate_limiter import get_rate_limiter
+from src.utils.resources import get_resource_registry
 from src.utils.retry import CircuitBreaker, RetryConfig, retry
+from src.utils.tracing import span, start_trace
 
 logger = get_logger(__name__)
 
@@ -203,18 +208,23 @@ class ResearchAgent:
         if self.rag_enabled:
             tools_info += "\n\n**RAG Knowledge Base Tools:**\n- `search_knowledge_base`: Hybrid vector + keyword search\n- `list_knowledge_sources`: Show available document collections\n- `get_document`: Retrieve full document by ID"
 
+        self._system_prompt = get_system_prompt(
+            readonly=self.readonly,
+            minimal=self.minimal_prompt,
+            explain_mode=self.explain_mode,
+            thinking_mode=self.thinking_mode,
+            mcp_servers_info=tools_info,
+        )
+        # Model requests and MCP tool calls are recorded as spans of the turn's trace
         self.agent = Agent(
-            model=self.model,
-            system_prompt=get_system_prompt(
-                readonly=self.readonly,
-                minimal=self.minimal_prompt,
-                explain_mode=self.explain_mode,
-                thinking_mode=self.thinking_mode,
-                mcp_servers_info=tools_info,
-            ),
-            toolsets=self._active_toolsets,
+            model=TracingModel(self.model) if isinstance(self.model, Model) else self.model,
+            system_prompt=self._system_prompt,
+            toolsets=[TracingToolset(toolset) for toolset in self._active_toolsets],
         )
 
+        # Token-budgeted history sent to the model on each turn
+        self._history = self._create_history_window()
+
         # Register web search tool if enabled
         if self._web_search_tools is not None:
             self._register_web_search_tool()
@@ -320,30 +330,16 @@ class ResearchAgent:
         """
         Initialize RAG tools with database connection.
 
-        Creates a connection to the LLM_BackEnd database for vector search.
+        Uses the shared LLM_BackEnd engine and embedder from the resource
+        registry, so agents never build (and leak) their own connection pools.
         """
         try:
-            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-
-            # Build connection string for LLM_BackEnd database
-            backend_host = settings.backend_db_host or settings.sql_server_host
-            backend_port = settings.backend_db_port or 1434
-            backend_db = settings.backend_db_name or "LLM_BackEnd"
-            backend_user = settings.backend_db_username or settings.sql_username
-            backend_pass = settings.backend_db_password or settings.sql_password
-
-            connection_string = (
-                f"mssql+aioodbc://{backend_user}:{backend_pass}@"
-                f"{backend_host}:{backend_port}/{backend_db}"
-                f"?driver=ODBC+Driver+18+for+SQL+Server"
-                f"&TrustServerCertificate=yes"
+            registry = get_resource_registry()
+            self._rag_tools = create_rag_tools(
+                registry.get_backend_session_factory(),
+                embedder=registry.get_embedder(),
             )
-
-            engine = create_async_engine(connection_string, echo=False)
-            session_factory = async_sessionmaker(engine, expire_on_commit=False)
-
-            self._rag_tools = create_rag_tools(session_factory)
-            logger.info("rag_tools_initialized", database=backend_db)
+            logger.info("rag_tools_initialized", database=settings.backend_db_name)
 
         except Exception as e:
             logger.warning("rag_tools_init_failed", error=str(e))
@@ -498,7 +494,8 @@ class ResearchAgent:
         This establishes MCP server connections once at the start of a session,
         rather than reconnecting on every message.
         """
-        await self.agent.__aenter__()
+        with span("mcp.connect", servers=len(self._active_toolsets)):
+            await self.agent.__aenter__()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -509,7 +506,32 @@ class ResearchAgent:
         """
         return await self.agent.__aexit__(exc_type, exc_val, exc_tb)
 
-    async def _run_agent_with_retry(self, message: str) -> str:
+    def _create_history_window(self) -> HistoryWindow:
+        """Create an empty history window for the current system prompt."""
+        return HistoryWindow(
+            system_prompt=self._system_prompt,
+            token_budget=settings.history_token_budget,
+            summary_max_tokens=settings.history_summary_max_tokens,
+        )
+
+    def _record_turn(self, message: str, response_text: str, duration_ms: float) -> None:
+        """
+        Record a completed turn in the conversation and history window.
+
+        Args:
+            message: User message
+            response_text: Agent response text
+            duration_ms: Turn duration in milliseconds
+        """
+        turn = ConversationTurn(
+            user_message=ChatMessage.user(message),
+            assistant_message=ChatMessage.assistant(response_text),
+            duration_ms=duration_ms,
+        )
+        self.conversation.add_turn(turn)
+        self._history.add_turn(turn)
+
+    async def _run_agent_with_retry(self, message: str, include_history: bool = True) -> str:
         """
         Execute agent.run() with retry logic and circuit breaker.
 
@@ -518,6 +540,7 @@ class ResearchAgent:
 
         Args:
             message: User message
+            include_history: Send the token-budgeted conversation history
 
         Returns:
             Agent response text
@@ -525,11 +548,12 @@ class ResearchAgent:
         Raises:
             ResearchAgentError: If execution fails after retries
         """
+        message_history = self._history.get_messages() if include_history else None
 
         @retry(config=self._retry_config, circuit_breaker=self._circuit_breaker)
         async def _execute():
             # Agent context is managed at session level, not per-message
-            result = await self.agent.run(message)
+            result = await self.agent.run(message, message_history=message_history)
             return result.output
 
         return await _execute()
@@ -568,20 +592,21 @@ class ResearchAgent:
                     )
 
                     # Record conversation turn (still track even for cached responses)
-                    turn = ConversationTurn(
-                        user_message=ChatMessage.user(message),
-                        assistant_message=ChatMessage.assistant(cached_response),
-                        duration_ms=duration_ms,
-                    )
-                    self.conversation.add_turn(turn)
+                    self._record_turn(message, cached_response, duration_ms)
 
                     return cached_response
 
-            # Apply rate limiting if enabled
-            await self.rate_limiter.acquire()
+            with start_trace("agent.chat", model=self.provider.model_name) as trace:
+                self._stats_manager.set_last_trace(trace)
 
-            # Run agent with retry logic and circuit breaker
-            response_text = await self._run_agent_with_retry(message)
+                # Apply rate limiting if enabled
+                with span("agent.rate_limit"):
+                    await self.rate_limiter.acquire()
+
+                # Run agent with retry logic and circuit breaker
+                response_text = await self._run_agent_with_retry(
+                    message, include_history=_include_history
+                )
 
             duration_ms = (time.time() - start_time) * 1000
 
@@ -590,12 +615,7 @@ class ResearchAgent:
                 self.cache.set(message, response_text)
 
             # Record conversation turn
-            turn = ConversationTurn(
-                user_message=ChatMessage.user(message),
-                assistant_message=ChatMessage.assistant(response_text),
-                duration_ms=duration_ms,
-            )
-            self.conversation.add_turn(turn)
+            self._record_turn(message, response_text, duration_ms)
 
             logger.info(
                 "agent_chat_completed",
@@ -638,19 +658,25 @@ class ResearchAgent:
         try:
             logger.info("agent_stream_started", message_length=len(message))
 
-            # Apply rate limiting if enabled
-            await self.rate_limiter.acquire()
-
             # Run agent with retry logic (streaming simulation)
             @retry(config=self._retry_config, circuit_breaker=self._circuit_breaker)
             async def _execute_stream():
                 # Agent context is managed at session level, not per-message
                 # Use run() instead of run_stream() to ensure tool calls are executed
                 # run_stream() stops after first output which breaks tool execution
-                result = await self.agent.run(message)
+                result = await self.agent.run(message, message_history=message_history)
                 return result.output, TokenUsage.from_pydantic_usage(result.usage())
 
-            full_response, token_usage = await _execute_stream()
+            # The span closes before chunks are yielded so it never leaks into the consumer
+            with start_trace("agent.chat_stream", model=self.provider.model_name) as trace:
+                self._stats_manager.set_last_trace(trace)
+
+                # Apply rate limiting if enabled
+                with span("agent.rate_limit"):
+                    await self.rate_limiter.acquire()
+
+                message_history = self._history.get_messages()
+                full_response, token_usage = await _execute_stream()
 
             # Simulate streaming by yielding chunks of the response
             # This ensures tools execute while still providing a streaming-like UX
@@ -665,12 +691,7 @@ class ResearchAgent:
             self._stats_manager.set_last_response(token_usage, duration_ms)
 
             # Record conversation turn after streaming completes
-            turn = ConversationTurn(
-                user_message=ChatMessage.user(message),
-                assistant_message=ChatMessage.assistant(full_response),
-                duration_ms=duration_ms,
-            )
-            self.conversation.add_turn(turn)
+            self._record_turn(message, full_response, duration_ms)
 
             logger.info(
                 "agent_stream_completed",
@@ -696,14 +717,18 @@ class ResearchAgent:
         start_time = time.time()
 
         try:
+            message_history = self._history.get_messages()
+
             # Run with retry logic
             @retry(config=self._retry_config, circuit_breaker=self._circuit_breaker)
             async def _execute_with_details():
                 # Agent context is managed at session level, not per-message
-                result = await self.agent.run(message)
+                result = await self.agent.run(message, message_history=message_history)
                 return result.output, TokenUsage.from_pydantic_usage(result.usage())
 
-            response_text, token_usage = await _execute_with_details()
+            with start_trace("agent.chat_with_details", model=self.provider.model_name) as trace:
+                self._stats_manager.set_last_trace(trace)
+                response_text, token_usage = await _execute_with_details()
 
             duration_ms = (time.time() - start_time) * 1000
 
@@ -712,6 +737,7 @@ class ResearchAgent:
                 duration_ms=duration_ms,
                 model=self.provider.model_name,
                 token_usage=token_usage,
+                trace=trace.to_dict() if trace else None,
             )
 
         except Exception as e:
@@ -730,19 +756,47 @@ class ResearchAgent:
     def clear_history(self) -> None:
         """Clear conversation history."""
         self.conversation = Conversation()
+        self._history = self._create_history_window()
         logger.info("conversation_history_cleared")
 
-    def get_history(self, max_turns: int = 10) -> list[dict[str, str]]:
+    def load_history(self, exchanges: list[tuple[str, str]]) -> None:
+        """
+        Seed the conversation with earlier exchanges.
+
+        Used when an agent is created for a conversation that already has
+        turns, so the history window sent to the model starts from them.
+
+        Args:
+            exchanges: (user message, assistant response) pairs, oldest first
+        """
+        for user_message, response_text in exchanges:
+            turn = ConversationTurn(
+                user_message=ChatMessage.user(user_message),
+                assistant_message=ChatMessage.assistant(response_text),
+            )
+            self.conversation.add_turn(turn)
+            self._history.add_turn(turn)
+        if exchanges:
+            logger.info("conversation_history_loaded", turns=len(exchanges))
+
+    def get_history(
+        self, max_turns: int = 10, max_tokens: int | None = None
+    ) -> list[dict[str, str]]:
         """
         Get conversation history for context.
 
         Args:
             max_turns: Maximum turns to return
+            max_tokens: Optional estimated token budget for the returned turns
 
         Returns:
             List of message dictionaries
         """
-        return self.conversation.get_history_for_context(max_turns)
+        return self.conversation.get_history_for_context(max_turns, max_tokens=max_tokens)
+
+    def get_history_stats(self) -> dict:
+        """Get token budget statistics for the history sent to the model."""
+        return self._history.get_stats()
 
     @property
     def turn_count(self) -> int:
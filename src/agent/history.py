@@ -0,0 +1,236 @@
+"""
+Token-budgeted conversation history for the research agent.
+
+Keeps a running token estimate per turn and renders conversation history
+as Pydantic AI messages that fit a configurable context budget. Older turns
+are folded into a short extractive summary when the budget is exceeded.
+
+Compaction happens in blocks (down to a low-water mark) rather than one turn
+at a time, so the rendered prefix stays byte-identical between compactions
+and the model server can reuse its KV cache; each new turn only appends.
+"""
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+
+from src.models.chat import ConversationTurn, estimate_tokens
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Characters of each side of a turn kept in the summary of evicted turns
+SUMMARY_SNIPPET_CHARS = 160
+
+SUMMARY_HEADER = "Summary of earlier conversation turns:"
+
+
+def _snippet(text: str) -> str:
+    """Collapse whitespace and truncate text for the summary."""
+    text = " ".join(text.split())
+    if len(text) <= SUMMARY_SNIPPET_CHARS:
+        return text
+    return text[: SUMMARY_SNIPPET_CHARS - 3].rstrip() + "..."
+
+
+class HistoryWindow:
+    """
+    Incrementally rendered, token-budgeted message history.
+
+    The rendered message list is cached and extended as turns are added;
+    it is only rebuilt when the window is compacted.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str = "",
+        token_budget: int = 4000,
+        summary_max_tokens: int = 400,
+        compaction_ratio: float = 0.5,
+    ):
+        """
+        Initialize the history window.
+
+        Args:
+            system_prompt: System prompt placed at the start of the history
+            token_budget: Maximum estimated tokens of rendered history
+            summary_max_tokens: Maximum estimated tokens of the summary
+            compaction_ratio: Fraction of the turn budget kept after compaction
+        """
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.summary_max_tokens = summary_max_tokens
+        self.compaction_ratio = compaction_ratio
+
+        self._turns: list[tuple[str, str, int]] = []  # (user, assistant, tokens)
+        self._turn_tokens = 0
+        self._summary_lines: list[str] = []
+        self._summary_tokens = 0
+        self._messages: list[ModelMessage] = []
+        self._system_tokens = estimate_tokens(system_prompt) if system_prompt else 0
+
+        # Metrics
+        self.turns_added = 0
+        self.turns_summarized = 0
+        self.compactions = 0
+        self.renders = 0
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Get the estimated token count of the rendered history."""
+        return self._system_tokens + self._summary_tokens + self._turn_tokens
+
+    @property
+    def turn_count(self) -> int:
+        """Get the number of turns kept verbatim in the window."""
+        return len(self._turns)
+
+    @property
+    def summary(self) -> str:
+        """Get the summary of turns evicted from the window."""
+        if not self._summary_lines:
+            return ""
+        return "\n".join([SUMMARY_HEADER, *self._summary_lines])
+
+    def _turn_budget(self) -> int:
+        """Tokens available to verbatim turns after system prompt and summary."""
+        return max(0, self.token_budget - self._system_tokens - self.summary_max_tokens)
+
+    def add_turn(self, turn: ConversationTurn) -> None:
+        """
+        Add a completed turn to the window.
+
+        Args:
+            turn: Conversation turn to add
+        """
+        self.add_exchange(turn.user_message.content, turn.assistant_message.content)
+
+    def add_exchange(self, user: str, assistant: str) -> None:
+        """
+        Add a user/assistant exchange to the window.
+
+        Args:
+            user: User message content
+            assistant: Assistant response content
+        """
+        tokens = estimate_tokens(user) + estimate_tokens(assistant)
+        self._turns.append((user, assistant, tokens))
+        self._turn_tokens += tokens
+        self.turns_added += 1
+
+        if self._turn_tokens > self._turn_budget():
+            self._compact()
+        elif self._messages:
+            # Prefix unchanged; append only the new turn
+            self._messages.extend(self._render_turn(user, assistant))
+
+    def _compact(self) -> None:
+        """Evict the oldest turns into the summary down to the low-water mark."""
+        target = int(self._turn_budget() * self.compaction_ratio)
+        evicted = 0
+
+        # Always keep the newest turn, even if it alone exceeds the budget
+        while len(self._turns) > 1 and self._turn_tokens > target:
+            user, assistant, tokens = self._turns.pop(0)
+            self._turn_tokens -= tokens
+            self._summary_lines.append(f"- User: {_snippet(user)}")
+            self._summary_lines.append(f"  Assistant: {_snippet(assistant)}")
+            evicted += 1
+
+        self._summary_tokens = estimate_tokens(self.summary) if self._summary_lines else 0
+        while self._summary_lines and self._summary_tokens > self.summary_max_tokens:
+            # Drop the oldest summarized exchange (two lines)
+            del self._summary_lines[:2]
+            self._summary_tokens = estimate_tokens(self.summary) if self._summary_lines else 0
+
+        self.turns_summarized += evicted
+        self.compactions += 1
+        self._messages = []  # Rebuilt lazily on next render
+
+        logger.info(
+            "history_compacted",
+            turns_evicted=evicted,
+            turns_kept=len(self._turns),
+            prompt_tokens=self.prompt_tokens,
+            token_budget=self.token_budget,
+        )
+
+    @staticmethod
+    def _render_turn(user: str, assistant: str) -> list[ModelMessage]:
+        """Render one exchange as a request/response message pair."""
+        return [
+            ModelRequest(parts=[UserPromptPart(content=user)]),
+            ModelResponse(parts=[TextPart(content=assistant)]),
+        ]
+
+    def _render(self) -> list[ModelMessage]:
+        """Render the full message list from the current window state."""
+        self.renders += 1
+        messages: list[ModelMessage] = []
+
+        # Pydantic AI only injects the system prompt when history is empty,
+        # so it must lead the rendered history
+        prefix_parts = []
+        if self.system_prompt:
+            prefix_parts.append(SystemPromptPart(content=self.system_prompt))
+        if self._summary_lines:
+            prefix_parts.append(SystemPromptPart(content=self.summary))
+        if prefix_parts:
+            messages.append(ModelRequest(parts=prefix_parts))
+
+        for user, assistant, _tokens in self._turns:
+            messages.extend(self._render_turn(user, assistant))
+        return messages
+
+    def get_messages(self) -> list[ModelMessage]:
+        """
+        Get the rendered history for ``Agent.run(message_history=...)``.
+
+        Returns:
+            List of Pydantic AI messages (empty when there are no turns)
+        """
+        if not self._turns and not self._summary_lines:
+            return []
+        if not self._messages:
+            self._messages = self._render()
+        return list(self._messages)
+
+    def get_history(self) -> list[dict[str, str]]:
+        """
+        Get the windowed history as role/content dicts.
+
+        Returns:
+            List of message dicts with 'role' and 'content' keys
+        """
+        history = []
+        if self._summary_lines:
+            history.append({"role": "system", "content": self.summary})
+        for user, assistant, _tokens in self._turns:
+            history.append({"role": "user", "content": user})
+            history.append({"role": "assistant", "content": assistant})
+        return history
+
+    def clear(self) -> None:
+        """Remove all turns and the summary."""
+        self._turns.clear()
+        self._turn_tokens = 0
+        self._summary_lines.clear()
+        self._summary_tokens = 0
+        self._messages = []
+
+    def get_stats(self) -> dict:
+        """Get history window statistics."""
+        return {
+            "turns_in_window": len(self._turns),
+            "turns_added": self.turns_added,
+            "turns_summarized": self.turns_summarized,
+            "compactions": self.compactions,
+            "renders": self.renders,
+            "prompt_tokens": self.prompt_tokens,
+            "token_budget": self.token_budget,
+        }
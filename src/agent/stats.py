@@ -6,13 +6,14 @@ Tracks token usage, duration, and other metrics for agent responses.
 
 from src.models.chat import TokenUsage
 from src.utils.rate_limiter import RateLimitStats, TokenBucketRateLimiter
+from src.utils.tracing import Trace
 
 
 class AgentStats:
     """
     Manages statistics and metrics for the research agent.
 
-    Tracks last response metadata (token usage, duration) and
+    Tracks last response metadata (token usage, duration, span trace) and
     provides rate limiting statistics.
     """
 
@@ -26,6 +27,7 @@ class AgentStats:
         self._rate_limiter = rate_limiter
         self._last_token_usage: TokenUsage | None = None
         self._last_duration_ms: float = 0.0
+        self._last_trace: Trace | None = None
 
     def set_last_response(
         self,
@@ -42,11 +44,21 @@ class AgentStats:
         self._last_token_usage = token_usage
         self._last_duration_ms = duration_ms
 
+    def set_last_trace(self, trace: Trace | None) -> None:
+        """
+        Store the trace recording the current response.
+
+        Args:
+            trace: Active trace (None when tracing is disabled)
+        """
+        self._last_trace = trace
+
     def get_last_response_stats(self) -> dict:
         """Get statistics from the last response (useful after streaming)."""
         return {
             "token_usage": self._last_token_usage or TokenUsage(),
             "duration_ms": self._last_duration_ms,
+            "trace": self._last_trace.to_dict() if self._last_trace else None,
         }
 
     def get_rate_limit_stats(self) -> RateLimitStats:
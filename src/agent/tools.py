@@ -10,6 +10,7 @@ and external web search APIs for real-time information.
 """
 
 import asyncio
+import re
 from datetime import datetime
 from typing import Any
 
@@ -21,6 +22,10 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.rag.embedder import OllamaEmbedder
 from src.rag.mssql_vector_store import MSSQLVectorStore
+from src.rag.vector_codec import get_vector_codec
+from src.utils.config import get_settings
+from src.utils.resources import get_resource_registry
+from src.utils.tracing import traced
 
 logger = structlog.get_logger()
 
@@ -135,6 +140,7 @@ class WebSearchTools:
             self._request_times.append(now)
             return True
 
+    @traced("tool.call", tool="search_web")
     async def search_web(
         self,
         query: str,
@@ -318,6 +324,176 @@ def create_web_search_tools(
 # RAG Tool Functions
 # =============================================================================
 
+# CONTAINSTABLE ranks fall in 0-1000
+FULLTEXT_MAX_RANK = 1000
+
+# Upper bound on query terms sent to the full-text engine
+FULLTEXT_MAX_TERMS = 16
+
+# SQL Server errors meaning full-text search is not set up: table not
+# full-text indexed (7601, 7602), not installed (7609), disabled for the
+# database (7616)
+FULLTEXT_UNAVAILABLE_ERRORS = frozenset({7601, 7602, 7609, 7616})
+
+# ODBC messages carry the native error number in parentheses
+_SQL_ERROR_NUMBER = re.compile(r"\((\d{4,5})\)")
+
+
+def is_fulltext_unavailable(error: Exception) -> bool:
+    """
+    Check whether a database error means full-text search is not set up.
+
+    Args:
+        error: Exception raised by the keyword-leg query
+
+    Returns:
+        True if the error carries a full-text-unavailable error number
+    """
+    numbers = {int(n) for n in _SQL_ERROR_NUMBER.findall(str(error))}
+    return not numbers.isdisjoint(FULLTEXT_UNAVAILABLE_ERRORS)
+
+
+def build_fulltext_query(query: str) -> str | None:
+    """
+    Build a CONTAINSTABLE search condition from a natural language query.
+
+    Each distinct word becomes a quoted prefix term and terms are OR-ed, so
+    chunks matching more (and rarer) terms receive a higher full-text rank.
+    Quoting every term keeps user input from being parsed as full-text
+    operators.
+
+    Args:
+        query: Natural language search query
+
+    Returns:
+        Search condition string, or None if the query has no searchable words
+    """
+    terms: list[str] = []
+    for word in re.findall(r"\w+", query.lower()):
+        if len(word) > 1 and word not in terms:
+            terms.append(word)
+        if len(terms) >= FULLTEXT_MAX_TERMS:
+            break
+
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}*"' for term in terms)
+
+
+def build_knowledge_search_sql(keyword_leg: bool = True, source_filter: bool = False) -> str:
+    """
+    Build the knowledge base search statement.
+
+    The vector leg keeps only the top ``:candidates`` chunks by cosine
+    distance; the keyword leg keeps the top ``:candidates`` CONTAINSTABLE
+    matches. Both are ranked and fused with weighted reciprocal rank fusion
+    (``weight / (:rrf_k + rank)``), and only the final ``:top_k`` rows are
+    joined back to the chunk text.
+
+    Args:
+        keyword_leg: Include the full-text keyword leg
+        source_filter: Restrict both legs to ``:source_name``
+
+    Returns:
+        SQL statement text
+    """
+    vector_filter = "AND dc.source = :source_name" if source_filter else ""
+
+    sql = """
+        DECLARE @query_vec VECTOR(768) = :query_vector;
+        WITH VectorCandidates AS (
+            SELECT TOP (:candidates)
+                dc.id,
+                1.0 - VECTOR_DISTANCE('cosine', dc.embedding, @query_vec) AS vector_score
+            FROM vectors.document_chunks dc
+            WHERE dc.embedding IS NOT NULL
+            """
+    sql += vector_filter
+    sql += """
+            ORDER BY VECTOR_DISTANCE('cosine', dc.embedding, @query_vec)
+        ),
+        VectorRanked AS (
+            SELECT
+                id,
+                vector_score,
+                ROW_NUMBER() OVER (ORDER BY vector_score DESC) AS vector_rank
+            FROM VectorCandidates
+            WHERE vector_score >= :min_vector_score
+        ),
+    """
+
+    if keyword_leg:
+        if source_filter:
+            # Filter before taking the top N so other sources cannot crowd out matches
+            sql += """
+        KeywordCandidates AS (
+            SELECT TOP (:candidates) ft.[KEY] AS id, ft.[RANK] AS text_rank
+            FROM CONTAINSTABLE(vectors.document_chunks, content, :fulltext_query) ft
+            JOIN vectors.document_chunks dc ON dc.id = ft.[KEY]
+            WHERE dc.source = :source_name
+            ORDER BY ft.[RANK] DESC
+        ),
+            """
+        else:
+            sql += """
+        KeywordCandidates AS (
+            SELECT ft.[KEY] AS id, ft.[RANK] AS text_rank
+            FROM CONTAINSTABLE(
+                vectors.document_chunks, content, :fulltext_query, :candidates
+            ) ft
+        ),
+            """
+        sql += """
+        KeywordRanked AS (
+            SELECT
+                id,
+                text_rank,
+                ROW_NUMBER() OVER (ORDER BY text_rank DESC) AS keyword_rank
+            FROM KeywordCandidates
+        ),
+        Fused AS (
+            SELECT
+                COALESCE(v.id, k.id) AS id,
+                v.vector_score,
+                k.text_rank,
+                ISNULL(:vector_weight / (:rrf_k + v.vector_rank), 0.0)
+                    + ISNULL(:text_weight / (:rrf_k + k.keyword_rank), 0.0) AS rrf_score
+            FROM VectorRanked v
+            FULL OUTER JOIN KeywordRanked k ON v.id = k.id
+        )
+        """
+    else:
+        sql += """
+        Fused AS (
+            SELECT
+                id,
+                vector_score,
+                CAST(NULL AS INT) AS text_rank,
+                :vector_weight / (:rrf_k + vector_rank) AS rrf_score
+            FROM VectorRanked
+        )
+        """
+
+    sql += """
+        SELECT TOP (:top_k)
+            dc.document_id,
+            dc.chunk_index,
+            dc.content AS chunk_text,
+            dc.source,
+            dc.source_type,
+            dc.metadata,
+            COALESCE(
+                f.vector_score,
+                1.0 - VECTOR_DISTANCE('cosine', dc.embedding, @query_vec)
+            ) AS vector_score,
+            f.text_rank,
+            f.rrf_score
+        FROM Fused f
+        JOIN vectors.document_chunks dc ON dc.id = f.id
+        ORDER BY f.rrf_score DESC
+    """
+    return sql
+
 
 class RAGTools:
     """
@@ -335,31 +511,44 @@ class RAGTools:
         embedder: OllamaEmbedder | None = None,
         vector_weight: float = 0.7,
         text_weight: float = 0.3,
+        candidate_count: int | None = None,
+        rrf_k: int | None = None,
     ):
         """
         Initialize RAG tools.
 
         Args:
             session_factory: SQLAlchemy async session factory for LLM_BackEnd
-            embedder: Ollama embedder (created if not provided)
-            vector_weight: Weight for vector similarity (default 0.7)
-            text_weight: Weight for text match (default 0.3)
+            embedder: Ollama embedder (shared registry embedder if not provided)
+            vector_weight: RRF weight of the vector ranking (default 0.7)
+            text_weight: RRF weight of the full-text ranking (default 0.3)
+            candidate_count: Candidates taken from each leg (default from settings)
+            rrf_k: Reciprocal rank fusion constant (default from settings)
         """
+        settings = get_settings()
         self._session_factory = session_factory
-        self._embedder = embedder or OllamaEmbedder()
+        self._embedder = embedder or get_resource_registry().get_embedder()
         self._vector_weight = vector_weight
         self._text_weight = text_weight
+        self._candidate_count = candidate_count or settings.rag_candidate_count
+        self._rrf_k = rrf_k or settings.rag_rrf_k
+        self._fulltext_available = True
+        self._codec = get_vector_codec()
         self._vector_store: MSSQLVectorStore | None = None
 
     async def _get_vector_store(self) -> MSSQLVectorStore:
-        """Get or create the vector store instance."""
+        """Get the shared MSSQL vector store, creating it on first use."""
         if self._vector_store is None:
-            self._vector_store = MSSQLVectorStore(
-                session_factory=self._session_factory,
-                embedder=self._embedder,
+            self._vector_store = get_resource_registry().get_or_create(
+                "vector_store:mssql",
+                lambda: MSSQLVectorStore(
+                    session_factory=self._session_factory,
+                    embedder=self._embedder,
+                ),
             )
         return self._vector_store
 
+    @traced("tool.call", tool="search_knowledge_base")
     async def search_knowledge_base(
         self,
         query: str,
@@ -370,17 +559,19 @@ class RAGTools:
         """
         Search the knowledge base using hybrid vector + keyword search.
 
-        Combines semantic similarity (vector search) with keyword matching
-        for more accurate and relevant results.
+        The vector leg takes the top-N nearest chunks, the keyword leg takes
+        the top-N full-text (CONTAINSTABLE) matches, and the two rankings are
+        fused with weighted reciprocal rank fusion. Falls back to vector-only
+        ranking when full-text search is not installed.
 
         Args:
             query: Natural language search query
             top_k: Maximum number of results to return (default 5)
             source_filter: Optional filter by source name
-            min_score: Minimum relevance score threshold (default 0.3)
+            min_score: Minimum vector similarity for semantic candidates (default 0.3)
 
         Returns:
-            List of SearchResult objects with relevance scores
+            List of SearchResult objects ordered by fused relevance
         """
         logger.info(
             "rag_search_started",
@@ -392,101 +583,85 @@ class RAGTools:
         try:
             # Generate query embedding
             query_embedding = await self._embedder.embed(query)
-            embedding_json = f"[{','.join(str(x) for x in query_embedding)}]"
-
-            async with self._session_factory() as session:
-                # Hybrid search query combining vector and text search
-                # Build query conditionally to avoid string formatting security warnings
-                vector_filter = "AND dc.source = :source_name" if source_filter else ""
-                text_filter = "WHERE dc.source = :source_name" if source_filter else ""
+            embedding_json = self._codec.to_sql(query_embedding)
+
+            fulltext_query = build_fulltext_query(query)
+            keyword_leg = self._fulltext_available and fulltext_query is not None
+
+            params = {
+                "query_vector": embedding_json,
+                "candidates": max(self._candidate_count, top_k),
+                "min_vector_score": min_score,
+                "vector_weight": self._vector_weight,
+                "text_weight": self._text_weight,
+                "rrf_k": self._rrf_k,
+                "top_k": top_k,
+            }
+            if source_filter:
+                params["source_name"] = source_filter
+
+            rows = None
+            if keyword_leg:
+                params["fulltext_query"] = fulltext_query
+                try:
+                    async with self._session_factory() as session:
+                        sql = build_knowledge_search_sql(
+                            keyword_leg=True, source_filter=bool(source_filter)
+                        )
+                        result = await session.execute(text(sql), params)
+                        rows = result.fetchall()
+                except Exception as e:
+                    keyword_leg = False
+                    params.pop("fulltext_query")
+                    if is_fulltext_unavailable(e):
+                        # Full-text catalog/index missing: stop trying and rank by vector only
+                        self._fulltext_available = False
+                        logger.warning(
+                            "rag_fulltext_fallback",
+                            error=str(e),
+                            message="Full-text search unavailable, using vector ranking only",
+                        )
+                    else:
+                        # Transient or unrelated failure: only this search skips the keyword leg
+                        logger.warning(
+                            "rag_fulltext_query_failed",
+                            error=str(e),
+                            message="Keyword leg failed, using vector ranking for this search",
+                        )
 
-                base_query = """
-                    WITH VectorSearch AS (
-                        SELECT
-                            dc.document_id,
-                            dc.chunk_index,
-                            dc.chunk_text,
-                            dc.source,
-                            dc.source_type,
-                            dc.metadata,
-                            1.0 - VECTOR_DISTANCE('cosine', dc.embedding, CAST(:query_vector AS VECTOR(768))) AS vector_score
-                        FROM vectors.document_chunks dc
-                        WHERE dc.embedding IS NOT NULL
-                        """
-                base_query += vector_filter
-                base_query += """
-                    ),
-                    TextSearch AS (
-                        SELECT
-                            dc.document_id,
-                            dc.chunk_index,
-                            CASE
-                                WHEN dc.chunk_text LIKE '%' + :query_text + '%' THEN 0.5
-                                WHEN dc.chunk_text LIKE '%' + :first_word + '%' THEN 0.3
-                                ELSE 0.0
-                            END AS text_score
-                        FROM vectors.document_chunks dc
-                        """
-                base_query += text_filter
-                base_query += """
+            if rows is None:
+                async with self._session_factory() as session:
+                    sql = build_knowledge_search_sql(
+                        keyword_leg=False, source_filter=bool(source_filter)
                     )
-                    SELECT
-                        v.document_id,
-                        v.chunk_index,
-                        v.chunk_text,
-                        v.source,
-                        v.source_type,
-                        v.metadata,
-                        v.vector_score,
-                        ISNULL(t.text_score, 0.0) AS text_score,
-                        (v.vector_score * :vector_weight + ISNULL(t.text_score, 0.0) * :text_weight) AS combined_score
-                    FROM VectorSearch v
-                    LEFT JOIN TextSearch t ON v.document_id = t.document_id AND v.chunk_index = t.chunk_index
-                    WHERE v.vector_score >= :min_vector_score
-                    ORDER BY combined_score DESC
-                    OFFSET 0 ROWS FETCH NEXT :top_k ROWS ONLY
-                """
-                sql = text(base_query)
-
-                params = {
-                    "query_vector": embedding_json,
-                    "query_text": query,
-                    "first_word": query.split()[0] if query else "",
-                    "vector_weight": self._vector_weight,
-                    "text_weight": self._text_weight,
-                    "min_vector_score": max(
-                        0.1, min_score - 0.2
-                    ),  # Lower threshold for initial filter
-                    "top_k": top_k,
-                }
-                if source_filter:
-                    params["source_name"] = source_filter
+                    result = await session.execute(text(sql), params)
+                    rows = result.fetchall()
 
-                result = await session.execute(sql, params)
-                rows = result.fetchall()
+            # Normalize RRF so a chunk ranked first by every leg scores 1.0
+            best_weight = self._vector_weight + (self._text_weight if keyword_leg else 0.0)
+            best_rrf = best_weight / (self._rrf_k + 1)
 
             results = []
             for row in rows:
-                combined_score = float(row.combined_score)
-                if combined_score >= min_score:
-                    results.append(
-                        SearchResult(
-                            document_id=str(row.document_id),
-                            chunk_id=row.chunk_index,
-                            content=row.chunk_text,
-                            source=row.source,
-                            source_type=row.source_type or "document",
-                            relevance_score=round(combined_score, 4),
-                            vector_score=round(float(row.vector_score), 4),
-                            text_score=round(float(row.text_score), 4),
-                            metadata=row.metadata if row.metadata else {},
-                        )
+                results.append(
+                    SearchResult(
+                        document_id=str(row.document_id),
+                        chunk_id=row.chunk_index,
+                        content=row.chunk_text,
+                        source=row.source,
+                        source_type=row.source_type or "document",
+                        relevance_score=round(min(1.0, float(row.rrf_score) / best_rrf), 4),
+                        vector_score=round(float(row.vector_score or 0.0), 4),
+                        text_score=round(float(row.text_rank or 0) / FULLTEXT_MAX_RANK, 4),
+                        metadata=row.metadata if row.metadata else {},
                     )
+                )
 
             logger.info(
                 "rag_search_completed",
                 query=query[:50],
                 results_found=len(results),
+                keyword_leg=keyword_leg,
             )
 
             return results
@@ -495,6 +670,7 @@ class RAGTools:
             logger.error("rag_search_error", error=str(e), query=query[:50])
             raise
 
+    @traced("tool.call", tool="list_knowledge_sources")
     async def list_knowledge_sources(self) -> list[KnowledgeSource]:
         """
         List all available knowledge sources/collections.
@@ -540,6 +716,7 @@ class RAGTools:
             logger.error("list_sources_error", error=str(e))
             raise
 
+    @traced("tool.call", tool="get_document")
     async def get_document_content(self, document_id: str) -> DocumentContent | None:
         """
         Retrieve full document content by ID.
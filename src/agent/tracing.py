@@ -0,0 +1,39 @@
+"""
+Agent tracing instrumentation.
+
+Wrappers that record Pydantic AI model requests and MCP tool calls as spans
+of the active request trace (see ``src.utils.tracing``).
+"""
+
+from typing import Any
+
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.toolsets import WrapperToolset
+
+from src.utils.tracing import span
+
+
+class TracingModel(WrapperModel):
+    """Model wrapper recording each model round-trip as an ``llm.request`` span."""
+
+    async def request(self, messages, model_settings, model_request_parameters):
+        """Send the request, recording latency and token counts."""
+        with span("llm.request", model=self.model_name, messages=len(messages)) as s:
+            response = await self.wrapped.request(
+                messages, model_settings, model_request_parameters
+            )
+            if s is not None:
+                s.set_attribute("input_tokens", response.usage.input_tokens)
+                s.set_attribute("output_tokens", response.usage.output_tokens)
+                s.set_attribute("finish_reason", response.finish_reason)
+            return response
+
+
+class TracingToolset(WrapperToolset):
+    """Toolset wrapper recording each tool call as a ``tool.call`` span."""
+
+    async def call_tool(self, name: str, tool_args: dict[str, Any], ctx, tool) -> Any:
+        """Call the wrapped tool inside a span."""
+        toolset = getattr(self.wrapped, "id", None) or self.wrapped.label
+        with span("tool.call", tool=name, toolset=toolset):
+            return await self.wrapped.call_tool(name, tool_args, ctx, tool)
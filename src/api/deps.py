@@ -10,9 +10,13 @@ from collections.abc import AsyncGenerator
 
 import structlog
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.startup import SkipStep, StartupGraph
+from src.providers.http import close_http_client
 from src.utils.config import get_settings
+from src.utils.query_profiler import get_profiler
+from src.utils.resources import BACKEND_DATABASE, SAMPLE_DATABASE, get_resource_registry
 
 logger = structlog.get_logger()
 
@@ -119,156 +123,363 @@ _embedder = None
 _mcp_manager = None
 _alert_scheduler = None
 _query_scheduler = None
+_widget_refresh_service = None
+_ingestion_queue = None
+_metrics_rollup_service = None
 _websocket_manager = None
+_provider_status_service = None
+_startup: StartupGraph | None = None
 
 
-async def init_services() -> None:
-    """Initialize all services on application startup."""
-    global _engine, _session_factory, _backend_engine, _backend_session_factory
-    global _redis_client, _vector_store, _embedder, _mcp_manager
-    global _alert_scheduler, _query_scheduler, _websocket_manager
+async def _init_sample_database() -> None:
+    """Sample database engine (ResearchAnalytics - for demo queries)."""
+    global _engine, _session_factory
 
-    settings = get_settings()
+    registry = get_resource_registry()
+    _session_factory = registry.get_sample_session_factory()
+    _engine = registry.get_engine(SAMPLE_DATABASE)
+    _enable_profiling(_engine, "sample")
+    logger.info("sample_database_engine_initialized", database="ResearchAnalytics")
 
-    # Initialize sample database engine (ResearchAnalytics - for demo queries)
-    try:
-        _engine = create_async_engine(
-            settings.database_url_async,
-            echo=settings.debug,
-            pool_pre_ping=True,
-        )
-        _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
-        logger.info("sample_database_engine_initialized", database="ResearchAnalytics")
-    except Exception as e:
-        logger.warning("sample_database_engine_failed", error=str(e))
 
-    # Initialize backend database engine (LLM_BackEnd - app state + vectors)
-    try:
-        _backend_engine = create_async_engine(
-            settings.backend_database_url_async,
-            echo=settings.debug,
-            pool_pre_ping=True,
-        )
-        _backend_session_factory = async_sessionmaker(_backend_engine, expire_on_commit=False)
-        logger.info("backend_database_engine_initialized", database="LLM_BackEnd")
-    except Exception as e:
-        logger.warning("backend_database_engine_failed", error=str(e))
-        # Fall back to sample database for app state if backend not available
-        if _session_factory:
-            _backend_session_factory = _session_factory
-            logger.info("using_sample_database_for_backend_fallback")
+async def _init_backend_database() -> None:
+    """Backend database engine (LLM_BackEnd - app state + vectors)."""
+    global _backend_engine, _backend_session_factory
 
-    # Initialize Redis client (for caching, optional vector fallback)
+    registry = get_resource_registry()
     try:
-        _redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
-        await _redis_client.ping()
-        logger.info("redis_connection_established")
+        _backend_session_factory = registry.get_backend_session_factory()
+        _backend_engine = registry.get_engine(BACKEND_DATABASE)
     except Exception as e:
-        logger.warning("redis_connection_failed", error=str(e))
-        _redis_client = None
+        # Fall back to sample database for app state if backend not available
+        if not _session_factory:
+            raise
+        logger.warning("backend_database_engine_failed", error=str(e))
+        _backend_session_factory = _session_factory
+        logger.info("using_sample_database_for_backend_fallback")
+        return
+    _enable_profiling(_backend_engine, "backend")
+    logger.info("backend_database_engine_initialized", database="LLM_BackEnd")
 
-    # Initialize embedder (required for vector operations)
-    try:
-        from src.rag.embedder import OllamaEmbedder
 
-        _embedder = OllamaEmbedder(
-            base_url=settings.ollama_host,
-            model=settings.embedding_model,
+def _enable_profiling(engine, label: str) -> None:
+    """Profile statements on an engine (per-fingerprint latency, slow query log)."""
+    settings = get_settings()
+    if settings.db_profiling_enabled and engine is not None:
+        profiler = get_profiler(
+            slow_query_threshold_ms=settings.db_slow_query_threshold_ms,
+            max_slow_queries=settings.db_slow_query_log_size,
+            max_fingerprints=settings.db_profile_max_fingerprints,
+            capture_parameters=settings.db_profile_capture_parameters,
         )
-        logger.info("embedder_initialized", model=settings.embedding_model)
-    except Exception as e:
-        logger.warning("embedder_init_failed", error=str(e))
+        profiler.enable(engine, database=label)
 
-    # Initialize vector store based on configuration
-    if _embedder:
-        vector_store_type = settings.vector_store_type.lower()
 
-        # Try MSSQL vector store first (SQL Server 2025)
-        if vector_store_type == "mssql" and _backend_session_factory:
-            try:
-                from src.rag.mssql_vector_store import MSSQLVectorStore
+async def _init_redis() -> None:
+    """Redis client (for caching, optional vector fallback)."""
+    global _redis_client
 
-                _vector_store = MSSQLVectorStore(
-                    session_factory=_backend_session_factory,
-                    embedder=_embedder,
-                    dimensions=settings.vector_dimensions,
-                )
-                await _vector_store.create_index()
-                logger.info(
-                    "vector_store_initialized", type="mssql", dimensions=settings.vector_dimensions
-                )
-            except Exception as e:
-                logger.warning("mssql_vector_store_init_failed", error=str(e))
-                # Fall back to Redis if MSSQL fails
-                if _redis_client:
-                    logger.info("falling_back_to_redis_vector_store")
-                    vector_store_type = "redis"
-
-        # Redis vector store (fallback or explicit choice)
-        if vector_store_type == "redis" and _redis_client and _vector_store is None:
-            try:
-                from src.rag.redis_vector_store import RedisVectorStore
-
-                _vector_store = RedisVectorStore(
-                    redis_client=_redis_client,
-                    embedder=_embedder,
-                    dimensions=settings.vector_dimensions,
-                )
-                await _vector_store.create_index()
-                logger.info(
-                    "vector_store_initialized", type="redis", dimensions=settings.vector_dimensions
-                )
-            except Exception as e:
-                logger.warning("redis_vector_store_init_failed", error=str(e))
+    client = Redis.from_url(get_settings().redis_url, decode_responses=True)
+    await client.ping()
+    _redis_client = client
+    logger.info("redis_connection_established")
 
-    # Initialize MCP manager
-    try:
-        from src.mcp.dynamic_manager import DynamicMCPManager
 
-        _mcp_manager = DynamicMCPManager(config_path=settings.mcp_config_path)
-        await _mcp_manager.load_config()
-        logger.info("mcp_manager_initialized")
-    except Exception as e:
-        logger.warning("mcp_manager_init_failed", error=str(e))
+async def _init_embedder() -> None:
+    """Embedder (required for vector operations)."""
+    global _embedder
 
-    # Initialize schedulers (only if backend database is available)
-    if _backend_session_factory:
-        try:
-            from src.services.alert_scheduler import AlertScheduler
-            from src.services.query_scheduler import QueryScheduler
+    _embedder = get_resource_registry().get_embedder()
+    logger.info("embedder_initialized", model=get_settings().embedding_model)
+
+
+async def _init_vector_store() -> None:
+    """Vector store based on configuration, creating its index if needed."""
+    global _vector_store
 
-            _alert_scheduler = AlertScheduler(session_factory=_backend_session_factory)
-            await _alert_scheduler.start()
-            logger.info("alert_scheduler_initialized")
+    if not _embedder:
+        raise SkipStep("Embedder not initialized")
 
-            _query_scheduler = QueryScheduler(session_factory=_backend_session_factory)
-            await _query_scheduler.start()
-            logger.info("query_scheduler_initialized")
+    settings = get_settings()
+    registry = get_resource_registry()
+    vector_store_type = settings.vector_store_type.lower()
+
+    # Try MSSQL vector store first (SQL Server 2025)
+    if vector_store_type == "mssql" and _backend_session_factory:
+        try:
+            from src.rag.mssql_vector_store import MSSQLVectorStore
+
+            store = MSSQLVectorStore(
+                session_factory=_backend_session_factory,
+                embedder=_embedder,
+                dimensions=settings.vector_dimensions,
+            )
+            await store.create_index()
+            _vector_store = store
+            registry.register("vector_store:mssql", _vector_store)
+            logger.info(
+                "vector_store_initialized", type="mssql", dimensions=settings.vector_dimensions
+            )
         except Exception as e:
-            logger.warning("schedulers_init_failed", error=str(e))
+            logger.warning("mssql_vector_store_init_failed", error=str(e))
+            # Fall back to Redis if MSSQL fails
+            if _redis_client:
+                logger.info("falling_back_to_redis_vector_store")
+                vector_store_type = "redis"
+
+    # Redis vector store (fallback or explicit choice)
+    if vector_store_type == "redis" and _redis_client and _vector_store is None:
+        try:
+            from src.rag.redis_vector_store import RedisVectorStore
+
+            store = RedisVectorStore(
+                redis_client=_redis_client,
+                embedder=_embedder,
+                dimensions=settings.vector_dimensions,
+            )
+            await store.create_index()
+            _vector_store = store
+            registry.register("vector_store:redis", _vector_store)
+            logger.info(
+                "vector_store_initialized", type="redis", dimensions=settings.vector_dimensions
+            )
+        except Exception as e:
+            logger.warning("redis_vector_store_init_failed", error=str(e))
 
-        # Seed preset themes
+    # Local on-disk vector store (explicit choice, no server required)
+    if vector_store_type == "local":
         try:
-            await _seed_preset_themes(_backend_session_factory)
-            logger.info("preset_themes_seeded")
+            from src.rag.local_vector_store import LocalVectorStore
+
+            store = LocalVectorStore(
+                path=settings.local_vector_store_path,
+                embedder=_embedder,
+                dimensions=settings.vector_dimensions,
+            )
+            await store.create_index()
+            _vector_store = store
+            registry.register("vector_store:local", _vector_store)
+            logger.info(
+                "vector_store_initialized", type="local", dimensions=settings.vector_dimensions
+            )
         except Exception as e:
-            logger.warning("theme_seeding_failed", error=str(e))
+            logger.warning("local_vector_store_init_failed", error=str(e))
 
-    # Initialize WebSocket manager with heartbeat
-    try:
-        from src.api.websocket import websocket_manager as ws_mgr
+    if _vector_store is None:
+        raise SkipStep(f"No {vector_store_type} vector store available")
 
-        _websocket_manager = ws_mgr
-        await _websocket_manager.start_heartbeat()
-        logger.info("websocket_manager_initialized")
-    except Exception as e:
-        logger.warning("websocket_manager_init_failed", error=str(e))
+    # Cache query embeddings and search results in front of the store
+    if settings.rag_cache_enabled:
+        from src.rag.search_cache import CachedVectorStore, SearchCache
+
+        _vector_store = CachedVectorStore(_vector_store, SearchCache(redis_client=_redis_client))
+        logger.info("rag_search_cache_enabled", backend=_vector_store.cache.backend)
+
+
+async def _init_mcp_manager() -> None:
+    """MCP manager with the server configuration loaded."""
+    global _mcp_manager
+
+    from src.mcp.dynamic_manager import DynamicMCPManager
+
+    _mcp_manager = DynamicMCPManager(config_path=get_settings().mcp_config_path)
+    await _mcp_manager.load_config()
+    logger.info("mcp_manager_initialized")
+
+
+def _require_backend_database() -> None:
+    """Skip a step that needs the backend database when it is unavailable."""
+    if not _backend_session_factory:
+        raise SkipStep("Backend database not initialized")
+
+
+async def _init_schedulers() -> None:
+    """Alert and scheduled query schedulers."""
+    global _alert_scheduler, _query_scheduler
+
+    _require_backend_database()
+    from src.services.alert_scheduler import AlertScheduler
+    from src.services.query_scheduler import QueryScheduler
+
+    settings = get_settings()
+    _alert_scheduler = AlertScheduler(
+        session_factory=_backend_session_factory,
+        max_concurrency=settings.alert_max_concurrency,
+        query_timeout_seconds=settings.alert_query_timeout_seconds,
+    )
+    await _alert_scheduler.start()
+    logger.info("alert_scheduler_initialized")
+
+    _query_scheduler = QueryScheduler(session_factory=_backend_session_factory)
+    await _query_scheduler.start()
+    logger.info("query_scheduler_initialized")
+
+
+async def _init_widget_refresh() -> None:
+    """Shared widget data cache and refresh scheduler."""
+    global _widget_refresh_service
+
+    _require_backend_database()
+    from src.api.websocket import websocket_manager as ws_mgr
+    from src.services.widget_refresh import WidgetRefreshService
+
+    _widget_refresh_service = WidgetRefreshService(
+        session_factory=_backend_session_factory,
+        websocket_manager=ws_mgr,
+        default_ttl_seconds=get_settings().widget_cache_ttl_seconds,
+    )
+    await _widget_refresh_service.start()
+    logger.info("widget_refresh_service_initialized")
+
+
+async def _init_ingestion_queue() -> None:
+    """Durable document ingestion workers."""
+    global _ingestion_queue
+
+    _require_backend_database()
+    if _vector_store is None:
+        raise SkipStep("Vector store not initialized")
+    from src.services.ingestion_queue import IngestionQueue
+
+    queue = IngestionQueue(session_factory=_backend_session_factory, vector_store=_vector_store)
+    await queue.start()
+    _ingestion_queue = queue
+    logger.info("ingestion_queue_initialized", workers=_ingestion_queue.workers)
+
+
+async def _init_metrics_rollup() -> None:
+    """Analytics rollup job."""
+    global _metrics_rollup_service
+
+    _require_backend_database()
+    from src.services.metrics_rollup import MetricsRollupService
+
+    service = MetricsRollupService(session_factory=_backend_session_factory)
+    await service.start()
+    _metrics_rollup_service = service
+    logger.info("metrics_rollup_service_initialized")
+
+
+async def _init_preset_themes() -> None:
+    """Seed preset themes."""
+    _require_backend_database()
+    await _seed_preset_themes(_backend_session_factory)
+    logger.info("preset_themes_seeded")
+
+
+async def _init_provider_status() -> None:
+    """Provider status checks pushed to WebSocket clients."""
+    global _provider_status_service
+
+    from src.services.provider_status import ProviderStatusService
+
+    service = ProviderStatusService(
+        websocket_manager=_websocket_manager,
+        poll_interval_seconds=get_settings().provider_status_poll_seconds,
+    )
+    await service.start()
+    _provider_status_service = service
+    logger.info("provider_status_service_initialized")
+
+
+async def _init_websocket_manager() -> None:
+    """WebSocket manager with heartbeat."""
+    global _websocket_manager
+
+    from src.api.websocket import websocket_manager as ws_mgr
+
+    _websocket_manager = ws_mgr
+    await _websocket_manager.start_heartbeat()
+    logger.info("websocket_manager_initialized")
+
+
+def build_startup_graph(step_timeout_seconds: float | None = None) -> StartupGraph:
+    """
+    Build the service initialization graph.
+
+    Critical steps (databases, Redis, embedder, MCP config, WebSocket manager)
+    are what requests need to be served. Vector store index checks, the
+    schedulers, ingestion workers, theme seeding and provider status checks
+    run in the background.
+
+    Args:
+        step_timeout_seconds: Upper bound on each step
+
+    Returns:
+        StartupGraph with all service steps registered
+    """
+    graph = StartupGraph(step_timeout_seconds=step_timeout_seconds)
+
+    graph.add("sample_database", _init_sample_database)
+    graph.add("backend_database", _init_backend_database, depends_on=("sample_database",))
+    graph.add("redis", _init_redis)
+    graph.add("embedder", _init_embedder)
+    graph.add("mcp_manager", _init_mcp_manager)
+    graph.add("websocket_manager", _init_websocket_manager)
+
+    graph.add(
+        "vector_store",
+        _init_vector_store,
+        depends_on=("backend_database", "redis", "embedder"),
+        critical=False,
+    )
+    graph.add("schedulers", _init_schedulers, depends_on=("backend_database",), critical=False)
+    graph.add(
+        "widget_refresh",
+        _init_widget_refresh,
+        depends_on=("backend_database", "websocket_manager"),
+        critical=False,
+    )
+    graph.add(
+        "ingestion_queue",
+        _init_ingestion_queue,
+        depends_on=("backend_database", "vector_store"),
+        critical=False,
+    )
+    graph.add(
+        "metrics_rollup", _init_metrics_rollup, depends_on=("backend_database",), critical=False
+    )
+    graph.add(
+        "preset_themes", _init_preset_themes, depends_on=("backend_database",), critical=False
+    )
+    graph.add(
+        "provider_status",
+        _init_provider_status,
+        depends_on=("websocket_manager",),
+        critical=False,
+    )
+    return graph
+
+
+async def init_services() -> None:
+    """
+    Initialize all services on application startup.
+
+    Independent services start concurrently. Returns once the critical
+    services are initialized; background services keep starting while the
+    API serves requests unless ``startup_defer_background`` is disabled.
+    """
+    global _startup
+
+    settings = get_settings()
+    _startup = build_startup_graph(step_timeout_seconds=settings.startup_step_timeout_seconds)
+    await _startup.run_critical()
+
+    if settings.startup_defer_background:
+        _startup.start_background()
+    else:
+        await _startup.run_background()
 
 
 async def shutdown_services() -> None:
     """Cleanup services on application shutdown."""
     global _engine, _backend_engine, _redis_client, _mcp_manager
-    global _alert_scheduler, _query_scheduler, _websocket_manager
+    global _alert_scheduler, _query_scheduler, _widget_refresh_service, _websocket_manager
+    global _ingestion_queue, _metrics_rollup_service, _provider_status_service
+
+    # Report not-ready and stop background initialization still in flight
+    if _startup:
+        await _startup.drain()
 
     # Stop WebSocket manager first
     if _websocket_manager:
@@ -290,6 +501,34 @@ async def shutdown_services() -> None:
         except Exception as e:
             logger.error("query_scheduler_shutdown_error", error=str(e))
 
+    if _widget_refresh_service:
+        try:
+            await _widget_refresh_service.stop()
+        except Exception as e:
+            logger.error("widget_refresh_service_shutdown_error", error=str(e))
+
+    if _ingestion_queue:
+        try:
+            await _ingestion_queue.stop()
+        except Exception as e:
+            logger.error("ingestion_queue_shutdown_error", error=str(e))
+        _ingestion_queue = None
+
+    if _metrics_rollup_service:
+        try:
+            await _metrics_rollup_service.stop()
+        except Exception as e:
+            logger.error("metrics_rollup_service_shutdown_error", error=str(e))
+        _metrics_rollup_service = None
+
+    if _provider_status_service:
+        try:
+            await _provider_status_service.stop()
+        except Exception as e:
+            logger.error("provider_status_service_shutdown_error", error=str(e))
+        _provider_status_service = None
+    await close_http_client()
+
     if _mcp_manager:
         try:
             await _mcp_manager.shutdown()
@@ -302,21 +541,15 @@ async def shutdown_services() -> None:
         except Exception as e:
             logger.error("redis_close_error", error=str(e))
 
-    # Dispose backend database engine
-    if _backend_engine:
-        try:
-            await _backend_engine.dispose()
-            logger.info("backend_database_disposed")
-        except Exception as e:
-            logger.error("backend_database_dispose_error", error=str(e))
+    # Detach the profiler before the engines go away
+    for engine in (_engine, _backend_engine):
+        if engine is not None:
+            get_profiler().disable(engine)
 
-    # Dispose sample database engine
-    if _engine:
-        try:
-            await _engine.dispose()
-            logger.info("sample_database_disposed")
-        except Exception as e:
-            logger.error("sample_database_dispose_error", error=str(e))
+    # Dispose shared database engines (sample and backend) and drop shared resources
+    await get_resource_registry().dispose()
+    _engine = None
+    _backend_engine = None
 
     logger.info("all_services_shutdown")
 
@@ -358,6 +591,11 @@ async def get_sample_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def get_startup_graph() -> StartupGraph | None:
+    """Get the service startup graph (None before startup)."""
+    return _startup
+
+
 def get_backend_session_factory():
     """Get the backend session factory for background tasks."""
     return _backend_session_factory
@@ -421,6 +659,21 @@ def get_query_scheduler():
     return _query_scheduler
 
 
+def get_widget_refresh_service():
+    """Get widget refresh service for dependency injection."""
+    return _widget_refresh_service
+
+
+def get_ingestion_queue_optional():
+    """Get document ingestion queue (optional, returns None if not available)."""
+    return _ingestion_queue
+
+
+def get_provider_status_service_optional():
+    """Get provider status service (optional, returns None if not available)."""
+    return _provider_status_service
+
+
 def get_websocket_manager():
     """Get WebSocket manager for dependency injection."""
     if _websocket_manager is None:
@@ -0,0 +1,85 @@
+"""
+Document Tags
+Phase 2.1: Backend Infrastructure & RAG Pipeline
+
+Normalized tag storage for documents. ``app.document_tags`` holds one row
+per document and tag, indexed on (tag, document_id), so tag filters and the
+tag sidebar's per-tag counts are index seeks. ``Document.tags`` keeps the
+JSON array for API responses and is written alongside the table.
+"""
+
+import json
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.database import Document, DocumentTag
+from src.rag.search_filter import normalize_tag
+
+
+def normalize_tags(tags: list[str]) -> list[str]:
+    """Normalize and de-duplicate tags (trimmed, lowercase), preserving order."""
+    return list(dict.fromkeys(t for t in (normalize_tag(tag) for tag in tags) if t))
+
+
+def parse_tags(raw: str | None) -> list[str]:
+    """Parse a ``Document.tags`` JSON array, tolerating missing or malformed values."""
+    if not raw:
+        return []
+    try:
+        tags = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return [tag for tag in tags if isinstance(tag, str)] if isinstance(tags, list) else []
+
+
+async def set_document_tags(db: AsyncSession, document: Document, tags: list[str]) -> list[str]:
+    """Replace a document's tags in both the JSON column and the tag table.
+
+    The caller commits.
+
+    Args:
+        db: Database session.
+        document: Document to update.
+        tags: New tags (normalized here).
+
+    Returns:
+        The normalized tags that were stored.
+    """
+    normalized = normalize_tags(tags)
+    document.tags = json.dumps(normalized)
+    await db.execute(delete(DocumentTag).where(DocumentTag.document_id == document.id))
+    db.add_all(DocumentTag(document_id=document.id, tag=tag) for tag in normalized)
+    return normalized
+
+
+def tag_filter(tags: list[str], match_all: bool = False):
+    """Build a ``Document.id IN (...)`` predicate over the tag index.
+
+    Args:
+        tags: Tags to match (normalized here).
+        match_all: Require every tag instead of any of them.
+
+    Returns:
+        SQLAlchemy boolean expression.
+    """
+    tags = normalize_tags(tags)
+    matching = select(DocumentTag.document_id).where(DocumentTag.tag.in_(tags))
+    if match_all and len(tags) > 1:
+        matching = matching.group_by(DocumentTag.document_id).having(func.count() == len(tags))
+    return Document.id.in_(matching)
+
+
+async def tag_facets(db: AsyncSession) -> list[tuple[str, int]]:
+    """Count documents per tag.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        (tag, document count) pairs sorted by tag.
+    """
+    result = await db.execute(
+        select(DocumentTag.tag, func.count()).group_by(DocumentTag.tag).order_by(DocumentTag.tag)
+    )
+    return [(tag, count) for tag, count in result.all()]
@@ -8,10 +8,12 @@ Main entry point for the FastAPI backend API.
 from contextlib import asynccontextmanager
 
 import structlog
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.api.deps import init_services, shutdown_services
+from src.api.pagination import InvalidCursorError
 from src.api.routes import (
     agent,
     alerts,
@@ -72,6 +74,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Reject malformed or mismatched pagination cursors as bad requests."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 # Include routers
 app.include_router(health.router, prefix="/api/health", tags=["Health"])
 app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
@@ -164,3 +173,43 @@ async def websocket_alerts(websocket: WebSocket):
         NotificationService.unregister_client(client_id, websocket)
         await ws_manager.disconnect(client_id)
         logger.info("alert_websocket_disconnected", client_id=client_id)
+
+
+# WebSocket endpoint for live dashboard widget data
+@app.websocket("/ws/dashboards/{dashboard_id}")
+async def websocket_dashboard(websocket: WebSocket, dashboard_id: int):
+    """WebSocket endpoint streaming shared widget refreshes for a dashboard."""
+    from src.api.deps import get_websocket_manager_optional, get_widget_refresh_service
+
+    ws_manager = get_websocket_manager_optional()
+    widget_service = get_widget_refresh_service()
+
+    if ws_manager is None or widget_service is None:
+        await websocket.accept()
+        await websocket.close(code=1013)  # Try again later
+        return
+
+    client_id = f"dashboard-{dashboard_id}-{id(websocket)}"
+    connection = await ws_manager.connect(websocket, client_id)
+
+    try:
+        # Send cached results immediately on open
+        results = await widget_service.subscribe(dashboard_id, client_id)
+        await connection.send_json(
+            {
+                "type": "widget_snapshot",
+                "dashboard_id": dashboard_id,
+                "widgets": [r.to_dict() for r in results],
+            }
+        )
+
+        while True:
+            data = await connection.receive_text()
+            if data is None:
+                break
+            if data == "ping":
+                await connection.send_text("pong")
+    finally:
+        widget_service.unsubscribe(dashboard_id, client_id)
+        await ws_manager.disconnect(client_id)
+        logger.info("dashboard_websocket_disconnected", client_id=client_id)
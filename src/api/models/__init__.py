@@ -11,12 +11,16 @@ from src.api.models.database import (
     Dashboard,
     DataAlert,
     Document,
+    DocumentTag,
     MCPServerConfig,
     Message,
+    MetricsRollup,
+    MetricsRollupWatermark,
     QueryHistory,
     SavedQuery,
     ScheduledQuery,
     ThemeConfig,
+    ToolCallRecord,
     Widget,
 )
 
@@ -26,11 +30,15 @@ __all__ = [
     "Dashboard",
     "DataAlert",
     "Document",
+    "DocumentTag",
     "MCPServerConfig",
     "Message",
+    "MetricsRollup",
+    "MetricsRollupWatermark",
     "QueryHistory",
     "SavedQuery",
     "ScheduledQuery",
     "ThemeConfig",
+    "ToolCallRecord",
     "Widget",
 ]
@@ -14,6 +14,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -136,10 +137,58 @@ class Document(Base):
     processing_status = Column(String(50))  # 'pending', 'processing', 'completed', 'failed'
     error_message = Column(Text)
     tags = Column(Text)  # JSON array of tags (added in migration add_tags_to_documents)
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file, for duplicate uploads
     created_at = Column(DateTime, default=datetime.utcnow)
     processed_at = Column(DateTime)
 
 
+class DocumentTag(Base):
+    """Normalized document tag (one row per document and tag).
+
+    Mirrors ``Document.tags`` so tag filters and facets are indexed lookups
+    instead of JSON parsing.
+    """
+
+    __tablename__ = "document_tags"
+    __table_args__ = (
+        Index("ix_document_tags_tag_document_id", "tag", "document_id"),
+        {"schema": "app"},
+    )
+
+    document_id = Column(
+        Integer, ForeignKey("app.documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag = Column(String(255), primary_key=True)  # Normalized: trimmed, lowercase
+
+
+class IngestionJob(Base):
+    """Durable document ingestion job, leased by queue workers."""
+
+    __tablename__ = "ingestion_jobs"
+    __table_args__ = (
+        Index("ix_ingestion_jobs_status_id", "status", "id"),
+        {"schema": "app"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(
+        Integer, ForeignKey("app.documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status = Column(
+        String(20), nullable=False
+    )  # 'queued', 'running', 'completed', 'failed', 'cancelled'
+    attempts = Column(Integer, nullable=False, default=0)
+    chunks_total = Column(Integer)
+    chunks_done = Column(Integer, nullable=False, default=0)  # Checkpoint: chunks stored so far
+    lease_owner = Column(String(100))
+    lease_expires_at = Column(DateTime)
+    error_message = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class MCPServerConfig(Base):
     """MCP Server configuration model."""
 
@@ -207,6 +256,53 @@ class QueryHistory(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class MetricsRollup(Base):
+    """Hourly or daily summary of an analytics metric (queries, messages)."""
+
+    __tablename__ = "metrics_rollups"
+    __table_args__ = {"schema": "app"}
+
+    metric = Column(String(50), primary_key=True)  # 'queries', 'messages'
+    granularity = Column(String(10), primary_key=True)  # 'hour', 'day'
+    bucket_start = Column(DateTime, primary_key=True)
+    event_count = Column(BigInteger, nullable=False, default=0)
+    value_count = Column(BigInteger, nullable=False, default=0)  # Events with a value
+    value_sum = Column(BigInteger, nullable=False, default=0)
+    value_min = Column(Integer)
+    value_max = Column(Integer)
+    rows_sum = Column(BigInteger, nullable=False, default=0)
+    sketch = Column(Text)  # Serialized QuantileSketch of the values
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class MetricsRollupWatermark(Base):
+    """Last source row folded into the metrics rollups."""
+
+    __tablename__ = "metrics_rollup_watermarks"
+    __table_args__ = {"schema": "app"}
+
+    source = Column(String(50), primary_key=True)  # 'query_history', 'messages'
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ToolCallRecord(Base):
+    """Normalized MCP tool call, extracted from Message.tool_calls."""
+
+    __tablename__ = "tool_calls"
+    __table_args__ = (
+        Index("ix_tool_calls_created_at_tool_name", "created_at", "tool_name"),
+        {"schema": "app"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    message_id = Column(
+        Integer, ForeignKey("app.messages.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    tool_name = Column(String(255), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
 class ThemeConfig(Base):
     """Theme configuration model."""
 
@@ -0,0 +1,239 @@
+"""
+Pagination
+Phase 2.1: Backend Infrastructure & RAG Pipeline
+
+Shared list-endpoint pagination: SQL-side counting, keyset (cursor)
+pagination with opaque continuation tokens, and aggregated child counts.
+
+Keyset pagination seeks past the last row of the previous page instead of
+skipping ``OFFSET`` rows, so deep pages cost the same as the first one.
+Offset paging (``skip``) is still honoured when no cursor is given so
+existing clients keep working; every page returns a ``next_cursor`` they
+can switch to.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Literal
+
+import structlog
+from sqlalchemy import Select, and_, func, or_, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger()
+
+CountMode = Literal["exact", "estimate"]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a continuation token is malformed or from another listing."""
+
+
+@dataclass
+class Page:
+    """A single page of results."""
+
+    items: list[Any]
+    total: int
+    next_cursor: str | None = None
+    child_counts: dict[int, int] = field(default_factory=dict)
+
+
+def encode_cursor(order_by: list[tuple[Any, bool]], values: list[Any]) -> str:
+    """Encode the sort key of the last row into an opaque token.
+
+    Args:
+        order_by: (column, descending) pairs defining the sort key.
+        values: Values of those columns for the last row of the page.
+
+    Returns:
+        URL-safe continuation token.
+    """
+    payload = {
+        "k": [column.key for column, _ in order_by],
+        "v": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(order_by: list[tuple[Any, bool]], token: str) -> list[Any]:
+    """Decode a continuation token back into sort key values.
+
+    Args:
+        order_by: (column, descending) pairs the token must have been built for.
+        token: Token returned as ``next_cursor`` by a previous page.
+
+    Returns:
+        Sort key values, typed to match the columns.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or belongs to another sort key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        keys, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    if keys != [column.key for column, _ in order_by] or len(values) != len(order_by):
+        raise InvalidCursorError("Pagination cursor does not match this listing")
+
+    decoded = []
+    for (column, _), value in zip(order_by, values, strict=True):
+        if value is not None and column.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as e:
+                raise InvalidCursorError("Invalid pagination cursor") from e
+        decoded.append(value)
+    return decoded
+
+
+def keyset_predicate(order_by: list[tuple[Any, bool]], values: list[Any]):
+    """Build the WHERE clause selecting rows after the given sort key.
+
+    Expands the row-value comparison ``(a, b) > (x, y)`` into
+    ``a > x OR (a = x AND b > y)`` since SQL Server has no tuple comparison.
+
+    Args:
+        order_by: (column, descending) pairs defining the sort key.
+        values: Sort key values of the last row already returned.
+
+    Returns:
+        SQLAlchemy boolean expression.
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(order_by):
+        after = column < values[i] if descending else column > values[i]
+        equal_prefix = [order_by[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses)
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode = "exact") -> int:
+    """Count the rows a query would return without loading them.
+
+    Args:
+        db: Database session.
+        query: Filtered SELECT (ordering and paging are ignored).
+        mode: ``"exact"`` runs ``SELECT COUNT(*)``. ``"estimate"`` reads the
+            SQL Server partition row counts for unfiltered queries and falls
+            back to an exact count otherwise.
+
+    Returns:
+        Row count.
+    """
+    if mode == "estimate" and query.whereclause is None:
+        estimate = await _estimate_rows(db, query)
+        if estimate is not None:
+            return estimate
+
+    count_query = select(func.count()).select_from(
+        query.order_by(None).limit(None).offset(None).subquery()
+    )
+    result = await db.execute(count_query)
+    return result.scalar_one()
+
+
+async def _estimate_rows(db: AsyncSession, query: Select) -> int | None:
+    """Read the table row count from SQL Server metadata, if available."""
+    froms = query.get_final_froms()
+    if len(froms) != 1 or not hasattr(froms[0], "fullname"):
+        return None
+    try:
+        if db.get_bind().dialect.name != "mssql":
+            return None
+        result = await db.execute(
+            text(
+                "SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+                "WHERE object_id = OBJECT_ID(:name) AND index_id IN (0, 1)"
+            ),
+            {"name": froms[0].fullname},
+        )
+        estimate = result.scalar()
+    except SQLAlchemyError as e:
+        logger.debug("row_estimate_unavailable", table=froms[0].fullname, error=str(e))
+        return None
+    return int(estimate) if estimate is not None else None
+
+
+async def count_children(db: AsyncSession, foreign_key, parent_ids: list[int]) -> dict[int, int]:
+    """Count child rows per parent with a single GROUP BY.
+
+    Args:
+        db: Database session.
+        foreign_key: Child column referencing the parent id.
+        parent_ids: Parent ids on the current page.
+
+    Returns:
+        Mapping of parent id to child count (parents without children are omitted).
+    """
+    if not parent_ids:
+        return {}
+    result = await db.execute(
+        select(foreign_key, func.count()).where(foreign_key.in_(parent_ids)).group_by(foreign_key)
+    )
+    return dict(result.all())
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: list[tuple[Any, bool]],
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+    count: CountMode = "exact",
+    child_count=None,
+) -> Page:
+    """Fetch one page of an ORM query.
+
+    Args:
+        db: Database session.
+        query: Filtered ``select(Model)`` query without ordering.
+        order_by: (column, descending) pairs; must end with a unique column
+            (the primary key) so the sort key is total.
+        limit: Maximum number of items to return.
+        cursor: Continuation token from a previous page. Takes precedence over ``skip``.
+        skip: Offset used when no cursor is given.
+        count: Counting mode passed to ``count_rows``.
+        child_count: Optional child foreign key column; when given, child
+            counts for the page are returned in ``Page.child_counts``.
+
+    Returns:
+        Page of items with the total and the next continuation token.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded.
+    """
+    total = await count_rows(db, query, count)
+
+    page_query = query.order_by(
+        *(column.desc() if descending else column.asc() for column, descending in order_by)
+    )
+    if cursor:
+        page_query = page_query.where(keyset_predicate(order_by, decode_cursor(order_by, cursor)))
+    elif skip:
+        page_query = page_query.offset(skip)
+
+    # Fetch one extra row to learn whether another page exists
+    result = await db.execute(page_query.limit(limit + 1))
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(order_by, [getattr(last, column.key) for column, _ in order_by])
+
+    child_counts = {}
+    if child_count is not None:
+        child_counts = await count_children(db, child_count, [item.id for item in items])
+
+    return Page(items=items, total=total, next_cursor=next_cursor, child_counts=child_counts)
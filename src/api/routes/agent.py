@@ -10,14 +10,22 @@ import contextlib
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
+from sqlalchemy import select
 
 from src.agent.research_agent import ResearchAgentError, create_research_agent
-from src.api.deps import get_vector_store_optional
+from src.api.deps import get_backend_session_factory, get_vector_store_optional
+from src.api.models.database import Message
+from src.rag.embedding_scheduler import get_embedding_scheduler
+from src.rag.search_filter import SearchFilter
 from src.utils.config import get_settings
+from src.utils.tracing import span, start_trace
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Most recent stored messages used to seed a new agent's history window
+HISTORY_SEED_MESSAGES = 200
+
 
 class ChatRequest(BaseModel):
     """Request model for chat."""
@@ -45,6 +53,7 @@ class RAGSearchRequest(BaseModel):
     source_type: str | None = None  # 'document', 'schema', or None for all
     hybrid: bool = False  # Enable hybrid search (semantic + keyword)
     alpha: float = 0.5  # Weight for semantic search (0.0 = keyword only, 1.0 = semantic only)
+    filters: SearchFilter | None = None  # Tag, date range and metadata filters
 
 
 class RAGSearchResponse(BaseModel):
@@ -102,6 +111,7 @@ async def rag_search(
         source_type: Filter by source type ('document', 'schema', or None for all)
         hybrid: Enable hybrid search (default: False)
         alpha: Weight for semantic vs keyword (0.0 = keyword only, 1.0 = semantic only)
+        filters: Optional tags, created_after/created_before and metadata equality
     """
     if not vector_store:
         raise HTTPException(
@@ -117,6 +127,7 @@ async def rag_search(
                 top_k=request.top_k,
                 source_type=request.source_type,
                 alpha=request.alpha,
+                filters=request.filters,
             )
             search_type = "hybrid"
             logger.info(
@@ -132,6 +143,7 @@ async def rag_search(
                 query=request.query,
                 top_k=request.top_k,
                 source_type=request.source_type,
+                filters=request.filters,
             )
             search_type = "semantic"
 
@@ -141,6 +153,9 @@ async def rag_search(
             search_type=search_type,
         )
 
+    except ValueError as e:
+        # Unsupported filter (e.g. metadata key not indexed by this store)
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("rag_search_error", error=str(e), hybrid=request.hybrid)
         raise HTTPException(
@@ -188,12 +203,59 @@ async def get_rag_stats(
 
     try:
         stats = await vector_store.get_stats()
-        return {"status": "available", **stats}
+        return {
+            "status": "available",
+            **stats,
+            "embedding_scheduler": get_embedding_scheduler().get_stats(),
+        }
     except Exception as e:
         logger.error("rag_stats_error", error=str(e))
         return {"status": "error", "error": str(e)}
 
 
+async def load_conversation_exchanges(conversation_id: int) -> list[tuple[str, str]]:
+    """
+    Load a conversation's stored user/assistant exchanges, oldest first.
+
+    A user message without a following assistant reply (e.g. the message
+    being answered right now) is not an exchange and is skipped.
+
+    Args:
+        conversation_id: Conversation ID
+
+    Returns:
+        (user message, assistant response) pairs
+    """
+    session_factory = get_backend_session_factory()
+    if session_factory is None:
+        return []
+
+    try:
+        async with session_factory() as db:
+            result = await db.execute(
+                select(Message.role, Message.content)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(Message.created_at.desc(), Message.id.desc())
+                .limit(HISTORY_SEED_MESSAGES)
+            )
+            rows = list(reversed(result.all()))
+    except Exception as e:
+        logger.warning(
+            "conversation_history_load_failed", conversation_id=conversation_id, error=str(e)
+        )
+        return []
+
+    exchanges = []
+    user_message = None
+    for role, content in rows:
+        if role == "user":
+            user_message = content or ""
+        elif role == "assistant" and user_message is not None:
+            exchanges.append((user_message, content or ""))
+            user_message = None
+    return exchanges
+
+
 # WebSocket endpoint for real-time chat (Phase 2.2)
 @router.websocket("/ws/{conversation_id}")
 async def agent_websocket(
@@ -203,7 +265,10 @@ async def agent_websocket(
     """
     WebSocket endpoint for real-time agent interactions.
 
-    Receives messages and streams responses back to the client.
+    Receives messages and streams responses back to the client. One agent
+    serves the connection while the provider/model settings are unchanged;
+    a new agent starts from the conversation's stored messages plus the
+    turns already answered on this connection.
 
     Message format (client -> server):
     {
@@ -215,7 +280,8 @@ async def agent_websocket(
     Response format (server -> client):
     - {"type": "chunk", "content": "partial response"}
     - {"type": "tool_call", "tool_name": "...", "tool_args": {...}}
-    - {"type": "complete", "message": {...}}
+    - {"type": "complete", "message": {...}, "trace": {...}}
+      (trace: per-turn span waterfall and breakdown_ms, null if tracing is disabled)
     - {"type": "error", "error": "..."}
     - {"type": "ping"} (heartbeat)
 
@@ -245,8 +311,11 @@ async def agent_websocket(
         connection = None
         logger.info("websocket_connected", conversation_id=conversation_id)
 
-    # Create agent for this session
+    # Agent for this connection, recreated only when its configuration changes
     agent = None
+    agent_config = None
+    # Completed exchanges, seeded from stored messages on first use
+    exchanges: list[tuple[str, str]] | None = None
 
     try:
         while True:
@@ -281,153 +350,175 @@ async def agent_websocket(
                     rag_enabled=rag_enabled,
                 )
 
-                # Initialize augmented content and RAG sources
-                augmented_content = content
-                rag_sources = []
+                # Time the whole turn; spans from RAG, the model, tools and SQL nest under it
+                with start_trace(
+                    "chat.turn",
+                    conversation_id=conversation_id,
+                    provider=provider_type,
+                    model=model_name,
+                    rag_enabled=rag_enabled,
+                ) as trace:
+                    # Initialize augmented content and RAG sources
+                    augmented_content = content
+                    rag_sources = []
+
+                    # RAG context augmentation if enabled
+                    if rag_enabled:
+                        try:
+                            vector_store = get_vector_store_optional()
+                            if vector_store:
+                                # Use hybrid search if enabled, otherwise semantic search
+                                if rag_hybrid_search:
+                                    rag_alpha = data.get("rag_alpha", 0.5)
+                                    rag_results = await vector_store.hybrid_search(
+                                        query=content,
+                                        top_k=rag_top_k,
+                                        alpha=rag_alpha,
+                                    )
+                                    search_mode = "hybrid"
+                                else:
+                                    rag_results = await vector_store.search(
+                                        query=content,
+                                        top_k=rag_top_k,
+                                    )
+                                    search_mode = "semantic"
+
+                                if rag_results:
+                                    context_parts = []
+                                    for result in rag_results:
+                                        context_parts.append(result.get("content", ""))
+                                        rag_sources.append(
+                                            {
+                                                "document_id": result.get("document_id"),
+                                                "title": result.get("title", "Unknown"),
+                                                "score": result.get("score", 0.0),
+                                                "search_type": result.get(
+                                                    "search_type", search_mode
+                                                ),
+                                            }
+                                        )
+                                    rag_context = "\n---\n".join(context_parts)
+                                    augmented_content = f"Based on the following context from relevant documents:\n\n{rag_context}\n\nUser question: {content}"
+                                    logger.info(
+                                        "rag_context_added",
+                                        sources_count=len(rag_sources),
+                                        search_mode=search_mode,
+                                    )
+                        except Exception as e:
+                            logger.warning("rag_search_failed", error=str(e))
 
-                # RAG context augmentation if enabled
-                if rag_enabled:
+                    # Thinking mode - switch to reasoning model if enabled
+                    effective_model = model_name
+                    if thinking_enabled and not model_name:
+                        effective_model = "qwq:latest"
+                        logger.info("thinking_mode_enabled", model=effective_model)
+
+                    # Create agent instance with optional provider/model configuration
+                    config = (provider_type, effective_model, thinking_enabled)
                     try:
-                        vector_store = get_vector_store_optional()
-                        if vector_store:
-                            # Use hybrid search if enabled, otherwise semantic search
-                            if rag_hybrid_search:
-                                rag_alpha = data.get("rag_alpha", 0.5)
-                                rag_results = await vector_store.hybrid_search(
-                                    query=content,
-                                    top_k=rag_top_k,
-                                    alpha=rag_alpha,
-                                )
-                                search_mode = "hybrid"
-                            else:
-                                rag_results = await vector_store.search(
-                                    query=content,
-                                    top_k=rag_top_k,
+                        if agent is None or config != agent_config:
+                            if exchanges is None:
+                                exchanges = await load_conversation_exchanges(conversation_id)
+                            with span("agent.create"):
+                                agent = await create_research_agent(
+                                    provider_type=provider_type,
+                                    model_name=effective_model,
+                                    thinking_mode=thinking_enabled,
                                 )
-                                search_mode = "semantic"
-
-                            if rag_results:
-                                context_parts = []
-                                for result in rag_results:
-                                    context_parts.append(result.get("content", ""))
-                                    rag_sources.append(
-                                        {
-                                            "document_id": result.get("document_id"),
-                                            "title": result.get("title", "Unknown"),
-                                            "score": result.get("score", 0.0),
-                                            "search_type": result.get("search_type", search_mode),
-                                        }
-                                    )
-                                rag_context = "\n---\n".join(context_parts)
-                                augmented_content = f"Based on the following context from relevant documents:\n\n{rag_context}\n\nUser question: {content}"
-                                logger.info(
-                                    "rag_context_added",
-                                    sources_count=len(rag_sources),
-                                    search_mode=search_mode,
+                            agent.load_history(exchanges)
+                            agent_config = config
+
+                            # Send warning if model doesn't support tool calling
+                            if agent.tool_warning:
+                                warning_msg = {
+                                    "type": "warning",
+                                    "warning": agent.tool_warning,
+                                    "warning_type": "tool_calling_not_supported",
+                                }
+                                if connection:
+                                    await connection.send_json(warning_msg)
+                                else:
+                                    await websocket.send_json(warning_msg)
+                                logger.warning(
+                                    "agent_tool_warning_sent",
+                                    warning=agent.tool_warning,
+                                    provider=provider_type,
+                                    model=effective_model,
                                 )
+
                     except Exception as e:
-                        logger.warning("rag_search_failed", error=str(e))
-
-                # Thinking mode - switch to reasoning model if enabled
-                effective_model = model_name
-                if thinking_enabled and not model_name:
-                    effective_model = "qwq:latest"
-                    logger.info("thinking_mode_enabled", model=effective_model)
-
-                # Create agent instance with optional provider/model configuration
-                try:
-                    agent = create_research_agent(
-                        provider_type=provider_type,
-                        model_name=effective_model,
-                        thinking_mode=thinking_enabled,
-                    )
-
-                    # Send warning if model doesn't support tool calling
-                    if agent.tool_warning:
-                        warning_msg = {
-                            "type": "warning",
-                            "warning": agent.tool_warning,
-                            "warning_type": "tool_calling_not_supported",
+                        logger.error("agent_creation_error", error=str(e))
+                        error_msg = {
+                            "type": "error",
+                            "error": f"Failed to create agent: {str(e)}",
                         }
                         if connection:
-                            await connection.send_json(warning_msg)
+                            await connection.send_json(error_msg)
                         else:
-                            await websocket.send_json(warning_msg)
-                        logger.warning(
-                            "agent_tool_warning_sent",
-                            warning=agent.tool_warning,
-                            provider=provider_type,
-                            model=effective_model,
-                        )
-
-                except Exception as e:
-                    logger.error("agent_creation_error", error=str(e))
-                    error_msg = {
-                        "type": "error",
-                        "error": f"Failed to create agent: {str(e)}",
-                    }
-                    if connection:
-                        await connection.send_json(error_msg)
-                    else:
-                        await websocket.send_json(error_msg)
-                    continue
-
-                # Stream response with MCP server connection
-                # CRITICAL: async with agent establishes MCP server connections
-                full_response = ""
-                try:
-                    async with agent:  # Establish MCP server connections
-                        async for chunk in agent.chat_stream(augmented_content):
-                            full_response += chunk
-                            chunk_msg = {
-                                "type": "chunk",
-                                "content": chunk,
+                            await websocket.send_json(error_msg)
+                        continue
+
+                    # Stream response with MCP server connection
+                    # CRITICAL: async with agent establishes MCP server connections
+                    full_response = ""
+                    try:
+                        async with agent:  # Establish MCP server connections
+                            async for chunk in agent.chat_stream(augmented_content):
+                                full_response += chunk
+                                chunk_msg = {
+                                    "type": "chunk",
+                                    "content": chunk,
+                                }
+                                if connection:
+                                    await connection.send_json(chunk_msg)
+                                else:
+                                    await websocket.send_json(chunk_msg)
+
+                            exchanges.append((content, full_response))
+
+                            # Get token usage after streaming
+                            stats = agent.get_last_response_stats()
+                            token_usage = stats.get("token_usage")
+
+                            # Send completion message
+                            complete_msg = {
+                                "type": "complete",
+                                "message": {
+                                    "id": 0,  # Would be set by database in full implementation
+                                    "conversation_id": conversation_id,
+                                    "role": "assistant",
+                                    "content": full_response,
+                                    "tool_calls": None,
+                                    "metadata": {"sources": rag_sources} if rag_sources else None,
+                                    "tokens_used": token_usage.total_tokens
+                                    if token_usage
+                                    else None,
+                                    "created_at": None,
+                                },
+                                "trace": trace.to_dict() if trace else None,
                             }
                             if connection:
-                                await connection.send_json(chunk_msg)
+                                await connection.send_json(complete_msg)
                             else:
-                                await websocket.send_json(chunk_msg)
-
-                        # Get token usage after streaming
-                        stats = agent.get_last_response_stats()
-                        token_usage = stats.get("token_usage")
-
-                        # Send completion message
-                        complete_msg = {
-                            "type": "complete",
-                            "message": {
-                                "id": 0,  # Would be set by database in full implementation
-                                "conversation_id": conversation_id,
-                                "role": "assistant",
-                                "content": full_response,
-                                "tool_calls": None,
-                                "metadata": {"sources": rag_sources} if rag_sources else None,
-                                "tokens_used": token_usage.total_tokens if token_usage else None,
-                                "created_at": None,
-                            },
+                                await websocket.send_json(complete_msg)
+
+                            logger.info(
+                                "websocket_response_sent",
+                                conversation_id=conversation_id,
+                                response_length=len(full_response),
+                                tokens=token_usage.total_tokens if token_usage else 0,
+                            )
+
+                    except ResearchAgentError as e:
+                        logger.error("agent_chat_error", error=str(e))
+                        error_msg = {
+                            "type": "error",
+                            "error": str(e),
                         }
                         if connection:
-                            await connection.send_json(complete_msg)
+                            await connection.send_json(error_msg)
                         else:
-                            await websocket.send_json(complete_msg)
-
-                        logger.info(
-                            "websocket_response_sent",
-                            conversation_id=conversation_id,
-                            response_length=len(full_response),
-                            tokens=token_usage.total_tokens if token_usage else 0,
-                        )
-
-                except ResearchAgentError as e:
-                    logger.error("agent_chat_error", error=str(e))
-                    error_msg = {
-                        "type": "error",
-                        "error": str(e),
-                    }
-                    if connection:
-                        await connection.send_json(error_msg)
-                    else:
-                        await websocket.send_json(error_msg)
+                            await websocket.send_json(error_msg)
 
     except WebSocketDisconnect:
         logger.info("websocket_disconnected", conversation_id=conversation_id)
@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_db
 from src.api.models.database import DataAlert
+from src.api.pagination import CountMode, paginate
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -61,6 +62,7 @@ class AlertListResponse(BaseModel):
 
     alerts: list[AlertResponse]
     total: int
+    next_cursor: str | None = None
 
 
 class AlertCheckResponse(BaseModel):
@@ -83,6 +85,8 @@ async def list_alerts(
     skip: int = 0,
     limit: int = 50,
     active_only: bool = False,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List all data alerts."""
@@ -90,18 +94,20 @@ async def list_alerts(
     if active_only:
         query = query.where(DataAlert.is_active == True)  # noqa: E712
 
-    # Get total
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(DataAlert.created_at.desc())
-    result = await db.execute(query)
-    alerts = result.scalars().all()
+    page = await paginate(
+        db,
+        query,
+        order_by=[(DataAlert.created_at, True), (DataAlert.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+    )
 
     return AlertListResponse(
-        alerts=[AlertResponse.model_validate(a) for a in alerts],
-        total=total,
+        alerts=[AlertResponse.model_validate(a) for a in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -132,6 +138,18 @@ async def create_alert(
     return AlertResponse.model_validate(alert)
 
 
+@router.get("/scheduler/metrics")
+async def get_alert_scheduler_metrics():
+    """Get alert evaluation metrics (cycle duration, start lag, timeouts)."""
+    from src.api.deps import get_alert_scheduler
+
+    scheduler = get_alert_scheduler()
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="Alert scheduler not available")
+
+    return {"running": scheduler.is_running, **scheduler.get_metrics()}
+
+
 @router.get("/{alert_id}", response_model=AlertResponse)
 async def get_alert(
     alert_id: int,
@@ -5,17 +5,31 @@ Phase 4.5: Observability - Query Performance Metrics Dashboard
 Endpoints for query performance metrics, system analytics, and monitoring.
 """
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
-from typing import Literal
+from typing import Any, Literal
 
 import structlog
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from redis.asyncio import Redis
-from sqlalchemy import text
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_db, get_redis_optional
+from src.api.deps import get_backend_session_factory, get_db, get_redis_optional
+from src.api.models.database import MetricsRollup, ToolCallRecord
+from src.services.metrics_rollup import (
+    METRIC_MESSAGES,
+    METRIC_QUERIES,
+    RollupSummary,
+    load_rollups,
+    summarize,
+)
+from src.utils.config import get_settings
+from src.utils.query_profiler import get_profiler
+from src.utils.tracing import get_trace_collector
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -129,6 +143,154 @@ class DashboardOverview(BaseModel):
     cache_stats: CacheStats | None
 
 
+class StatementProfile(BaseModel):
+    """Latency profile of one normalized SQL statement."""
+
+    fingerprint: str
+    database: str
+    statement: str
+    count: int
+    total_time_ms: float
+    avg_time_ms: float
+    min_time_ms: float
+    max_time_ms: float
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+
+
+class ProfiledSlowQuery(BaseModel):
+    """A statement that exceeded the slow query threshold."""
+
+    statement: str
+    fingerprint: str
+    database: str
+    parameters: str | None
+    execution_time_ms: float
+    timestamp: float
+
+
+class DatabaseProfileResponse(BaseModel):
+    """Live statement profile of the sample and backend engines."""
+
+    enabled: bool
+    total_queries: int
+    total_time_ms: float
+    avg_time_ms: float
+    max_time_ms: float
+    slow_queries: int
+    slow_query_threshold_ms: int
+    fingerprints: list[StatementProfile]
+    recent_slow_queries: list[ProfiledSlowQuery]
+
+
+class SpanLatency(BaseModel):
+    """Latency percentiles for one span name across recent turns."""
+
+    name: str
+    count: int
+    errors: int
+    avg_ms: float
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+
+
+class TraceSummary(BaseModel):
+    """One recorded agent turn."""
+
+    trace_id: str
+    name: str | None
+    duration_ms: float
+    breakdown_ms: dict[str, float]
+
+
+class TraceStatsResponse(BaseModel):
+    """Per-span latency percentiles and the most recent traces."""
+
+    enabled: bool
+    spans: list[SpanLatency]
+    recent: list[TraceSummary]
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+async def run_concurrently(
+    session_factory, *queries: Callable[[AsyncSession], Awaitable[Any]]
+) -> list[Any]:
+    """Run independent read queries concurrently, each on its own session."""
+    if session_factory is None:
+        raise RuntimeError("Backend database not initialized")
+
+    async def run(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with session_factory() as db:
+            return await query(db)
+
+    return await asyncio.gather(*(run(query) for query in queries))
+
+
+async def scalar_count(db: AsyncSession, sql: str) -> int:
+    """Run a COUNT query and return its value."""
+    result = await db.execute(text(sql))
+    return result.scalar() or 0
+
+
+def hour_label(bucket: datetime) -> str:
+    """Hour-of-day label (matches DATEPART(HOUR, ...))."""
+    return str(bucket.hour)
+
+
+def date_label(bucket: datetime) -> str:
+    """Date label (matches CAST(... AS DATE))."""
+    return bucket.date().isoformat()
+
+
+def week_label(bucket: datetime) -> str:
+    """Week-of-year label."""
+    return str(bucket.isocalendar().week)
+
+
+def month_label(bucket: datetime) -> str:
+    """Year-month label (matches FORMAT(..., 'yyyy-MM'))."""
+    return bucket.strftime("%Y-%m")
+
+
+def group_rollups(
+    rows: list[MetricsRollup], label: Callable[[datetime], str]
+) -> list[tuple[str, RollupSummary]]:
+    """Merge rollup rows sharing a label, keeping bucket order."""
+    groups: dict[str, RollupSummary] = {}
+    for row in rows:
+        key = label(row.bucket_start)
+        groups.setdefault(key, RollupSummary()).merge(RollupSummary.from_row(row))
+    return list(groups.items())
+
+
+async def get_redis_cache_stats(redis: Redis | None) -> CacheStats | None:
+    """Read keyspace statistics from Redis."""
+    if not redis:
+        return None
+    try:
+        info = await redis.info("stats")
+        hits = info.get("keyspace_hits", 0)
+        misses = info.get("keyspace_misses", 0)
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            hit_rate=f"{(hits / max(1, hits + misses) * 100):.1f}%",
+            evictions=info.get("evicted_keys", 0),
+            size=await redis.dbsize(),
+            max_size=0,  # Redis doesn't have a fixed max size like our LRU cache
+            ttl_seconds=0,
+        )
+    except Exception as e:
+        logger.warning("failed_to_get_redis_stats", error=str(e))
+        return None
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -136,13 +298,15 @@ class DashboardOverview(BaseModel):
 
 @router.get("/overview", response_model=DashboardOverview)
 async def get_analytics_overview(
-    db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_backend_session_factory),
     redis: Redis | None = Depends(get_redis_optional),
 ):
     """
     Get a complete analytics overview for the dashboard.
 
     Returns aggregated metrics for queries, system health, and cache performance.
+    Query and message figures come from the hourly/daily rollup tables, so the
+    cost does not grow with history size; the independent reads run concurrently.
     """
 
     now = datetime.utcnow()
@@ -150,85 +314,54 @@ async def get_analytics_overview(
     week_ago = now - timedelta(days=7)
     month_ago = now - timedelta(days=30)
 
-    # Query performance stats
-    query_stats_result = await db.execute(
-        text("""
-            SELECT
-                COUNT(*) as total_queries,
-                AVG(execution_time_ms) as avg_time,
-                MIN(execution_time_ms) as min_time,
-                MAX(execution_time_ms) as max_time,
-                SUM(COALESCE(result_row_count, 0)) as total_rows
-            FROM app.query_history
-        """)
+    (
+        (daily_queries, recent_queries, daily_messages, total_convs, total_docs, active_mcp),
+        cache_stats,
+    ) = await asyncio.gather(
+        run_concurrently(
+            session_factory,
+            lambda db: load_rollups(db, METRIC_QUERIES, "day"),
+            lambda db: load_rollups(db, METRIC_QUERIES, "hour", since=month_ago),
+            lambda db: load_rollups(db, METRIC_MESSAGES, "day"),
+            lambda db: scalar_count(db, "SELECT COUNT(*) FROM app.conversations"),
+            lambda db: scalar_count(db, "SELECT COUNT(*) FROM app.documents"),
+            lambda db: scalar_count(
+                db, "SELECT COUNT(*) FROM app.mcp_server_configs WHERE is_enabled = 1"
+            ),
+        ),
+        get_redis_cache_stats(redis),
     )
-    row = query_stats_result.fetchone()
 
-    # Get queries by time period
-    queries_today = await db.execute(
-        text("SELECT COUNT(*) FROM app.query_history WHERE created_at >= :today"),
-        {"today": today_start},
-    )
-    queries_week = await db.execute(
-        text("SELECT COUNT(*) FROM app.query_history WHERE created_at >= :week_ago"),
-        {"week_ago": week_ago},
-    )
-    queries_month = await db.execute(
-        text("SELECT COUNT(*) FROM app.query_history WHERE created_at >= :month_ago"),
-        {"month_ago": month_ago},
-    )
+    all_time = summarize(daily_queries)
 
-    query_stats = QueryPerformanceStats(
-        total_queries=row.total_queries if row else 0,
-        avg_execution_time_ms=float(row.avg_time) if row and row.avg_time else None,
-        min_execution_time_ms=row.min_time if row else None,
-        max_execution_time_ms=row.max_time if row else None,
-        median_execution_time_ms=None,  # Would require more complex query
-        total_rows_returned=row.total_rows if row and row.total_rows else 0,
-        queries_today=queries_today.scalar() or 0,
-        queries_this_week=queries_week.scalar() or 0,
-        queries_this_month=queries_month.scalar() or 0,
-    )
+    def queries_since(since: datetime) -> int:
+        floor = since.replace(minute=0, second=0, microsecond=0)
+        return sum(row.event_count for row in recent_queries if row.bucket_start >= floor)
 
-    # System metrics
-    conversations_count = await db.execute(text("SELECT COUNT(*) FROM app.conversations"))
-    messages_count = await db.execute(text("SELECT COUNT(*) FROM app.messages"))
-    documents_count = await db.execute(text("SELECT COUNT(*) FROM app.documents"))
-    active_mcp = await db.execute(
-        text("SELECT COUNT(*) FROM app.mcp_server_configs WHERE is_enabled = 1")
+    query_stats = QueryPerformanceStats(
+        total_queries=all_time.event_count,
+        avg_execution_time_ms=all_time.avg,
+        min_execution_time_ms=all_time.value_min,
+        max_execution_time_ms=all_time.value_max,
+        median_execution_time_ms=all_time.quantile(0.5),
+        total_rows_returned=all_time.rows_sum,
+        queries_today=queries_since(today_start),
+        queries_this_week=queries_since(week_ago),
+        queries_this_month=queries_since(month_ago),
     )
 
-    total_convs = conversations_count.scalar() or 0
-    total_msgs = messages_count.scalar() or 0
-
+    total_msgs = sum(row.event_count for row in daily_messages)
     system_metrics = SystemMetrics(
         total_conversations=total_convs,
         total_messages=total_msgs,
-        total_documents=documents_count.scalar() or 0,
-        total_queries=row.total_queries if row else 0,
+        total_documents=total_docs,
+        total_queries=all_time.event_count,
         avg_messages_per_conversation=(total_msgs / total_convs) if total_convs > 0 else 0,
-        active_mcp_servers=active_mcp.scalar() or 0,
+        active_mcp_servers=active_mcp,
         database_status="connected",
         cache_status="connected" if redis else "disconnected",
     )
 
-    # Cache stats (if Redis available)
-    cache_stats = None
-    if redis:
-        try:
-            info = await redis.info("stats")
-            cache_stats = CacheStats(
-                hits=info.get("keyspace_hits", 0),
-                misses=info.get("keyspace_misses", 0),
-                hit_rate=f"{(info.get('keyspace_hits', 0) / max(1, info.get('keyspace_hits', 0) + info.get('keyspace_misses', 0)) * 100):.1f}%",
-                evictions=info.get("evicted_keys", 0),
-                size=await redis.dbsize(),
-                max_size=0,  # Redis doesn't have a fixed max size like our LRU cache
-                ttl_seconds=0,
-            )
-        except Exception as e:
-            logger.warning("failed_to_get_redis_stats", error=str(e))
-
     return DashboardOverview(
         query_stats=query_stats,
         system_metrics=system_metrics,
@@ -244,6 +377,9 @@ async def get_query_performance_timeline(
     """
     Get query execution time trends over time.
 
+    Reads hourly rollups for the last 24 hours and daily rollups otherwise;
+    weekly and monthly points merge the daily rows.
+
     Args:
         period: Time period for aggregation (hour, day, week, month)
     """
@@ -251,53 +387,27 @@ async def get_query_performance_timeline(
 
     # Determine date range and grouping based on period
     if period == "hour":
-        start_date = now - timedelta(hours=24)
-        group_format = "DATEPART(HOUR, created_at)"
+        rows = await load_rollups(db, METRIC_QUERIES, "hour", since=now - timedelta(hours=24))
+        label = hour_label
     elif period == "day":
-        start_date = now - timedelta(days=7)
-        group_format = "CAST(created_at AS DATE)"
+        rows = await load_rollups(db, METRIC_QUERIES, "day", since=now - timedelta(days=7))
+        label = date_label
     elif period == "week":
-        start_date = now - timedelta(weeks=4)
-        group_format = "DATEPART(WEEK, created_at)"
+        rows = await load_rollups(db, METRIC_QUERIES, "day", since=now - timedelta(weeks=4))
+        label = week_label
     else:  # month
-        start_date = now - timedelta(days=365)
-        group_format = "FORMAT(created_at, 'yyyy-MM')"
+        rows = await load_rollups(db, METRIC_QUERIES, "day", since=now - timedelta(days=365))
+        label = month_label
 
-    result = await db.execute(
-        text(f"""
-            SELECT
-                {group_format} as time_bucket,
-                AVG(execution_time_ms) as avg_time,
-                COUNT(*) as query_count
-            FROM app.query_history
-            WHERE created_at >= :start_date
-            GROUP BY {group_format}
-            ORDER BY time_bucket
-        """),
-        {"start_date": start_date},
-    )
-
-    rows = result.fetchall()
     data = [
-        TimeSeriesPoint(timestamp=str(row.time_bucket), value=float(row.avg_time or 0))
-        for row in rows
+        TimeSeriesPoint(timestamp=key, value=float(summary.avg or 0))
+        for key, summary in group_rollups(rows, label)
     ]
 
-    # Calculate overall average
-    avg_result = await db.execute(
-        text("""
-            SELECT AVG(execution_time_ms) as avg_time
-            FROM app.query_history
-            WHERE created_at >= :start_date
-        """),
-        {"start_date": start_date},
-    )
-    avg_row = avg_result.fetchone()
-
     return QueryTimeSeriesResponse(
         period=period,
         data=data,
-        avg_execution_time=float(avg_row.avg_time) if avg_row and avg_row.avg_time else None,
+        avg_execution_time=summarize(rows).avg,
     )
 
 
@@ -386,52 +496,29 @@ async def get_tool_usage_stats(
     """
     Get MCP tool usage statistics.
 
-    Analyzes tool_calls from messages to determine tool usage patterns.
+    Aggregates the normalized tool_calls table (extracted from message
+    tool_calls by the rollup job) over its (created_at, tool_name) index.
     """
-    import json
-
     start_date = datetime.utcnow() - timedelta(days=days)
 
-    # Get all messages with tool calls
+    usage = func.count().label("usage_count")
     result = await db.execute(
-        text("""
-            SELECT tool_calls
-            FROM app.messages
-            WHERE tool_calls IS NOT NULL
-            AND tool_calls != ''
-            AND created_at >= :start_date
-        """),
-        {"start_date": start_date},
+        select(ToolCallRecord.tool_name, usage)
+        .where(ToolCallRecord.created_at >= start_date)
+        .group_by(ToolCallRecord.tool_name)
+        .order_by(usage.desc())
     )
-
-    rows = result.fetchall()
-
-    # Parse tool calls and count usage
-    tool_counts: dict[str, int] = {}
-    total_calls = 0
-
-    for row in rows:
-        try:
-            if row.tool_calls:
-                tool_calls = json.loads(row.tool_calls)
-                if isinstance(tool_calls, list):
-                    for call in tool_calls:
-                        tool_name = call.get("name", call.get("tool_name", "unknown"))
-                        tool_counts[tool_name] = tool_counts.get(tool_name, 0) + 1
-                        total_calls += 1
-        except json.JSONDecodeError:
-            continue
-
-    # Calculate percentages and create response
-    tools = []
-    for name, count in sorted(tool_counts.items(), key=lambda x: x[1], reverse=True):
-        tools.append(
-            ToolUsageStats(
-                tool_name=name,
-                usage_count=count,
-                percentage=round((count / total_calls * 100) if total_calls > 0 else 0, 1),
-            )
+    rows = result.all()
+    total_calls = sum(count for _, count in rows)
+
+    tools = [
+        ToolUsageStats(
+            tool_name=name,
+            usage_count=count,
+            percentage=round((count / total_calls * 100) if total_calls > 0 else 0, 1),
         )
+        for name, count in rows
+    ]
 
     return ToolUsageResponse(total_tool_calls=total_calls, tools=tools)
 
@@ -478,90 +565,162 @@ async def get_conversation_activity(
     """
     Get conversation activity over time.
 
-    Shows number of messages per time period.
+    Shows number of messages per time period, read from the message rollups.
     """
     now = datetime.utcnow()
 
     if period == "day":
-        start_date = now - timedelta(days=1)
-        group_format = "DATEPART(HOUR, created_at)"
-    elif period == "week":
-        start_date = now - timedelta(days=7)
-        group_format = "CAST(created_at AS DATE)"
-    else:  # month
-        start_date = now - timedelta(days=30)
-        group_format = "CAST(created_at AS DATE)"
-
-    result = await db.execute(
-        text(f"""
-            SELECT
-                {group_format} as time_bucket,
-                COUNT(*) as message_count
-            FROM app.messages
-            WHERE created_at >= :start_date
-            GROUP BY {group_format}
-            ORDER BY time_bucket
-        """),
-        {"start_date": start_date},
-    )
+        rows = await load_rollups(db, METRIC_MESSAGES, "hour", since=now - timedelta(days=1))
+        label = hour_label
+    else:
+        days = 7 if period == "week" else 30
+        rows = await load_rollups(db, METRIC_MESSAGES, "day", since=now - timedelta(days=days))
+        label = date_label
 
-    rows = result.fetchall()
     return [
-        TimeSeriesPoint(timestamp=str(row.time_bucket), value=float(row.message_count))
-        for row in rows
+        TimeSeriesPoint(timestamp=key, value=float(summary.event_count))
+        for key, summary in group_rollups(rows, label)
     ]
 
 
 @router.get("/documents/stats")
 async def get_document_stats(
-    db: AsyncSession = Depends(get_db),
+    session_factory=Depends(get_backend_session_factory),
 ):
     """
     Get document processing statistics.
 
-    Returns counts by processing status and file type.
+    Returns counts by processing status and file type. The three aggregates
+    run concurrently.
     """
-    # Get counts by status
-    status_result = await db.execute(
-        text("""
-            SELECT processing_status, COUNT(*) as count
-            FROM app.documents
-            GROUP BY processing_status
-        """)
+
+    async def status_counts(db: AsyncSession) -> dict[str, int]:
+        result = await db.execute(
+            text("""
+                SELECT processing_status, COUNT(*) as count
+                FROM app.documents
+                GROUP BY processing_status
+            """)
+        )
+        return {row.processing_status: row.count for row in result.fetchall()}
+
+    async def type_counts(db: AsyncSession) -> dict[str, int]:
+        result = await db.execute(
+            text("""
+                SELECT
+                    CASE
+                        WHEN mime_type LIKE '%pdf%' THEN 'PDF'
+                        WHEN mime_type LIKE '%word%' OR mime_type LIKE '%docx%' THEN 'Word'
+                        WHEN mime_type LIKE '%text%' THEN 'Text'
+                        ELSE 'Other'
+                    END as file_type,
+                    COUNT(*) as count
+                FROM app.documents
+                GROUP BY CASE
+                        WHEN mime_type LIKE '%pdf%' THEN 'PDF'
+                        WHEN mime_type LIKE '%word%' OR mime_type LIKE '%docx%' THEN 'Word'
+                        WHEN mime_type LIKE '%text%' THEN 'Text'
+                        ELSE 'Other'
+                    END
+            """)
+        )
+        return {row.file_type: row.count for row in result.fetchall()}
+
+    by_status, by_type, total_chunks = await run_concurrently(
+        session_factory,
+        status_counts,
+        type_counts,
+        lambda db: scalar_count(
+            db, "SELECT SUM(COALESCE(chunk_count, 0)) as total_chunks FROM app.documents"
+        ),
     )
 
-    # Get counts by file type
-    type_result = await db.execute(
-        text("""
-            SELECT
-                CASE
-                    WHEN mime_type LIKE '%pdf%' THEN 'PDF'
-                    WHEN mime_type LIKE '%word%' OR mime_type LIKE '%docx%' THEN 'Word'
-                    WHEN mime_type LIKE '%text%' THEN 'Text'
-                    ELSE 'Other'
-                END as file_type,
-                COUNT(*) as count
-            FROM app.documents
-            GROUP BY CASE
-                    WHEN mime_type LIKE '%pdf%' THEN 'PDF'
-                    WHEN mime_type LIKE '%word%' OR mime_type LIKE '%docx%' THEN 'Word'
-                    WHEN mime_type LIKE '%text%' THEN 'Text'
-                    ELSE 'Other'
-                END
-        """)
+    return {
+        "by_status": by_status,
+        "by_type": by_type,
+        "total_chunks": total_chunks,
+    }
+
+
+@router.get("/db-profile", response_model=DatabaseProfileResponse)
+async def get_db_profile(
+    limit: int = Query(default=20, ge=1, le=200),
+    sort_by: Literal["total_time_ms", "count", "p95_ms", "max_time_ms"] = "total_time_ms",
+):
+    """
+    Get live per-statement latency for both database engines.
+
+    Statements are grouped by fingerprint (SQL with literals stripped) and
+    reported with count, mean and p50/p95/p99 latency since startup or the
+    last reset, together with the most recent slow queries. Slow queries
+    carry their normalized text and no bind parameters unless
+    ``DB_PROFILE_CAPTURE_PARAMETERS`` is set.
+    """
+    profiler = get_profiler()
+    stats = profiler.get_stats()
+    return DatabaseProfileResponse(
+        enabled=get_settings().db_profiling_enabled,
+        total_queries=stats["total_queries"],
+        total_time_ms=stats["total_time_ms"],
+        avg_time_ms=stats["avg_time_ms"],
+        max_time_ms=stats["max_time_ms"],
+        slow_queries=stats["slow_queries"],
+        slow_query_threshold_ms=stats["slow_query_threshold_ms"],
+        fingerprints=profiler.get_fingerprints(limit=limit, sort_by=sort_by),
+        recent_slow_queries=list(reversed(profiler.get_slow_queries(limit=limit))),
     )
 
-    # Get total chunks
-    chunks_result = await db.execute(
-        text("SELECT SUM(COALESCE(chunk_count, 0)) as total_chunks FROM app.documents")
+
+@router.delete("/db-profile", status_code=204)
+async def reset_db_profile():
+    """Reset the statement profile."""
+    get_profiler().reset()
+
+
+@router.get("/db-profile/metrics", response_class=PlainTextResponse)
+async def get_db_profile_metrics():
+    """
+    Export statement latency histograms in the Prometheus text format.
+
+    Only available when ``DB_PROFILE_PROMETHEUS_ENABLED`` is set.
+    """
+    if not get_settings().db_profile_prometheus_enabled:
+        raise HTTPException(status_code=404, detail="Prometheus export is disabled")
+    return PlainTextResponse(
+        get_profiler().render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
     )
 
-    status_rows = status_result.fetchall()
-    type_rows = type_result.fetchall()
-    total_chunks = chunks_result.scalar() or 0
 
-    return {
-        "by_status": {row.processing_status: row.count for row in status_rows},
-        "by_type": {row.file_type: row.count for row in type_rows},
-        "total_chunks": total_chunks,
-    }
+@router.get("/traces", response_model=TraceStatsResponse)
+async def get_trace_stats(limit: int = Query(default=20, ge=1, le=200)):
+    """
+    Get per-turn latency breakdowns.
+
+    Returns p50/p95/p99 per span name (RAG embedding, vector search, model
+    requests, tool calls, SQL) across recorded turns, and the most recent
+    turns with their time per span name.
+    """
+    collector = get_trace_collector()
+    return TraceStatsResponse(
+        enabled=collector.enabled,
+        spans=collector.get_span_stats(),
+        recent=[
+            TraceSummary(
+                trace_id=trace.trace_id,
+                name=trace.root.name if trace.root else None,
+                duration_ms=round(trace.duration_ms, 2),
+                breakdown_ms=trace.breakdown(),
+            )
+            for trace in collector.get_recent(limit)
+        ],
+    )
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Get the span waterfall of a recent turn."""
+    trace = get_trace_collector().get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace.to_dict()
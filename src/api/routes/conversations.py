@@ -16,6 +16,7 @@ from sqlalchemy.orm import selectinload
 
 from src.api.deps import get_db
 from src.api.models.database import Conversation, Message
+from src.api.pagination import CountMode, paginate
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -76,6 +77,7 @@ class ConversationListResponse(BaseModel):
 
     conversations: list[ConversationResponse]
     total: int
+    next_cursor: str | None = None
 
 
 @router.get("", response_model=ConversationListResponse)
@@ -83,27 +85,25 @@ async def list_conversations(
     skip: int = 0,
     limit: int = 20,
     include_archived: bool = False,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List all conversations."""
-    # Build query
     query = select(Conversation)
     if not include_archived:
         query = query.where(Conversation.is_archived == False)  # noqa: E712
 
-    # Get total count
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results with message count
-    query = (
-        query.options(selectinload(Conversation.messages))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Conversation.updated_at.desc())
+    page = await paginate(
+        db,
+        query,
+        order_by=[(Conversation.updated_at, True), (Conversation.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+        child_count=Message.conversation_id,
     )
-    result = await db.execute(query)
-    conversations = result.scalars().all()
 
     return ConversationListResponse(
         conversations=[
@@ -113,11 +113,12 @@ async def list_conversations(
                 created_at=conv.created_at,
                 updated_at=conv.updated_at,
                 is_archived=conv.is_archived,
-                message_count=len(conv.messages),
+                message_count=page.child_counts.get(conv.id, 0),
             )
-            for conv in conversations
+            for conv in page.items
         ],
-        total=total,
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -177,6 +178,7 @@ class MessagesListResponse(BaseModel):
 
     messages: list[MessageResponse]
     total: int
+    next_cursor: str | None = None
 
 
 @router.get("/{conversation_id}/messages", response_model=MessagesListResponse)
@@ -184,6 +186,8 @@ async def list_messages(
     conversation_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List all messages for a conversation."""
@@ -191,24 +195,20 @@ async def list_messages(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    query = (
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
+    page = await paginate(
+        db,
+        select(Message).where(Message.conversation_id == conversation_id),
+        order_by=[(Message.created_at, False), (Message.id, False)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
     )
 
-    # Get total count
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    messages = result.scalars().all()
-
     return MessagesListResponse(
-        messages=[MessageResponse.model_validate(msg) for msg in messages],
-        total=total,
+        messages=[MessageResponse.model_validate(msg) for msg in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -18,8 +18,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.api.deps import get_db
+from src.api.deps import get_db, get_widget_refresh_service
 from src.api.models.database import Dashboard, DashboardWidget
+from src.api.pagination import CountMode, paginate
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -107,6 +108,26 @@ class LayoutUpdateRequest(BaseModel):
     widgets: list[LayoutUpdateItem]
 
 
+class WidgetDataResponse(BaseModel):
+    """Response model for cached widget query results."""
+
+    widget_id: int
+    query_hash: str
+    data: list[dict[str, Any]]
+    columns: list[str]
+    row_count: int
+    execution_time_ms: int
+    refreshed_at: datetime
+    error: str | None = None
+
+
+class DashboardDataResponse(BaseModel):
+    """Response model for cached data of all widgets on a dashboard."""
+
+    dashboard_id: int
+    widgets: list[WidgetDataResponse]
+
+
 # Dashboard Models
 class DashboardCreate(BaseModel):
     """Request model for creating a dashboard."""
@@ -145,6 +166,7 @@ class DashboardListResponse(BaseModel):
 
     dashboards: list[DashboardResponse]
     total: int
+    next_cursor: str | None = None
 
 
 # Dashboard Endpoints
@@ -152,19 +174,21 @@ class DashboardListResponse(BaseModel):
 async def list_dashboards(
     skip: int = 0,
     limit: int = 20,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List all dashboards."""
-    query = select(Dashboard).options(selectinload(Dashboard.widgets))
-
-    # Get total
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(Dashboard.updated_at.desc())
-    result = await db.execute(query)
-    dashboards = result.scalars().all()
+    page = await paginate(
+        db,
+        select(Dashboard),
+        order_by=[(Dashboard.updated_at, True), (Dashboard.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+        child_count=DashboardWidget.dashboard_id,
+    )
 
     return DashboardListResponse(
         dashboards=[
@@ -178,11 +202,12 @@ async def list_dashboards(
                 share_expires_at=d.share_expires_at,
                 created_at=d.created_at,
                 updated_at=d.updated_at,
-                widget_count=len(d.widgets),
+                widget_count=page.child_counts.get(d.id, 0),
             )
-            for d in dashboards
+            for d in page.items
         ],
-        total=total,
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -433,6 +458,10 @@ async def create_widget(
     await db.commit()
     await db.refresh(widget)
 
+    widget_service = get_widget_refresh_service()
+    if widget_service:
+        widget_service.widget_changed(widget)
+
     # Return with parsed JSON
     return WidgetListItem(
         id=widget.id,
@@ -471,6 +500,10 @@ async def update_widget(
     await db.commit()
     await db.refresh(widget)
 
+    widget_service = get_widget_refresh_service()
+    if widget_service:
+        widget_service.widget_changed(widget)
+
     return WidgetResponse.model_validate(widget)
 
 
@@ -488,6 +521,10 @@ async def delete_widget(
     await db.delete(widget)
     await db.commit()
 
+    widget_service = get_widget_refresh_service()
+    if widget_service:
+        widget_service.invalidate_widget(widget_id)
+
     return {"status": "deleted", "widget_id": widget_id}
 
 
@@ -538,6 +575,52 @@ async def list_dashboard_widgets(
     return WidgetListResponse(widgets=widget_list)
 
 
+@router.get("/{dashboard_id}/data", response_model=DashboardDataResponse)
+async def get_dashboard_data(
+    dashboard_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get cached query results for every widget on a dashboard.
+
+    Results are served from the server-side widget cache; only stale or
+    missing widgets are executed, and concurrent viewers share one execution.
+    """
+    widget_service = get_widget_refresh_service()
+    if widget_service is None:
+        raise HTTPException(status_code=503, detail="Widget refresh service not available")
+
+    dashboard = await db.get(Dashboard, dashboard_id)
+    if not dashboard:
+        raise HTTPException(status_code=404, detail="Dashboard not found")
+
+    results = await widget_service.get_dashboard_data(dashboard_id)
+    return DashboardDataResponse(
+        dashboard_id=dashboard_id,
+        widgets=[WidgetDataResponse(**r.to_dict()) for r in results],
+    )
+
+
+@router.get("/{dashboard_id}/widgets/{widget_id}/data", response_model=WidgetDataResponse)
+async def get_widget_data(
+    dashboard_id: int,
+    widget_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get cached query results for a single widget."""
+    widget_service = get_widget_refresh_service()
+    if widget_service is None:
+        raise HTTPException(status_code=503, detail="Widget refresh service not available")
+
+    widget = await db.get(DashboardWidget, widget_id)
+    if not widget or widget.dashboard_id != dashboard_id:
+        raise HTTPException(status_code=404, detail="Widget not found")
+    if not widget.query:
+        raise HTTPException(status_code=400, detail="Widget has no query")
+
+    result = await widget_service.get_widget_data(widget)
+    return WidgetDataResponse(**result.to_dict())
+
+
 @router.put("/{dashboard_id}/layout")
 async def update_dashboard_layout(
     dashboard_id: int,
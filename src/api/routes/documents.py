@@ -6,10 +6,12 @@ Endpoints for document upload, processing, and management.
 """
 
 import contextlib
+import hashlib
 import json
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Annotated
 
 import aiofiles
 import structlog
@@ -21,13 +23,16 @@ from fastapi import (
     HTTPException,
     UploadFile,
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_db, get_vector_store_optional
+from src.api.deps import get_db, get_ingestion_queue_optional, get_vector_store_optional
+from src.api.document_tags import set_document_tags, tag_facets, tag_filter
 from src.api.models.database import Document
+from src.api.pagination import CountMode, paginate
 from src.rag.docling_processor import get_document_processor
+from src.services.document_service import DocumentService
 from src.utils.config import get_settings
 
 router = APIRouter()
@@ -82,12 +87,20 @@ class DocumentListResponse(BaseModel):
 
     documents: list[DocumentResponse]
     total: int
+    next_cursor: str | None = None
 
 
 class DocumentTagsUpdate(BaseModel):
     """Request model for updating document tags."""
 
-    tags: list[str]
+    tags: list[Annotated[str, Field(max_length=255)]]
+
+
+class TagFacet(BaseModel):
+    """Tag with the number of documents carrying it."""
+
+    tag: str
+    count: int
 
 
 class AllTagsResponse(BaseModel):
@@ -95,6 +108,7 @@ class AllTagsResponse(BaseModel):
 
     tags: list[str]
     total: int
+    facets: list[TagFacet] = []
 
 
 # NOTE: /tags/all MUST be defined BEFORE /{document_id} routes to prevent
@@ -103,24 +117,13 @@ class AllTagsResponse(BaseModel):
 async def get_all_tags(
     db: AsyncSession = Depends(get_db),
 ):
-    """Get all unique tags across all documents."""
-    query = select(Document)
-    result = await db.execute(query)
-    documents = result.scalars().all()
-
-    all_tags: set[str] = set()
-    for doc in documents:
-        if doc.tags:
-            try:
-                doc_tags = json.loads(doc.tags)
-                all_tags.update(doc_tags)
-            except (json.JSONDecodeError, TypeError):
-                # Silently skip documents with malformed tags JSON to ensure
-                # the endpoint returns valid tags from other documents
-                pass
-
-    sorted_tags = sorted(all_tags)
-    return AllTagsResponse(tags=sorted_tags, total=len(sorted_tags))
+    """Get all unique tags across all documents, with per-tag document counts."""
+    facets = await tag_facets(db)
+    return AllTagsResponse(
+        tags=[tag for tag, _ in facets],
+        total=len(facets),
+        facets=[TagFacet(tag=tag, count=count) for tag, count in facets],
+    )
 
 
 @router.get("", response_model=DocumentListResponse)
@@ -128,44 +131,29 @@ async def list_documents(
     skip: int = 0,
     limit: int = 20,
     tag: str | None = None,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List all documents, optionally filtered by tag."""
-    # Get total count
-    count_query = select(Document)
-    result = await db.execute(count_query)
-    all_docs = result.scalars().all()
-
-    # Filter by tag if provided
+    query = select(Document)
     if tag:
-        filtered_docs = []
-        for doc in all_docs:
-            if doc.tags:
-                try:
-                    doc_tags = json.loads(doc.tags)
-                    if tag.lower() in [t.lower() for t in doc_tags]:
-                        filtered_docs.append(doc)
-                except (json.JSONDecodeError, TypeError):
-                    # Skip documents with malformed tag JSON - this can happen if tags
-                    # were manually edited in the database or during migration
-                    logger.debug(
-                        "skipping_document_with_invalid_tags",
-                        document_id=doc.id,
-                        tags_value=doc.tags,
-                    )
-        total = len(filtered_docs)
-        # Apply pagination
-        documents = filtered_docs[skip : skip + limit]
-    else:
-        total = len(all_docs)
-        # Get paginated results
-        query = select(Document).offset(skip).limit(limit).order_by(Document.created_at.desc())
-        result = await db.execute(query)
-        documents = result.scalars().all()
+        query = query.where(tag_filter([tag]))
+
+    page = await paginate(
+        db,
+        query,
+        order_by=[(Document.created_at, True), (Document.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+    )
 
     return DocumentListResponse(
-        documents=[DocumentResponse.from_orm_with_tags(doc) for doc in documents],
-        total=total,
+        documents=[DocumentResponse.from_orm_with_tags(doc) for doc in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -175,6 +163,7 @@ async def upload_document(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
     vector_store=Depends(get_vector_store_optional),
+    ingestion_queue=Depends(get_ingestion_queue_optional),
 ):
     """Upload a new document for processing."""
     settings = get_settings()
@@ -202,6 +191,30 @@ async def upload_document(
             detail=f"Unsupported file type. Supported: {processor.SUPPORTED_EXTENSIONS}",
         )
 
+    # Identical content uploaded before is returned instead of stored again;
+    # a copy whose processing failed is processed again instead
+    document_service = DocumentService()
+    duplicate = await document_service.find_duplicate(db, content)
+    if duplicate is not None:
+        if duplicate.processing_status != "failed":
+            logger.info(
+                "duplicate_upload_detected",
+                document_id=duplicate.id,
+                original_filename=file.filename,
+            )
+            return DocumentResponse.from_orm_with_tags(duplicate)
+
+        document = await document_service.retry_failed_duplicate(db, duplicate, content)
+        if vector_store:
+            await _schedule_processing(
+                document.id,
+                Path(settings.upload_dir) / document.filename,
+                background_tasks,
+                ingestion_queue,
+                restart=True,
+            )
+        return DocumentResponse.from_orm_with_tags(document)
+
     # Save file
     filename = f"{uuid.uuid4()}{suffix}"
     upload_path = Path(settings.upload_dir) / filename
@@ -217,6 +230,7 @@ async def upload_document(
         mime_type=file.content_type,
         file_size=file_size,
         processing_status="pending",
+        content_hash=hashlib.sha256(content).hexdigest(),
     )
     db.add(document)
     await db.commit()
@@ -224,26 +238,42 @@ async def upload_document(
 
     # Process in background if vector store is available
     if vector_store:
-        background_tasks.add_task(
-            process_document_task,
-            document.id,
-            upload_path,
-            settings.chunk_size,
-            settings.chunk_overlap,
-        )
+        await _schedule_processing(document.id, upload_path, background_tasks, ingestion_queue)
     else:
         logger.warning("vector_store_unavailable", document_id=document.id)
 
     return DocumentResponse.from_orm_with_tags(document)
 
 
+async def _schedule_processing(
+    document_id: int,
+    file_path: Path,
+    background_tasks: BackgroundTasks,
+    ingestion_queue=None,
+    restart: bool = False,
+) -> None:
+    """Queue a document on the durable ingestion queue, or as a background task."""
+    if ingestion_queue is not None:
+        await ingestion_queue.enqueue(document_id, restart=restart)
+        return
+
+    settings = get_settings()
+    background_tasks.add_task(
+        process_document_task,
+        document_id,
+        file_path,
+        settings.chunk_size,
+        settings.chunk_overlap,
+    )
+
+
 async def process_document_task(
     document_id: int,
     file_path: Path,
     chunk_size: int,
     chunk_overlap: int,
 ):
-    """Background task to process document."""
+    """Background task to process document (used when the ingestion queue is unavailable)."""
     from src.api.deps import _backend_session_factory, _vector_store
 
     if _backend_session_factory is None:
@@ -283,9 +313,9 @@ async def process_document_task(
         # Process file
         result = await processor.process_file(file_path)
 
-        # Add to vector store if available
+        # Sync to vector store if available (only changed chunks are written)
         if _vector_store:
-            await _vector_store.add_document(
+            await _vector_store.sync_document(
                 document_id=str(document_id),
                 chunks=result["chunks"],
                 source=file_path.name,  # Use filename since we may not have doc reference
@@ -302,6 +332,13 @@ async def process_document_task(
                 doc.processed_at = datetime.utcnow()
                 await db.commit()
 
+                # Reprocessed documents keep their tags; re-apply them to the new chunks
+                if _vector_store and doc.tags:
+                    with contextlib.suppress(json.JSONDecodeError, TypeError):
+                        await _vector_store.update_document_tags(
+                            str(document_id), json.loads(doc.tags)
+                        )
+
         logger.info(
             "document_processed",
             document_id=document_id,
@@ -355,13 +392,15 @@ async def recover_stuck_documents(
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     vector_store=Depends(get_vector_store_optional),
+    ingestion_queue=Depends(get_ingestion_queue_optional),
 ):
     """
     Recover documents stuck in 'processing' status.
 
     This endpoint finds all documents with 'processing' status and requeues them
     for processing. Useful after server restarts or crashes that left documents
-    in an incomplete state.
+    in an incomplete state. With the ingestion queue, jobs already queued or
+    leased are kept and resume from their last checkpoint.
     """
     settings = get_settings()
 
@@ -378,6 +417,7 @@ async def recover_stuck_documents(
         )
 
     recovered_ids = []
+    recovered: list[tuple[int, Path]] = []
 
     for document in stuck_documents:
         # Check file still exists
@@ -393,30 +433,21 @@ async def recover_stuck_documents(
             )
             continue
 
-        # Delete existing embeddings if any
-        if vector_store:
-            with contextlib.suppress(Exception):
-                await vector_store.delete_document(str(document.id))
-
-        # Reset status to pending
+        # Reset status to pending (stored chunks are diffed on reprocessing)
         document.processing_status = "pending"
         document.error_message = None
         document.chunk_count = None
         document.processed_at = None
         recovered_ids.append(document.id)
-
-        # Queue for reprocessing
-        if vector_store:
-            background_tasks.add_task(
-                process_document_task,
-                document.id,
-                file_path,
-                settings.chunk_size,
-                settings.chunk_overlap,
-            )
+        recovered.append((document.id, file_path))
 
     await db.commit()
 
+    # Queue for reprocessing
+    if vector_store:
+        for document_id, file_path in recovered:
+            await _schedule_processing(document_id, file_path, background_tasks, ingestion_queue)
+
     logger.info(
         "stuck_documents_recovered",
         recovered_count=len(recovered_ids),
@@ -430,6 +461,17 @@ async def recover_stuck_documents(
     )
 
 
+# NOTE: /queue/stats MUST be defined BEFORE /{document_id} routes
+@router.get("/queue/stats")
+async def get_ingestion_queue_stats(
+    ingestion_queue=Depends(get_ingestion_queue_optional),
+):
+    """Get ingestion queue depth and throughput."""
+    if ingestion_queue is None:
+        raise HTTPException(status_code=503, detail="Ingestion queue not available")
+    return await ingestion_queue.get_stats()
+
+
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
@@ -476,6 +518,7 @@ async def reprocess_document(
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     vector_store=Depends(get_vector_store_optional),
+    ingestion_queue=Depends(get_ingestion_queue_optional),
 ):
     """Reprocess a failed or stuck document."""
     document = await db.get(Document, document_id)
@@ -496,12 +539,7 @@ async def reprocess_document(
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Document file not found on disk")
 
-    # Delete existing embeddings if any
-    if vector_store:
-        with contextlib.suppress(Exception):
-            await vector_store.delete_document(str(document_id))
-
-    # Reset status
+    # Reset status (existing embeddings are kept; processing rewrites changed chunks)
     document.processing_status = "pending"
     document.error_message = None
     document.chunk_count = None
@@ -509,14 +547,10 @@ async def reprocess_document(
     await db.commit()
     await db.refresh(document)
 
-    # Process in background
+    # Process in background, discarding any checkpoint from an earlier run
     if vector_store:
-        background_tasks.add_task(
-            process_document_task,
-            document.id,
-            file_path,
-            settings.chunk_size,
-            settings.chunk_overlap,
+        await _schedule_processing(
+            document.id, file_path, background_tasks, ingestion_queue, restart=True
         )
 
     return DocumentResponse.from_orm_with_tags(document)
@@ -527,23 +561,28 @@ async def update_document_tags(
     document_id: int,
     data: DocumentTagsUpdate,
     db: AsyncSession = Depends(get_db),
+    vector_store=Depends(get_vector_store_optional),
 ):
     """Update tags for a document.
 
-    Tags are stored as a JSON array in the database.
+    Tags are stored as a JSON array on the document, indexed in the
+    document_tags table, and propagated to the document's chunks in the vector store for tag-filtered search.
     """
     document = await db.get(Document, document_id)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Normalize tags: lowercase, strip whitespace, remove duplicates
-    normalized_tags = list({tag.strip().lower() for tag in data.tags if tag.strip()})
-
-    # Update tags
-    document.tags = json.dumps(normalized_tags)
+    # Normalize tags (lowercase, trimmed, de-duplicated) and index them
+    normalized_tags = await set_document_tags(db, document, data.tags)
     await db.commit()
     await db.refresh(document)
 
+    if vector_store:
+        try:
+            await vector_store.update_document_tags(str(document_id), normalized_tags)
+        except Exception as e:
+            logger.warning("vector_tags_update_failed", document_id=document_id, error=str(e))
+
     logger.info("document_tags_updated", document_id=document_id, tags=normalized_tags)
 
     return DocumentResponse.from_orm_with_tags(document)
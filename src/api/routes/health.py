@@ -10,13 +10,21 @@ import time
 import httpx
 import structlog
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from redis.asyncio import Redis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_db, get_mcp_manager_optional, get_redis_optional
+from src.api.deps import (
+    get_db,
+    get_mcp_manager_optional,
+    get_redis_optional,
+    get_startup_graph,
+    get_websocket_manager_optional,
+)
 from src.utils.config import get_settings
+from src.utils.resources import get_resource_registry
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -176,20 +184,32 @@ async def health_check(
 @router.get("/ready")
 async def readiness_check():
     """
-    Simple readiness check.
+    Readiness check.
 
-    Returns 200 when the API is ready to accept requests.
+    Returns 200 once the critical services have been initialized, and 503
+    while starting up or shutting down. Background initialization (vector
+    store index checks, schedulers, theme seeding) may still be running;
+    ``background_complete`` and ``steps`` report its progress.
     Used by Kubernetes readiness probes.
     """
-    return {"status": "ready"}
+    startup = get_startup_graph()
+    if startup is None:
+        return JSONResponse(status_code=503, content={"status": "starting", "steps": {}})
+
+    report = startup.report()
+    status = "ready" if report.pop("ready") else "not_ready"
+    return JSONResponse(
+        status_code=200 if status == "ready" else 503, content={"status": status, **report}
+    )
 
 
 @router.get("/live")
 async def liveness_check():
     """
-    Simple liveness check.
+    Liveness check.
 
-    Returns 200 when the API is alive.
+    Returns 200 whenever the process is serving requests, independent of
+    service initialization (see ``/ready``).
     Used by Kubernetes liveness probes.
     """
     return {"status": "alive"}
@@ -199,11 +219,13 @@ async def liveness_check():
 async def services_status(
     redis: Redis | None = Depends(get_redis_optional),
     mcp_manager=Depends(get_mcp_manager_optional),
+    ws_manager=Depends(get_websocket_manager_optional),
 ):
     """
     Get detailed status of all configured services.
 
-    Includes MCP servers and their status.
+    Includes MCP servers and their status, WebSocket send backlogs,
+    database connection pool metrics, and service startup progress.
     """
     services = {
         "api": {"status": "running", "version": "2.1.0"},
@@ -211,6 +233,15 @@ async def services_status(
         "mcp_servers": [],
     }
 
+    if ws_manager:
+        services["websocket"] = ws_manager.get_stats()
+
+    services["database_pools"] = get_resource_registry().get_pool_stats()
+
+    startup = get_startup_graph()
+    if startup:
+        services["startup"] = startup.report()
+
     # Add MCP server info if available
     if mcp_manager:
         try:
@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_db
 from src.api.models.database import QueryHistory, SavedQuery
+from src.api.pagination import CountMode, paginate
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -60,6 +61,7 @@ class QueryHistoryListResponse(BaseModel):
 
     queries: list[QueryHistoryResponse]
     total: int
+    next_cursor: str | None = None
 
 
 # Saved Query Models
@@ -91,6 +93,7 @@ class SavedQueryListResponse(BaseModel):
 
     queries: list[SavedQueryResponse]
     total: int
+    next_cursor: str | None = None
 
 
 # Query Endpoints - "/" redirects to history for frontend compatibility
@@ -99,10 +102,14 @@ async def list_queries(
     skip: int = 0,
     limit: int = 50,
     is_favorite: bool = False,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List queries (alias for /history for frontend compatibility)."""
-    return await list_query_history(skip, limit, is_favorite, db)
+    return await list_query_history(
+        skip=skip, limit=limit, favorites_only=is_favorite, cursor=cursor, count=count, db=db
+    )
 
 
 # Query History Endpoints
@@ -111,6 +118,8 @@ async def list_query_history(
     skip: int = 0,
     limit: int = 50,
     favorites_only: bool = False,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List query history."""
@@ -118,18 +127,20 @@ async def list_query_history(
     if favorites_only:
         query = query.where(QueryHistory.is_favorite == True)  # noqa: E712
 
-    # Get total
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(QueryHistory.created_at.desc())
-    result = await db.execute(query)
-    queries = result.scalars().all()
+    page = await paginate(
+        db,
+        query,
+        order_by=[(QueryHistory.created_at, True), (QueryHistory.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+    )
 
     return QueryHistoryListResponse(
-        queries=[QueryHistoryResponse.model_validate(q) for q in queries],
-        total=total,
+        queries=[QueryHistoryResponse.model_validate(q) for q in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -174,23 +185,25 @@ async def delete_query_history(
 async def list_saved_queries(
     skip: int = 0,
     limit: int = 50,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List saved queries."""
-    query = select(SavedQuery)
-
-    # Get total
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(SavedQuery.created_at.desc())
-    result = await db.execute(query)
-    queries = result.scalars().all()
+    page = await paginate(
+        db,
+        select(SavedQuery),
+        order_by=[(SavedQuery.created_at, True), (SavedQuery.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+    )
 
     return SavedQueryListResponse(
-        queries=[SavedQueryResponse.model_validate(q) for q in queries],
-        total=total,
+        queries=[SavedQueryResponse.model_validate(q) for q in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_db
 from src.api.models.database import ScheduledQuery
+from src.api.pagination import CountMode, paginate
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -59,6 +60,7 @@ class ScheduledQueryListResponse(BaseModel):
 
     queries: list[ScheduledQueryResponse]
     total: int
+    next_cursor: str | None = None
 
 
 class RunQueryResponse(BaseModel):
@@ -94,6 +96,8 @@ async def list_scheduled_queries(
     skip: int = 0,
     limit: int = 50,
     active_only: bool = False,
+    cursor: str | None = None,
+    count: CountMode = "exact",
     db: AsyncSession = Depends(get_db),
 ):
     """List all scheduled queries."""
@@ -101,18 +105,20 @@ async def list_scheduled_queries(
     if active_only:
         query = query.where(ScheduledQuery.is_active == True)  # noqa: E712
 
-    # Get total
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(ScheduledQuery.created_at.desc())
-    result = await db.execute(query)
-    queries = result.scalars().all()
+    page = await paginate(
+        db,
+        query,
+        order_by=[(ScheduledQuery.created_at, True), (ScheduledQuery.id, True)],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        count=count,
+    )
 
     return ScheduledQueryListResponse(
-        queries=[ScheduledQueryResponse.model_validate(q) for q in queries],
-        total=total,
+        queries=[ScheduledQueryResponse.model_validate(q) for q in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -17,13 +17,15 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_db
+from src.api.deps import get_db, get_provider_status_service_optional
 from src.api.models.database import ThemeConfig
 from src.providers.foundry import (
     FOUNDRY_NON_TOOL_MODELS,
     FOUNDRY_TOOL_CAPABLE_MODELS,
 )
+from src.providers.http import get_http_client, get_json
 from src.providers.ollama import OLLAMA_TOOL_CAPABLE_MODELS
+from src.services.provider_status import ProviderStatusService
 from src.utils.config import get_settings
 
 router = APIRouter()
@@ -264,59 +266,16 @@ class ProviderConnectionTestResult(BaseModel):
 
 
 @router.get("/providers", response_model=list[ProviderInfo])
-async def list_providers():
-    """List all available LLM providers with their status."""
-    settings = get_settings()
-    providers = []
-
-    # Check Ollama
-    ollama_info = ProviderInfo(
-        id="ollama",
-        name="ollama",
-        display_name="Ollama",
-        icon="🦙",
-        available=False,
-    )
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.ollama_host}/api/version",
-                timeout=5.0,
-            )
-            if response.status_code == 200:
-                data = response.json()
-                ollama_info.available = True
-                ollama_info.version = data.get("version", "unknown")
-    except Exception as e:
-        ollama_info.error = str(e)[:100]
-    providers.append(ollama_info)
-
-    # Check Foundry Local
-    foundry_info = ProviderInfo(
-        id="foundry_local",
-        name="foundry_local",
-        display_name="Foundry Local",
-        icon="🔧",
-        available=False,
-    )
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.foundry_endpoint}/v1/models",
-                timeout=5.0,
-            )
-            if response.status_code == 200:
-                foundry_info.available = True
-                foundry_info.version = "local"
-    except httpx.ConnectError:
-        foundry_info.error = (
-            f"Not running at {settings.foundry_endpoint}. Start with: foundry model run phi-4"
-        )
-    except Exception as e:
-        foundry_info.error = str(e)[:100]
-    providers.append(foundry_info)
+async def list_providers(status_service=Depends(get_provider_status_service_optional)):
+    """
+    List all available LLM providers with their status.
 
-    return providers
+    Providers are checked concurrently and responses are cached briefly, so
+    frequent polling does not add load on a busy inference server. Status
+    changes are also pushed as ``provider_status`` WebSocket messages.
+    """
+    service = status_service or ProviderStatusService()
+    return [ProviderInfo(**status) for status in await service.get_statuses()]
 
 
 def _check_ollama_tool_support(model_name: str) -> tuple[bool, str | None]:
@@ -407,29 +366,23 @@ async def list_provider_models(provider_id: str):
 
     if provider_id == "ollama":
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.ollama_host}/api/tags",
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                for model in data.get("models", []):
-                    model_name = model.get("name", "")
-                    supports_tools, tool_warning = _check_ollama_tool_support(model_name)
-                    models.append(
-                        ModelInfo(
-                            name=model_name,
-                            size=_format_size(model.get("size", 0)),
-                            modified_at=model.get("modified_at"),
-                            family=model.get("details", {}).get("family"),
-                            parameter_size=model.get("details", {}).get("parameter_size"),
-                            quantization_level=model.get("details", {}).get("quantization_level"),
-                            supports_tools=supports_tools,
-                            tool_warning=tool_warning,
-                        )
+            data = await get_json(f"{settings.ollama_host}/api/tags")
+
+            for model in data.get("models", []):
+                model_name = model.get("name", "")
+                supports_tools, tool_warning = _check_ollama_tool_support(model_name)
+                models.append(
+                    ModelInfo(
+                        name=model_name,
+                        size=_format_size(model.get("size", 0)),
+                        modified_at=model.get("modified_at"),
+                        family=model.get("details", {}).get("family"),
+                        parameter_size=model.get("details", {}).get("parameter_size"),
+                        quantization_level=model.get("details", {}).get("quantization_level"),
+                        supports_tools=supports_tools,
+                        tool_warning=tool_warning,
                     )
+                )
         except Exception as e:
             return ProviderModelsResponse(
                 provider=provider_id,
@@ -439,25 +392,19 @@ async def list_provider_models(provider_id: str):
 
     elif provider_id == "foundry_local":
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.foundry_endpoint}/v1/models",
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                for model in data.get("data", []):
-                    model_name = model.get("id", "")
-                    supports_tools, tool_warning = _check_foundry_tool_support(model_name)
-                    models.append(
-                        ModelInfo(
-                            name=model_name,
-                            family=model.get("owned_by"),
-                            supports_tools=supports_tools,
-                            tool_warning=tool_warning,
-                        )
+            data = await get_json(f"{settings.foundry_endpoint}/v1/models")
+
+            for model in data.get("data", []):
+                model_name = model.get("id", "")
+                supports_tools, tool_warning = _check_foundry_tool_support(model_name)
+                models.append(
+                    ModelInfo(
+                        name=model_name,
+                        family=model.get("owned_by"),
+                        supports_tools=supports_tools,
+                        tool_warning=tool_warning,
                     )
+                )
         except Exception as e:
             return ProviderModelsResponse(
                 provider=provider_id,
@@ -1020,39 +967,40 @@ async def test_provider_connection(request: ConnectionTestRequest):
 
     if request.provider == "ollama":
         try:
-            async with httpx.AsyncClient() as client:
-                # First check version
-                version_response = await client.get(
-                    f"{settings.ollama_host}/api/version",
-                    timeout=5.0,
-                )
-                version = None
-                if version_response.status_code == 200:
-                    version = version_response.json().get("version")
-
-                # If model specified, try a simple generation
-                if request.model:
-                    response = await client.post(
-                        f"{settings.ollama_host}/api/generate",
-                        json={
-                            "model": request.model,
-                            "prompt": "Hi",
-                            "stream": False,
-                            "options": {"num_predict": 1},
-                        },
-                        timeout=30.0,
-                    )
-                    response.raise_for_status()
+            # Explicit test: bypass the status cache but reuse the shared pool
+            client = get_http_client()
+            # First check version
+            version_response = await client.get(
+                f"{settings.ollama_host}/api/version",
+                timeout=5.0,
+            )
+            version = None
+            if version_response.status_code == 200:
+                version = version_response.json().get("version")
 
-                latency = (time.time() - start_time) * 1000
-                return ProviderConnectionTestResult(
-                    success=True,
-                    provider=request.provider,
-                    model=request.model,
-                    message=f"Connected to Ollama{f' with model {request.model}' if request.model else ''}",
-                    latency_ms=round(latency, 2),
-                    version=version,
+            # If model specified, try a simple generation
+            if request.model:
+                response = await client.post(
+                    f"{settings.ollama_host}/api/generate",
+                    json={
+                        "model": request.model,
+                        "prompt": "Hi",
+                        "stream": False,
+                        "options": {"num_predict": 1},
+                    },
+                    timeout=30.0,
                 )
+                response.raise_for_status()
+
+            latency = (time.time() - start_time) * 1000
+            return ProviderConnectionTestResult(
+                success=True,
+                provider=request.provider,
+                model=request.model,
+                message=f"Connected to Ollama{f' with model {request.model}' if request.model else ''}",
+                latency_ms=round(latency, 2),
+                version=version,
+            )
         except Exception as e:
             return ProviderConnectionTestResult(
                 success=False,
@@ -1064,21 +1012,20 @@ async def test_provider_connection(request: ConnectionTestRequest):
 
     elif request.provider == "foundry_local":
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.foundry_endpoint}/v1/models",
-                    timeout=5.0,
-                )
-                response.raise_for_status()
+            response = await get_http_client().get(
+                f"{settings.foundry_endpoint}/v1/models",
+                timeout=5.0,
+            )
+            response.raise_for_status()
 
-                latency = (time.time() - start_time) * 1000
-                return ProviderConnectionTestResult(
-                    success=True,
-                    provider=request.provider,
-                    model=request.model,
-                    message="Connected to Foundry Local",
-                    latency_ms=round(latency, 2),
-                )
+            latency = (time.time() - start_time) * 1000
+            return ProviderConnectionTestResult(
+                success=True,
+                provider=request.provider,
+                model=request.model,
+                message="Connected to Foundry Local",
+                latency_ms=round(latency, 2),
+            )
         except Exception as e:
             return ProviderConnectionTestResult(
                 success=False,
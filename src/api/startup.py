@@ -0,0 +1,227 @@
+"""
+Service Startup Graph
+Phase 2.1: Backend Infrastructure & RAG Pipeline
+
+Service initialization as a dependency graph. Each step names the steps it
+depends on; steps whose dependencies have finished run concurrently, so
+worker start time is bounded by the slowest chain of critical dependencies
+rather than the sum of all of them.
+
+Critical steps run before the API accepts traffic. Background steps
+(vector store index checks, schedulers, theme seeding) are started once the
+critical phase has finished and may complete while requests are already
+being served. Readiness is reported from the graph state.
+
+A failing step is logged and recorded but does not stop its dependents:
+every service is optional, and dependents check what they need (as the
+sequential initialization did before).
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class StepStatus(str, Enum):
+    """Lifecycle of a startup step."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class SkipStep(Exception):
+    """Raised by a step whose prerequisites are unavailable."""
+
+
+@dataclass
+class StartupStep:
+    """A single service initialization step."""
+
+    name: str
+    func: Callable[[], Awaitable[None]]
+    depends_on: tuple[str, ...] = ()
+    critical: bool = True
+    status: StepStatus = StepStatus.PENDING
+    message: str | None = None
+    duration_ms: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the step has run (successfully or not)."""
+        return self.status not in (StepStatus.PENDING, StepStatus.RUNNING)
+
+    def to_dict(self) -> dict:
+        """Serialize for health endpoints."""
+        return {
+            "status": self.status.value,
+            "critical": self.critical,
+            "depends_on": list(self.depends_on),
+            "duration_ms": self.duration_ms,
+            "message": self.message,
+        }
+
+
+class StartupGraph:
+    """
+    Runs service initialization steps concurrently in dependency order.
+
+    Usage:
+        graph = StartupGraph(step_timeout_seconds=15)
+        graph.add("redis", init_redis)
+        graph.add("vector_store", init_vector_store, depends_on=("redis",), critical=False)
+        await graph.run_critical()
+        graph.start_background()
+    """
+
+    def __init__(self, step_timeout_seconds: float | None = None):
+        """
+        Initialize an empty graph.
+
+        Args:
+            step_timeout_seconds: Upper bound on each step (None = unbounded)
+        """
+        self.step_timeout_seconds = step_timeout_seconds
+        self._steps: dict[str, StartupStep] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._background: asyncio.Task | None = None
+        self._started_at: float | None = None
+        self._critical_ms: float | None = None
+        self._draining = False
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        *,
+        depends_on: tuple[str, ...] = (),
+        critical: bool = True,
+    ) -> None:
+        """
+        Register a step. Dependencies must be registered first, which keeps
+        the graph acyclic.
+
+        Args:
+            name: Unique step name
+            func: Coroutine function initializing the service
+            depends_on: Names of steps that must finish first
+            critical: Whether the API waits for this step before serving
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies, or a
+                critical step depending on a background step
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate startup step: {name}")
+        for dependency in depends_on:
+            if dependency not in self._steps:
+                raise ValueError(f"Startup step {name!r} depends on unknown step {dependency!r}")
+            if critical and not self._steps[dependency].critical:
+                raise ValueError(
+                    f"Critical startup step {name!r} cannot depend on background step {dependency!r}"
+                )
+        self._steps[name] = StartupStep(
+            name=name, func=func, depends_on=depends_on, critical=critical
+        )
+
+    @property
+    def steps(self) -> dict[str, StartupStep]:
+        """Registered steps by name."""
+        return self._steps
+
+    @property
+    def ready(self) -> bool:
+        """Whether the critical phase has finished and the API is not draining."""
+        return (
+            not self._draining
+            and self._started_at is not None
+            and all(step.finished for step in self._steps.values() if step.critical)
+        )
+
+    @property
+    def background_complete(self) -> bool:
+        """Whether every background step has finished."""
+        return all(step.finished for step in self._steps.values() if not step.critical)
+
+    async def run_critical(self) -> None:
+        """Run all critical steps and wait for them."""
+        self._started_at = time.perf_counter()
+        await self._run([step for step in self._steps.values() if step.critical])
+        self._critical_ms = round((time.perf_counter() - self._started_at) * 1000, 2)
+        logger.info("startup_critical_complete", duration_ms=self._critical_ms)
+
+    def start_background(self) -> None:
+        """Start the background steps without waiting for them."""
+        steps = [step for step in self._steps.values() if not step.critical]
+        if steps:
+            self._background = asyncio.create_task(self._run(steps), name="startup:background")
+
+    async def run_background(self) -> None:
+        """Run the background steps and wait for them."""
+        self.start_background()
+        await self.wait_background()
+
+    async def wait_background(self) -> None:
+        """Wait for started background steps to finish."""
+        if self._background is not None:
+            await self._background
+
+    async def drain(self) -> None:
+        """Report not-ready and cancel background steps that are still running."""
+        self._draining = True
+        if self._background is not None and not self._background.done():
+            self._background.cancel()
+            for task in self._tasks.values():
+                task.cancel()
+            await asyncio.gather(self._background, *self._tasks.values(), return_exceptions=True)
+
+    def report(self) -> dict:
+        """Readiness and per-step status for health endpoints."""
+        return {
+            "ready": self.ready,
+            "background_complete": self.background_complete,
+            "critical_ms": self._critical_ms,
+            "steps": {name: step.to_dict() for name, step in self._steps.items()},
+        }
+
+    async def _run(self, steps: list[StartupStep]) -> None:
+        # Tasks are created in registration order, so every dependency has a
+        # task by the time a dependent starts waiting on it
+        for step in steps:
+            self._tasks[step.name] = asyncio.create_task(
+                self._run_step(step), name=f"startup:{step.name}"
+            )
+        await asyncio.gather(*(self._tasks[step.name] for step in steps))
+
+    async def _run_step(self, step: StartupStep) -> None:
+        if step.depends_on:
+            await asyncio.gather(*(self._tasks[name] for name in step.depends_on))
+
+        step.status = StepStatus.RUNNING
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(step.func(), timeout=self.step_timeout_seconds)
+            step.status = StepStatus.READY
+        except SkipStep as e:
+            step.status = StepStatus.SKIPPED
+            step.message = str(e)
+        except TimeoutError:
+            step.status = StepStatus.FAILED
+            step.message = f"Timed out after {self.step_timeout_seconds}s"
+            logger.warning(
+                "startup_step_timeout", step=step.name, timeout=self.step_timeout_seconds
+            )
+        except Exception as e:
+            step.status = StepStatus.FAILED
+            step.message = str(e)[:200]
+            logger.warning("startup_step_failed", step=step.name, error=str(e))
+        finally:
+            step.duration_ms = round((time.perf_counter() - start) * 1000, 2)
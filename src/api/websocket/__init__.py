@@ -7,13 +7,15 @@ Provides centralized WebSocket connection management with:
 - Heartbeat/keepalive
 - Broadcasting capabilities
 - Conversation-based message routing
+- Per-connection bounded send queues with slow consumer policies
 """
 
-from src.api.websocket.connection import WebSocketConnection
+from src.api.websocket.connection import SlowConsumerPolicy, WebSocketConnection
 from src.api.websocket.heartbeat import HeartbeatManager
 from src.api.websocket.manager import WebSocketManager, websocket_manager
 
 __all__ = [
+    "SlowConsumerPolicy",
     "WebSocketConnection",
     "WebSocketManager",
     "HeartbeatManager",
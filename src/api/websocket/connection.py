@@ -3,9 +3,16 @@ WebSocket Connection Wrapper
 Phase 2.5: WebSocket Connection Management Refactor
 
 Wraps WebSocket with connection tracking and error handling.
+
+Fan-out messages are delivered through a bounded per-connection outbound
+queue drained by a dedicated writer task, so one slow client cannot stall
+delivery to the others.
 """
 
+import asyncio
+import contextlib
 from datetime import UTC, datetime
+from enum import Enum
 from typing import Any
 
 import structlog
@@ -13,6 +20,17 @@ from fastapi import WebSocket
 
 logger = structlog.get_logger()
 
+# Default outbound queue size per connection
+DEFAULT_SEND_QUEUE_SIZE = 256
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's outbound queue is full."""
+
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message
+    DROP_NEWEST = "drop_newest"  # Discard the incoming message
+    DISCONNECT = "disconnect"  # Close the connection
+
 
 class WebSocketConnection:
     """Wrapper for WebSocket with connection tracking and heartbeat."""
@@ -22,6 +40,8 @@ class WebSocketConnection:
         websocket: WebSocket,
         connection_id: str,
         conversation_id: int | None = None,
+        max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
     ):
         """
         Initialize WebSocket connection wrapper.
@@ -30,13 +50,27 @@ class WebSocketConnection:
             websocket: The FastAPI WebSocket instance
             connection_id: Unique identifier for this connection
             conversation_id: Optional conversation ID for agent chat
+            max_queue_size: Maximum number of queued outbound messages
+            slow_consumer_policy: Action taken when the outbound queue is full
         """
         self.websocket = websocket
         self.connection_id = connection_id
         self.conversation_id = conversation_id
         self.connected_at = datetime.now(UTC)
         self.last_activity = datetime.now(UTC)
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
         self._closed = False
+        self._evicted = False  # Disconnected by the slow consumer policy
+
+        # Outbound queue drained by the writer task
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max(1, max_queue_size))
+        self._writer_task: asyncio.Task | None = None
+
+        # Backlog metrics
+        self.messages_queued = 0
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.max_backlog = 0
 
     async def send_json(self, data: dict[str, Any]) -> bool:
         """
@@ -98,6 +132,114 @@ class WebSocketConnection:
             self._closed = True
             return False
 
+    def enqueue_text(self, text: str) -> bool:
+        """
+        Queue a pre-serialized message for delivery by the writer task.
+
+        Never blocks. When the queue is full the slow consumer policy decides
+        whether the oldest message, the new message, or the connection is dropped.
+
+        Args:
+            text: Serialized message to send
+
+        Returns:
+            True if the message was queued, False if dropped or closed
+        """
+        if self._closed or self._evicted:
+            return False
+
+        self._ensure_writer()
+
+        if self._queue.full():
+            if self.slow_consumer_policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning(
+                    "websocket_slow_consumer_disconnect",
+                    connection_id=self.connection_id,
+                    backlog=self._queue.qsize(),
+                )
+                self._evict()
+                return False
+
+            self.messages_dropped += 1
+            if self.slow_consumer_policy == SlowConsumerPolicy.DROP_NEWEST:
+                logger.debug("websocket_message_dropped", connection_id=self.connection_id)
+                return False
+
+            # DROP_OLDEST: make room for the newest message
+            with contextlib.suppress(asyncio.QueueEmpty):
+                self._queue.get_nowait()
+                self._queue.task_done()
+
+        self._queue.put_nowait(text)
+        self.messages_queued += 1
+        self.max_backlog = max(self.max_backlog, self._queue.qsize())
+        return True
+
+    def _ensure_writer(self) -> None:
+        """Start the writer task if it is not already running."""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _writer_loop(self) -> None:
+        """Send queued messages to the client one at a time."""
+        while not self._closed:
+            text = await self._queue.get()
+            try:
+                if await self.send_text(text):
+                    self.messages_sent += 1
+            finally:
+                self._queue.task_done()
+
+        self._discard_queue()
+
+    def _discard_queue(self) -> None:
+        """Drop all pending outbound messages."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+
+    def _evict(self) -> None:
+        """Stop delivering to a slow consumer; the manager reaps the connection."""
+        self._evicted = True
+        if self._writer_task and not self._writer_task.done():
+            self._writer_task.cancel()
+        self._discard_queue()
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """
+        Wait until all queued messages have been sent.
+
+        Args:
+            timeout: Optional maximum wait in seconds
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    @property
+    def backlog(self) -> int:
+        """Number of messages waiting in the outbound queue."""
+        return self._queue.qsize()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get outbound queue metrics for this connection."""
+        return {
+            "connection_id": self.connection_id,
+            "conversation_id": self.conversation_id,
+            "backlog": self.backlog,
+            "max_backlog": self.max_backlog,
+            "queued": self.messages_queued,
+            "sent": self.messages_sent,
+            "dropped": self.messages_dropped,
+            "closed": self._closed,
+            "evicted": self._evicted,
+        }
+
     async def receive_json(self) -> dict[str, Any] | None:
         """
         Receive JSON message from client.
@@ -151,6 +293,12 @@ class WebSocketConnection:
         Args:
             code: WebSocket close code (default: 1000 - normal closure)
         """
+        if self._writer_task and not self._writer_task.done():
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+        self._discard_queue()
+
         if self._closed:
             return
 
@@ -170,6 +318,11 @@ class WebSocketConnection:
         """Check if connection is closed."""
         return self._closed
 
+    @property
+    def needs_disconnect(self) -> bool:
+        """Check if the connection failed or was evicted and should be removed."""
+        return self._closed or self._evicted
+
     @property
     def idle_seconds(self) -> float:
         """Get seconds since last activity."""
@@ -87,27 +87,18 @@ class HeartbeatManager:
 
     async def _send_pings(self) -> None:
         """Send ping message to all active connections."""
-        connections = self.manager.get_all_connections()
+        connection_count = self.manager.get_connection_count()
 
-        if not connections:
+        if not connection_count:
             return
 
-        logger.debug("heartbeat_sending_pings", connection_count=len(connections))
+        logger.debug("heartbeat_sending_pings", connection_count=connection_count)
 
-        for connection in connections:
-            try:
-                success = await connection.send_json({"type": "ping"})
-                if not success:
-                    logger.debug(
-                        "heartbeat_ping_failed",
-                        connection_id=connection.connection_id,
-                    )
-            except Exception as e:
-                logger.warning(
-                    "heartbeat_ping_error",
-                    connection_id=connection.connection_id,
-                    error=str(e),
-                )
+        # Serialized once and queued per connection; never waits on a slow client
+        try:
+            await self.manager.broadcast({"type": "ping"})
+        except Exception as e:
+            logger.warning("heartbeat_ping_error", error=str(e))
 
     async def _cleanup_stale_connections(self) -> None:
         """Close connections that haven't been active recently."""
@@ -117,7 +108,9 @@ class HeartbeatManager:
             return
 
         stale_connections = [
-            conn for conn in connections if conn.idle_seconds > STALE_CONNECTION_TIMEOUT
+            conn
+            for conn in connections
+            if conn.needs_disconnect or conn.idle_seconds > STALE_CONNECTION_TIMEOUT
         ]
 
         if stale_connections:
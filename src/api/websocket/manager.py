@@ -3,24 +3,53 @@ WebSocket Connection Manager
 Phase 2.5: WebSocket Connection Management Refactor
 
 Manages WebSocket connections with pooling, broadcasting, and heartbeat.
+
+Broadcasts serialize each message once and hand the same payload to every
+connection's bounded outbound queue, so fan-out cost does not depend on the
+slowest client.
 """
 
+import json
+from collections.abc import Iterable
 from typing import Any
 
 import structlog
 from fastapi import WebSocket
 
-from src.api.websocket.connection import WebSocketConnection
+from src.api.websocket.connection import (
+    DEFAULT_SEND_QUEUE_SIZE,
+    SlowConsumerPolicy,
+    WebSocketConnection,
+)
 from src.api.websocket.heartbeat import HeartbeatManager
+from src.utils.config import get_settings
 
 logger = structlog.get_logger()
 
 
+def serialize_message(message: dict[str, Any]) -> str:
+    """Serialize a message the same way Starlette's send_json does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
 class WebSocketManager:
     """Manages WebSocket connections with pooling and broadcasting."""
 
-    def __init__(self):
-        """Initialize WebSocket manager."""
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
+        """
+        Initialize WebSocket manager.
+
+        Args:
+            max_queue_size: Outbound queue size for each connection
+            slow_consumer_policy: Action taken when a connection's queue is full
+        """
+        self.max_queue_size = max_queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
+
         # All active connections by connection ID
         self._connections: dict[str, WebSocketConnection] = {}
 
@@ -55,6 +84,8 @@ class WebSocketManager:
             websocket=websocket,
             connection_id=connection_id,
             conversation_id=conversation_id,
+            max_queue_size=self.max_queue_size,
+            slow_consumer_policy=self.slow_consumer_policy,
         )
 
         # Store connection
@@ -146,6 +177,45 @@ class WebSocketManager:
 
         return success
 
+    async def send_to_connections(
+        self,
+        connection_ids: Iterable[str],
+        message: dict[str, Any],
+    ) -> int:
+        """
+        Fan a message out to a set of connections.
+
+        The message is serialized once and queued on each connection without
+        waiting for delivery. Connections that have failed or been evicted as
+        slow consumers are disconnected.
+
+        Args:
+            connection_ids: Target connection IDs
+            message: Message data to send
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        payload = serialize_message(message)
+        queued_count = 0
+        failed_connections = []
+
+        for connection_id in connection_ids:
+            connection = self._connections.get(connection_id)
+            if not connection:
+                continue
+
+            if connection.enqueue_text(payload):
+                queued_count += 1
+            elif connection.needs_disconnect:
+                failed_connections.append(connection_id)
+
+        # Clean up failed connections
+        for connection_id in failed_connections:
+            await self.disconnect(connection_id)
+
+        return queued_count
+
     async def send_to_conversation(
         self,
         conversation_id: int,
@@ -159,7 +229,7 @@ class WebSocketManager:
             message: Message data to send
 
         Returns:
-            Number of connections that received the message
+            Number of connections the message was queued for
         """
         connection_ids = self._conversation_connections.get(conversation_id, [])
 
@@ -170,29 +240,12 @@ class WebSocketManager:
             )
             return 0
 
-        sent_count = 0
-        failed_connections = []
-
-        for connection_id in connection_ids:
-            connection = self._connections.get(connection_id)
-            if not connection:
-                continue
-
-            success = await connection.send_json(message)
-            if success:
-                sent_count += 1
-            else:
-                failed_connections.append(connection_id)
-
-        # Clean up failed connections
-        for connection_id in failed_connections:
-            await self.disconnect(connection_id)
+        sent_count = await self.send_to_connections(list(connection_ids), message)
 
         logger.debug(
             "websocket_sent_to_conversation",
             conversation_id=conversation_id,
             sent_count=sent_count,
-            failed_count=len(failed_connections),
         )
 
         return sent_count
@@ -210,30 +263,16 @@ class WebSocketManager:
             exclude_connections: Set of connection IDs to exclude
 
         Returns:
-            Number of connections that received the message
+            Number of connections the message was queued for
         """
         exclude = exclude_connections or set()
-        sent_count = 0
-        failed_connections = []
-
-        for connection_id, connection in self._connections.items():
-            if connection_id in exclude:
-                continue
+        targets = [cid for cid in self._connections if cid not in exclude]
 
-            success = await connection.send_json(message)
-            if success:
-                sent_count += 1
-            else:
-                failed_connections.append(connection_id)
-
-        # Clean up failed connections
-        for connection_id in failed_connections:
-            await self.disconnect(connection_id)
+        sent_count = await self.send_to_connections(targets, message)
 
         logger.debug(
             "websocket_broadcast",
             sent_count=sent_count,
-            failed_count=len(failed_connections),
             excluded_count=len(exclude),
         )
 
@@ -291,6 +330,30 @@ class WebSocketManager:
         """
         return len(self._conversation_connections)
 
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get outbound backlog metrics across all connections.
+
+        Returns:
+            Aggregate counters plus the connections with the largest backlog
+        """
+        connections = list(self._connections.values())
+        per_connection = sorted(
+            (c.get_stats() for c in connections),
+            key=lambda stats: stats["backlog"],
+            reverse=True,
+        )
+        return {
+            "connections": len(connections),
+            "conversations": len(self._conversation_connections),
+            "max_queue_size": self.max_queue_size,
+            "slow_consumer_policy": self.slow_consumer_policy.value,
+            "total_backlog": sum(c.backlog for c in connections),
+            "total_sent": sum(c.messages_sent for c in connections),
+            "total_dropped": sum(c.messages_dropped for c in connections),
+            "top_backlogs": per_connection[:10],
+        }
+
     async def start_heartbeat(self) -> None:
         """Start the heartbeat background task."""
         if self._heartbeat is None:
@@ -321,4 +384,7 @@ class WebSocketManager:
 
 
 # Global WebSocket manager instance
-websocket_manager = WebSocketManager()
+websocket_manager = WebSocketManager(
+    max_queue_size=get_settings().websocket_send_queue_size,
+    slow_consumer_policy=get_settings().websocket_slow_consumer_policy,
+)
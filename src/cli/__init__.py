@@ -1,5 +1,13 @@
 """CLI interface for the research agent."""
 
-from src.cli.chat import app, main
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.cli.chat import app, main
+
+# Lazy so `python -m src.cli.chat` doesn't import the module twice
+__getattr__, __dir__ = lazy_exports(__name__, {"app": "src.cli.chat", "main": "src.cli.chat"})
 
 __all__ = ["app", "main"]
@@ -8,22 +8,12 @@ Supports both Ollama and Foundry Local as LLM providers.
 
 import asyncio
 import sys
+from typing import TYPE_CHECKING
 
 import typer
-from prompt_toolkit import PromptSession
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.keys import Keys
 from rich.prompt import Prompt
 from rich.text import Text
 
-from src.agent.research_agent import ResearchAgent, ResearchAgentError
-from src.cli.command_handlers import (
-    handle_cache_clear_command,
-    handle_cache_command,
-    handle_clear_command,
-    handle_export_command,
-    handle_help_command,
-)
 from src.cli.theme import (
     COLORS,
     Icons,
@@ -46,16 +36,24 @@ from src.cli.theme import (
 )
 from src.providers import ProviderType, create_provider, get_available_providers
 from src.utils.config import SqlAuthType, settings
-from src.utils.database_manager import DatabaseConfig, get_database_manager
-from src.utils.health import (
-    HealthStatus,
-    run_health_checks,
-)
-from src.utils.history import get_history_manager
+from src.utils.lazy import lazy_exports
 from src.utils.logger import get_logger, setup_logging
 
+if TYPE_CHECKING:
+    from src.agent.research_agent import ResearchAgent, ResearchAgentError
+
 logger = get_logger(__name__)
 
+# The agent pulls in Pydantic AI, MCP, the RAG stack and SQLAlchemy; load it only
+# for commands that talk to the model so `status` and `--help` start fast
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ResearchAgent": "src.agent.research_agent",
+        "ResearchAgentError": "src.agent.research_agent",
+    },
+)
+
 app = typer.Typer(
     name="agent-ai",
     help="Agent AI - SQL Server Analytics with Local LLMs",
@@ -230,7 +228,13 @@ async def list_provider_models(provider_type: str) -> list[str]:
         return []
 
 
-def print_cache_stats(agent: ResearchAgent) -> None:
+def _agent_classes() -> tuple[type["ResearchAgent"], type["ResearchAgentError"]]:
+    """ResearchAgent and ResearchAgentError, imported on first use."""
+    module = sys.modules[__name__]
+    return module.ResearchAgent, module.ResearchAgentError
+
+
+def print_cache_stats(agent: "ResearchAgent") -> None:
     """Print cache statistics with styled table."""
     stats = agent.get_cache_stats()
     table = create_status_table(show_header=True)
@@ -310,6 +314,10 @@ class ThinkingModeInput:
         self.thinking_mode = thinking_mode
         self._toggled_this_prompt = False
 
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.key_binding import KeyBindings
+        from prompt_toolkit.keys import Keys
+
         # Create key bindings
         self.bindings = KeyBindings()
 
@@ -386,6 +394,18 @@ async def run_chat_loop(
         web_search_enabled: Enable built-in web search tool
         rag_enabled: Enable RAG knowledge base search tools
     """
+    from src.cli.command_handlers import (
+        handle_cache_clear_command,
+        handle_cache_command,
+        handle_clear_command,
+        handle_export_command,
+        handle_help_command,
+    )
+    from src.utils.database_manager import DatabaseConfig, get_database_manager
+    from src.utils.history import get_history_manager
+
+    ResearchAgent, ResearchAgentError = _agent_classes()
+
     # Use configured provider if not specified
     effective_provider = provider_type or settings.llm_provider
 
@@ -1190,6 +1210,8 @@ def health(
     """Run system health checks on LLM providers, MCP server, and database."""
     import json
 
+    from src.utils.health import HealthStatus, run_health_checks
+
     async def run_checks() -> None:
         with console.status(
             f"[bold {COLORS['primary']}]{Icons.THINKING} Running health checks...[/]"
@@ -1303,6 +1325,7 @@ def query(
     """Send a single query to the agent and exit."""
 
     async def run_query() -> None:
+        ResearchAgent, _ = _agent_classes()
         effective_provider = provider or settings.llm_provider
         status = await check_provider_status(effective_provider)
 
@@ -11,6 +11,25 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+# Rough characters-per-token ratio for English text with common tokenizers
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message overhead (role markers, separators) in chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a message.
+
+    Args:
+        text: Message text
+
+    Returns:
+        Estimated number of tokens including message overhead
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
 
 class MessageRole(str, Enum):
     """Role of a message sender."""
@@ -69,6 +88,13 @@ class ConversationTurn(BaseModel):
         """Check if this turn involved tool calls."""
         return len(self.tool_calls) > 0
 
+    @property
+    def token_estimate(self) -> int:
+        """Estimate the prompt tokens this turn adds to the context."""
+        return estimate_tokens(self.user_message.content) + estimate_tokens(
+            self.assistant_message.content
+        )
+
 
 class Conversation(BaseModel):
     """A complete conversation with history."""
@@ -90,17 +116,29 @@ class Conversation(BaseModel):
             messages.append(turn.assistant_message)
         return messages
 
-    def get_history_for_context(self, max_turns: int = 10) -> list[dict[str, str]]:
+    def get_history_for_context(
+        self, max_turns: int = 10, max_tokens: int | None = None
+    ) -> list[dict[str, str]]:
         """
         Get conversation history formatted for agent context.
 
         Args:
             max_turns: Maximum number of turns to include
+            max_tokens: Optional estimated token budget; oldest turns are dropped to fit
 
         Returns:
             List of message dicts with 'role' and 'content' keys
         """
         recent_turns = self.turns[-max_turns:] if max_turns else self.turns
+        if max_tokens is not None:
+            kept: list[ConversationTurn] = []
+            used = 0
+            for turn in reversed(recent_turns):
+                used += turn.token_estimate
+                if used > max_tokens:
+                    break
+                kept.append(turn)
+            recent_turns = kept[::-1]
         history = []
         for turn in recent_turns:
             history.append({"role": "user", "content": turn.user_message.content})
@@ -155,6 +193,7 @@ class AgentResponse(BaseModel):
     model: str = ""
     error: str | None = None
     token_usage: TokenUsage = Field(default_factory=TokenUsage)
+    trace: dict[str, Any] | None = None  # Per-turn span timings (see src.utils.tracing)
 
     @property
     def success(self) -> bool:
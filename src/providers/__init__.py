@@ -4,10 +4,12 @@ LLM Provider Abstraction
 Supports multiple local LLM backends:
 - Ollama: Local LLM inference engine
 - Foundry Local: Microsoft's local AI inference runtime
+- Fake: Scripted, latency-modelled responses for load testing
 """
 
 from src.providers.base import LLMProvider, ProviderType
 from src.providers.factory import create_provider, get_available_providers
+from src.providers.fake import FakeProvider
 from src.providers.foundry import FoundryLocalProvider
 from src.providers.ollama import OllamaProvider
 
@@ -16,6 +18,7 @@ __all__ = [
     "ProviderType",
     "OllamaProvider",
     "FoundryLocalProvider",
+    "FakeProvider",
     "create_provider",
     "get_available_providers",
 ]
@@ -7,9 +7,10 @@ Abstract base class for LLM providers (Ollama, Foundry Local, etc.)
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from pydantic_ai.models.openai import OpenAIModel
+if TYPE_CHECKING:
+    from pydantic_ai.models.openai import OpenAIModel
 
 
 class ProviderType(str, Enum):
@@ -17,6 +18,7 @@ class ProviderType(str, Enum):
 
     OLLAMA = "ollama"
     FOUNDRY_LOCAL = "foundry_local"
+    FAKE = "fake"  # Scripted responses for load testing, never auto-selected
 
 
 @dataclass
@@ -70,7 +72,7 @@ class LLMProvider(ABC):
         pass
 
     @abstractmethod
-    def get_model(self) -> OpenAIModel:
+    def get_model(self) -> "OpenAIModel":
         """
         Get a Pydantic AI compatible model instance.
 
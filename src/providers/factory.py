@@ -4,7 +4,10 @@ Provider Factory
 Factory functions for creating LLM provider instances.
 """
 
+import asyncio
+
 from src.providers.base import LLMProvider, ProviderStatus, ProviderType
+from src.providers.fake import FakeProvider
 from src.providers.foundry import FoundryLocalProvider
 from src.providers.ollama import OllamaProvider
 from src.utils.config import settings
@@ -23,7 +26,7 @@ def create_provider(
     Create an LLM provider instance.
 
     Args:
-        provider_type: Provider type (ollama, foundry_local) or None for auto-detect
+        provider_type: Provider type (ollama, foundry_local, fake) or None for auto-detect
         model_name: Model name/alias (uses settings default if not provided)
         endpoint: API endpoint URL (uses settings default if not provided)
         **kwargs: Additional provider-specific arguments
@@ -60,6 +63,19 @@ def create_provider(
             endpoint=endpoint or settings.foundry_endpoint,
             **kwargs,
         )
+    elif provider_type == ProviderType.FAKE:
+        options = {
+            "ttft_ms": settings.fake_llm_ttft_ms,
+            "tokens_per_second": settings.fake_llm_tokens_per_second,
+            "jitter": settings.fake_llm_jitter,
+            "response_tokens": settings.fake_llm_response_tokens,
+            "tool_call": settings.fake_llm_tool_call,
+            "script_path": settings.fake_llm_script_path,
+        }
+        return FakeProvider(
+            model_name=model_name or settings.fake_llm_model,
+            **{**options, **kwargs},
+        )
     else:
         raise ValueError(f"Unsupported provider type: {provider_type}")
 
@@ -68,46 +84,29 @@ async def get_available_providers() -> list[ProviderStatus]:
     """
     Check which providers are currently available.
 
+    Providers are probed concurrently; responses are cached briefly (see
+    ``provider_status_ttl_seconds``), so frequent polling is cheap.
+
     Returns:
         List of ProviderStatus for each configured provider
     """
-    statuses = []
-
-    # Check Ollama
-    try:
-        ollama = OllamaProvider(
-            model_name=settings.ollama_model,
-            host=settings.ollama_host,
-        )
-        status = await ollama.check_connection()
-        statuses.append(status)
-    except Exception as e:
-        statuses.append(
-            ProviderStatus(
-                available=False,
-                provider_type=ProviderType.OLLAMA,
-                error=str(e),
-            )
-        )
 
-    # Check Foundry Local
-    try:
-        foundry = FoundryLocalProvider(
-            model_name=settings.foundry_model,
-            endpoint=settings.foundry_endpoint,
-        )
-        status = await foundry.check_connection()
-        statuses.append(status)
-    except Exception as e:
-        statuses.append(
-            ProviderStatus(
-                available=False,
-                provider_type=ProviderType.FOUNDRY_LOCAL,
-                error=str(e),
-            )
-        )
+    async def check(provider_type: ProviderType) -> ProviderStatus:
+        try:
+            if provider_type == ProviderType.OLLAMA:
+                provider = OllamaProvider(
+                    model_name=settings.ollama_model, host=settings.ollama_host
+                )
+            else:
+                provider = FoundryLocalProvider(
+                    model_name=settings.foundry_model,
+                    endpoint=settings.foundry_endpoint,
+                )
+            return await provider.check_connection()
+        except Exception as e:
+            return ProviderStatus(available=False, provider_type=provider_type, error=str(e))
 
-    return statuses
+    return list(await asyncio.gather(check(ProviderType.OLLAMA), check(ProviderType.FOUNDRY_LOCAL)))
 
 
 async def auto_select_provider() -> LLMProvider | None:
@@ -136,8 +135,10 @@ async def auto_select_provider() -> LLMProvider | None:
     except Exception:
         pass
 
-    # Try each provider in order
+    # Try each provider in order (the fake provider is only used when configured)
     for ptype in ProviderType:
+        if ptype == ProviderType.FAKE:
+            continue
         try:
             provider = create_provider(provider_type=ptype)
             status = await provider.check_connection()
@@ -0,0 +1,418 @@
+"""
+Fake Provider
+
+Scripted, latency-modelled LLM for load testing. Requests go through the
+real OpenAI client and Pydantic AI model to an in-process OpenAI-compatible
+server (an httpx transport), so the API, WebSocket and MCP layers can be
+profiled without Ollama's latency dominating.
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from src.providers.base import LLMProvider, ProviderStatus, ProviderType
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from pydantic_ai.models.openai import OpenAIModel
+
+logger = get_logger(__name__)
+
+FAKE_ENDPOINT = "http://fake-llm.local/v1"
+
+FILLER_TEXT = (
+    "the results show that sales revenue grew in the north region while inventory "
+    "levels stayed flat and customer orders increased across most product lines"
+)
+
+
+@dataclass
+class ScriptedResponse:
+    """One model response: text content or tool calls."""
+
+    content: str = ""
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ScriptedResponse":
+        """Build from a script entry ``{"content": ...}`` or ``{"tool_calls": [...]}``."""
+        return cls(content=data.get("content", ""), tool_calls=data.get("tool_calls", []))
+
+
+def load_script(path: str | Path) -> list[ScriptedResponse]:
+    """
+    Load a response script.
+
+    The script is a JSON list; entry ``n`` answers the ``n``-th model request
+    of a turn (0 = first request after the user message), e.g.::
+
+        [
+            {"tool_calls": [{"name": "list_tables", "arguments": {}}]},
+            {"content": "There are 12 tables."}
+        ]
+
+    Args:
+        path: Path to the JSON script
+
+    Returns:
+        Scripted responses in order
+    """
+    entries = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [ScriptedResponse.from_dict(entry) for entry in entries]
+
+
+@dataclass
+class LatencyModel:
+    """Time-to-first-token and decode speed of the fake model."""
+
+    ttft_ms: float = 300.0
+    tokens_per_second: float = 40.0
+    jitter: float = 0.2
+
+    def _jittered(self, value: float, rng: random.Random) -> float:
+        if not self.jitter:
+            return value
+        return value * rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def first_token_delay(self, rng: random.Random) -> float:
+        """Seconds before the first token."""
+        return self._jittered(self.ttft_ms, rng) / 1000
+
+    def token_delay(self, rng: random.Random) -> float:
+        """Seconds between tokens."""
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return self._jittered(1 / self.tokens_per_second, rng)
+
+
+class FakeOpenAIServer(httpx.AsyncBaseTransport):
+    """
+    In-process OpenAI-compatible server.
+
+    Serves ``POST /chat/completions`` (streaming and non-streaming, including
+    tool calls) and ``GET /models`` as an httpx transport.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake-llm",
+        latency: LatencyModel | None = None,
+        response_tokens: int = 80,
+        tool_call: str = "",
+        script: list[ScriptedResponse] | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            model_name: Model name reported in responses
+            latency: Latency model (defaults to 300ms TTFT, 40 tokens/s)
+            response_tokens: Length of generated text responses in tokens
+            tool_call: Tool to call on the first request of a turn when offered
+            script: Scripted responses; overrides ``tool_call`` and generated text
+            seed: Random seed for reproducible jitter
+        """
+        self.model_name = model_name
+        self.latency = latency or LatencyModel()
+        self.response_tokens = response_tokens
+        self.tool_call = tool_call
+        self.script = script or []
+        self._rng = random.Random(seed)
+        self.requests = 0
+
+    def respond(self, body: dict[str, Any]) -> ScriptedResponse:
+        """
+        Choose the response for a chat completion request.
+
+        Args:
+            body: Request body
+
+        Returns:
+            Tool calls when scripted (or configured) and the tools are offered,
+            otherwise text
+        """
+        messages = body.get("messages", [])
+        user_index = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        step = sum(1 for m in messages[user_index + 1 :] if m.get("role") == "assistant")
+        offered = {tool["function"]["name"] for tool in body.get("tools", [])}
+
+        if self.script:
+            response = self.script[min(step, len(self.script) - 1)]
+        elif self.tool_call and step == 0:
+            response = ScriptedResponse(tool_calls=[{"name": self.tool_call, "arguments": {}}])
+        else:
+            response = ScriptedResponse()
+
+        if response.tool_calls and all(call["name"] in offered for call in response.tool_calls):
+            return response
+        return ScriptedResponse(content=response.content or self._generate_text(messages))
+
+    def _generate_text(self, messages: list[dict[str, Any]]) -> str:
+        prompt = next((m.get("content") for m in reversed(messages) if m.get("role") == "user"), "")
+        words = str(prompt).split()[:8]
+        filler_words = FILLER_TEXT.split()
+        filler = [
+            filler_words[i % len(filler_words)]
+            for i in range(max(self.response_tokens - len(words) - 3, 0))
+        ]
+        return " ".join(["Fake", "response", "to:", *words, *filler])
+
+    @staticmethod
+    def _count_tokens(messages: list[dict[str, Any]]) -> int:
+        return sum(len(str(m.get("content") or "").split()) for m in messages)
+
+    def _tool_call_payload(self, response: ScriptedResponse) -> list[dict[str, Any]]:
+        return [
+            {
+                "index": i,
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])},
+            }
+            for i, call in enumerate(response.tool_calls)
+        ]
+
+    async def complete(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Non-streaming chat completion."""
+        response = self.respond(body)
+        tokens = response.content.split(" ") if response.content else []
+        delay = self.latency.first_token_delay(self._rng)
+        delay += sum(self.latency.token_delay(self._rng) for _ in tokens[1:])
+        await asyncio.sleep(delay)
+
+        message: dict[str, Any] = {"role": "assistant", "content": response.content or None}
+        if response.tool_calls:
+            message["tool_calls"] = [
+                {key: value for key, value in call.items() if key != "index"}
+                for call in self._tool_call_payload(response)
+            ]
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.model_name,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if response.tool_calls else "stop",
+                }
+            ],
+            "usage": self._usage(body, len(tokens) or len(response.tool_calls)),
+        }
+
+    def _usage(self, body: dict[str, Any], completion_tokens: int) -> dict[str, int]:
+        prompt_tokens = self._count_tokens(body.get("messages", []))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    async def stream(self, body: dict[str, Any]) -> AsyncIterator[bytes]:
+        """Streaming chat completion as server-sent events."""
+        response = self.respond(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        def event(delta: dict[str, Any], finish_reason: str | None = None) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": self.model_name,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        yield event({"role": "assistant", "content": ""})
+        await asyncio.sleep(self.latency.first_token_delay(self._rng))
+
+        if response.tool_calls:
+            completion_tokens = len(response.tool_calls)
+            yield event({"tool_calls": self._tool_call_payload(response)})
+            finish_reason = "tool_calls"
+        else:
+            tokens = response.content.split(" ")
+            completion_tokens = len(tokens)
+            for i, token in enumerate(tokens):
+                if i:
+                    await asyncio.sleep(self.latency.token_delay(self._rng))
+                yield event({"content": token if i == 0 else f" {token}"})
+            finish_reason = "stop"
+
+        yield event({}, finish_reason)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": self.model_name,
+                "choices": [],
+                "usage": self._usage(body, completion_tokens),
+            }
+            yield f"data: {json.dumps(usage)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Route an OpenAI API request."""
+        path = request.url.path
+        if request.method == "GET" and path.endswith("/models"):
+            return httpx.Response(
+                200,
+                json={"object": "list", "data": [{"id": self.model_name, "object": "model"}]},
+                request=request,
+            )
+        if request.method != "POST" or not path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": "Not found"}}, request=request)
+
+        self.requests += 1
+        body = json.loads(await request.aread())
+        if body.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=self.stream(body),
+                request=request,
+            )
+        return httpx.Response(200, json=await self.complete(body), request=request)
+
+
+@lru_cache(maxsize=16)
+def get_fake_server(
+    model_name: str,
+    ttft_ms: float,
+    tokens_per_second: float,
+    jitter: float,
+    response_tokens: int,
+    tool_call: str,
+    script_path: str,
+) -> FakeOpenAIServer:
+    """
+    Get the shared in-process server for a configuration.
+
+    Shared so that, like the cached HTTP client real providers use, creating
+    an agent per message does not create a new client per message.
+    """
+    return FakeOpenAIServer(
+        model_name=model_name,
+        latency=LatencyModel(ttft_ms=ttft_ms, tokens_per_second=tokens_per_second, jitter=jitter),
+        response_tokens=response_tokens,
+        tool_call=tool_call,
+        script=load_script(script_path) if script_path else None,
+    )
+
+
+@lru_cache(maxsize=16)
+def _get_http_client(server: FakeOpenAIServer) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=server, base_url=FAKE_ENDPOINT)
+
+
+class FakeProvider(LLMProvider):
+    """
+    Fake LLM provider for load and performance testing.
+
+    Responses are generated text or scripted tool calls, streamed with a
+    configurable time-to-first-token and decode speed. Never selected
+    automatically; use ``LLM_PROVIDER=fake`` or ``"provider": "fake"``.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake-llm",
+        ttft_ms: float = 300.0,
+        tokens_per_second: float = 40.0,
+        jitter: float = 0.2,
+        response_tokens: int = 80,
+        tool_call: str = "",
+        script_path: str = "",
+    ):
+        """
+        Initialize fake provider.
+
+        Args:
+            model_name: Model name reported to the agent
+            ttft_ms: Mean time to first token in milliseconds
+            tokens_per_second: Mean decode speed (0 = no inter-token delay)
+            jitter: Relative random variation of both latencies (0.2 = ±20%)
+            response_tokens: Length of generated text responses in tokens
+            tool_call: Tool to call on the first request of a turn when offered
+            script_path: JSON response script (see ``load_script``)
+        """
+        self._model_name = model_name
+        self._server = get_fake_server(
+            model_name, ttft_ms, tokens_per_second, jitter, response_tokens, tool_call, script_path
+        )
+
+        logger.debug(
+            "fake_provider_initialized",
+            model=model_name,
+            ttft_ms=ttft_ms,
+            tokens_per_second=tokens_per_second,
+        )
+
+    @property
+    def provider_type(self) -> ProviderType:
+        """Get the provider type."""
+        return ProviderType.FAKE
+
+    @property
+    def model_name(self) -> str:
+        """Get the current model name."""
+        return self._model_name
+
+    @property
+    def endpoint(self) -> str:
+        """Get the (in-process) API endpoint."""
+        return FAKE_ENDPOINT
+
+    @property
+    def server(self) -> FakeOpenAIServer:
+        """The in-process server answering this provider's requests."""
+        return self._server
+
+    def get_model(self) -> "OpenAIModel":
+        """
+        Get a Pydantic AI compatible model instance.
+
+        Returns:
+            OpenAIModel talking to the in-process server
+        """
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
+        provider = OpenAIProvider(
+            base_url=FAKE_ENDPOINT,
+            api_key="fake",
+            http_client=_get_http_client(self._server),
+        )
+        return OpenAIModel(model_name=self._model_name, provider=provider)
+
+    async def check_connection(self) -> ProviderStatus:
+        """The fake provider is always available."""
+        return ProviderStatus(
+            available=True,
+            provider_type=self.provider_type,
+            model_name=self._model_name,
+            endpoint=FAKE_ENDPOINT,
+            version="fake",
+        )
+
+    async def list_models(self) -> list[str]:
+        """List the single fake model."""
+        return [self._model_name]
+
+    def supports_tool_calling(self) -> bool:
+        """Scripted tool calls are always supported."""
+        return True
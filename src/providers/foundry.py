@@ -5,14 +5,18 @@ Implementation for Microsoft Foundry Local AI inference runtime.
 https://learn.microsoft.com/en-us/azure/ai-foundry/foundry-local/get-started
 """
 
+from typing import TYPE_CHECKING
+
 import httpx
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 
 from src.providers.base import LLMProvider, ProviderStatus, ProviderType
+from src.providers.http import get_json
 from src.utils.config import settings
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from pydantic_ai.models.openai import OpenAIModel
+
 logger = get_logger(__name__)
 
 # Default Foundry Local endpoint
@@ -127,7 +131,7 @@ class FoundryLocalProvider(LLMProvider):
         """Get the OpenAI-compatible API endpoint."""
         return f"{self._endpoint}/v1"
 
-    def get_model(self) -> OpenAIModel:
+    def get_model(self) -> "OpenAIModel":
         """
         Get a Pydantic AI compatible model instance.
 
@@ -141,6 +145,10 @@ class FoundryLocalProvider(LLMProvider):
 
         model_to_use = self._actual_model_name or self._model_name
 
+        # Imported here so provider status checks don't load Pydantic AI
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         # Use OpenAIProvider with custom base_url for Foundry Local compatibility
         provider = OpenAIProvider(
             base_url=self.endpoint,
@@ -230,90 +238,87 @@ class FoundryLocalProvider(LLMProvider):
             ProviderStatus with connection details
         """
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Try to get models list (OpenAI-compatible endpoint)
-                response = await client.get(f"{self._endpoint}/v1/models")
-                response.raise_for_status()
-                data = response.json()
+            # Model list is cached briefly and shares one connection pool
+            data = await get_json(f"{self._endpoint}/v1/models")
 
-                models = data.get("data", [])
-                model_ids = [m.get("id", "") for m in models]
+            models = data.get("data", [])
+            model_ids = [m.get("id", "") for m in models]
 
-                logger.debug(
-                    "foundry_models_response",
-                    models=model_ids,
-                    requested_model=self._model_name,
-                )
+            logger.debug(
+                "foundry_models_response",
+                models=model_ids,
+                requested_model=self._model_name,
+            )
 
-                # Find a matching model - check for exact match first, then partial
-                matched_model = None
-                model_lower = self._model_name.lower()
+            # Find a matching model - check for exact match first, then partial
+            matched_model = None
+            model_lower = self._model_name.lower()
 
-                # First pass: exact match
+            # First pass: exact match
+            for m_id in model_ids:
+                if m_id.lower() == model_lower:
+                    matched_model = m_id
+                    break
+
+            # Second pass: starts with the requested model (e.g., "Phi-4" matches "Phi-4-cuda-gpu:0")
+            if not matched_model:
                 for m_id in model_ids:
-                    if m_id.lower() == model_lower:
+                    m_lower = m_id.lower()
+                    # Check if model ID starts with our requested model name
+                    if m_lower.startswith(model_lower) or m_lower.startswith(
+                        model_lower.replace("-", "")
+                    ):
                         matched_model = m_id
                         break
 
-                # Second pass: starts with the requested model (e.g., "Phi-4" matches "Phi-4-cuda-gpu:0")
-                if not matched_model:
-                    for m_id in model_ids:
-                        m_lower = m_id.lower()
-                        # Check if model ID starts with our requested model name
-                        if m_lower.startswith(model_lower) or m_lower.startswith(
-                            model_lower.replace("-", "")
-                        ):
-                            matched_model = m_id
-                            break
-
-                # Third pass: requested model is contained in available model ID
-                if not matched_model:
-                    for m_id in model_ids:
-                        m_lower = m_id.lower()
-                        if model_lower in m_lower:
-                            matched_model = m_id
-                            break
-
-                if matched_model:
-                    # Store the actual model name for use in get_model()
-                    self._actual_model_name = matched_model
-                    logger.info(
-                        "foundry_model_matched",
-                        requested=self._model_name,
-                        actual=matched_model,
-                    )
-                    return ProviderStatus(
-                        available=True,
-                        provider_type=self.provider_type,
-                        model_name=matched_model,
-                        endpoint=self._endpoint,
-                    )
-
-                if model_ids:
-                    # Model not found but Foundry is running - use first available
-                    self._actual_model_name = model_ids[0]
-                    logger.warning(
-                        "foundry_model_not_found",
-                        requested=self._model_name,
-                        using=model_ids[0],
-                        available=model_ids,
-                    )
-                    return ProviderStatus(
-                        available=True,
-                        provider_type=self.provider_type,
-                        model_name=model_ids[0],
-                        endpoint=self._endpoint,
-                        error=f"Requested model '{self._model_name}' not loaded. Using: {model_ids[0]}",
-                    )
+            # Third pass: requested model is contained in available model ID
+            if not matched_model:
+                for m_id in model_ids:
+                    m_lower = m_id.lower()
+                    if model_lower in m_lower:
+                        matched_model = m_id
+                        break
 
+            if matched_model:
+                # Store the actual model name for use in get_model()
+                self._actual_model_name = matched_model
+                logger.info(
+                    "foundry_model_matched",
+                    requested=self._model_name,
+                    actual=matched_model,
+                )
                 return ProviderStatus(
-                    available=False,
+                    available=True,
                     provider_type=self.provider_type,
-                    model_name=self._model_name,
+                    model_name=matched_model,
                     endpoint=self._endpoint,
-                    error="No models loaded in Foundry Local",
                 )
 
+            if model_ids:
+                # Model not found but Foundry is running - use first available
+                self._actual_model_name = model_ids[0]
+                logger.warning(
+                    "foundry_model_not_found",
+                    requested=self._model_name,
+                    using=model_ids[0],
+                    available=model_ids,
+                )
+                return ProviderStatus(
+                    available=True,
+                    provider_type=self.provider_type,
+                    model_name=model_ids[0],
+                    endpoint=self._endpoint,
+                    error=f"Requested model '{self._model_name}' not loaded. Using: {model_ids[0]}",
+                )
+
+            return ProviderStatus(
+                available=False,
+                provider_type=self.provider_type,
+                model_name=self._model_name,
+                endpoint=self._endpoint,
+                error="No models loaded in Foundry Local",
+            )
+
         except httpx.ConnectError:
             # Try auto-start if enabled
             if self._auto_start:
@@ -394,11 +399,8 @@ class FoundryLocalProvider(LLMProvider):
             List of model IDs
         """
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(f"{self._endpoint}/v1/models")
-                response.raise_for_status()
-                data = response.json()
-                return [m.get("id", "") for m in data.get("data", [])]
+            data = await get_json(f"{self._endpoint}/v1/models")
+            return [m.get("id", "") for m in data.get("data", [])]
         except Exception as e:
             logger.error("foundry_list_models_error", error=str(e))
             return []
@@ -0,0 +1,121 @@
+"""
+Provider HTTP Client
+
+Shared connection pool and short-lived response cache for provider status
+checks and model discovery. Every status poll used to open fresh
+connections to Ollama/Foundry Local; with a shared keep-alive pool and a
+few seconds of caching, frequent polling costs at most one request per
+endpoint per TTL instead of competing with inference for the server.
+
+Clients are kept per event loop, since an ``httpx.AsyncClient`` pool is
+bound to the loop it was first used on (the CLI and Streamlit run
+short-lived loops).
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any
+
+import httpx
+
+from src.utils.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# url -> (expires_at, parsed JSON)
+_cache: dict[str, tuple[float, Any]] = {}
+# url -> in-flight request shared by concurrent callers on the same loop
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the running event loop.
+
+    Returns:
+        AsyncClient with a small keep-alive connection pool
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        limit = settings.provider_http_max_connections
+        client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client of the running event loop."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def get_json(url: str, ttl: float | None = None, timeout: float = 10.0) -> Any:
+    """
+    GET a JSON document through the shared client, caching the result.
+
+    Concurrent callers for the same URL share one request. Errors are not
+    cached.
+
+    Args:
+        url: URL to fetch
+        ttl: Seconds to cache the result (None = provider_status_ttl_seconds, 0 = no cache)
+        timeout: Request timeout in seconds
+
+    Returns:
+        Parsed JSON body
+
+    Raises:
+        httpx.HTTPError: On connection errors or non-2xx responses
+    """
+    ttl = settings.provider_status_ttl_seconds if ttl is None else ttl
+    if ttl > 0:
+        cached = _cache.get(url)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+    task = _inflight.get(url)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch(url, timeout))
+        _inflight[url] = task
+        task.add_done_callback(lambda t: _forget(url, t))
+
+    data = await asyncio.shield(task)
+    if ttl > 0:
+        _cache[url] = (time.monotonic() + ttl, data)
+    return data
+
+
+async def _fetch(url: str, timeout: float) -> Any:
+    response = await get_http_client().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def _forget(url: str, task: asyncio.Task) -> None:
+    if _inflight.get(url) is task:
+        del _inflight[url]
+    # Mark the error as retrieved even if every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+def clear_cache(prefix: str = "") -> None:
+    """
+    Drop cached responses.
+
+    Args:
+        prefix: Only drop URLs starting with this prefix (default: all)
+    """
+    for url in [url for url in _cache if url.startswith(prefix)]:
+        del _cache[url]
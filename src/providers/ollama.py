@@ -4,13 +4,18 @@ Ollama Provider
 Implementation for Ollama local LLM inference engine.
 """
 
+import asyncio
+from typing import TYPE_CHECKING
+
 import httpx
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 
 from src.providers.base import LLMProvider, ProviderStatus, ProviderType
+from src.providers.http import get_json
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from pydantic_ai.models.openai import OpenAIModel
+
 logger = get_logger(__name__)
 
 # Models known to support tool calling in Ollama
@@ -120,13 +125,17 @@ class OllamaProvider(LLMProvider):
         """Get the OpenAI-compatible API endpoint."""
         return f"{self._host}/v1"
 
-    def get_model(self) -> OpenAIModel:
+    def get_model(self) -> "OpenAIModel":
         """
         Get a Pydantic AI compatible model instance.
 
         Returns:
             OpenAIModel configured for Ollama
         """
+        # Imported here so provider status checks don't load Pydantic AI
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+
         # Use OpenAIProvider with custom base_url for Ollama compatibility
         provider = OpenAIProvider(
             base_url=self.endpoint,
@@ -145,44 +154,38 @@ class OllamaProvider(LLMProvider):
             ProviderStatus with connection details
         """
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Check Ollama is running
-                response = await client.get(f"{self._host}/api/version")
-                response.raise_for_status()
-                version_data = response.json()
-                version = version_data.get("version", "unknown")
-
-                # Check if model is available
-                models_response = await client.get(f"{self._host}/api/tags")
-                models_response.raise_for_status()
-                models_data = models_response.json()
-
-                available_models = [m.get("name", "") for m in models_data.get("models", [])]
-
-                # Check if our model is in the list
-                model_found = any(
-                    self._model_name in m or m.startswith(self._model_name.split(":")[0])
-                    for m in available_models
-                )
+            # Version and model list are cached briefly and share one connection pool
+            version_data, models_data = await asyncio.gather(
+                get_json(f"{self._host}/api/version"),
+                get_json(f"{self._host}/api/tags"),
+            )
+            version = version_data.get("version", "unknown")
+            available_models = [m.get("name", "") for m in models_data.get("models", [])]
 
-                if not model_found:
-                    return ProviderStatus(
-                        available=False,
-                        provider_type=self.provider_type,
-                        model_name=self._model_name,
-                        endpoint=self._host,
-                        version=version,
-                        error=f"Model '{self._model_name}' not found. Run: ollama pull {self._model_name}",
-                    )
+            # Check if our model is in the list
+            model_found = any(
+                self._model_name in m or m.startswith(self._model_name.split(":")[0])
+                for m in available_models
+            )
 
+            if not model_found:
                 return ProviderStatus(
-                    available=True,
+                    available=False,
                     provider_type=self.provider_type,
                     model_name=self._model_name,
                     endpoint=self._host,
                     version=version,
+                    error=f"Model '{self._model_name}' not found. Run: ollama pull {self._model_name}",
                 )
 
+            return ProviderStatus(
+                available=True,
+                provider_type=self.provider_type,
+                model_name=self._model_name,
+                endpoint=self._host,
+                version=version,
+            )
+
         except httpx.ConnectError:
             return ProviderStatus(
                 available=False,
@@ -208,11 +211,8 @@ class OllamaProvider(LLMProvider):
             List of model names
         """
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(f"{self._host}/api/tags")
-                response.raise_for_status()
-                data = response.json()
-                return [m.get("name", "") for m in data.get("models", [])]
+            data = await get_json(f"{self._host}/api/tags")
+            return [m.get("name", "") for m in data.get("models", [])]
         except Exception as e:
             logger.error("ollama_list_models_error", error=str(e))
             return []
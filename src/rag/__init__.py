@@ -3,32 +3,80 @@ RAG Pipeline Package
 Phase 2.1+: Backend Infrastructure & RAG Pipeline
 
 Components for Retrieval-Augmented Generation:
-- Ollama embeddings
+- Ollama embeddings behind a global adaptive concurrency scheduler
 - SQL Server 2025 vector store (native VECTOR type)
 - Redis vector store (fallback option)
+- Local memory-mapped vector store (no server)
 - Document processing with Docling (primary) or pypdf/docx (fallback)
 - Schema indexing for query enhancement
+- Tag, date and metadata search filters pushed down into each store
+- Query-embedding and search-result caching with corpus versioning
 - Abstract base class for vector stores
 - Factory pattern for vector store creation
 """
 
-from src.rag.docling_processor import DoclingDocumentProcessor, get_document_processor
-from src.rag.document_processor import DocumentProcessor
-from src.rag.embedder import OllamaEmbedder
-from src.rag.mssql_vector_store import MSSQLVectorStore
-from src.rag.redis_vector_store import RedisVectorStore
-from src.rag.schema_indexer import SchemaIndexer
-from src.rag.vector_store_base import VectorStoreBase, VectorStoreProtocol
-from src.rag.vector_store_factory import VectorStoreFactory, VectorStoreType
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.rag.docling_processor import DoclingDocumentProcessor, get_document_processor
+    from src.rag.document_processor import DocumentProcessor
+    from src.rag.embedder import OllamaEmbedder
+    from src.rag.embedding_scheduler import (
+        EmbeddingPriority,
+        EmbeddingScheduler,
+        get_embedding_scheduler,
+    )
+    from src.rag.local_vector_store import LocalVectorStore
+    from src.rag.mssql_vector_store import MSSQLVectorStore
+    from src.rag.redis_vector_store import RedisVectorStore
+    from src.rag.schema_indexer import SchemaIndexer
+    from src.rag.search_cache import CachedVectorStore, SearchCache
+    from src.rag.search_filter import SearchFilter
+    from src.rag.vector_store_base import VectorStoreBase, VectorStoreProtocol
+    from src.rag.vector_store_factory import VectorStoreFactory, VectorStoreType
+
+# Imported on first access so importing one submodule does not load them all
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "DoclingDocumentProcessor": "src.rag.docling_processor",
+        "get_document_processor": "src.rag.docling_processor",
+        "DocumentProcessor": "src.rag.document_processor",
+        "OllamaEmbedder": "src.rag.embedder",
+        "EmbeddingPriority": "src.rag.embedding_scheduler",
+        "EmbeddingScheduler": "src.rag.embedding_scheduler",
+        "get_embedding_scheduler": "src.rag.embedding_scheduler",
+        "LocalVectorStore": "src.rag.local_vector_store",
+        "MSSQLVectorStore": "src.rag.mssql_vector_store",
+        "RedisVectorStore": "src.rag.redis_vector_store",
+        "SchemaIndexer": "src.rag.schema_indexer",
+        "CachedVectorStore": "src.rag.search_cache",
+        "SearchCache": "src.rag.search_cache",
+        "SearchFilter": "src.rag.search_filter",
+        "VectorStoreBase": "src.rag.vector_store_base",
+        "VectorStoreProtocol": "src.rag.vector_store_base",
+        "VectorStoreFactory": "src.rag.vector_store_factory",
+        "VectorStoreType": "src.rag.vector_store_factory",
+    },
+)
 
 __all__ = [
     "OllamaEmbedder",
+    "EmbeddingScheduler",
+    "EmbeddingPriority",
+    "get_embedding_scheduler",
     "MSSQLVectorStore",
     "RedisVectorStore",
+    "LocalVectorStore",
     "DocumentProcessor",  # Legacy processor (fallback)
     "DoclingDocumentProcessor",  # Primary processor with Docling
     "get_document_processor",  # Factory function for automatic selection
     "SchemaIndexer",
+    "SearchFilter",
+    "SearchCache",
+    "CachedVectorStore",
     "VectorStoreBase",
     "VectorStoreProtocol",
     "VectorStoreFactory",
@@ -282,7 +282,9 @@ class DoclingDocumentProcessor:
             if chunk:
                 chunks.append(chunk)
 
-            start = end - self.chunk_overlap
+            # Always move forward, even when a boundary falls inside the overlap
+            next_start = end - self.chunk_overlap
+            start = next_start if next_start > start else end
             if start >= text_length:
                 break
 
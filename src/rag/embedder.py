@@ -1,7 +1,9 @@
 """
 Ollama Embedder
 
-Generates vector embeddings using Ollama's embedding models.
+Generates vector embeddings using Ollama's embedding models. Every request
+goes through the process-wide EmbeddingScheduler, which bounds concurrency
+across all callers and admits query embeddings ahead of bulk ingestion.
 """
 
 import asyncio
@@ -9,6 +11,13 @@ import asyncio
 import httpx
 import structlog
 
+from src.rag.embedding_scheduler import (
+    EmbeddingPriority,
+    EmbeddingScheduler,
+    get_embedding_scheduler,
+)
+from src.utils.tracing import traced
+
 logger = structlog.get_logger()
 
 
@@ -20,6 +29,7 @@ class OllamaEmbedder:
         base_url: str = "http://localhost:11434",
         model: str = "nomic-embed-text",
         timeout: float = 60.0,
+        scheduler: EmbeddingScheduler | None = None,
     ):
         """
         Initialize the Ollama embedder.
@@ -28,18 +38,29 @@ class OllamaEmbedder:
             base_url: Ollama server URL
             model: Embedding model name (default: nomic-embed-text)
             timeout: Timeout for individual embedding requests in seconds
+            scheduler: Embedding scheduler (default: the process-wide scheduler)
         """
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.timeout = timeout
+        self._scheduler = scheduler
         self._dimensions: int | None = None
 
-    async def embed(self, text: str) -> list[float]:
+    @property
+    def scheduler(self) -> EmbeddingScheduler:
+        """Scheduler that admits this embedder's requests."""
+        return self._scheduler or get_embedding_scheduler()
+
+    @traced("rag.embed")
+    async def embed(
+        self, text: str, priority: EmbeddingPriority = EmbeddingPriority.INTERACTIVE
+    ) -> list[float]:
         """
         Generate embedding for a single text.
 
         Args:
             text: Text to embed
+            priority: Scheduling priority (queries are interactive by default)
 
         Returns:
             List of floats representing the embedding vector
@@ -48,6 +69,11 @@ class OllamaEmbedder:
             httpx.TimeoutException: If request times out
             httpx.HTTPStatusError: If Ollama returns an error
         """
+        return await self.scheduler.run(lambda: self._request_embedding(text), priority)
+
+    @traced("rag.embed.request")
+    async def _request_embedding(self, text: str) -> list[float]:
+        """Send one embedding request to Ollama."""
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{self.base_url}/api/embeddings",
@@ -71,15 +97,19 @@ class OllamaEmbedder:
     async def embed_batch(
         self,
         texts: list[str],
-        batch_size: int = 10,
+        batch_size: int = 32,
         max_retries: int = 3,
     ) -> list[list[float]]:
         """
         Generate embeddings for multiple texts with progress logging and retry logic.
 
+        Requests are submitted at bulk priority; the scheduler decides how many
+        run concurrently across all batches in the process.
+
         Args:
             texts: List of texts to embed
-            batch_size: Number of concurrent embedding requests
+            batch_size: Number of texts submitted to the scheduler at a time
+                (bounds this batch's share of the queue, not concurrency)
             max_retries: Maximum retries for failed embeddings
 
         Returns:
@@ -167,7 +197,7 @@ class OllamaEmbedder:
     async def _embed_with_error_handling(self, text: str, index: int) -> list[float]:
         """Embed a single text with error handling for batch processing."""
         try:
-            return await self.embed(text)
+            return await self.embed(text, priority=EmbeddingPriority.BULK)
         except Exception as e:
             logger.debug(
                 "embedding_error",
@@ -0,0 +1,255 @@
+"""
+Embedding Scheduler
+
+Process-wide governor for embedding requests sent to Ollama.
+
+All embedding work (query embeddings and document ingestion from every
+background job) is queued here and admitted under one concurrency limit,
+so simultaneous uploads no longer multiply the number of in-flight requests.
+The limit is tuned with AIMD (additive increase, multiplicative decrease):
+
+- each request completing under the latency target adds 1/limit, so the
+  limit grows by about one slot per round trip
+- a request over the latency target, a timeout, a connection error or a
+  5xx/429 response cuts the limit by ``decrease_factor`` (at most once per
+  latency-target interval, so one slow burst is not counted many times)
+
+Waiting requests are admitted by priority, so interactive query embeddings
+overtake queued bulk ingestion.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from typing import Any, TypeVar
+
+import httpx
+import structlog
+
+from src.utils.config import get_settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class EmbeddingPriority(IntEnum):
+    """Admission priority of embedding work (lower is admitted first)."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an error signals that the embedding server is overloaded."""
+    if isinstance(error, httpx.TimeoutException | httpx.ConnectError | httpx.RemoteProtocolError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class EmbeddingScheduler:
+    """
+    Priority queue with an AIMD-tuned global concurrency limit.
+
+    Usage:
+        scheduler = get_embedding_scheduler()
+        embedding = await scheduler.run(lambda: request(text), EmbeddingPriority.BULK)
+    """
+
+    def __init__(
+        self,
+        initial_limit: int | None = None,
+        min_limit: int | None = None,
+        max_limit: int | None = None,
+        latency_target_ms: float | None = None,
+        decrease_factor: float = 0.5,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lowest concurrency limit
+            max_limit: Highest concurrency limit
+            latency_target_ms: Per-request latency above which the limit is cut
+            decrease_factor: Multiplier applied to the limit on overload
+        """
+        settings = get_settings()
+        self.min_limit = max(1, min_limit or settings.embedding_min_concurrency)
+        self.max_limit = max(self.min_limit, max_limit or settings.embedding_max_concurrency)
+        initial = initial_limit or settings.embedding_initial_concurrency
+        self.latency_target_ms = latency_target_ms or settings.embedding_latency_target_ms
+        self.decrease_factor = decrease_factor
+
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+
+        self.completed = 0
+        self.errors = 0
+        self.decreases = 0
+        self.latency_ewma_ms = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def active(self) -> int:
+        """Requests currently in flight."""
+        return self._active
+
+    def queued(self, priority: EmbeddingPriority | None = None) -> int:
+        """Number of waiting requests, optionally for one priority."""
+        return sum(
+            1
+            for entry_priority, _, future in self._waiters
+            if not future.done() and (priority is None or entry_priority == priority)
+        )
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[T]],
+        priority: EmbeddingPriority = EmbeddingPriority.INTERACTIVE,
+    ) -> T:
+        """
+        Run an embedding request once a slot is available.
+
+        Args:
+            request: Zero-argument coroutine function performing the request
+            priority: Admission priority
+
+        Returns:
+            Result of the request
+        """
+        await self._acquire(priority)
+        start = time.perf_counter()
+        try:
+            result = await request()
+        except Exception as e:
+            self.errors += 1
+            if is_overload_error(e):
+                self._decrease(reason=type(e).__name__)
+            raise
+        finally:
+            self._release()
+
+        self._record_success((time.perf_counter() - start) * 1000)
+        return result
+
+    async def _acquire(self, priority: EmbeddingPriority) -> None:
+        """Take a slot, waiting behind higher-priority and earlier requests."""
+        if self._active < self.limit and not self.queued():
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as the waiter was cancelled
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Return a slot and admit waiters."""
+        self._active -= 1
+        self._admit()
+
+    def _admit(self) -> None:
+        """Admit waiting requests while slots are free."""
+        while self._waiters and self._active < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # Cancelled while waiting
+            self._active += 1
+            future.set_result(None)
+
+    def _record_success(self, latency_ms: float) -> None:
+        """Update latency statistics and adjust the limit."""
+        self.completed += 1
+        if self.latency_ewma_ms == 0.0:
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.latency_ewma_ms += LATENCY_EWMA_ALPHA * (latency_ms - self.latency_ewma_ms)
+
+        if latency_ms > self.latency_target_ms:
+            self._decrease(reason="latency", latency_ms=round(latency_ms, 1))
+        elif self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            self._admit()
+
+    def _decrease(self, reason: str, **details: Any) -> None:
+        """Cut the limit multiplicatively, at most once per latency window."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.latency_target_ms / 1000:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self.decreases += 1
+        logger.info(
+            "embedding_concurrency_decreased",
+            reason=reason,
+            previous=previous,
+            limit=self.limit,
+            **details,
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get scheduler statistics."""
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "active": self._active,
+            "queued_interactive": self.queued(EmbeddingPriority.INTERACTIVE),
+            "queued_bulk": self.queued(EmbeddingPriority.BULK),
+            "completed": self.completed,
+            "errors": self.errors,
+            "decreases": self.decreases,
+            "latency_ewma_ms": round(self.latency_ewma_ms, 1),
+            "latency_target_ms": self.latency_target_ms,
+        }
+
+
+# Global scheduler instance shared by every embedder
+_embedding_scheduler: EmbeddingScheduler | None = None
+
+
+def get_embedding_scheduler() -> EmbeddingScheduler:
+    """
+    Get or create the process-wide embedding scheduler.
+
+    Returns:
+        EmbeddingScheduler instance
+    """
+    global _embedding_scheduler
+    if _embedding_scheduler is None:
+        _embedding_scheduler = EmbeddingScheduler()
+        logger.info(
+            "embedding_scheduler_initialized",
+            limit=_embedding_scheduler.limit,
+            max_limit=_embedding_scheduler.max_limit,
+        )
+    return _embedding_scheduler
+
+
+def reset_embedding_scheduler() -> None:
+    """Reset the global embedding scheduler."""
+    global _embedding_scheduler
+    _embedding_scheduler = None
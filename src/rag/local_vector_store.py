@@ -0,0 +1,821 @@
+"""
+Local Vector Store
+Single-node vector store with no external server.
+
+Embeddings are L2-normalized and appended to a memory-mapped float32 matrix
+file (``vectors.f32``); chunk text and metadata live in a SQLite sidecar
+(``chunks.db``) keyed by matrix row. Search is a vectorized NumPy dot product
+over the mapped file (zero-copy reads), optionally narrowed by an IVF
+(inverted file) coarse quantizer for large corpora. Deletes are tombstones;
+the matrix is compacted once enough rows are dead.
+
+Compaction writes the new matrix to a generation-numbered file, commits the
+renumbered metadata together with that generation, and only then swaps the
+file in; reopening finishes a swap interrupted after the commit and discards
+files from compactions that never committed.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import structlog
+
+from src.rag.embedder import OllamaEmbedder
+from src.rag.search_filter import SearchFilter
+from src.rag.vector_store_base import VectorStoreBase
+from src.utils.config import get_settings
+from src.utils.tracing import traced
+
+logger = structlog.get_logger()
+
+VECTORS_FILENAME = "vectors.f32"
+METADATA_FILENAME = "chunks.db"
+
+# Compacted matrix awaiting its swap: vectors.f32.compact-<generation>
+COMPACT_SUFFIX = ".compact-"
+
+# k-means iterations used to train the IVF centroids
+IVF_TRAIN_ITERATIONS = 10
+
+# Rows sampled per centroid when training the IVF centroids
+IVF_TRAIN_SAMPLES_PER_LIST = 64
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so cosine similarity is a dot product."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    idx = np.argpartition(-scores, k)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+class IVFIndex:
+    """
+    Inverted file index over the vector matrix.
+
+    Rows are bucketed by their nearest k-means centroid; a query only scores
+    the rows in its ``nprobe`` nearest buckets.
+    """
+
+    def __init__(self, centroids: np.ndarray):
+        """
+        Initialize the index.
+
+        Args:
+            centroids: Normalized centroid matrix (nlist x dimensions)
+        """
+        self.centroids = centroids
+        self.lists: list[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in centroids]
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, rows: np.ndarray, nlist: int) -> "IVFIndex":
+        """
+        Train centroids on a sample of rows and assign every row.
+
+        Args:
+            vectors: Vector matrix (may be memory-mapped)
+            rows: Live row numbers to index
+            nlist: Number of buckets
+
+        Returns:
+            Built IVFIndex
+        """
+        rng = np.random.default_rng(0)
+        sample_size = min(len(rows), nlist * IVF_TRAIN_SAMPLES_PER_LIST)
+        sample = vectors[np.sort(rng.choice(rows, sample_size, replace=False))]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(nlist):
+                members = sample[assignment == i]
+                if len(members):
+                    centroids[i] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+
+        index = cls(centroids)
+        index.add(rows, vectors)
+        return index
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """
+        Assign rows to their nearest bucket.
+
+        Args:
+            rows: Row numbers to add
+            vectors: Vector matrix indexed by row number
+        """
+        # Assign in blocks to bound temporary memory
+        block = 65536
+        for start in range(0, len(rows), block):
+            chunk = rows[start : start + block]
+            assignment = np.argmax(vectors[chunk] @ self.centroids.T, axis=1)
+            for i in np.unique(assignment):
+                self.lists[i] = np.concatenate([self.lists[i], chunk[assignment == i]])
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """
+        Get the rows in the buckets nearest to a query.
+
+        Args:
+            query: Normalized query vector
+            nprobe: Number of buckets to scan
+
+        Returns:
+            Candidate row numbers
+        """
+        probes = _top_k(self.centroids @ query, nprobe)
+        return np.concatenate([self.lists[i] for i in probes])
+
+
+class LocalVectorStore(VectorStoreBase):
+    """Vector store backed by a memory-mapped float32 file and SQLite metadata."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        embedder: OllamaEmbedder,
+        dimensions: int = 768,  # nomic-embed-text default
+        compaction_ratio: float | None = None,
+        ivf_min_rows: int | None = None,
+        ivf_nprobe: int | None = None,
+    ):
+        """
+        Initialize the local vector store.
+
+        Args:
+            path: Directory holding the vector and metadata files
+            embedder: Ollama embedder for generating vectors
+            dimensions: Embedding dimensions (default: 768 for nomic-embed-text)
+            compaction_ratio: Dead-row fraction that triggers compaction
+            ivf_min_rows: Live rows before an IVF index is used (0 disables)
+            ivf_nprobe: IVF buckets scanned per query
+        """
+        super().__init__(embedder=embedder, dimensions=dimensions)
+        settings = get_settings()
+        self.path = Path(path)
+        self.compaction_ratio = (
+            settings.local_vector_compaction_ratio if compaction_ratio is None else compaction_ratio
+        )
+        self.ivf_min_rows = (
+            settings.local_vector_ivf_min_rows if ivf_min_rows is None else ivf_min_rows
+        )
+        self.ivf_nprobe = ivf_nprobe or settings.local_vector_ivf_nprobe
+
+        self._row_bytes = dimensions * 4
+        self._vectors_path = self.path / VECTORS_FILENAME
+        self._conn: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._write_lock = asyncio.Lock()
+
+        self._matrix: np.memmap | None = None
+        self._rows = 0
+        self._live = np.zeros(0, dtype=bool)
+        self._source_types = np.zeros(0, dtype=np.int32)
+        self._source_type_codes: dict[str, int] = {}
+        self._ivf: IVFIndex | None = None
+        self._ivf_build_lock = threading.Lock()
+        # Compaction generation recorded in the metadata database
+        self._compaction_generation = 0
+        # Bumped whenever row numbers change meaning (compaction, reopen)
+        self._generation = 0
+        self.compactions = 0
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def _source_type_code(self, source_type: str) -> int:
+        """Get the integer code of a source type."""
+        code = self._source_type_codes.get(source_type)
+        if code is None:
+            code = len(self._source_type_codes)
+            self._source_type_codes[source_type] = code
+        return code
+
+    def _open(self, overwrite: bool) -> None:
+        """Open (or recreate) the files and load row state."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if overwrite:
+            for name in (VECTORS_FILENAME, METADATA_FILENAME):
+                for suffix in ("", "-wal", "-shm"):
+                    with contextlib.suppress(FileNotFoundError):
+                        (self.path / (name + suffix)).unlink()
+
+        conn = sqlite3.connect(self.path / METADATA_FILENAME, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                source TEXT NOT NULL,
+                source_type TEXT NOT NULL,
+                metadata TEXT NOT NULL DEFAULT '{}',
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS ix_chunks_document ON chunks(document_id);
+            CREATE TABLE IF NOT EXISTS store_state (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        # Filter columns were added after the first release of the store
+        columns = {c["name"] for c in conn.execute("PRAGMA table_info(chunks)")}
+        if "tags" not in columns:
+            conn.execute("ALTER TABLE chunks ADD COLUMN tags TEXT NOT NULL DEFAULT '[]'")
+        if "created_at" not in columns:
+            conn.execute("ALTER TABLE chunks ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+        if "content_hash" not in columns:
+            conn.execute("ALTER TABLE chunks ADD COLUMN content_hash TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_chunks_created_at ON chunks(created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_chunks_content_hash ON chunks(content_hash)")
+        conn.commit()
+        self._conn = conn
+
+        state = conn.execute("SELECT value FROM store_state WHERE key = 'generation'").fetchone()
+        generation = state["value"] if state else 0
+        pending = self._compact_path(generation)
+        if pending.exists():
+            # Compaction committed its metadata but was interrupted before the swap
+            os.replace(pending, self._vectors_path)
+            logger.warning("local_vector_compaction_recovered", generation=generation)
+        for stale in self.path.glob(VECTORS_FILENAME + COMPACT_SUFFIX + "*"):
+            # Compaction that never committed: the metadata still matches the old file
+            stale.unlink()
+
+        rows = conn.execute("SELECT row, source_type, deleted FROM chunks ORDER BY row").fetchall()
+        count = rows[-1]["row"] + 1 if rows else 0
+
+        # Vectors appended without committed metadata (interrupted add) are dropped
+        self._vectors_path.touch()
+        if self._vectors_path.stat().st_size != count * self._row_bytes:
+            os.truncate(self._vectors_path, count * self._row_bytes)
+
+        self._rows = count
+        self._live = np.zeros(count, dtype=bool)
+        self._source_types = np.zeros(count, dtype=np.int32)
+        for row in rows:
+            self._live[row["row"]] = not row["deleted"]
+            self._source_types[row["row"]] = self._source_type_code(row["source_type"])
+        self._matrix = None
+        self._ivf = None
+        self._compaction_generation = generation
+        self._generation += 1
+
+    def _compact_path(self, generation: int) -> Path:
+        """Get the path of the compacted vector file for a generation."""
+        return self.path / f"{VECTORS_FILENAME}{COMPACT_SUFFIX}{generation}"
+
+    def _get_matrix(self) -> np.ndarray:
+        """Get the read-only memory map of the vector file."""
+        if self._rows == 0:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        if self._matrix is None or self._matrix.shape[0] != self._rows:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dimensions)
+            )
+            self._ivf = None  # Rebuilt against the new mapping on demand
+        return self._matrix
+
+    def _build_ivf(self, matrix: np.ndarray, live_rows: np.ndarray) -> IVFIndex | None:
+        """
+        Build the IVF index without holding the state lock and install it.
+
+        The index covers the snapshot it was built from, so the caller can
+        always use it; it is only installed if no rows were appended or
+        renumbered meanwhile.
+
+        Args:
+            matrix: Vector matrix snapshot
+            live_rows: Live row numbers of the snapshot
+
+        Returns:
+            Built IVFIndex, or None if another search is already building one
+        """
+        if not self._ivf_build_lock.acquire(blocking=False):
+            return None  # Scan exactly until the other build finishes
+        try:
+            nlist = max(1, int(np.sqrt(len(live_rows))))
+            ivf = IVFIndex.build(matrix, live_rows, nlist)
+        finally:
+            self._ivf_build_lock.release()
+        logger.info("local_ivf_index_built", rows=len(live_rows), lists=nlist)
+
+        with self._db_lock:
+            if self._ivf is None and self._matrix is matrix and matrix.shape[0] == self._rows:
+                self._ivf = ivf
+        return ivf
+
+    def _require_open(self) -> sqlite3.Connection:
+        """Get the metadata connection, failing if create_index was not called."""
+        if self._conn is None:
+            raise RuntimeError("Local vector store not opened. Call create_index() first.")
+        return self._conn
+
+    # -------------------------------------------------------------------------
+    # VectorStoreBase
+    # -------------------------------------------------------------------------
+
+    async def create_index(self, overwrite: bool = False) -> None:
+        """
+        Open the store, creating its files if needed.
+
+        Args:
+            overwrite: If True, delete existing vectors and metadata
+        """
+        await asyncio.to_thread(self._open, overwrite)
+        logger.info(
+            "local_vector_store_opened",
+            path=str(self.path),
+            rows=self._rows,
+            live=int(self._live.sum()),
+        )
+
+    async def add_document(
+        self,
+        document_id: str,
+        chunks: list[str],
+        source: str,
+        source_type: str = "document",
+        metadata: dict[str, Any] | None = None,
+        start_index: int = 0,
+        embeddings: list[list[float]] | None = None,
+    ) -> None:
+        """
+        Add document chunks to the vector store.
+
+        Args:
+            document_id: Unique identifier for the document
+            chunks: List of text chunks
+            source: Source name (e.g., filename)
+            source_type: Type of source ('document', 'schema')
+            metadata: Optional metadata dictionary
+            start_index: Chunk index of the first chunk
+            embeddings: Precomputed chunk embeddings
+        """
+        logger.info("adding_document", document_id=document_id, chunk_count=len(chunks))
+        if not chunks:
+            return
+
+        if embeddings is None:
+            embeddings = await self.embed_chunks(chunks)
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        metadata_json = json.dumps(metadata or {})
+        created_at = time.time()
+
+        async with self._write_lock:
+            conn = self._require_open()
+            start = self._rows
+            new_rows = np.arange(start, start + len(chunks), dtype=np.int64)
+
+            def write() -> None:
+                with open(self._vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with self._db_lock, conn:
+                    conn.executemany(
+                        "INSERT INTO chunks (row, document_id, chunk_index, content, source, "
+                        "source_type, metadata, created_at, content_hash) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                int(row),
+                                document_id,
+                                start_index + i,
+                                chunk,
+                                source,
+                                source_type,
+                                metadata_json,
+                                created_at,
+                                self.chunk_hash(chunk),
+                            )
+                            for i, (row, chunk) in enumerate(zip(new_rows, chunks, strict=True))
+                        ],
+                    )
+
+            await asyncio.to_thread(write)
+
+            with self._db_lock:
+                ivf = self._ivf
+                code = self._source_type_code(source_type)
+                self._source_types = np.concatenate(
+                    [self._source_types, np.full(len(chunks), code, dtype=np.int32)]
+                )
+                self._live = np.concatenate([self._live, np.ones(len(chunks), dtype=bool)])
+                self._rows += len(chunks)
+                if ivf is not None:
+                    # Keep the trained index; only assign the appended rows
+                    ivf.add(new_rows, self._get_matrix())
+                    self._ivf = ivf
+
+        logger.info("document_added", document_id=document_id, chunks_added=len(chunks))
+
+    def _filter_rows(self, search_filter: SearchFilter) -> np.ndarray:
+        """
+        Get the live row numbers that satisfy a filter.
+
+        The date range is evaluated by SQLite on the indexed created_at
+        column; tags and metadata are matched on the remaining rows.
+
+        Args:
+            search_filter: Non-empty filter expression
+
+        Returns:
+            Array of matching row numbers
+        """
+        conn = self._require_open()
+        sql = "SELECT row, tags, metadata FROM chunks WHERE deleted = 0"
+        params: list[Any] = []
+        if search_filter.created_after:
+            sql += " AND created_at >= ?"
+            params.append(search_filter.created_after.timestamp())
+        if search_filter.created_before:
+            sql += " AND created_at < ?"
+            params.append(search_filter.created_before.timestamp())
+        row_filter = search_filter.model_copy(
+            update={"created_after": None, "created_before": None}
+        )
+
+        with self._db_lock:
+            records = conn.execute(sql, params).fetchall()
+
+        rows = []
+        for record in records:
+            tags, metadata = [], {}
+            with contextlib.suppress(json.JSONDecodeError, TypeError):
+                tags = json.loads(record["tags"])
+                metadata = json.loads(record["metadata"])
+            if row_filter.matches(tags, None, metadata):
+                rows.append(record["row"])
+        return np.asarray(rows, dtype=np.int64)
+
+    def _search_rows(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        source_type: str | None,
+        allowed_rows: np.ndarray | None = None,
+    ) -> list[tuple[int, float]]:
+        """Score live rows against a normalized query and return the top k."""
+        # Snapshot state under the lock; compaction swaps file and state under it
+        with self._db_lock:
+            if self._rows == 0:
+                return []
+            matrix = self._get_matrix()
+            mask = self._live
+            if allowed_rows is not None:
+                allowed = np.zeros(len(mask), dtype=bool)
+                allowed[allowed_rows[allowed_rows < len(mask)]] = True
+                mask = mask & allowed
+            if source_type is not None:
+                code = self._source_type_codes.get(source_type)
+                if code is None:
+                    return []
+                mask = mask & (self._source_types[: len(mask)] == code)
+            # Filtered scans are exact: IVF buckets could miss a narrow scope
+            ivf, live_rows = None, None
+            if allowed_rows is None and self.ivf_min_rows:
+                live_rows = np.flatnonzero(self._live)
+                if len(live_rows) >= self.ivf_min_rows:
+                    ivf = self._ivf
+
+        if ivf is None and live_rows is not None and len(live_rows) >= self.ivf_min_rows:
+            # k-means runs outside the lock so writers and lookups are not blocked
+            ivf = self._build_ivf(matrix, live_rows)
+
+        if ivf is not None:
+            candidates = ivf.candidates(query, self.ivf_nprobe)
+            candidates = np.sort(candidates[mask[candidates]])
+            scores = matrix[candidates] @ query
+        else:
+            scores = matrix @ query
+            candidates = np.flatnonzero(mask)
+            scores = scores[candidates]
+
+        best = _top_k(scores, top_k)
+        return [(int(candidates[i]), float(scores[i])) for i in best]
+
+    @traced("rag.vector_search")
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_type: str | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Search for similar documents.
+
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            source_type: Filter by source type
+            filters: Optional tag, date range and metadata filters
+
+        Returns:
+            List of matching documents with scores (cosine distance, lower is better)
+        """
+        conn = self._require_open()
+        query_embedding = await self.embedder.embed(query)
+        query_vector = _normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        # Row numbers are only meaningful within one generation: a compaction
+        # between scoring and the metadata fetch renumbers them, so start over
+        while True:
+            generation = self._generation
+            allowed_rows = None
+            if filters is not None and not filters.is_empty():
+                allowed_rows = await asyncio.to_thread(self._filter_rows, filters)
+                if len(allowed_rows) == 0:
+                    return []
+
+            hits = await asyncio.to_thread(
+                self._search_rows, query_vector, top_k, source_type, allowed_rows
+            )
+            if not hits:
+                return []
+
+            placeholders = ",".join("?" for _ in hits)
+            with self._db_lock:
+                if self._generation != generation:
+                    logger.debug("local_search_retried_after_compaction")
+                    continue
+                records = {
+                    record["row"]: record
+                    for record in conn.execute(
+                        "SELECT * FROM chunks WHERE row IN (" + placeholders + ")",
+                        [row for row, _score in hits],
+                    )
+                }
+            break
+
+        formatted = []
+        for row, score in hits:
+            record = records[row]
+            metadata = {}
+            with contextlib.suppress(json.JSONDecodeError, TypeError):
+                metadata = json.loads(record["metadata"])
+            formatted.append(
+                {
+                    "id": row,
+                    "content": record["content"],
+                    "source": record["source"],
+                    "source_type": record["source_type"],
+                    "document_id": record["document_id"],
+                    "chunk_index": record["chunk_index"],
+                    "metadata": metadata,
+                    "score": round(1.0 - score, 6),  # Cosine distance (lower is better)
+                }
+            )
+        return formatted
+
+    async def update_document_tags(self, document_id: str, tags: list[str]) -> int:
+        """
+        Store a document's tags on its chunks for tag filtering.
+
+        Args:
+            document_id: Document ID
+            tags: Normalized document tags
+
+        Returns:
+            Number of chunks updated
+        """
+        async with self._write_lock:
+            conn = self._require_open()
+            with self._db_lock, conn:
+                cursor = conn.execute(
+                    "UPDATE chunks SET tags = ? WHERE document_id = ? AND deleted = 0",
+                    (json.dumps(tags), document_id),
+                )
+        return cursor.rowcount
+
+    async def _tombstone(self, where: str, params: tuple) -> int:
+        """Tombstone the live chunks matching a condition, compacting if needed."""
+        async with self._write_lock:
+            conn = self._require_open()
+            with self._db_lock, conn:
+                rows = [
+                    r["row"]
+                    for r in conn.execute(
+                        "SELECT row FROM chunks WHERE deleted = 0 AND " + where, params
+                    )
+                ]
+                conn.execute("UPDATE chunks SET deleted = 1 WHERE " + where, params)
+            if rows:
+                self._live[rows] = False
+
+            dead = self._rows - int(self._live.sum())
+            if self._rows and dead / self._rows >= self.compaction_ratio:
+                await asyncio.to_thread(self._compact)
+        return len(rows)
+
+    async def delete_chunks_from(self, document_id: str, start_index: int) -> int:
+        """
+        Tombstone a document's chunks from a chunk index onwards.
+
+        Args:
+            document_id: Document ID
+            start_index: First chunk index to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        return await self._tombstone(
+            "document_id = ? AND chunk_index >= ?", (document_id, start_index)
+        )
+
+    async def delete_chunks(self, document_id: str, chunk_indexes: list[int]) -> int:
+        """
+        Tombstone specific chunks of a document.
+
+        Args:
+            document_id: Document ID
+            chunk_indexes: Chunk indexes to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        if not chunk_indexes:
+            return 0
+        placeholders = ",".join("?" * len(chunk_indexes))
+        return await self._tombstone(
+            f"document_id = ? AND chunk_index IN ({placeholders})",
+            (document_id, *chunk_indexes),
+        )
+
+    async def get_chunk_hashes(self, document_id: str) -> dict[int, str]:
+        """
+        Get the content hash of each live chunk of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Mapping of chunk index to content hash
+        """
+        conn = self._require_open()
+        with self._db_lock:
+            rows = conn.execute(
+                "SELECT chunk_index, content_hash FROM chunks "
+                "WHERE document_id = ? AND deleted = 0",
+                (document_id,),
+            ).fetchall()
+        # Chunks written before hashes were recorded have no known model: never unchanged
+        return {row["chunk_index"]: row["content_hash"] or "" for row in rows}
+
+    async def get_embeddings_by_hash(self, hashes: list[str]) -> dict[str, list[float]]:
+        """
+        Look up stored embeddings by chunk content hash.
+
+        Args:
+            hashes: Chunk content hashes
+
+        Returns:
+            Embedding for each hash found in the store
+        """
+        if not hashes or self._conn is None:
+            return {}
+        conn = self._conn
+        found: dict[str, int] = {}
+        with self._db_lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for row in conn.execute(
+                    f"SELECT content_hash, row FROM chunks "
+                    f"WHERE deleted = 0 AND content_hash IN ({placeholders})",
+                    batch,
+                ):
+                    found.setdefault(row["content_hash"], row["row"])
+            matrix = self._get_matrix()
+            # Rows committed by an add that has not finished mapping are skipped
+            return {h: matrix[row].tolist() for h, row in found.items() if row < self._rows}
+
+    async def delete_document(self, document_id: str) -> int:
+        """
+        Tombstone all chunks for a document, compacting when enough rows are dead.
+
+        Args:
+            document_id: Document ID to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        deleted = await self._tombstone("document_id = ?", (document_id,))
+        logger.info("document_deleted", document_id=document_id, chunks_deleted=deleted)
+        return deleted
+
+    def _compact(self) -> None:
+        """Rewrite the vector file without tombstoned rows and renumber metadata."""
+        conn = self._require_open()
+        live_rows = np.flatnonzero(self._live)
+        matrix = self._get_matrix()
+
+        generation = self._compaction_generation + 1
+        tmp_path = self._compact_path(generation)
+        with open(tmp_path, "wb") as f:
+            block = 65536
+            for start in range(0, len(live_rows), block):
+                f.write(np.ascontiguousarray(matrix[live_rows[start : start + block]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self._db_lock:
+            try:
+                with conn:
+                    conn.execute("DELETE FROM chunks WHERE deleted = 1")
+                    # Ascending order: each new row number is free or already vacated
+                    conn.executemany(
+                        "UPDATE chunks SET row = ? WHERE row = ?",
+                        [(new, int(old)) for new, old in enumerate(live_rows) if new != old],
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO store_state (key, value) VALUES ('generation', ?)",
+                        (generation,),
+                    )
+            except BaseException:
+                # Rolled back: the old file still matches the metadata
+                tmp_path.unlink(missing_ok=True)
+                raise
+            # Only swap once the metadata is durable; _open finishes it after a crash
+            os.replace(tmp_path, self._vectors_path)
+
+            self._matrix = None
+            self._rows = len(live_rows)
+            self._source_types = self._source_types[live_rows]
+            self._live = np.ones(self._rows, dtype=bool)
+            self._ivf = None
+            self._compaction_generation = generation
+            self._generation += 1
+        self.compactions += 1
+        logger.info("local_vector_store_compacted", rows=self._rows)
+
+    async def get_stats(self) -> dict[str, Any]:
+        """
+        Get vector store statistics.
+
+        Returns:
+            Dictionary with stats (document count, chunk count, etc.)
+        """
+        conn = self._require_open()
+        with self._db_lock:
+            row = conn.execute(
+                "SELECT COUNT(DISTINCT document_id) AS docs FROM chunks WHERE deleted = 0"
+            ).fetchone()
+        live = int(self._live.sum())
+        return {
+            "store_type": "local",
+            "dimensions": self.dimensions,
+            "num_documents": row["docs"],
+            "num_chunks": live,
+            "tombstones": self._rows - live,
+            "compactions": self.compactions,
+            "index": "ivf" if self._ivf is not None else "flat",
+            "file_bytes": self._rows * self._row_bytes,
+            "path": str(self.path),
+        }
+
+    async def clear_all(self) -> dict[str, int]:
+        """
+        Clear all vector data (use with caution).
+
+        Returns:
+            Dictionary with counts of deleted items
+        """
+        async with self._write_lock:
+            chunks_deleted = int(self._live.sum())
+            await asyncio.to_thread(self._open, True)
+
+        logger.warning("vector_store_cleared", chunks_deleted=chunks_deleted)
+        return {"chunks_deleted": chunks_deleted}
+
+    async def close(self) -> None:
+        """Close the metadata database and release the memory map."""
+        self._matrix = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
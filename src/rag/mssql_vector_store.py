@@ -4,21 +4,257 @@ Uses native VECTOR data type and VECTOR_DISTANCE for similarity search.
 
 This module provides vector storage using SQL Server 2025's native vector
 capabilities, eliminating the need for Redis for vector operations.
+
+Two index modes are supported:
+- exact: VECTOR_DISTANCE scan via the vectors.* stored procedures
+- diskann: approximate nearest-neighbour search with a DiskANN vector index
+  (CREATE VECTOR INDEX / VECTOR_SEARCH), used for unfiltered queries once the
+  corpus is large enough; filtered queries and small corpora stay exact
+
+A table with a vector index is read-only, so writes to document_chunks drop
+the index first (searches stay exact meanwhile). The index is rebuilt once
+writes have been quiet for ``vector_ann_rebuild_delay_seconds``; an
+application lock keeps builds and writes from overlapping across processes.
 """
 
+import asyncio
 import contextlib
 import json
+import random
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from typing import Any
 
 import structlog
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.rag.embedder import OllamaEmbedder
+from src.rag.search_filter import SearchFilter, build_mssql_filter, indexed_metadata_keys
+from src.rag.vector_codec import VectorCodec, get_vector_codec
 from src.rag.vector_store_base import VectorStoreBase
+from src.utils.config import get_settings
+from src.utils.tracing import traced
 
 logger = structlog.get_logger()
 
+INDEX_MODE_EXACT = "exact"
+INDEX_MODE_DISKANN = "diskann"
+
+DISKANN_INDEX_NAME = "vix_document_chunks_embedding"
+
+# sp_getapplock resource serializing index builds (exclusive) with chunk
+# writes (shared) across every process using the database
+INDEX_LOCK_RESOURCE = "vectors.document_chunks:diskann"
+
+# How long a write waits for a running index build to finish
+WRITE_LOCK_TIMEOUT_MS = 10 * 60 * 1000
+
+# Values per IN (...) list, well under SQL Server's 2100-parameter limit
+HASH_LOOKUP_BATCH = 500
+
+# Reciprocal rank fusion constant (matches vectors.HybridSearchDocuments)
+RRF_K = 60
+
+ANN_SEARCH_SQL = """
+    DECLARE @query_vec VECTOR(768) = :embedding;
+    DECLARE @top_n INT = :top_k;
+    SELECT
+        t.id,
+        t.content,
+        t.source,
+        t.source_type,
+        t.document_id,
+        t.chunk_index,
+        t.metadata,
+        s.distance
+    FROM VECTOR_SEARCH(
+        TABLE = vectors.document_chunks AS t,
+        COLUMN = embedding,
+        SIMILAR_TO = @query_vec,
+        METRIC = 'cosine',
+        TOP_N = @top_n
+    ) AS s
+    ORDER BY s.distance
+"""
+
+ANN_HYBRID_SEARCH_SQL = """
+    DECLARE @query_vec VECTOR(768) = :embedding;
+    DECLARE @candidates INT = :candidates;
+    WITH VectorRanked AS (
+        SELECT
+            t.id,
+            s.distance,
+            ROW_NUMBER() OVER (ORDER BY s.distance) AS vector_rank
+        FROM VECTOR_SEARCH(
+            TABLE = vectors.document_chunks AS t,
+            COLUMN = embedding,
+            SIMILAR_TO = @query_vec,
+            METRIC = 'cosine',
+            TOP_N = @candidates
+        ) AS s
+    ),
+    KeywordRanked AS (
+        SELECT
+            ft.[KEY] AS id,
+            ROW_NUMBER() OVER (ORDER BY ft.[RANK] DESC) AS keyword_rank
+        FROM CONTAINSTABLE(vectors.document_chunks, content, :search_text, @candidates) ft
+    ),
+    Fused AS (
+        SELECT
+            COALESCE(v.id, k.id) AS id,
+            v.distance,
+            ISNULL(:alpha / (:rrf_k + v.vector_rank), 0.0)
+                + ISNULL((1.0 - :alpha) / (:rrf_k + k.keyword_rank), 0.0) AS rrf_score,
+            CASE
+                WHEN v.id IS NOT NULL AND k.id IS NOT NULL THEN 'hybrid'
+                WHEN v.id IS NOT NULL THEN 'semantic'
+                ELSE 'keyword'
+            END AS search_type
+        FROM VectorRanked v
+        FULL OUTER JOIN KeywordRanked k ON v.id = k.id
+    )
+    SELECT TOP (:top_k)
+        dc.id,
+        dc.content,
+        dc.source,
+        dc.source_type,
+        dc.document_id,
+        dc.chunk_index,
+        dc.metadata,
+        f.rrf_score,
+        f.distance,
+        f.search_type
+    FROM Fused f
+    JOIN vectors.document_chunks dc ON dc.id = f.id
+    ORDER BY f.rrf_score DESC
+"""
+
+
+def _filtered_search_sql(predicates: str) -> str:
+    """Exact vector search over the rows matching pushed-down predicates."""
+    sql = """
+        DECLARE @query_vec VECTOR(768) = :embedding;
+        SELECT TOP (:top_k)
+            dc.id,
+            dc.content,
+            dc.source,
+            dc.source_type,
+            dc.document_id,
+            dc.chunk_index,
+            dc.metadata,
+            VECTOR_DISTANCE('cosine', dc.embedding, @query_vec) AS distance
+        FROM vectors.document_chunks dc
+        WHERE dc.embedding IS NOT NULL
+    """
+    sql += predicates
+    sql += """
+        ORDER BY distance
+    """
+    return sql
+
+
+def _filtered_hybrid_search_sql(predicates: str) -> str:
+    """Vector + full-text RRF search with predicates applied to both legs."""
+    sql = """
+        DECLARE @query_vec VECTOR(768) = :embedding;
+        WITH VectorRanked AS (
+            SELECT TOP (:candidates)
+                dc.id,
+                VECTOR_DISTANCE('cosine', dc.embedding, @query_vec) AS distance,
+                ROW_NUMBER() OVER (
+                    ORDER BY VECTOR_DISTANCE('cosine', dc.embedding, @query_vec)
+                ) AS vector_rank
+            FROM vectors.document_chunks dc
+            WHERE dc.embedding IS NOT NULL
+    """
+    sql += predicates
+    sql += """
+            ORDER BY distance
+        ),
+        KeywordRanked AS (
+            SELECT TOP (:candidates)
+                dc.id,
+                ROW_NUMBER() OVER (ORDER BY ft.[RANK] DESC) AS keyword_rank
+            FROM CONTAINSTABLE(vectors.document_chunks, content, :search_text) ft
+            JOIN vectors.document_chunks dc ON dc.id = ft.[KEY]
+            WHERE 1 = 1
+    """
+    sql += predicates
+    sql += """
+            ORDER BY ft.[RANK] DESC
+        ),
+        Fused AS (
+            SELECT
+                COALESCE(v.id, k.id) AS id,
+                v.distance,
+                ISNULL(:alpha / (:rrf_k + v.vector_rank), 0.0)
+                    + ISNULL((1.0 - :alpha) / (:rrf_k + k.keyword_rank), 0.0) AS rrf_score,
+                CASE
+                    WHEN v.id IS NOT NULL AND k.id IS NOT NULL THEN 'hybrid'
+                    WHEN v.id IS NOT NULL THEN 'semantic'
+                    ELSE 'keyword'
+                END AS search_type
+            FROM VectorRanked v
+            FULL OUTER JOIN KeywordRanked k ON v.id = k.id
+        )
+        SELECT TOP (:top_k)
+            dc.id,
+            dc.content,
+            dc.source,
+            dc.source_type,
+            dc.document_id,
+            dc.chunk_index,
+            dc.metadata,
+            f.rrf_score,
+            f.distance,
+            f.search_type
+        FROM Fused f
+        JOIN vectors.document_chunks dc ON dc.id = f.id
+        ORDER BY f.rrf_score DESC
+    """
+    return sql
+
+
+def _scope_predicates(
+    source_type: str | None,
+    document_id: int | None,
+    filters: SearchFilter | None,
+) -> tuple[str, dict[str, Any]]:
+    """Build the WHERE fragment and parameters for a filtered search."""
+    predicates, params = build_mssql_filter(filters)
+    if source_type is not None:
+        predicates += " AND dc.source_type = :source_type"
+        params["source_type"] = source_type
+    if document_id is not None:
+        predicates += " AND dc.document_id = :document_id"
+        params["document_id"] = document_id
+    return predicates, params
+
+
+@dataclass
+class SearchLatency:
+    """Latency counters for one search path."""
+
+    queries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        """Record one query latency."""
+        self.queries += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "queries": self.queries,
+            "avg_ms": round(self.total_ms / self.queries, 2) if self.queries else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
 
 class MSSQLVectorStore(VectorStoreBase):
     """Vector store using SQL Server 2025 native VECTOR type."""
@@ -28,6 +264,11 @@ class MSSQLVectorStore(VectorStoreBase):
         session_factory: async_sessionmaker[AsyncSession],
         embedder: OllamaEmbedder,
         dimensions: int = 768,  # nomic-embed-text default
+        index_mode: str | None = None,
+        ann_min_rows: int | None = None,
+        recall_sample_rate: float | None = None,
+        codec: VectorCodec | None = None,
+        ann_rebuild_delay_seconds: float | None = None,
     ):
         """
         Initialize the SQL Server vector store.
@@ -36,9 +277,45 @@ class MSSQLVectorStore(VectorStoreBase):
             session_factory: SQLAlchemy async session factory
             embedder: Ollama embedder for generating vectors
             dimensions: Embedding dimensions (default: 768 for nomic-embed-text)
+            index_mode: 'exact' or 'diskann' (default from settings)
+            ann_min_rows: Minimum chunk count before a DiskANN index is built
+            recall_sample_rate: Fraction of ANN queries re-run exactly to measure recall
+            codec: Vector codec for query/insert literals (default from settings)
+            ann_rebuild_delay_seconds: Quiet period after writes before the index is rebuilt
         """
         super().__init__(embedder=embedder, dimensions=dimensions)
+        settings = get_settings()
         self._session_factory = session_factory
+        self._codec = codec or get_vector_codec()
+        self.index_mode = (index_mode or settings.vector_index_mode).lower()
+        if self.index_mode not in (INDEX_MODE_EXACT, INDEX_MODE_DISKANN):
+            raise ValueError(
+                f"Invalid vector index mode: {self.index_mode}. Supported modes: 'exact', 'diskann'"
+            )
+        self.ann_min_rows = settings.vector_ann_min_rows if ann_min_rows is None else ann_min_rows
+        self.recall_sample_rate = (
+            settings.vector_ann_recall_sample_rate
+            if recall_sample_rate is None
+            else recall_sample_rate
+        )
+        self.ann_rebuild_delay_seconds = (
+            settings.vector_ann_rebuild_delay_seconds
+            if ann_rebuild_delay_seconds is None
+            else ann_rebuild_delay_seconds
+        )
+        self._candidate_count = settings.rag_candidate_count
+        self._ann_ready = False
+        # Index dropped for writes and not yet rebuilt
+        self._index_stale = False
+        self._writes_in_flight = 0
+        self._refresh_task: asyncio.Task | None = None
+        self._rebuilding = False
+
+        # Metrics
+        self._latency = {"exact": SearchLatency(), "ann": SearchLatency()}
+        self._recall_samples = 0
+        self._recall_total = 0.0
+        self._recall_tasks: set[asyncio.Task] = set()
 
     async def create_index(self, overwrite: bool = False) -> None:
         """
@@ -70,9 +347,307 @@ class MSSQLVectorStore(VectorStoreBase):
                 )
                 raise RuntimeError("Vector tables not found. Run init-backend scripts first.")
 
-    def _embedding_to_json(self, embedding: list[float]) -> str:
-        """Convert embedding list to JSON array string for SQL Server."""
-        return json.dumps(embedding)
+        await self.ensure_filter_indexes()
+        await self.ensure_content_hash_column()
+        if self.index_mode == INDEX_MODE_DISKANN:
+            await self.ensure_vector_index(rebuild=overwrite)
+
+    async def ensure_filter_indexes(self) -> None:
+        """
+        Create the indexes that filtered searches seek on.
+
+        Adds an index on created_at and, for each configured metadata key, a
+        computed column ``meta_<key> AS JSON_VALUE(metadata, '$.<key>')`` with
+        an index. SQL Server matches ``JSON_VALUE(metadata, '$.<key>')``
+        predicates to the computed column, so metadata filters become seeks.
+        """
+        statements = [
+            """
+            IF NOT EXISTS (SELECT 1 FROM sys.indexes
+                           WHERE name = 'ix_document_chunks_created_at'
+                           AND object_id = OBJECT_ID('vectors.document_chunks'))
+                CREATE INDEX ix_document_chunks_created_at
+                ON vectors.document_chunks(created_at)
+            """
+        ]
+        for key in indexed_metadata_keys():
+            statements.append(f"""
+                IF COL_LENGTH('vectors.document_chunks', 'meta_{key}') IS NULL
+                    ALTER TABLE vectors.document_chunks
+                    ADD meta_{key} AS JSON_VALUE(metadata, '$.{key}')
+            """)
+            statements.append(f"""
+                IF NOT EXISTS (SELECT 1 FROM sys.indexes
+                               WHERE name = 'ix_document_chunks_meta_{key}'
+                               AND object_id = OBJECT_ID('vectors.document_chunks'))
+                    CREATE INDEX ix_document_chunks_meta_{key}
+                    ON vectors.document_chunks(meta_{key})
+            """)
+
+        await self._execute_optional_ddl(statements, "filter_index_unavailable")
+
+    async def ensure_content_hash_column(self) -> None:
+        """
+        Add the indexed ``content_hash`` column used to reuse chunk embeddings.
+
+        Rows written before the column existed keep a NULL hash; they are
+        hashed from their content when their document is next re-ingested.
+        """
+        await self._execute_optional_ddl(
+            [
+                """
+                IF COL_LENGTH('vectors.document_chunks', 'content_hash') IS NULL
+                    ALTER TABLE vectors.document_chunks ADD content_hash CHAR(64) NULL
+                """,
+                """
+                IF NOT EXISTS (SELECT 1 FROM sys.indexes
+                               WHERE name = 'ix_document_chunks_content_hash'
+                               AND object_id = OBJECT_ID('vectors.document_chunks'))
+                    CREATE INDEX ix_document_chunks_content_hash
+                    ON vectors.document_chunks(content_hash)
+                """,
+            ],
+            "content_hash_column_unavailable",
+        )
+
+    async def _execute_optional_ddl(self, statements: list[str], failure_event: str) -> None:
+        """Run DDL statements one by one, logging (not raising) failures."""
+        async with self._session_factory() as session:
+            for statement in statements:
+                try:
+                    await session.execute(text(statement))
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    logger.warning(failure_event, error=str(e))
+
+    async def ensure_vector_index(self, rebuild: bool = False) -> bool:
+        """
+        Create (or rebuild) the DiskANN vector index when the corpus is large enough.
+
+        Below ``ann_min_rows`` chunks exact search is both fast and exact, so no
+        index is built. Call with ``rebuild=True`` after bulk loads so new rows
+        are covered by the graph.
+
+        The build holds the index lock exclusively, so it never overlaps a
+        write from any process. If writes hold the lock the build is skipped
+        and the index stays stale, to be retried once they finish.
+
+        Args:
+            rebuild: Drop and recreate an existing index
+
+        Returns:
+            True if ANN search is available
+        """
+        chunk_count = None
+        async with self._session_factory() as session:
+            try:
+                # Transaction-owned: released by the commit or rollback below
+                granted = await self._get_index_lock(
+                    session, "Exclusive", "Transaction", timeout_ms=0
+                )
+                if not granted:
+                    await session.rollback()
+                    self._ann_ready = False
+                    self._index_stale = True
+                    logger.info("diskann_index_busy", message="Writes in progress")
+                    self._schedule_refresh()
+                    return False
+
+                result = await session.execute(
+                    text("""
+                        SELECT
+                            (SELECT COUNT(*) FROM vectors.document_chunks) AS chunk_count,
+                            (SELECT COUNT(*) FROM sys.indexes
+                             WHERE name = :index_name
+                             AND object_id = OBJECT_ID('vectors.document_chunks')) AS index_count
+                    """),
+                    {"index_name": DISKANN_INDEX_NAME},
+                )
+                row = result.fetchone()
+                chunk_count = row.chunk_count if row else 0
+                index_exists = bool(row and row.index_count)
+
+                if index_exists and rebuild:
+                    await session.execute(
+                        text(f"DROP INDEX {DISKANN_INDEX_NAME} ON vectors.document_chunks")
+                    )
+                    index_exists = False
+
+                if not index_exists and chunk_count >= self.ann_min_rows:
+                    start = time.perf_counter()
+                    await session.execute(
+                        text(f"""
+                            CREATE VECTOR INDEX {DISKANN_INDEX_NAME}
+                            ON vectors.document_chunks(embedding)
+                            WITH (METRIC = 'cosine', TYPE = 'diskann')
+                        """)
+                    )
+                    index_exists = True
+                    logger.info(
+                        "diskann_index_created",
+                        chunks=chunk_count,
+                        duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                    )
+
+                await session.commit()
+                # Up to date: built, already present, or not needed yet
+                self._index_stale = False
+            except Exception as e:
+                await session.rollback()
+                logger.warning("diskann_index_unavailable", error=str(e))
+                index_exists = False
+
+        self._ann_ready = index_exists
+        logger.info(
+            "vector_index_mode",
+            mode=self.index_mode,
+            ann_ready=self._ann_ready,
+            chunks=chunk_count,
+            ann_min_rows=self.ann_min_rows,
+        )
+        return self._ann_ready
+
+    async def refresh_vector_index(self) -> bool:
+        """
+        Rebuild the DiskANN index after it was dropped for writes.
+
+        Does nothing while this process still has writes in flight or when
+        no index was dropped, so it is cheap to call whenever ingestion goes
+        idle. Writes also schedule it themselves (see ``_chunk_writes``).
+
+        Returns:
+            True if ANN search is available
+        """
+        if self.index_mode != INDEX_MODE_DISKANN or not self._index_stale:
+            return self._ann_ready
+        if self._writes_in_flight:
+            return False
+        return await self.ensure_vector_index()
+
+    def _schedule_refresh(self) -> None:
+        """(Re)start the debounced index rebuild."""
+        if self.index_mode != INDEX_MODE_DISKANN:
+            return
+        task = self._refresh_task
+        if task is not None and not task.done():
+            if self._rebuilding:
+                # The running rebuild re-checks for staleness when it finishes
+                return
+            task.cancel()
+        self._refresh_task = asyncio.create_task(self._refresh_after_delay())
+
+    async def _refresh_after_delay(self) -> None:
+        """Rebuild once writes have been quiet for ``ann_rebuild_delay_seconds``."""
+        await asyncio.sleep(self.ann_rebuild_delay_seconds)
+        self._rebuilding = True
+        try:
+            await self.refresh_vector_index()
+        except Exception as e:
+            logger.warning("diskann_index_refresh_failed", error=str(e))
+        finally:
+            self._rebuilding = False
+        # Busy (writes in another process) or failed: try again later. Local
+        # writes still in flight schedule a refresh when they finish.
+        if self._index_stale and not self._writes_in_flight:
+            self._refresh_task = asyncio.create_task(self._refresh_after_delay())
+
+    @contextlib.asynccontextmanager
+    async def _chunk_writes(self) -> AsyncIterator[None]:
+        """
+        Make vectors.document_chunks writable for the duration of a write.
+
+        Holds the index lock in shared mode, so writes from every process run
+        concurrently with each other but never with an index build, and drops
+        the DiskANN index if one exists. Searches use exact distance until
+        the rebuild scheduled when the last write finishes.
+        """
+        if self.index_mode != INDEX_MODE_DISKANN:
+            yield
+            return
+
+        self._writes_in_flight += 1
+        try:
+            async with self._session_factory() as lock_session:
+                # Session-owned: held across the write's own sessions and commits
+                if not await self._get_index_lock(
+                    lock_session, "Shared", "Session", timeout_ms=WRITE_LOCK_TIMEOUT_MS
+                ):
+                    raise RuntimeError("Timed out waiting for the vector index build to finish")
+                try:
+                    await self._drop_vector_index()
+                    yield
+                finally:
+                    await lock_session.execute(
+                        text(
+                            "EXEC sp_releaseapplock @Resource = :resource, @LockOwner = 'Session'"
+                        ),
+                        {"resource": INDEX_LOCK_RESOURCE},
+                    )
+        finally:
+            self._writes_in_flight -= 1
+            if not self._writes_in_flight:
+                self._schedule_refresh()
+
+    @staticmethod
+    async def _get_index_lock(
+        session: AsyncSession, mode: str, owner: str, timeout_ms: int
+    ) -> bool:
+        """Acquire the application lock that serializes index builds and writes."""
+        result = await session.execute(
+            text("""
+                DECLARE @result INT;
+                EXEC @result = sp_getapplock
+                    @Resource = :resource,
+                    @LockMode = :mode,
+                    @LockOwner = :owner,
+                    @LockTimeout = :timeout_ms;
+                SELECT @result AS result
+            """),
+            {
+                "resource": INDEX_LOCK_RESOURCE,
+                "mode": mode,
+                "owner": owner,
+                "timeout_ms": timeout_ms,
+            },
+        )
+        # 0 = granted, 1 = granted after waiting, < 0 = timeout/deadlock/error
+        return result.scalar() >= 0
+
+    async def _drop_vector_index(self) -> None:
+        """Drop the DiskANN index so the chunk table accepts writes."""
+        was_ready = self._ann_ready
+        self._ann_ready = False
+        self._index_stale = True
+        async with self._session_factory() as session:
+            # Concurrent writers may race to drop it: "does not exist" (3701) is fine
+            await session.execute(
+                text(f"""
+                    IF EXISTS (SELECT 1 FROM sys.indexes
+                               WHERE name = '{DISKANN_INDEX_NAME}'
+                               AND object_id = OBJECT_ID('vectors.document_chunks'))
+                    BEGIN TRY
+                        DROP INDEX {DISKANN_INDEX_NAME} ON vectors.document_chunks
+                    END TRY
+                    BEGIN CATCH
+                        IF ERROR_NUMBER() <> 3701 THROW;
+                    END CATCH
+                """)
+            )
+            await session.commit()
+        if was_ready:
+            logger.info("diskann_index_dropped_for_writes")
+
+    def _mark_ann_unavailable(self) -> None:
+        """Use exact search until the index is verified (e.g. another process dropped it)."""
+        self._ann_ready = False
+        if not self._index_stale:
+            self._index_stale = True
+            self._schedule_refresh()
+
+    def _use_ann(self, filtered: bool) -> bool:
+        """Whether a query should use the DiskANN index."""
+        return self.index_mode == INDEX_MODE_DISKANN and self._ann_ready and not filtered
 
     async def add_document(
         self,
@@ -81,6 +656,8 @@ class MSSQLVectorStore(VectorStoreBase):
         source: str,
         source_type: str = "document",
         metadata: dict[str, Any] | None = None,
+        start_index: int = 0,
+        embeddings: list[list[float]] | None = None,
     ) -> None:
         """
         Add document chunks to the vector store.
@@ -91,6 +668,8 @@ class MSSQLVectorStore(VectorStoreBase):
             source: Source name (e.g., filename)
             source_type: Type of source ('document', 'schema')
             metadata: Optional metadata dictionary
+            start_index: Chunk index of the first chunk
+            embeddings: Precomputed chunk embeddings
         """
         logger.info(
             "adding_document",
@@ -98,13 +677,14 @@ class MSSQLVectorStore(VectorStoreBase):
             chunk_count=len(chunks),
         )
 
-        # Generate embeddings in batch
-        embeddings = await self.embedder.embed_batch(chunks)
+        # Generate embeddings in batch, reusing those of chunks already stored
+        if embeddings is None:
+            embeddings = await self.embed_chunks(chunks)
 
-        async with self._session_factory() as session:
+        async with self._chunk_writes(), self._session_factory() as session:
             # Insert chunks with embeddings
             for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True)):
-                embedding_json = self._embedding_to_json(embedding)
+                embedding_json = self._codec.to_sql(embedding)
                 metadata_json = json.dumps(metadata or {})
 
                 # Use DECLARE to properly convert JSON to VECTOR type
@@ -112,14 +692,17 @@ class MSSQLVectorStore(VectorStoreBase):
                     text("""
                         DECLARE @vec VECTOR(768) = :embedding;
                         INSERT INTO vectors.document_chunks
-                        (document_id, chunk_index, content, source, source_type, metadata, embedding)
+                        (document_id, chunk_index, content, content_hash, source, source_type,
+                         metadata, embedding)
                         VALUES
-                        (:doc_id, :chunk_idx, :content, :source, :source_type, :metadata, @vec)
+                        (:doc_id, :chunk_idx, :content, :content_hash, :source, :source_type,
+                         :metadata, @vec)
                     """),
                     {
                         "doc_id": int(document_id),
-                        "chunk_idx": i,
+                        "chunk_idx": start_index + i,
                         "content": chunk,
+                        "content_hash": self.chunk_hash(chunk),
                         "source": source,
                         "source_type": source_type,
                         "metadata": metadata_json,
@@ -135,12 +718,14 @@ class MSSQLVectorStore(VectorStoreBase):
             chunks_added=len(chunks),
         )
 
+    @traced("rag.vector_search")
     async def search(
         self,
         query: str,
         top_k: int = 5,
         source_type: str | None = None,
         document_id: int | None = None,
+        filters: SearchFilter | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for similar documents using cosine distance.
@@ -150,37 +735,40 @@ class MSSQLVectorStore(VectorStoreBase):
             top_k: Number of results to return
             source_type: Filter by source type
             document_id: Filter by specific document
+            filters: Tag, date range and metadata filters
 
         Returns:
             List of matching documents with scores
         """
         # Generate query embedding
         query_embedding = await self.embedder.embed(query)
-        embedding_json = self._embedding_to_json(query_embedding)
+        embedding_json = self._codec.to_sql(query_embedding)
 
-        async with self._session_factory() as session:
-            # Use the stored procedure for optimized search
-            # Note: We pass the JSON array string directly - SQL Server will convert it to VECTOR
-            result = await session.execute(
-                text("""
-                    DECLARE @query_vec VECTOR(768) = :embedding;
-                    EXEC vectors.SearchDocuments
-                        @query_vector = @query_vec,
-                        @top_n = :top_k,
-                        @source_type = :source_type,
-                        @document_id = :document_id
-                """),
-                {
-                    "embedding": embedding_json,
-                    "top_k": top_k,
-                    "source_type": source_type,
-                    "document_id": document_id,
-                },
+        if filters is not None and not filters.is_empty():
+            rows = await self._filtered_search_rows(
+                embedding_json, top_k, source_type, document_id, filters
             )
+            return self._format_search_rows(rows)
 
-            rows = result.fetchall()
+        filtered = source_type is not None or document_id is not None
+        rows = None
+        if self._use_ann(filtered):
+            try:
+                rows = await self._ann_search_rows(embedding_json, top_k)
+                self._maybe_sample_recall(embedding_json, top_k, rows)
+            except Exception as e:
+                # Index dropped or unusable: stay on exact search until rebuilt
+                self._mark_ann_unavailable()
+                logger.warning("ann_search_fallback", error=str(e))
 
-        # Format results
+        if rows is None:
+            rows = await self._exact_search_rows(embedding_json, top_k, source_type, document_id)
+
+        return self._format_search_rows(rows)
+
+    @staticmethod
+    def _format_search_rows(rows: list[Any]) -> list[dict[str, Any]]:
+        """Format vector search rows as result dicts."""
         formatted = []
         for row in rows:
             metadata = {}
@@ -203,6 +791,92 @@ class MSSQLVectorStore(VectorStoreBase):
 
         return formatted
 
+    async def _exact_search_rows(
+        self,
+        embedding_json: str,
+        top_k: int,
+        source_type: str | None = None,
+        document_id: int | None = None,
+    ) -> list[Any]:
+        """Run exact VECTOR_DISTANCE search through the stored procedure."""
+        start = time.perf_counter()
+        async with self._session_factory() as session:
+            # Note: We pass the JSON array string directly - SQL Server will convert it to VECTOR
+            result = await session.execute(
+                text("""
+                    DECLARE @query_vec VECTOR(768) = :embedding;
+                    EXEC vectors.SearchDocuments
+                        @query_vector = @query_vec,
+                        @top_n = :top_k,
+                        @source_type = :source_type,
+                        @document_id = :document_id
+                """),
+                {
+                    "embedding": embedding_json,
+                    "top_k": top_k,
+                    "source_type": source_type,
+                    "document_id": document_id,
+                },
+            )
+            rows = result.fetchall()
+        self._latency["exact"].record((time.perf_counter() - start) * 1000)
+        return rows
+
+    async def _filtered_search_rows(
+        self,
+        embedding_json: str,
+        top_k: int,
+        source_type: str | None,
+        document_id: int | None,
+        filters: SearchFilter,
+    ) -> list[Any]:
+        """Run exact vector search restricted by pushed-down filter predicates."""
+        predicates, params = _scope_predicates(source_type, document_id, filters)
+        start = time.perf_counter()
+        async with self._session_factory() as session:
+            result = await session.execute(
+                text(_filtered_search_sql(predicates)),
+                {"embedding": embedding_json, "top_k": top_k, **params},
+            )
+            rows = result.fetchall()
+        self._latency["exact"].record((time.perf_counter() - start) * 1000)
+        return rows
+
+    async def _ann_search_rows(self, embedding_json: str, top_k: int) -> list[Any]:
+        """Run approximate search against the DiskANN index."""
+        start = time.perf_counter()
+        async with self._session_factory() as session:
+            result = await session.execute(
+                text(ANN_SEARCH_SQL),
+                {"embedding": embedding_json, "top_k": top_k},
+            )
+            rows = result.fetchall()
+        self._latency["ann"].record((time.perf_counter() - start) * 1000)
+        return rows
+
+    def _maybe_sample_recall(self, embedding_json: str, top_k: int, ann_rows: list[Any]) -> None:
+        """Re-run a sampled ANN query exactly in the background to measure recall."""
+        if self.recall_sample_rate <= 0 or random.random() >= self.recall_sample_rate:
+            return
+
+        ann_ids = {row.id for row in ann_rows}
+
+        async def measure() -> None:
+            try:
+                exact_rows = await self._exact_search_rows(embedding_json, top_k)
+            except Exception as e:
+                logger.warning("ann_recall_sample_failed", error=str(e))
+                return
+            exact_ids = {row.id for row in exact_rows}
+            if exact_ids:
+                self._recall_samples += 1
+                self._recall_total += len(ann_ids & exact_ids) / len(exact_ids)
+
+        task = asyncio.create_task(measure())
+        self._recall_tasks.add(task)
+        task.add_done_callback(self._recall_tasks.discard)
+
+    @traced("rag.hybrid_search")
     async def hybrid_search(
         self,
         query: str,
@@ -210,6 +884,7 @@ class MSSQLVectorStore(VectorStoreBase):
         source_type: str | None = None,
         document_id: int | None = None,
         alpha: float = 0.5,
+        filters: SearchFilter | None = None,
     ) -> list[dict[str, Any]]:
         """
         Hybrid search combining semantic (vector) and keyword (full-text) search.
@@ -222,17 +897,68 @@ class MSSQLVectorStore(VectorStoreBase):
             source_type: Filter by source type
             document_id: Filter by specific document
             alpha: Weight for semantic search (0.0 = keyword only, 1.0 = semantic only)
+            filters: Tag, date range and metadata filters
 
         Returns:
             List of matching documents with combined RRF scores
         """
         # Generate query embedding
         query_embedding = await self.embedder.embed(query)
-        embedding_json = self._embedding_to_json(query_embedding)
+        embedding_json = self._codec.to_sql(query_embedding)
 
         # Prepare search text for full-text search
         search_text = self._prepare_search_text(query)
 
+        if filters is not None and not filters.is_empty():
+            predicates, params = _scope_predicates(source_type, document_id, filters)
+            try:
+                start = time.perf_counter()
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        text(_filtered_hybrid_search_sql(predicates)),
+                        {
+                            "embedding": embedding_json,
+                            "search_text": search_text,
+                            "candidates": max(self._candidate_count, top_k),
+                            "alpha": alpha,
+                            "rrf_k": RRF_K,
+                            "top_k": top_k,
+                            **params,
+                        },
+                    )
+                    rows = result.fetchall()
+                self._latency["exact"].record((time.perf_counter() - start) * 1000)
+                return self._format_hybrid_rows(rows)
+            except Exception as e:
+                logger.warning(
+                    "hybrid_search_fallback",
+                    error=str(e),
+                    message="Falling back to semantic search",
+                )
+                return await self.search(query, top_k, source_type, document_id, filters)
+
+        if self._use_ann(source_type is not None or document_id is not None):
+            try:
+                start = time.perf_counter()
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        text(ANN_HYBRID_SEARCH_SQL),
+                        {
+                            "embedding": embedding_json,
+                            "search_text": search_text,
+                            "candidates": max(self._candidate_count, top_k),
+                            "alpha": alpha,
+                            "rrf_k": RRF_K,
+                            "top_k": top_k,
+                        },
+                    )
+                    rows = result.fetchall()
+                self._latency["ann"].record((time.perf_counter() - start) * 1000)
+                return self._format_hybrid_rows(rows)
+            except Exception as e:
+                self._mark_ann_unavailable()
+                logger.warning("ann_hybrid_search_fallback", error=str(e))
+
         async with self._session_factory() as session:
             try:
                 # Use the hybrid search stored procedure
@@ -268,7 +994,11 @@ class MSSQLVectorStore(VectorStoreBase):
                 )
                 return await self.search(query, top_k, source_type, document_id)
 
-        # Format results
+        return self._format_hybrid_rows(rows)
+
+    @staticmethod
+    def _format_hybrid_rows(rows: list[Any]) -> list[dict[str, Any]]:
+        """Format hybrid search rows as result dicts."""
         formatted = []
         for row in rows:
             metadata = {}
@@ -343,7 +1073,7 @@ class MSSQLVectorStore(VectorStoreBase):
         """
         # Generate query embedding
         query_embedding = await self.embedder.embed(query)
-        embedding_json = self._embedding_to_json(query_embedding)
+        embedding_json = self._codec.to_sql(query_embedding)
 
         async with self._session_factory() as session:
             # Use DECLARE to properly convert JSON to VECTOR type
@@ -403,7 +1133,7 @@ class MSSQLVectorStore(VectorStoreBase):
         """
         # Generate embedding for the description
         embedding = await self.embedder.embed(description)
-        embedding_json = self._embedding_to_json(embedding)
+        embedding_json = self._codec.to_sql(embedding)
 
         async with self._session_factory() as session:
             # Upsert: delete existing and insert new
@@ -450,6 +1180,111 @@ class MSSQLVectorStore(VectorStoreBase):
             object_name=object_name,
         )
 
+    async def delete_chunks_from(self, document_id: str, start_index: int) -> int:
+        """
+        Delete a document's chunks from a chunk index onwards.
+
+        Args:
+            document_id: Document ID
+            start_index: First chunk index to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        async with self._chunk_writes(), self._session_factory() as session:
+            result = await session.execute(
+                text("""
+                    DELETE FROM vectors.document_chunks
+                    WHERE document_id = :doc_id AND chunk_index >= :start_index
+                """),
+                {"doc_id": int(document_id), "start_index": start_index},
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def delete_chunks(self, document_id: str, chunk_indexes: list[int]) -> int:
+        """
+        Delete specific chunks of a document.
+
+        Args:
+            document_id: Document ID
+            chunk_indexes: Chunk indexes to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        deleted = 0
+        async with self._chunk_writes(), self._session_factory() as session:
+            for start in range(0, len(chunk_indexes), HASH_LOOKUP_BATCH):
+                batch = chunk_indexes[start : start + HASH_LOOKUP_BATCH]
+                result = await session.execute(
+                    text("""
+                        DELETE FROM vectors.document_chunks
+                        WHERE document_id = :doc_id AND chunk_index IN :chunk_indexes
+                    """).bindparams(bindparam("chunk_indexes", expanding=True)),
+                    {"doc_id": int(document_id), "chunk_indexes": batch},
+                )
+                deleted += result.rowcount
+            await session.commit()
+        return deleted
+
+    async def get_chunk_hashes(self, document_id: str) -> dict[int, str]:
+        """
+        Get the content hash of each stored chunk of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Mapping of chunk index to content hash
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                text("""
+                    SELECT chunk_index, content_hash
+                    FROM vectors.document_chunks
+                    WHERE document_id = :doc_id
+                """),
+                {"doc_id": int(document_id)},
+            )
+            rows = result.fetchall()
+        # Chunks written before hashes were recorded have no known model: never unchanged
+        return {row.chunk_index: row.content_hash or "" for row in rows}
+
+    async def get_embeddings_by_hash(self, hashes: list[str]) -> dict[str, list[float]]:
+        """
+        Look up stored embeddings by chunk content hash.
+
+        Args:
+            hashes: Chunk content hashes
+
+        Returns:
+            Embedding for each hash found in the corpus
+        """
+        found: dict[str, list[float]] = {}
+        async with self._session_factory() as session:
+            for start in range(0, len(hashes), HASH_LOOKUP_BATCH):
+                batch = hashes[start : start + HASH_LOOKUP_BATCH]
+                result = await session.execute(
+                    text("""
+                        SELECT content_hash, embedding_json
+                        FROM (
+                            SELECT content_hash,
+                                   CAST(embedding AS NVARCHAR(MAX)) AS embedding_json,
+                                   ROW_NUMBER() OVER (
+                                       PARTITION BY content_hash ORDER BY id
+                                   ) AS rn
+                            FROM vectors.document_chunks
+                            WHERE content_hash IN :hashes
+                        ) AS matches
+                        WHERE rn = 1
+                    """).bindparams(bindparam("hashes", expanding=True)),
+                    {"hashes": batch},
+                )
+                for row in result.fetchall():
+                    found[row.content_hash] = json.loads(row.embedding_json)
+        return found
+
     async def delete_document(self, document_id: str) -> int:
         """
         Delete all chunks for a document.
@@ -460,7 +1295,7 @@ class MSSQLVectorStore(VectorStoreBase):
         Returns:
             Number of chunks deleted
         """
-        async with self._session_factory() as session:
+        async with self._chunk_writes(), self._session_factory() as session:
             result = await session.execute(
                 text("""
                     DELETE FROM vectors.document_chunks
@@ -514,6 +1349,7 @@ class MSSQLVectorStore(VectorStoreBase):
                     "num_documents": doc_count,
                     "num_chunks": chunk_count,
                     "num_schema_embeddings": schema_count,
+                    **self.get_search_stats(),
                 }
             except Exception as e:
                 logger.warning("stats_fetch_error", error=str(e))
@@ -522,6 +1358,27 @@ class MSSQLVectorStore(VectorStoreBase):
                     "error": str(e),
                 }
 
+    def get_search_stats(self) -> dict[str, Any]:
+        """
+        Get index mode, search latency and sampled ANN recall.
+
+        Returns:
+            Dictionary of search statistics
+        """
+        return {
+            "index_mode": self.index_mode,
+            "ann_index_ready": self._ann_ready,
+            "search_latency": {mode: stats.to_dict() for mode, stats in self._latency.items()},
+            "ann_recall": {
+                "samples": self._recall_samples,
+                "mean_recall": (
+                    round(self._recall_total / self._recall_samples, 4)
+                    if self._recall_samples
+                    else None
+                ),
+            },
+        }
+
     async def clear_all(self) -> dict[str, int]:
         """
         Clear all vector data (use with caution).
@@ -529,7 +1386,7 @@ class MSSQLVectorStore(VectorStoreBase):
         Returns:
             Dictionary with counts of deleted items
         """
-        async with self._session_factory() as session:
+        async with self._chunk_writes(), self._session_factory() as session:
             # Delete all document chunks
             chunk_result = await session.execute(text("DELETE FROM vectors.document_chunks"))
             chunks_deleted = chunk_result.rowcount
@@ -8,20 +8,85 @@ Vector store using Redis Stack with vector similarity search.
 import contextlib
 import hashlib
 import json
+import time
 from typing import Any
 
-import numpy as np
 import structlog
 from redis.asyncio import Redis
+from redis.client import NEVER_DECODE
 from redisvl.index import AsyncSearchIndex
 from redisvl.query import VectorQuery
 from redisvl.schema import IndexSchema
 
 from src.rag.embedder import OllamaEmbedder
+from src.rag.search_filter import (
+    SearchFilter,
+    build_redis_filter,
+    indexed_metadata_keys,
+    metadata_value_text,
+)
+from src.rag.vector_codec import VectorCodec, get_vector_codec
 from src.rag.vector_store_base import VectorStoreBase
+from src.utils.tracing import traced
 
 logger = structlog.get_logger()
 
+# Content hashes per TAG query when looking up reusable embeddings
+HASH_LOOKUP_BATCH = 100
+
+
+def fuse_rankings(
+    vector_ranks: dict[str, dict[str, Any]],
+    keyword_ranks: dict[str, dict[str, Any]],
+    alpha: float,
+    top_k: int,
+    rrf_k: int = 60,
+) -> list[dict[str, Any]]:
+    """
+    Combine vector and keyword rankings with weighted Reciprocal Rank Fusion.
+
+    Args:
+        vector_ranks: Vector leg results keyed by chunk id ({"rank", "data", "distance"})
+        keyword_ranks: Keyword leg results keyed by chunk id ({"rank", "data"})
+        alpha: Weight for the vector leg (keyword leg gets 1 - alpha)
+        top_k: Number of results to keep
+        rrf_k: RRF constant
+
+    Returns:
+        Top results ({"doc_id", "rrf_score", "data", "distance"}), best first
+    """
+    all_doc_ids = set(vector_ranks.keys()) | set(keyword_ranks.keys())
+
+    combined_scores = []
+    for doc_id in all_doc_ids:
+        vector_score = 0.0
+        keyword_score = 0.0
+        data = None
+
+        if doc_id in vector_ranks:
+            vector_score = 1.0 / (rrf_k + vector_ranks[doc_id]["rank"])
+            data = vector_ranks[doc_id]["data"]
+
+        if doc_id in keyword_ranks:
+            keyword_score = 1.0 / (rrf_k + keyword_ranks[doc_id]["rank"])
+            if data is None:
+                data = keyword_ranks[doc_id]["data"]
+
+        rrf_score = alpha * vector_score + (1 - alpha) * keyword_score
+
+        combined_scores.append(
+            {
+                "doc_id": doc_id,
+                "rrf_score": rrf_score,
+                "data": data,
+                "distance": vector_ranks.get(doc_id, {}).get("distance", 0),
+            }
+        )
+
+    # Sort by RRF score (higher is better)
+    combined_scores.sort(key=lambda x: x["rrf_score"], reverse=True)
+    return combined_scores[:top_k]
+
 
 class RedisVectorStore(VectorStoreBase):
     """Vector store using Redis Stack."""
@@ -34,6 +99,7 @@ class RedisVectorStore(VectorStoreBase):
         redis_client: Redis,
         embedder: OllamaEmbedder,
         dimensions: int = 768,  # nomic-embed-text default
+        codec: VectorCodec | None = None,
     ):
         """
         Initialize the Redis vector store.
@@ -42,9 +108,11 @@ class RedisVectorStore(VectorStoreBase):
             redis_client: Async Redis client
             embedder: Ollama embedder for generating vectors
             dimensions: Embedding dimensions (default: 768 for nomic-embed-text)
+            codec: Vector codec for stored/query vectors (default from settings)
         """
         super().__init__(embedder=embedder, dimensions=dimensions)
         self.redis = redis_client
+        self._codec = codec or get_vector_codec()
         self._index: AsyncSearchIndex | None = None
 
     def _get_schema(self) -> dict:
@@ -61,13 +129,17 @@ class RedisVectorStore(VectorStoreBase):
                 {"name": "document_id", "type": "tag"},
                 {"name": "chunk_index", "type": "numeric"},
                 {"name": "metadata", "type": "text"},
+                {"name": "tags", "type": "tag"},
+                {"name": "created_at", "type": "numeric"},
+                {"name": "content_hash", "type": "tag"},
+                *({"name": f"meta_{key}", "type": "tag"} for key in indexed_metadata_keys()),
                 {
                     "name": "embedding",
                     "type": "vector",
                     "attrs": {
                         "dims": self.dimensions,
                         "algorithm": "hnsw",
-                        "datatype": "float32",
+                        "datatype": self._codec.encoding.value,
                         "distance_metric": "cosine",
                     },
                 },
@@ -104,6 +176,8 @@ class RedisVectorStore(VectorStoreBase):
         source: str,
         source_type: str = "document",
         metadata: dict[str, Any] | None = None,
+        start_index: int = 0,
+        embeddings: list[list[float]] | None = None,
     ) -> None:
         """
         Add document chunks to the vector store.
@@ -114,6 +188,8 @@ class RedisVectorStore(VectorStoreBase):
             source: Source name (e.g., filename)
             source_type: Type of source ('document', 'schema')
             metadata: Optional metadata dictionary
+            start_index: Chunk index of the first chunk
+            embeddings: Precomputed chunk embeddings
         """
         logger.info(
             "adding_document",
@@ -121,14 +197,24 @@ class RedisVectorStore(VectorStoreBase):
             chunk_count=len(chunks),
         )
 
-        # Generate embeddings
-        embeddings = await self.embedder.embed_batch(chunks)
+        # Generate embeddings, reusing those of chunks already stored
+        if embeddings is None:
+            embeddings = await self.embed_chunks(chunks)
 
         # Prepare records
+        metadata = metadata or {}
+        filter_fields = {
+            f"meta_{key}": metadata_value_text(metadata[key])
+            for key in indexed_metadata_keys()
+            if key in metadata
+        }
+        created_at = time.time()
         records = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings, strict=True)):
+        for i, (chunk, embedding) in enumerate(
+            zip(chunks, embeddings, strict=True), start=start_index
+        ):
             # Convert embedding list to numpy array bytes for Redis
-            embedding_bytes = np.array(embedding, dtype=np.float32).tobytes()
+            embedding_bytes = self._codec.to_bytes(embedding)
             record = {
                 "id": self._generate_id(document_id, i),
                 "content": chunk,
@@ -136,7 +222,11 @@ class RedisVectorStore(VectorStoreBase):
                 "source_type": source_type,
                 "document_id": document_id,
                 "chunk_index": i,
-                "metadata": json.dumps(metadata or {}),
+                "metadata": json.dumps(metadata),
+                "tags": "",
+                "created_at": created_at,
+                "content_hash": self.chunk_hash(chunk),
+                **filter_fields,
                 "embedding": embedding_bytes,
             }
             records.append(record)
@@ -149,11 +239,13 @@ class RedisVectorStore(VectorStoreBase):
             chunks_added=len(records),
         )
 
+    @traced("rag.vector_search")
     async def search(
         self,
         query: str,
         top_k: int = 5,
         source_type: str | None = None,
+        filters: SearchFilter | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for similar documents.
@@ -162,18 +254,20 @@ class RedisVectorStore(VectorStoreBase):
             query: Search query text
             top_k: Number of results to return
             source_type: Filter by source type
+            filters: Optional tag, date range and metadata filters
 
         Returns:
             List of matching documents with scores
+
+        Raises:
+            ValueError: If a metadata filter key is not indexed
         """
+        # Build filter before embedding so invalid filters fail fast
+        filter_expr = build_redis_filter(filters, source_type)
+
         # Generate query embedding and convert to bytes
         query_embedding = await self.embedder.embed(query)
-        query_bytes = np.array(query_embedding, dtype=np.float32).tobytes()
-
-        # Build filter
-        filter_expr = None
-        if source_type:
-            filter_expr = f"@source_type:{{{source_type}}}"
+        query_bytes = self._codec.to_bytes(query_embedding)
 
         # Create query
         vector_query = VectorQuery(
@@ -211,12 +305,14 @@ class RedisVectorStore(VectorStoreBase):
 
         return formatted
 
+    @traced("rag.hybrid_search")
     async def hybrid_search(
         self,
         query: str,
         top_k: int = 5,
         source_type: str | None = None,
         alpha: float = 0.5,
+        filters: SearchFilter | None = None,
     ) -> list[dict[str, Any]]:
         """
         Hybrid search combining semantic (vector) and keyword (full-text) search.
@@ -228,6 +324,7 @@ class RedisVectorStore(VectorStoreBase):
             top_k: Number of results to return
             source_type: Filter by source type
             alpha: Weight for semantic search (0.0 = keyword only, 1.0 = semantic only)
+            filters: Optional tag, date range and metadata filters (applied to both legs)
 
         Returns:
             List of matching documents with combined RRF scores
@@ -237,22 +334,20 @@ class RedisVectorStore(VectorStoreBase):
 
         # If alpha is 1.0, use pure semantic search
         if alpha >= 1.0:
-            results = await self.search(query, top_k, source_type)
+            results = await self.search(query, top_k, source_type, filters)
             for r in results:
                 r["search_type"] = "semantic"
             return results
 
         # Generate query embedding
         query_embedding = await self.embedder.embed(query)
-        query_bytes = np.array(query_embedding, dtype=np.float32).tobytes()
+        query_bytes = self._codec.to_bytes(query_embedding)
 
         # Get more results than needed for RRF fusion
         fetch_count = top_k * 3
 
-        # Build filter for source type
-        filter_expr = None
-        if source_type:
-            filter_expr = f"@source_type:{{{source_type}}}"
+        # Build filter for both legs
+        filter_expr = build_redis_filter(filters, source_type)
 
         # --- Vector Search ---
         vector_query = VectorQuery(
@@ -293,8 +388,8 @@ class RedisVectorStore(VectorStoreBase):
                 from redis.commands.search.query import Query
 
                 ft_query_str = f"@content:{escaped_query}"
-                if source_type:
-                    ft_query_str = f"@source_type:{{{source_type}}} {ft_query_str}"
+                if filter_expr:
+                    ft_query_str = f"{filter_expr} {ft_query_str}"
 
                 ft_query = (
                     Query(ft_query_str)
@@ -326,46 +421,17 @@ class RedisVectorStore(VectorStoreBase):
                     message="Falling back to vector-only search",
                 )
                 # If full-text fails, use pure semantic
-                results = await self.search(query, top_k, source_type)
+                results = await self.search(query, top_k, source_type, filters)
                 for r in results:
                     r["search_type"] = "semantic"
                 return results
 
         # --- RRF Fusion ---
-        all_doc_ids = set(vector_ranks.keys()) | set(keyword_ranks.keys())
-
-        combined_scores = []
-        for doc_id in all_doc_ids:
-            vector_score = 0.0
-            keyword_score = 0.0
-            data = None
-
-            if doc_id in vector_ranks:
-                vector_score = 1.0 / (rrf_k + vector_ranks[doc_id]["rank"])
-                data = vector_ranks[doc_id]["data"]
-
-            if doc_id in keyword_ranks:
-                keyword_score = 1.0 / (rrf_k + keyword_ranks[doc_id]["rank"])
-                if data is None:
-                    data = keyword_ranks[doc_id]["data"]
-
-            rrf_score = alpha * vector_score + (1 - alpha) * keyword_score
-
-            combined_scores.append(
-                {
-                    "doc_id": doc_id,
-                    "rrf_score": rrf_score,
-                    "data": data,
-                    "distance": vector_ranks.get(doc_id, {}).get("distance", 0),
-                }
-            )
-
-        # Sort by RRF score (higher is better)
-        combined_scores.sort(key=lambda x: x["rrf_score"], reverse=True)
+        fused = fuse_rankings(vector_ranks, keyword_ranks, alpha, top_k, rrf_k=rrf_k)
 
         # Format top results
         formatted = []
-        for item in combined_scores[:top_k]:
+        for item in fused:
             data = item["data"]
             metadata = {}
             with contextlib.suppress(json.JSONDecodeError, TypeError):
@@ -430,6 +496,109 @@ class RedisVectorStore(VectorStoreBase):
 
         return result
 
+    async def delete_chunks_from(self, document_id: str, start_index: int) -> int:
+        """
+        Delete a document's chunks from a chunk index onwards.
+
+        Args:
+            document_id: Document ID
+            start_index: First chunk index to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        keys_to_delete = []
+        async for key in self.redis.scan_iter(f"{self.PREFIX}:*"):
+            doc_id, chunk_index = await self.redis.hmget(key, ["document_id", "chunk_index"])
+            if doc_id == document_id and int(chunk_index or 0) >= start_index:
+                keys_to_delete.append(key)
+
+        if keys_to_delete:
+            await self.redis.delete(*keys_to_delete)
+        return len(keys_to_delete)
+
+    async def delete_chunks(self, document_id: str, chunk_indexes: list[int]) -> int:
+        """
+        Delete specific chunks of a document.
+
+        Args:
+            document_id: Document ID
+            chunk_indexes: Chunk indexes to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        targets = set(chunk_indexes)
+        keys_to_delete = []
+        async for key in self.redis.scan_iter(f"{self.PREFIX}:*"):
+            doc_id, chunk_index = await self.redis.hmget(key, ["document_id", "chunk_index"])
+            if doc_id == document_id and int(chunk_index or 0) in targets:
+                keys_to_delete.append(key)
+
+        if keys_to_delete:
+            await self.redis.delete(*keys_to_delete)
+        return len(keys_to_delete)
+
+    async def get_chunk_hashes(self, document_id: str) -> dict[int, str]:
+        """
+        Get the content hash of each stored chunk of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Mapping of chunk index to content hash
+        """
+        hashes: dict[int, str] = {}
+        async for key in self.redis.scan_iter(f"{self.PREFIX}:*"):
+            doc_id, chunk_index, chunk_hash = await self.redis.hmget(
+                key, ["document_id", "chunk_index", "content_hash"]
+            )
+            if doc_id != document_id:
+                continue
+            # Chunks written before hashes were recorded have no known model: never unchanged
+            hashes[int(chunk_index or 0)] = chunk_hash or ""
+        return hashes
+
+    async def get_embeddings_by_hash(self, hashes: list[str]) -> dict[str, list[float]]:
+        """
+        Look up stored embeddings by chunk content hash.
+
+        Args:
+            hashes: Chunk content hashes
+
+        Returns:
+            Embedding for each hash found in the index
+        """
+        from redis.commands.search.query import Query
+
+        found: dict[str, list[float]] = {}
+        for start in range(0, len(hashes), HASH_LOOKUP_BATCH):
+            batch = hashes[start : start + HASH_LOOKUP_BATCH]
+            query = (
+                Query(f"@content_hash:{{{' | '.join(batch)}}}")
+                .return_fields("content_hash")
+                .paging(0, len(batch) * 4)
+            )
+            try:
+                results = await self.redis.ft(self.INDEX_NAME).search(query)
+            except Exception as e:
+                # Indexes created before content hashes existed cannot be queried
+                logger.warning("redis_hash_lookup_failed", error=str(e))
+                return found
+
+            for doc in results.docs:
+                chunk_hash = getattr(doc, "content_hash", None)
+                if not chunk_hash or chunk_hash in found:
+                    continue
+                # The client decodes responses; read the packed vector as raw bytes
+                raw = await self.redis.execute_command(
+                    "HGET", doc.id, "embedding", **{NEVER_DECODE: True}
+                )
+                if raw:
+                    found[chunk_hash] = self._codec.from_bytes(raw).tolist()
+        return found
+
     async def delete_document(self, document_id: str) -> int:
         """
         Delete all chunks for a document.
@@ -460,6 +629,30 @@ class RedisVectorStore(VectorStoreBase):
 
         return len(keys_to_delete)
 
+    async def update_document_tags(self, document_id: str, tags: list[str]) -> int:
+        """
+        Write a document's tags onto its chunk hashes for tag filtering.
+
+        Args:
+            document_id: Document ID
+            tags: Normalized document tags
+
+        Returns:
+            Number of chunks updated
+        """
+        tag_value = ",".join(tags)
+        keys_to_update = []
+
+        async for key in self.redis.scan_iter(f"{self.PREFIX}:*"):
+            if await self.redis.hget(key, "document_id") == document_id:
+                keys_to_update.append(key)
+
+        for key in keys_to_update:
+            await self.redis.hset(key, "tags", tag_value)
+
+        logger.info("document_tags_updated", document_id=document_id, chunks=len(keys_to_update))
+        return len(keys_to_update)
+
     async def get_stats(self) -> dict[str, Any]:
         """
         Get vector store statistics.
@@ -0,0 +1,479 @@
+"""
+Search Cache
+
+Caches query embeddings and top-k search results in front of a vector store.
+
+Results are cached under the corpus version: a counter incremented whenever
+indexed content changes (add, delete, retag, clear). A write invalidates
+every cached result at once without scanning keys, and superseded entries
+age out through their TTL. Embeddings depend only on the model and the text,
+so they survive corpus changes.
+
+Redis is used when available so every worker shares the cache and the
+version counter; otherwise an in-process LRU cache is used.
+"""
+
+import json
+from typing import Any
+
+import structlog
+
+from src.rag.search_filter import SearchFilter
+from src.rag.vector_store_base import VectorStoreBase
+from src.utils.cache import RedisCacheBackend, ResponseCache
+from src.utils.config import get_settings
+
+logger = structlog.get_logger()
+
+
+class SearchCache:
+    """Query-embedding and search-result cache with corpus versioning."""
+
+    def __init__(
+        self,
+        redis_client: Any | None = None,
+        max_entries: int | None = None,
+        results_ttl_seconds: int | None = None,
+        embedding_ttl_seconds: int | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_client: Optional Redis async client (in-memory cache if None)
+            max_entries: Maximum entries per in-memory cache
+            results_ttl_seconds: Time-to-live of cached search results
+            embedding_ttl_seconds: Time-to-live of cached query embeddings
+        """
+        settings = get_settings()
+        self.max_entries = max_entries or settings.rag_cache_max_entries
+        self.results_ttl_seconds = results_ttl_seconds or settings.rag_cache_results_ttl_seconds
+        self.embedding_ttl_seconds = (
+            embedding_ttl_seconds or settings.rag_cache_embedding_ttl_seconds
+        )
+
+        self._redis = RedisCacheBackend(redis_client) if redis_client is not None else None
+        self._results = ResponseCache[str](
+            max_size=self.max_entries, ttl_seconds=self.results_ttl_seconds
+        )
+        self._embeddings = ResponseCache[list[float]](
+            max_size=self.max_entries, ttl_seconds=self.embedding_ttl_seconds
+        )
+        self._version = 0
+
+        self.embedding_hits = 0
+        self.embedding_misses = 0
+        self.result_hits = 0
+        self.result_misses = 0
+        self.invalidations = 0
+
+    @property
+    def backend(self) -> str:
+        """Name of the cache backend ('redis' or 'memory')."""
+        return "redis" if self._redis else "memory"
+
+    async def get_version(self) -> int | None:
+        """
+        Get the current corpus version.
+
+        Returns:
+            Version number, or None if it cannot be read (results are then
+            neither served from nor written to the cache)
+        """
+        if self._redis is None:
+            return self._version
+        try:
+            return await self._redis.get_corpus_version()
+        except Exception as e:
+            logger.warning("search_cache_version_failed", error=str(e))
+            return None
+
+    async def bump_version(self) -> None:
+        """Invalidate all cached search results after a corpus change."""
+        self.invalidations += 1
+        self._version += 1
+        self._results.clear()
+        if self._redis is not None:
+            try:
+                await self._redis.increment_corpus_version()
+            except Exception as e:
+                logger.warning("search_cache_invalidation_failed", error=str(e))
+
+    async def embed(self, embedder: Any, text: str) -> list[float]:
+        """
+        Embed a query, reusing a cached embedding when available.
+
+        Args:
+            embedder: Embedding generator
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        key = f"{getattr(embedder, 'model', '')}:{text}"
+
+        cached = self._embeddings.get(key)
+        if cached is None and self._redis is not None:
+            try:
+                cached = await self._redis.get_embedding(key)
+            except Exception as e:
+                logger.warning("search_cache_read_failed", error=str(e))
+        if cached is not None:
+            self.embedding_hits += 1
+            self._embeddings.set(key, cached)
+            return cached
+
+        self.embedding_misses += 1
+        embedding = await embedder.embed(text)
+        self._embeddings.set(key, embedding)
+        if self._redis is not None:
+            try:
+                await self._redis.set_embedding(key, embedding, ttl=self.embedding_ttl_seconds)
+            except Exception as e:
+                logger.warning("search_cache_write_failed", error=str(e))
+        return embedding
+
+    async def get_results(
+        self, query: str, top_k: int, source_type: str | None, variant: str, version: int
+    ) -> list[dict[str, Any]] | None:
+        """
+        Get cached results computed at a corpus version.
+
+        Args:
+            query: Search query
+            top_k: Number of results
+            source_type: Optional source type filter
+            variant: Search mode and options
+            version: Corpus version the results must belong to
+
+        Returns:
+            Cached results (a fresh copy) or None on a miss
+        """
+        variant = f"{variant}:v{version}"
+        if self._redis is not None:
+            try:
+                results = await self._redis.get_search_results(query, top_k, source_type, variant)
+            except Exception as e:
+                logger.warning("search_cache_read_failed", error=str(e))
+                results = None
+        else:
+            data = self._results.get(f"{query}\0{top_k}\0{source_type}\0{variant}")
+            results = json.loads(data) if data is not None else None
+
+        if results is None:
+            self.result_misses += 1
+        else:
+            self.result_hits += 1
+        return results
+
+    async def set_results(
+        self,
+        query: str,
+        top_k: int,
+        source_type: str | None,
+        variant: str,
+        version: int,
+        results: list[dict[str, Any]],
+    ) -> None:
+        """
+        Cache results computed at a corpus version.
+
+        Args:
+            query: Search query
+            top_k: Number of results
+            source_type: Optional source type filter
+            variant: Search mode and options
+            version: Corpus version read before the search ran
+            results: Search results
+        """
+        variant = f"{variant}:v{version}"
+        if self._redis is not None:
+            try:
+                await self._redis.set_search_results(
+                    query, top_k, source_type, results, self.results_ttl_seconds, variant
+                )
+            except Exception as e:
+                logger.warning("search_cache_write_failed", error=str(e))
+        else:
+            # Stored as JSON so callers can mutate returned results freely
+            self._results.set(
+                f"{query}\0{top_k}\0{source_type}\0{variant}", json.dumps(results, default=str)
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        result_total = self.result_hits + self.result_misses
+        embedding_total = self.embedding_hits + self.embedding_misses
+        return {
+            "backend": self.backend,
+            "result_hits": self.result_hits,
+            "result_misses": self.result_misses,
+            "result_hit_rate": round(self.result_hits / result_total, 4) if result_total else 0.0,
+            "embedding_hits": self.embedding_hits,
+            "embedding_misses": self.embedding_misses,
+            "embedding_hit_rate": (
+                round(self.embedding_hits / embedding_total, 4) if embedding_total else 0.0
+            ),
+            "invalidations": self.invalidations,
+        }
+
+
+class _CachedQueryEmbedder:
+    """Embedder proxy whose single-text ``embed`` goes through the search cache."""
+
+    def __init__(self, embedder: Any, cache: SearchCache):
+        self._embedder = embedder
+        self._cache = cache
+
+    async def embed(self, text: str) -> list[float]:
+        return await self._cache.embed(self._embedder, text)
+
+    async def embed_batch(self, texts: list[str], *args: Any, **kwargs: Any) -> list[list[float]]:
+        # Document ingestion: never repeated, so not cached
+        return await self._embedder.embed_batch(texts, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_embedder":
+            raise AttributeError(name)
+        return getattr(self._embedder, name)
+
+
+class CachedVectorStore(VectorStoreBase):
+    """
+    Vector store wrapper that caches query embeddings and search results.
+
+    Writes are forwarded to the wrapped store and bump the corpus version.
+    Store-specific methods (e.g. ``search_schema``) are delegated unchanged.
+
+    Usage:
+        store = CachedVectorStore(MSSQLVectorStore(...), SearchCache(redis_client))
+        results = await store.search("revenue by region")
+    """
+
+    def __init__(self, store: VectorStoreBase, cache: SearchCache):
+        """
+        Initialize the wrapper.
+
+        Args:
+            store: Vector store to wrap
+            cache: Search cache
+        """
+        super().__init__(embedder=store.embedder, dimensions=store.dimensions)
+        self.store = store
+        self.cache = cache
+        store.embedder = _CachedQueryEmbedder(store.embedder, cache)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not defined on the wrapper
+        if name == "store":
+            raise AttributeError(name)
+        return getattr(self.store, name)
+
+    @staticmethod
+    def _variant(mode: str, filters: SearchFilter | None, options: dict[str, Any]) -> str:
+        """Key material for everything besides query, top_k and source type."""
+        filter_key = filters.model_dump_json() if filters and not filters.is_empty() else ""
+        return json.dumps([mode, filter_key, options], sort_keys=True, default=str)
+
+    async def _cached(
+        self,
+        mode: str,
+        query: str,
+        top_k: int,
+        source_type: str | None,
+        filters: SearchFilter | None,
+        options: dict[str, Any],
+        run: Any,
+    ) -> list[dict[str, Any]]:
+        """Serve a search from the cache or run it and cache the results."""
+        version = await self.cache.get_version()
+        variant = self._variant(mode, filters, options)
+        if version is not None:
+            cached = await self.cache.get_results(query, top_k, source_type, variant, version)
+            if cached is not None:
+                return cached
+
+        results = await run()
+
+        # Results are stored under the version read before the search, so a
+        # concurrent write makes them unreachable instead of serving stale data
+        if version is not None:
+            await self.cache.set_results(query, top_k, source_type, variant, version, results)
+        return results
+
+    async def create_index(self, overwrite: bool = False) -> None:
+        """Create or verify the wrapped store's index."""
+        await self.store.create_index(overwrite=overwrite)
+        if overwrite:
+            await self.cache.bump_version()
+
+    async def add_document(
+        self,
+        document_id: str,
+        chunks: list[str],
+        source: str,
+        source_type: str = "document",
+        metadata: dict[str, Any] | None = None,
+        start_index: int = 0,
+        embeddings: list[list[float]] | None = None,
+    ) -> None:
+        """Add document chunks and invalidate cached results."""
+        try:
+            await self.store.add_document(
+                document_id,
+                chunks,
+                source,
+                source_type,
+                metadata,
+                start_index=start_index,
+                embeddings=embeddings,
+            )
+        finally:
+            # A partially failed add may still have written chunks
+            await self.cache.bump_version()
+
+    async def sync_document(
+        self,
+        document_id: str,
+        chunks: list[str],
+        source: str,
+        source_type: str = "document",
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, int]:
+        """Incrementally replace a document's chunks and invalidate cached results."""
+        try:
+            return await self.store.sync_document(
+                document_id, chunks, source, source_type, metadata, **kwargs
+            )
+        finally:
+            await self.cache.bump_version()
+
+    async def embed_chunks(self, chunks: list[str]) -> list[list[float]]:
+        """Embed chunks through the wrapped store (reusing stored embeddings)."""
+        return await self.store.embed_chunks(chunks)
+
+    async def get_embeddings_by_hash(self, hashes: list[str]) -> dict[str, list[float]]:
+        """Look up stored embeddings by chunk content hash."""
+        return await self.store.get_embeddings_by_hash(hashes)
+
+    async def get_chunk_hashes(self, document_id: str) -> dict[int, str]:
+        """Get the content hash of each stored chunk of a document."""
+        return await self.store.get_chunk_hashes(document_id)
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_type: str | None = None,
+        filters: SearchFilter | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Search for similar documents, served from the cache when possible.
+
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            source_type: Optional filter by source type
+            filters: Optional tag, date range and metadata filters
+            **kwargs: Store-specific options (e.g. document_id)
+
+        Returns:
+            List of matching documents with scores
+        """
+        return await self._cached(
+            "semantic",
+            query,
+            top_k,
+            source_type,
+            filters,
+            kwargs,
+            lambda: self.store.search(
+                query, top_k=top_k, source_type=source_type, filters=filters, **kwargs
+            ),
+        )
+
+    async def hybrid_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        source_type: str | None = None,
+        alpha: float = 0.5,
+        filters: SearchFilter | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Hybrid search, served from the cache when possible.
+
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            source_type: Optional filter by source type
+            alpha: Weight for semantic search (0.0 = keyword only, 1.0 = semantic only)
+            filters: Optional tag, date range and metadata filters
+            **kwargs: Store-specific options (e.g. document_id)
+
+        Returns:
+            List of matching documents with combined scores
+        """
+        return await self._cached(
+            "hybrid",
+            query,
+            top_k,
+            source_type,
+            filters,
+            {**kwargs, "alpha": alpha},
+            lambda: self.store.hybrid_search(
+                query,
+                top_k=top_k,
+                source_type=source_type,
+                alpha=alpha,
+                filters=filters,
+                **kwargs,
+            ),
+        )
+
+    async def update_document_tags(self, document_id: str, tags: list[str]) -> int:
+        """Update chunk tags and invalidate cached (tag-filtered) results."""
+        updated = await self.store.update_document_tags(document_id, tags)
+        await self.cache.bump_version()
+        return updated
+
+    async def refresh_vector_index(self) -> bool | None:
+        """Rebuild the wrapped store's invalidated indexes (results are unchanged)."""
+        return await self.store.refresh_vector_index()
+
+    async def delete_chunks(self, document_id: str, chunk_indexes: list[int]) -> int:
+        """Delete specific document chunks and invalidate cached results."""
+        try:
+            return await self.store.delete_chunks(document_id, chunk_indexes)
+        finally:
+            await self.cache.bump_version()
+
+    async def delete_chunks_from(self, document_id: str, start_index: int) -> int:
+        """Delete trailing document chunks and invalidate cached results."""
+        try:
+            return await self.store.delete_chunks_from(document_id, start_index)
+        finally:
+            await self.cache.bump_version()
+
+    async def delete_document(self, document_id: str) -> int:
+        """Delete a document's chunks and invalidate cached results."""
+        try:
+            return await self.store.delete_document(document_id)
+        finally:
+            await self.cache.bump_version()
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Get the wrapped store's statistics plus cache statistics."""
+        stats = await self.store.get_stats()
+        stats["search_cache"] = self.cache.get_stats()
+        return stats
+
+    async def clear_all(self) -> dict[str, int]:
+        """Clear the wrapped store and invalidate cached results."""
+        try:
+            return await self.store.clear_all()
+        finally:
+            await self.cache.bump_version()
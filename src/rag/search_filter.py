@@ -0,0 +1,220 @@
+"""
+Search Filters
+
+Structured filter expressions for vector search: document tags, creation
+date ranges and chunk metadata equality. Each vector store pushes the filter
+down into its own query language so scoped searches only score the rows in
+scope:
+
+- SQL Server: document_id / created_at predicates and JSON_VALUE expressions
+  matched to indexed computed columns
+- Redis: TAG and NUMERIC fields of the search index
+- Local store: a row mask built from the SQLite sidecar
+"""
+
+import re
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field, field_validator
+
+from src.utils.config import get_settings
+
+# Metadata keys are interpolated into JSON paths and column names
+METADATA_KEY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+
+MetadataValue = str | int | float | bool
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a tag the way document tags are stored (trimmed, lowercase)."""
+    return tag.strip().lower()
+
+
+def metadata_value_text(value: MetadataValue) -> str:
+    """Text form of a metadata value, as JSON_VALUE and Redis TAG fields hold it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def indexed_metadata_keys() -> list[str]:
+    """Get the metadata keys configured for indexed filtering."""
+    keys = get_settings().vector_filter_metadata_keys.split(",")
+    return [key.strip() for key in keys if key.strip() and METADATA_KEY_PATTERN.match(key.strip())]
+
+
+class SearchFilter(BaseModel):
+    """Filter expression for vector search."""
+
+    tags: list[str] = Field(default_factory=list, description="Document tags to match")
+    match_all_tags: bool = Field(
+        default=False, description="Require every tag (default: any tag matches)"
+    )
+    created_after: datetime | None = Field(
+        default=None, description="Only chunks indexed at or after this time"
+    )
+    created_before: datetime | None = Field(
+        default=None, description="Only chunks indexed before this time"
+    )
+    metadata: dict[str, MetadataValue] = Field(
+        default_factory=dict, description="Chunk metadata key/value equality"
+    )
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, tags: list[str]) -> list[str]:
+        """Normalize and de-duplicate tags, preserving order."""
+        normalized: list[str] = []
+        for tag in tags:
+            tag = normalize_tag(tag)
+            if tag and tag not in normalized:
+                normalized.append(tag)
+        return normalized
+
+    @field_validator("metadata")
+    @classmethod
+    def _validate_metadata_keys(cls, metadata: dict[str, Any]) -> dict[str, Any]:
+        """Reject metadata keys that are not plain identifiers."""
+        for key in metadata:
+            if not METADATA_KEY_PATTERN.match(key):
+                raise ValueError(f"Invalid metadata filter key: {key!r}")
+        return metadata
+
+    def is_empty(self) -> bool:
+        """Whether the filter has no predicates."""
+        return not (self.tags or self.created_after or self.created_before or self.metadata)
+
+    def matches(self, tags: list[str], created_at: datetime | None, metadata: dict) -> bool:
+        """
+        Evaluate the filter against one record (used by stores without pushdown).
+
+        Args:
+            tags: Document tags of the record
+            created_at: Record creation time
+            metadata: Record metadata
+
+        Returns:
+            True if the record is in scope
+        """
+        if self.tags:
+            record_tags = {normalize_tag(t) for t in tags}
+            hits = [t in record_tags for t in self.tags]
+            if not (all(hits) if self.match_all_tags else any(hits)):
+                return False
+        if self.created_after and (created_at is None or created_at < self.created_after):
+            return False
+        if self.created_before and (created_at is None or created_at >= self.created_before):
+            return False
+        for key, value in self.metadata.items():
+            if key not in metadata or metadata_value_text(metadata[key]) != metadata_value_text(
+                value
+            ):
+                return False
+        return True
+
+
+def build_mssql_filter(
+    search_filter: SearchFilter | None, alias: str = "dc"
+) -> tuple[str, dict[str, Any]]:
+    """
+    Translate a filter into SQL Server predicates on vectors.document_chunks.
+
+    Tags resolve to document ids through the (tag, document_id) index of
+    app.document_tags, so the chunk scan is narrowed by the document_id index. Metadata equality
+    uses ``JSON_VALUE(metadata, '$.key')``, which SQL Server matches to the
+    indexed computed column created by ``MSSQLVectorStore`` for configured
+    keys.
+
+    Args:
+        search_filter: Filter expression (None or empty for no predicates)
+        alias: Table alias of vectors.document_chunks in the statement
+
+    Returns:
+        Tuple of (SQL fragment starting with ' AND ', bind parameters)
+    """
+    if search_filter is None or search_filter.is_empty():
+        return "", {}
+
+    clauses: list[str] = []
+    params: dict[str, Any] = {}
+
+    if search_filter.tags:
+        names = []
+        for i, tag in enumerate(search_filter.tags):
+            params[f"filter_tag{i}"] = tag
+            names.append(f":filter_tag{i}")
+        tag_match = (
+            f"{alias}.document_id IN (SELECT dt.document_id FROM app.document_tags dt "
+            "WHERE dt.tag IN (" + ", ".join(names) + ")"
+        )
+        if search_filter.match_all_tags and len(names) > 1:
+            params["filter_tag_required"] = len(names)
+            tag_match += " GROUP BY dt.document_id HAVING COUNT(*) = :filter_tag_required"
+        clauses.append(tag_match + ")")
+
+    if search_filter.created_after:
+        params["filter_created_after"] = search_filter.created_after
+        clauses.append(f"{alias}.created_at >= :filter_created_after")
+    if search_filter.created_before:
+        params["filter_created_before"] = search_filter.created_before
+        clauses.append(f"{alias}.created_at < :filter_created_before")
+
+    for i, (key, value) in enumerate(sorted(search_filter.metadata.items())):
+        params[f"filter_meta{i}"] = metadata_value_text(value)
+        clauses.append(f"JSON_VALUE({alias}.metadata, '$.{key}') = :filter_meta{i}")
+
+    return " AND " + " AND ".join(clauses), params
+
+
+def build_redis_filter(
+    search_filter: SearchFilter | None,
+    source_type: str | None = None,
+    indexed_keys: list[str] | None = None,
+) -> str | None:
+    """
+    Translate a filter into a RediSearch query expression.
+
+    Args:
+        search_filter: Filter expression
+        source_type: Optional source type restriction
+        indexed_keys: Metadata keys indexed as TAG fields
+
+    Returns:
+        Filter expression string, or None for no filtering
+
+    Raises:
+        ValueError: If a metadata key is not indexed
+    """
+    from redisvl.query.filter import Num, Tag
+
+    expressions = []
+    if source_type:
+        expressions.append(Tag("source_type") == source_type)
+
+    if search_filter is not None and not search_filter.is_empty():
+        if search_filter.tags:
+            if search_filter.match_all_tags:
+                expressions.extend(Tag("tags") == tag for tag in search_filter.tags)
+            else:
+                expressions.append(Tag("tags") == search_filter.tags)
+        if search_filter.created_after:
+            expressions.append(Num("created_at") >= search_filter.created_after.timestamp())
+        if search_filter.created_before:
+            expressions.append(Num("created_at") < search_filter.created_before.timestamp())
+
+        indexed = indexed_keys if indexed_keys is not None else indexed_metadata_keys()
+        for key, value in sorted(search_filter.metadata.items()):
+            if key not in indexed:
+                raise ValueError(
+                    f"Metadata key {key!r} is not indexed for filtering "
+                    f"(indexed keys: {', '.join(indexed) or 'none'})"
+                )
+            expressions.append(Tag(f"meta_{key}") == metadata_value_text(value))
+
+    if not expressions:
+        return None
+    combined = expressions[0]
+    for expression in expressions[1:]:
+        combined = combined & expression
+    return str(combined)
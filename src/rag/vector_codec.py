@@ -0,0 +1,107 @@
+"""
+Vector Codec
+
+Single place where embeddings are serialized for storage and transport.
+
+- Byte stores (Redis) receive packed little-endian float32 or float16 arrays.
+- SQL Server receives a compact VECTOR literal. T-SQL only converts text/JSON
+  to VECTOR (there is no VARBINARY -> VECTOR conversion and the ODBC driver
+  does not expose the native TDS vector type), so the literal is written with
+  the minimum digits that round-trip the storage precision instead of the
+  17-digit float64 ``repr`` produced by ``json.dumps``.
+"""
+
+from collections.abc import Sequence
+from enum import Enum
+
+import numpy as np
+
+from src.utils.config import get_settings
+
+
+class VectorEncoding(str, Enum):
+    """Element type used to store and transmit embeddings."""
+
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+
+
+# Significant digits that round-trip each element type exactly
+_SQL_DIGITS = {
+    VectorEncoding.FLOAT32: 9,
+    VectorEncoding.FLOAT16: 5,
+}
+
+
+class VectorCodec:
+    """
+    Encoder/decoder for embedding vectors.
+
+    Usage:
+        codec = get_vector_codec()
+        literal = codec.to_sql(embedding)      # DECLARE @v VECTOR(768) = :literal
+        payload = codec.to_bytes(embedding)    # Redis HASH field
+    """
+
+    def __init__(self, encoding: VectorEncoding | str = VectorEncoding.FLOAT32):
+        """
+        Initialize the codec.
+
+        Args:
+            encoding: Element type ('float32' or 'float16')
+        """
+        self.encoding = VectorEncoding(encoding)
+        self.dtype = np.dtype("<f4" if self.encoding == VectorEncoding.FLOAT32 else "<f2")
+        self._element_format = f"%.{_SQL_DIGITS[self.encoding]}g"
+
+    def to_array(self, embedding: Sequence[float] | np.ndarray) -> np.ndarray:
+        """Convert an embedding to a NumPy array of the codec's element type."""
+        return np.asarray(embedding, dtype=self.dtype)
+
+    def to_bytes(self, embedding: Sequence[float] | np.ndarray) -> bytes:
+        """
+        Pack an embedding as little-endian binary.
+
+        Args:
+            embedding: Embedding vector
+
+        Returns:
+            Packed bytes (4 or 2 bytes per dimension)
+        """
+        return self.to_array(embedding).tobytes()
+
+    def from_bytes(self, data: bytes) -> np.ndarray:
+        """
+        Unpack binary produced by ``to_bytes``.
+
+        Args:
+            data: Packed bytes
+
+        Returns:
+            float32 NumPy array
+        """
+        return np.frombuffer(data, dtype=self.dtype).astype(np.float32)
+
+    def to_sql(self, embedding: Sequence[float] | np.ndarray) -> str:
+        """
+        Encode an embedding as a SQL Server VECTOR literal.
+
+        Args:
+            embedding: Embedding vector
+
+        Returns:
+            JSON array string with storage-precision digits
+        """
+        fmt = self._element_format
+        values = self.to_array(embedding).tolist()
+        return "[" + ",".join([fmt % x for x in values]) + "]"
+
+
+def get_vector_codec() -> VectorCodec:
+    """
+    Get a codec for the configured vector encoding.
+
+    Returns:
+        VectorCodec instance
+    """
+    return VectorCodec(get_settings().vector_encoding)
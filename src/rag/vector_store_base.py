@@ -3,16 +3,43 @@ Vector Store Abstract Base Class
 
 Defines the common interface for all vector store implementations.
 Ensures type safety and consistent behavior across MSSQL and Redis stores.
+
+Chunks are content-addressed: each stores the SHA-256 of its text and the
+embedding model (name and dimensions) that embedded it, so embeddings already
+present anywhere in the corpus are reused instead of recomputed, and
+re-ingesting a document only rewrites the chunks that changed. After a model
+change no stored hash matches, so everything is embedded again.
 """
 
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any, Protocol
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Protocol
 
 import structlog
 
+if TYPE_CHECKING:
+    from src.rag.search_filter import SearchFilter
+
 logger = structlog.get_logger()
 
 
+def content_hash(text: str, model_key: str = "") -> str:
+    """
+    SHA-256 hex digest identifying a chunk's text.
+
+    Args:
+        text: Chunk text
+        model_key: Embedding model identity mixed into the hash (see
+            ``VectorStoreBase.embedding_model_key``)
+
+    Returns:
+        Hex digest
+    """
+    data = f"{model_key}\0{text}" if model_key else text
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
 class VectorStoreProtocol(Protocol):
     """Protocol defining the vector store interface for type checking."""
 
@@ -27,15 +54,32 @@ class VectorStoreProtocol(Protocol):
         source: str,
         source_type: str = "document",
         metadata: dict[str, Any] | None = None,
+        start_index: int = 0,
+        embeddings: list[list[float]] | None = None,
     ) -> None:
         """Add document chunks to the vector store."""
         ...
 
+    async def sync_document(
+        self,
+        document_id: str,
+        chunks: list[str],
+        source: str,
+        source_type: str = "document",
+        metadata: dict[str, Any] | None = None,
+        existing_hashes: dict[int, str] | None = None,
+        batch_size: int | None = None,
+        on_batch: Callable[[int], Awaitable[None]] | None = None,
+    ) -> dict[str, int]:
+        """Replace a document's chunks, writing only the chunks that changed."""
+        ...
+
     async def search(
         self,
         query: str,
         top_k: int = 5,
         source_type: str | None = None,
+        filters: "SearchFilter | None" = None,
     ) -> list[dict[str, Any]]:
         """Search for similar documents."""
         ...
@@ -46,6 +90,7 @@ class VectorStoreProtocol(Protocol):
         top_k: int = 5,
         source_type: str | None = None,
         alpha: float = 0.5,
+        filters: "SearchFilter | None" = None,
     ) -> list[dict[str, Any]]:
         """Hybrid search combining semantic and keyword search."""
         ...
@@ -77,6 +122,8 @@ class VectorStoreBase(ABC):
         """
         self.embedder = embedder
         self.dimensions = dimensions
+        self.chunks_embedded = 0
+        self.chunks_reused = 0
 
     @abstractmethod
     async def create_index(self, overwrite: bool = False) -> None:
@@ -99,6 +146,8 @@ class VectorStoreBase(ABC):
         source: str,
         source_type: str = "document",
         metadata: dict[str, Any] | None = None,
+        start_index: int = 0,
+        embeddings: list[list[float]] | None = None,
     ) -> None:
         """
         Add document chunks to the vector store.
@@ -109,18 +158,210 @@ class VectorStoreBase(ABC):
             source: Source name (e.g., filename, URL)
             source_type: Type of source ('document', 'schema', etc.)
             metadata: Optional metadata dictionary
+            start_index: Chunk index of the first chunk (used when a document
+                is added in several slices)
+            embeddings: Precomputed chunk embeddings (default: ``embed_chunks``)
 
         Raises:
             Exception: If document addition fails
         """
         pass
 
+    @property
+    def embedding_model_key(self) -> str:
+        """Embedding model name and dimensions that stored vectors belong to."""
+        model = getattr(self.embedder, "model", None) or type(self.embedder).__name__
+        return f"{model}:{self.dimensions}"
+
+    def chunk_hash(self, text: str) -> str:
+        """
+        Hash a chunk is stored and looked up under.
+
+        Covers the text and the embedding model, so vectors of another model
+        (or dimension) are never reused and their chunks count as changed.
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            Hex digest
+        """
+        return content_hash(text, self.embedding_model_key)
+
+    async def embed_chunks(self, chunks: list[str]) -> list[list[float]]:
+        """
+        Embed chunks, reusing embeddings of identical chunks already stored.
+
+        Chunks are looked up by content hash across the whole corpus; only
+        chunks seen nowhere else (deduplicated within the batch) are sent to
+        the embedder.
+
+        Args:
+            chunks: Chunk texts
+
+        Returns:
+            One embedding per chunk
+        """
+        hashes = [self.chunk_hash(chunk) for chunk in chunks]
+        known = await self.get_embeddings_by_hash(list(dict.fromkeys(hashes)))
+
+        missing: dict[str, str] = {}
+        for chunk, chunk_hash in zip(chunks, hashes, strict=True):
+            if chunk_hash not in known:
+                missing.setdefault(chunk_hash, chunk)
+        if missing:
+            computed = await self.embedder.embed_batch(list(missing.values()))
+            known.update(zip(missing.keys(), computed, strict=True))
+
+        self.chunks_embedded += len(missing)
+        self.chunks_reused += len(chunks) - len(missing)
+        return [known[chunk_hash] for chunk_hash in hashes]
+
+    async def get_embeddings_by_hash(self, hashes: list[str]) -> dict[str, list[float]]:
+        """
+        Look up stored embeddings by chunk content hash.
+
+        Stores that do not record content hashes reuse nothing, so the
+        default implementation returns no matches.
+
+        Args:
+            hashes: Chunk content hashes
+
+        Returns:
+            Embedding for each hash found in the corpus
+        """
+        return {}
+
+    async def get_chunk_hashes(self, document_id: str) -> dict[int, str]:
+        """
+        Get the content hash of each stored chunk of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Mapping of chunk index to content hash
+
+        Raises:
+            NotImplementedError: If the store cannot list chunk hashes
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not record chunk hashes")
+
+    async def delete_chunks(self, document_id: str, chunk_indexes: list[int]) -> int:
+        """
+        Delete specific chunks of a document.
+
+        Args:
+            document_id: Document ID
+            chunk_indexes: Chunk indexes to delete
+
+        Returns:
+            Number of chunks deleted
+
+        Raises:
+            NotImplementedError: If the store cannot delete individual chunks
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support chunk deletes")
+
+    async def sync_document(
+        self,
+        document_id: str,
+        chunks: list[str],
+        source: str,
+        source_type: str = "document",
+        metadata: dict[str, Any] | None = None,
+        existing_hashes: dict[int, str] | None = None,
+        batch_size: int | None = None,
+        on_batch: Callable[[int], Awaitable[None]] | None = None,
+    ) -> dict[str, int]:
+        """
+        Replace a document's chunks, writing only the chunks that changed.
+
+        The stored chunk hashes are diffed against the new chunks by
+        position. Unchanged positions are left alone; changed positions are
+        deleted and re-inserted with embeddings resolved (before anything is
+        deleted) through ``embed_chunks``, so chunks that merely moved, e.g.
+        after a page was inserted, are not embedded again. Stores without
+        chunk hashes fall back to deleting and re-adding the document.
+
+        Args:
+            document_id: Document ID
+            chunks: New chunk texts, in order
+            source: Source name (e.g., filename)
+            source_type: Type of source ('document', 'schema')
+            metadata: Metadata stored on inserted chunks
+            existing_hashes: Stored chunk hashes, if the caller already read them
+            batch_size: Maximum chunks per insert
+            on_batch: Awaited with the running count of inserted chunks after
+                each insert (e.g. to checkpoint progress)
+
+        Returns:
+            Counts of unchanged, inserted and deleted chunks
+        """
+        if existing_hashes is None:
+            try:
+                existing_hashes = await self.get_chunk_hashes(document_id)
+            except NotImplementedError:
+                deleted = await self.delete_document(document_id)
+                await self.add_document(document_id, chunks, source, source_type, metadata)
+                return {"unchanged": 0, "inserted": len(chunks), "deleted": deleted}
+
+        hashes = [self.chunk_hash(chunk) for chunk in chunks]
+        changed = [i for i, h in enumerate(hashes) if existing_hashes.get(i) != h]
+        changed_set = set(changed)
+        stale = sorted(i for i in existing_hashes if i >= len(chunks) or i in changed_set)
+
+        embeddings = await self.embed_chunks([chunks[i] for i in changed])
+        if stale:
+            await self.delete_chunks(document_id, stale)
+
+        # Insert contiguous runs of changed positions
+        batch_size = batch_size or len(changed) or 1
+        inserted = 0
+        run_start = 0
+        while run_start < len(changed):
+            run_end = run_start + 1
+            while (
+                run_end < len(changed)
+                and run_end - run_start < batch_size
+                and changed[run_end] == changed[run_end - 1] + 1
+            ):
+                run_end += 1
+            positions = changed[run_start:run_end]
+            await self.add_document(
+                document_id,
+                [chunks[i] for i in positions],
+                source,
+                source_type,
+                metadata,
+                start_index=positions[0],
+                embeddings=embeddings[run_start:run_end],
+            )
+            inserted += len(positions)
+            if on_batch is not None:
+                await on_batch(inserted)
+            run_start = run_end
+
+        logger.info(
+            "document_synced",
+            document_id=document_id,
+            unchanged=len(chunks) - len(changed),
+            inserted=inserted,
+            deleted=len(stale),
+        )
+        return {
+            "unchanged": len(chunks) - len(changed),
+            "inserted": inserted,
+            "deleted": len(stale),
+        }
+
     @abstractmethod
     async def search(
         self,
         query: str,
         top_k: int = 5,
         source_type: str | None = None,
+        filters: "SearchFilter | None" = None,
     ) -> list[dict[str, Any]]:
         """
         Search for similar documents using vector similarity.
@@ -129,6 +370,8 @@ class VectorStoreBase(ABC):
             query: Search query text
             top_k: Number of results to return
             source_type: Optional filter by source type
+            filters: Optional tag, date range and metadata filters, applied
+                before ranking
 
         Returns:
             List of dictionaries containing:
@@ -151,6 +394,7 @@ class VectorStoreBase(ABC):
         top_k: int = 5,
         source_type: str | None = None,
         alpha: float = 0.5,
+        filters: "SearchFilter | None" = None,
     ) -> list[dict[str, Any]]:
         """
         Hybrid search combining semantic (vector) and keyword (full-text) search.
@@ -165,6 +409,7 @@ class VectorStoreBase(ABC):
             source_type: Optional filter by source type
             alpha: Weight for semantic search (0.0 = keyword only, 1.0 = semantic only)
                    Default 0.5 gives equal weight to both.
+            filters: Optional tag, date range and metadata filters
 
         Returns:
             List of dictionaries containing:
@@ -186,7 +431,55 @@ class VectorStoreBase(ABC):
             message="Using semantic search fallback - hybrid not implemented",
             store_type=self.__class__.__name__,
         )
-        return await self.search(query, top_k, source_type)
+        return await self.search(query, top_k, source_type, filters=filters)
+
+    async def update_document_tags(self, document_id: str, tags: list[str]) -> int:
+        """
+        Propagate a document's tags to its chunks for tag-filtered search.
+
+        Stores that resolve tags at query time need no update, so the default
+        implementation does nothing.
+
+        Args:
+            document_id: Document ID
+            tags: Normalized document tags
+
+        Returns:
+            Number of chunks updated
+        """
+        return 0
+
+    async def refresh_vector_index(self) -> bool | None:
+        """
+        Rebuild search indexes that writes invalidated.
+
+        Called once writes have stopped (e.g. when the ingestion queue is
+        idle). Stores whose indexes stay current on write need no refresh,
+        so the default implementation does nothing.
+
+        Returns:
+            Whether approximate search is available, or None if not applicable
+        """
+        return None
+
+    async def delete_chunks_from(self, document_id: str, start_index: int) -> int:
+        """
+        Delete a document's chunks from a chunk index onwards.
+
+        Used to discard chunks written after the last checkpoint of an
+        interrupted ingestion before it resumes.
+
+        Args:
+            document_id: Document ID
+            start_index: First chunk index to delete
+
+        Returns:
+            Number of chunks deleted
+
+        Raises:
+            NotImplementedError: If the store cannot delete partial documents
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support partial deletes")
 
     @abstractmethod
     async def delete_document(self, document_id: str) -> int:
@@ -2,7 +2,7 @@
 Vector Store Factory
 
 Factory pattern for creating vector store instances based on configuration.
-Supports MSSQL (SQL Server 2025) and Redis Stack implementations.
+Supports MSSQL (SQL Server 2025), Redis Stack and local on-disk implementations.
 """
 
 from typing import Literal
@@ -12,13 +12,14 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.rag.embedder import OllamaEmbedder
+from src.rag.local_vector_store import LocalVectorStore
 from src.rag.mssql_vector_store import MSSQLVectorStore
 from src.rag.redis_vector_store import RedisVectorStore
 from src.rag.vector_store_base import VectorStoreBase
 
 logger = structlog.get_logger()
 
-VectorStoreType = Literal["mssql", "redis"]
+VectorStoreType = Literal["mssql", "redis", "local"]
 
 
 class VectorStoreFactory:
@@ -31,16 +32,18 @@ class VectorStoreFactory:
         dimensions: int = 768,
         session_factory: async_sessionmaker | None = None,
         redis_client: Redis | None = None,
+        local_path: str | None = None,
     ) -> VectorStoreBase:
         """
         Create a vector store instance.
 
         Args:
-            store_type: Type of vector store ('mssql' or 'redis')
+            store_type: Type of vector store ('mssql', 'redis' or 'local')
             embedder: Ollama embedder instance
             dimensions: Embedding dimensions (default: 768)
             session_factory: SQLAlchemy session factory (required for MSSQL)
             redis_client: Redis client (required for Redis)
+            local_path: Directory for the local store (default from settings)
 
         Returns:
             Initialized vector store instance
@@ -63,9 +66,16 @@ class VectorStoreFactory:
                 dimensions=dimensions,
                 redis_client=redis_client,
             )
+        elif store_type_lower == "local":
+            return await VectorStoreFactory._create_local_store(
+                embedder=embedder,
+                dimensions=dimensions,
+                path=local_path,
+            )
         else:
             raise ValueError(
-                f"Invalid vector store type: {store_type}. Supported types: 'mssql', 'redis'"
+                f"Invalid vector store type: {store_type}. "
+                "Supported types: 'mssql', 'redis', 'local'"
             )
 
     @staticmethod
@@ -146,6 +156,40 @@ class VectorStoreFactory:
             logger.error("redis_vector_store_creation_failed", error=str(e))
             raise RuntimeError(f"Failed to create Redis vector store: {e}") from e
 
+    @staticmethod
+    async def _create_local_store(
+        embedder: OllamaEmbedder,
+        dimensions: int,
+        path: str | None,
+    ) -> LocalVectorStore:
+        """
+        Create local on-disk vector store.
+
+        Args:
+            embedder: Ollama embedder instance
+            dimensions: Embedding dimensions
+            path: Store directory (default from settings)
+
+        Returns:
+            Initialized local vector store
+
+        Raises:
+            RuntimeError: If initialization fails
+        """
+        from src.utils.config import get_settings
+
+        path = path or get_settings().local_vector_store_path
+        logger.info("creating_local_vector_store", dimensions=dimensions, path=path)
+
+        try:
+            store = LocalVectorStore(path=path, embedder=embedder, dimensions=dimensions)
+            await store.create_index()
+            logger.info("local_vector_store_created", dimensions=dimensions)
+            return store
+        except Exception as e:
+            logger.error("local_vector_store_creation_failed", error=str(e))
+            raise RuntimeError(f"Failed to create local vector store: {e}") from e
+
     @staticmethod
     async def create_with_fallback(
         primary_type: VectorStoreType,
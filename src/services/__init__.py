@@ -2,25 +2,58 @@
 Services Module
 Phase 2.5: Advanced Features & Polish
 
-Contains background services for alerts and scheduled queries,
+Contains background services for alerts, scheduled queries, document
+ingestion, analytics rollups and provider status,
 and service layer for business logic separation.
 """
 
-from src.services.alert_scheduler import AlertScheduler
-from src.services.config_service import ConfigService, get_config
-from src.services.dashboard_service import DashboardService
-from src.services.document_service import DocumentService
-from src.services.notification_service import NotificationService
-from src.services.query_scheduler import QueryScheduler
-from src.services.query_service import QueryService
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.services.alert_scheduler import AlertScheduler
+    from src.services.config_service import ConfigService, get_config
+    from src.services.dashboard_service import DashboardService
+    from src.services.document_service import DocumentService
+    from src.services.ingestion_queue import IngestionQueue
+    from src.services.metrics_rollup import MetricsRollupService
+    from src.services.notification_service import NotificationService
+    from src.services.provider_status import ProviderStatusService
+    from src.services.query_scheduler import QueryScheduler
+    from src.services.query_service import QueryService
+    from src.services.widget_refresh import WidgetRefreshService
+
+# Imported on first access so importing one submodule does not load them all
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AlertScheduler": "src.services.alert_scheduler",
+        "ConfigService": "src.services.config_service",
+        "get_config": "src.services.config_service",
+        "DashboardService": "src.services.dashboard_service",
+        "DocumentService": "src.services.document_service",
+        "IngestionQueue": "src.services.ingestion_queue",
+        "MetricsRollupService": "src.services.metrics_rollup",
+        "NotificationService": "src.services.notification_service",
+        "ProviderStatusService": "src.services.provider_status",
+        "QueryScheduler": "src.services.query_scheduler",
+        "QueryService": "src.services.query_service",
+        "WidgetRefreshService": "src.services.widget_refresh",
+    },
+)
 
 __all__ = [
     "AlertScheduler",
     "ConfigService",
     "DashboardService",
     "DocumentService",
+    "IngestionQueue",
+    "MetricsRollupService",
     "NotificationService",
+    "ProviderStatusService",
     "QueryScheduler",
     "QueryService",
+    "WidgetRefreshService",
     "get_config",
 ]
@@ -3,34 +3,133 @@ Alert Scheduler Service
 Phase 2.5: Advanced Features & Polish
 
 Service for scheduling and evaluating data alerts.
+
+Each check cycle evaluates alerts concurrently with bounded parallelism and
+a per-query timeout. Alerts that share an identical query are grouped so the
+query runs once, and all status changes are written in a single batch.
 """
 
+import asyncio
+import time
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 
 import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy import select, text
+from sqlalchemy import select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.models.database import DataAlert
 
 logger = structlog.get_logger()
 
+# Default evaluation limits
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_QUERY_TIMEOUT_SECONDS = 30.0
+
+
+def evaluate_condition(
+    condition: str | None,
+    threshold: float,
+    current_value: float,
+    last_value: str | None,
+) -> bool:
+    """
+    Check whether an alert condition is met.
+
+    Args:
+        condition: Alert condition ('greater_than', 'less_than', 'equals', 'changes')
+        threshold: Alert threshold
+        current_value: Value returned by the alert query
+        last_value: Previously recorded value (string), used by 'changes'
+
+    Returns:
+        True if the alert should trigger
+    """
+    if condition == "greater_than":
+        return current_value > threshold
+    if condition == "less_than":
+        return current_value < threshold
+    if condition == "equals":
+        return abs(current_value - threshold) < 0.001
+    if condition == "changes" and last_value is not None:
+        try:
+            return abs(current_value - float(last_value)) > 0.001
+        except ValueError:
+            return str(current_value) != last_value
+    return False
+
+
+@dataclass
+class AlertCycleMetrics:
+    """Metrics for alert evaluation cycles."""
+
+    cycles: int = 0
+    alerts_evaluated: int = 0
+    queries_executed: int = 0
+    queries_deduplicated: int = 0
+    triggered: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    last_cycle_started_at: datetime | None = None
+    last_cycle_duration_ms: float = 0.0
+    max_cycle_duration_ms: float = 0.0
+    last_start_lag_ms: float = 0.0
+    max_start_lag_ms: float = 0.0
+    overruns: int = 0
+    _query_durations_ms: list[float] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert metrics to dictionary."""
+        durations = sorted(self._query_durations_ms)
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))] if durations else 0.0
+        return {
+            "cycles": self.cycles,
+            "alerts_evaluated": self.alerts_evaluated,
+            "queries_executed": self.queries_executed,
+            "queries_deduplicated": self.queries_deduplicated,
+            "triggered": self.triggered,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "last_cycle_started_at": (
+                self.last_cycle_started_at.isoformat() if self.last_cycle_started_at else None
+            ),
+            "last_cycle_duration_ms": round(self.last_cycle_duration_ms, 2),
+            "max_cycle_duration_ms": round(self.max_cycle_duration_ms, 2),
+            "last_start_lag_ms": round(self.last_start_lag_ms, 2),
+            "max_start_lag_ms": round(self.max_start_lag_ms, 2),
+            "overruns": self.overruns,
+            "last_cycle_query_p95_ms": round(p95, 2),
+        }
+
 
 class AlertScheduler:
     """Service for scheduling and evaluating data alerts."""
 
-    def __init__(self, session_factory: Callable[[], AsyncSession]):
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        query_timeout_seconds: float = DEFAULT_QUERY_TIMEOUT_SECONDS,
+    ):
         """
         Initialize the alert scheduler.
 
         Args:
             session_factory: Async context manager that yields database sessions
+            max_concurrency: Maximum number of alert queries running at once
+            query_timeout_seconds: Timeout for a single alert query
         """
         self.scheduler = AsyncIOScheduler()
         self.session_factory = session_factory
+        self.max_concurrency = max(1, max_concurrency)
+        self.query_timeout_seconds = query_timeout_seconds
+        self.metrics = AlertCycleMetrics()
+        self._interval_seconds: float = 60.0
+        self._expected_start: float | None = None
         self._running = False
 
     async def start(self, check_interval_minutes: int = 1) -> None:
@@ -44,17 +143,29 @@ class AlertScheduler:
             logger.warning("alert_scheduler_already_running")
             return
 
-        # Add job to check alerts at the specified interval
+        self._interval_seconds = check_interval_minutes * 60
+        self._expected_start = time.monotonic() + self._interval_seconds
+
+        # Add job to check alerts at the specified interval. A cycle that overruns
+        # its interval is coalesced rather than queued up behind itself.
         self.scheduler.add_job(
             self._check_alerts,
             IntervalTrigger(minutes=check_interval_minutes),
             id="alert_checker",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=self._interval_seconds,
         )
 
         self.scheduler.start()
         self._running = True
-        logger.info("alert_scheduler_started", interval_minutes=check_interval_minutes)
+        logger.info(
+            "alert_scheduler_started",
+            interval_minutes=check_interval_minutes,
+            max_concurrency=self.max_concurrency,
+            query_timeout_seconds=self.query_timeout_seconds,
+        )
 
     async def stop(self) -> None:
         """Stop the alert scheduler."""
@@ -68,70 +179,177 @@ class AlertScheduler:
         """Check if the scheduler is running."""
         return self._running
 
+    def get_metrics(self) -> dict[str, Any]:
+        """Get alert evaluation metrics."""
+        return {
+            **self.metrics.to_dict(),
+            "max_concurrency": self.max_concurrency,
+            "query_timeout_seconds": self.query_timeout_seconds,
+            "interval_seconds": self._interval_seconds,
+        }
+
     async def _check_alerts(self) -> None:
-        """Check all active alerts."""
+        """Check all active alerts in one concurrent, batched cycle."""
+        started = time.monotonic()
+        self._record_start_lag(started)
         logger.debug("checking_alerts")
+
         async with self.session_factory() as db:
-            # Get active alerts
             query = select(DataAlert).where(DataAlert.is_active == True)  # noqa: E712
             result = await db.execute(query)
             alerts = result.scalars().all()
 
-            for alert in alerts:
+        if not alerts:
+            self._record_cycle(started, query_durations=[])
+            return
+
+        # Group alerts sharing an identical query so each query runs once
+        groups: dict[str, list[DataAlert]] = {}
+        for alert in alerts:
+            groups.setdefault((alert.query or "").strip(), []).append(alert)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        query_durations: list[float] = []
+
+        async def run_group(query_text: str) -> tuple[str, float | None]:
+            async with semaphore:
+                query_started = time.monotonic()
                 try:
-                    await self._evaluate_alert(db, alert)
-                except Exception as e:
-                    logger.error("alert_evaluation_error", alert_id=alert.id, error=str(e))
+                    value = await self._run_alert_query(query_text)
+                    return query_text, value
+                finally:
+                    query_durations.append((time.monotonic() - query_started) * 1000)
 
-    async def _evaluate_alert(self, db: AsyncSession, alert: DataAlert) -> None:
-        """Evaluate a single alert."""
-        # Execute the query
-        try:
-            result = await db.execute(text(alert.query))
-            row = result.fetchone()
+        outcomes = await asyncio.gather(
+            *(run_group(q) for q in groups if q), return_exceptions=True
+        )
 
-            if not row:
-                logger.debug("alert_query_no_results", alert_id=alert.id)
-                return
+        values: dict[str, float | None] = {}
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                continue
+            query_text, value = outcome
+            values[query_text] = value
+
+        # Evaluate conditions in memory and collect one batch of status updates
+        now = datetime.utcnow()
+        updates: list[dict[str, Any]] = []
+        triggered: list[tuple[DataAlert, float]] = []
+        for query_text, group in groups.items():
+            current_value = values.get(query_text)
+            if current_value is None:
+                continue
+
+            for alert in group:
+                threshold = float(alert.threshold) if alert.threshold else 0
+                is_triggered = evaluate_condition(
+                    alert.condition, threshold, current_value, alert.last_value
+                )
+                row: dict[str, Any] = {
+                    "id": alert.id,
+                    "last_checked_at": now,
+                    "last_value": str(current_value),
+                }
+                if is_triggered:
+                    row["last_triggered_at"] = now
+                    triggered.append((alert, current_value))
+                updates.append(row)
 
-            current_value = float(row[0])
-        except Exception as e:
-            logger.error("alert_query_error", alert_id=alert.id, error=str(e))
-            return
+        if updates:
+            await self._write_updates(updates)
 
-        # Check condition
-        threshold = float(alert.threshold) if alert.threshold else 0
-        triggered = False
-
-        if alert.condition == "greater_than":
-            triggered = current_value > threshold
-        elif alert.condition == "less_than":
-            triggered = current_value < threshold
-        elif alert.condition == "equals":
-            triggered = abs(current_value - threshold) < 0.001
-        elif alert.condition == "changes" and alert.last_value is not None:
+        for alert, current_value in triggered:
             try:
-                last_val = float(alert.last_value)
-                triggered = abs(current_value - last_val) > 0.001
-            except ValueError:
-                triggered = str(current_value) != alert.last_value
-
-        # Update alert record
-        alert.last_checked_at = datetime.utcnow()
-        alert.last_value = str(current_value)
-
-        if triggered:
-            alert.last_triggered_at = datetime.utcnow()
-            await self._send_notification(alert, current_value)
+                await self._send_notification(alert, current_value)
+            except Exception as e:
+                logger.error("alert_notification_error", alert_id=alert.id, error=str(e))
             logger.info(
                 "alert_triggered",
                 alert_id=alert.id,
                 name=alert.name,
                 value=current_value,
-                threshold=threshold,
             )
 
-        await db.commit()
+        self.metrics.alerts_evaluated += len(updates)
+        self.metrics.queries_deduplicated += len(alerts) - len(groups)
+        self.metrics.triggered += len(triggered)
+        self._record_cycle(started, query_durations)
+
+    async def _run_alert_query(self, query_text: str) -> float | None:
+        """
+        Execute an alert query in its own session with a timeout.
+
+        Returns:
+            The first column of the first row as float, or None on no rows/error
+        """
+        self.metrics.queries_executed += 1
+        try:
+            async with asyncio.timeout(self.query_timeout_seconds):
+                async with self.session_factory() as db:
+                    result = await db.execute(text(query_text))
+                    row = result.fetchone()
+        except TimeoutError:
+            self.metrics.timeouts += 1
+            logger.warning(
+                "alert_query_timeout",
+                query=query_text[:100],
+                timeout_seconds=self.query_timeout_seconds,
+            )
+            return None
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error("alert_query_error", query=query_text[:100], error=str(e))
+            return None
+
+        if not row:
+            logger.debug("alert_query_no_results", query=query_text[:100])
+            return None
+
+        try:
+            return float(row[0])
+        except (TypeError, ValueError) as e:
+            self.metrics.errors += 1
+            logger.error("alert_query_non_numeric", query=query_text[:100], error=str(e))
+            return None
+
+    async def _write_updates(self, updates: list[dict[str, Any]]) -> None:
+        """Write all alert status changes for a cycle in one transaction."""
+        try:
+            async with self.session_factory() as db:
+                await db.execute(update(DataAlert), updates)
+                await db.commit()
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error("alert_status_write_error", count=len(updates), error=str(e))
+
+    def _record_start_lag(self, started: float) -> None:
+        """Record how late this cycle started relative to its schedule."""
+        self.metrics.last_cycle_started_at = datetime.utcnow()
+        if self._expected_start is not None:
+            lag_ms = max(0.0, (started - self._expected_start) * 1000)
+            self.metrics.last_start_lag_ms = lag_ms
+            self.metrics.max_start_lag_ms = max(self.metrics.max_start_lag_ms, lag_ms)
+        self._expected_start = started + self._interval_seconds
+
+    def _record_cycle(self, started: float, query_durations: list[float]) -> None:
+        """Record duration metrics for a finished cycle."""
+        duration_ms = (time.monotonic() - started) * 1000
+        self.metrics.cycles += 1
+        self.metrics.last_cycle_duration_ms = duration_ms
+        self.metrics.max_cycle_duration_ms = max(self.metrics.max_cycle_duration_ms, duration_ms)
+        self.metrics._query_durations_ms = query_durations
+        if duration_ms > self._interval_seconds * 1000:
+            self.metrics.overruns += 1
+            logger.warning(
+                "alert_cycle_overrun",
+                duration_ms=round(duration_ms, 2),
+                interval_seconds=self._interval_seconds,
+            )
+        logger.debug(
+            "alert_cycle_complete",
+            duration_ms=round(duration_ms, 2),
+            queries=len(query_durations),
+        )
 
     async def _send_notification(self, alert: DataAlert, value: float) -> None:
         """Send notification for triggered alert."""
@@ -162,7 +380,9 @@ class AlertScheduler:
                 return {"error": "Alert not found"}
 
             try:
-                result = await db.execute(text(alert.query))
+                result = await asyncio.wait_for(
+                    db.execute(text(alert.query)), timeout=self.query_timeout_seconds
+                )
                 row = result.fetchone()
 
                 if not row:
@@ -170,20 +390,9 @@ class AlertScheduler:
 
                 current_value = float(row[0])
                 threshold = float(alert.threshold) if alert.threshold else 0
-
-                # Check condition
-                triggered = False
-                if alert.condition == "greater_than":
-                    triggered = current_value > threshold
-                elif alert.condition == "less_than":
-                    triggered = current_value < threshold
-                elif alert.condition == "equals":
-                    triggered = abs(current_value - threshold) < 0.001
-                elif alert.condition == "changes" and alert.last_value is not None:
-                    try:
-                        triggered = abs(current_value - float(alert.last_value)) > 0.001
-                    except ValueError:
-                        triggered = str(current_value) != alert.last_value
+                triggered = evaluate_condition(
+                    alert.condition, threshold, current_value, alert.last_value
+                )
 
                 return {
                     "alert_id": alert_id,
@@ -194,5 +403,11 @@ class AlertScheduler:
                     "triggered": triggered,
                     "status": "checked",
                 }
+            except TimeoutError:
+                return {
+                    "alert_id": alert_id,
+                    "status": "error",
+                    "error": f"Query timed out after {self.query_timeout_seconds}s",
+                }
             except Exception as e:
                 return {"alert_id": alert_id, "status": "error", "error": str(e)}
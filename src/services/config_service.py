@@ -290,15 +290,17 @@ class ConfigService:
 
         # Enum validation
         vector_store_type = self.get("vector_store.type")
-        if vector_store_type not in ("mssql", "redis"):
+        if vector_store_type not in ("mssql", "redis", "local"):
             errors.append(
-                f"Invalid vector_store.type: {vector_store_type} (must be 'mssql' or 'redis')"
+                f"Invalid vector_store.type: {vector_store_type} "
+                "(must be 'mssql', 'redis' or 'local')"
             )
 
         llm_provider = self.get("llm_provider")
-        if llm_provider not in ("ollama", "foundry_local"):
+        if llm_provider not in ("ollama", "foundry_local", "fake"):
             errors.append(
-                f"Invalid llm_provider: {llm_provider} (must be 'ollama' or 'foundry_local')"
+                f"Invalid llm_provider: {llm_provider} "
+                "(must be 'ollama', 'foundry_local' or 'fake')"
             )
 
         return errors
@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.api.models.database import Dashboard, DashboardWidget
+from src.api.pagination import CountMode, Page, paginate
 
 logger = structlog.get_logger()
 
@@ -34,29 +35,32 @@ class DashboardService:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[Dashboard], int]:
+        cursor: str | None = None,
+        count: CountMode = "exact",
+    ) -> Page:
         """List all dashboards with pagination.
 
         Args:
             db: Database session.
-            skip: Number of dashboards to skip (pagination).
+            skip: Number of dashboards to skip (used when no cursor is given).
             limit: Maximum number of dashboards to return.
+            cursor: Continuation token from a previous page.
+            count: Total counting mode ("exact" or "estimate").
 
         Returns:
-            Tuple of (list of dashboards with widgets loaded, total count).
+            Page of dashboards, most recently updated first. Widget counts are
+            in ``child_counts`` keyed by dashboard id.
         """
-        query = select(Dashboard).options(selectinload(Dashboard.widgets))
-
-        # Get total count
-        count_result = await db.execute(query)
-        total = len(count_result.scalars().all())
-
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(Dashboard.updated_at.desc())
-        result = await db.execute(query)
-        dashboards = result.scalars().all()
-
-        return dashboards, total
+        return await paginate(
+            db,
+            select(Dashboard),
+            order_by=[(Dashboard.updated_at, True), (Dashboard.id, True)],
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count=count,
+            child_count=DashboardWidget.dashboard_id,
+        )
 
     async def get_dashboard(
         self,
@@ -6,8 +6,7 @@ Business logic for document upload, processing, and RAG operations.
 Extracted from src/api/routes/documents.py to separate concerns.
 """
 
-import contextlib
-import json
+import hashlib
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -16,7 +15,9 @@ import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.document_tags import set_document_tags, tag_facets, tag_filter
 from src.api.models.database import Document
+from src.api.pagination import CountMode, Page, paginate
 from src.rag.docling_processor import get_document_processor
 from src.utils.config import get_settings
 
@@ -54,49 +55,35 @@ class DocumentService:
         skip: int = 0,
         limit: int = 20,
         tag: str | None = None,
-    ) -> tuple[list[Document], int]:
+        cursor: str | None = None,
+        count: CountMode = "exact",
+    ) -> Page:
         """List all documents with optional tag filtering.
 
         Args:
             db: Database session.
-            skip: Number of documents to skip (pagination).
+            skip: Number of documents to skip (used when no cursor is given).
             limit: Maximum number of documents to return.
             tag: Optional tag to filter by (case-insensitive).
+            cursor: Continuation token from a previous page.
+            count: Total counting mode ("exact" or "estimate").
 
         Returns:
-            Tuple of (list of documents, total count).
+            Page of documents, newest first, with the total and next cursor.
         """
-        # Get all documents
-        count_query = select(Document)
-        result = await db.execute(count_query)
-        all_docs = result.scalars().all()
-
-        # Filter by tag if provided
+        query = select(Document)
         if tag:
-            filtered_docs = []
-            for doc in all_docs:
-                if doc.tags:
-                    try:
-                        doc_tags = json.loads(doc.tags)
-                        if tag.lower() in [t.lower() for t in doc_tags]:
-                            filtered_docs.append(doc)
-                    except (json.JSONDecodeError, TypeError):
-                        logger.debug(
-                            "skipping_document_with_invalid_tags",
-                            document_id=doc.id,
-                            tags_value=doc.tags,
-                        )
-            total = len(filtered_docs)
-            # Apply pagination
-            documents = filtered_docs[skip : skip + limit]
-        else:
-            total = len(all_docs)
-            # Get paginated results
-            query = select(Document).offset(skip).limit(limit).order_by(Document.created_at.desc())
-            result = await db.execute(query)
-            documents = result.scalars().all()
-
-        return documents, total
+            query = query.where(tag_filter([tag]))
+
+        return await paginate(
+            db,
+            query,
+            order_by=[(Document.created_at, True), (Document.id, True)],
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count=count,
+        )
 
     async def get_document(self, db: AsyncSession, document_id: int) -> Document | None:
         """Get a specific document by ID.
@@ -119,21 +106,18 @@ class DocumentService:
         Returns:
             Sorted list of unique tags.
         """
-        query = select(Document)
-        result = await db.execute(query)
-        documents = result.scalars().all()
+        return [tag for tag, _ in await tag_facets(db)]
 
-        all_tags: set[str] = set()
-        for doc in documents:
-            if doc.tags:
-                try:
-                    doc_tags = json.loads(doc.tags)
-                    all_tags.update(doc_tags)
-                except (json.JSONDecodeError, TypeError):
-                    # Silently skip documents with malformed tags JSON
-                    pass
+    async def get_tag_facets(self, db: AsyncSession) -> list[tuple[str, int]]:
+        """Get every tag with the number of documents carrying it.
 
-        return sorted(all_tags)
+        Args:
+            db: Database session.
+
+        Returns:
+            (tag, document count) pairs sorted by tag.
+        """
+        return await tag_facets(db)
 
     async def validate_upload(self, file_content: bytes, filename: str) -> None:
         """Validate uploaded file before processing.
@@ -163,6 +147,59 @@ class DocumentService:
         if suffix not in processor.SUPPORTED_EXTENSIONS:
             raise ValueError(f"Unsupported file type. Supported: {processor.SUPPORTED_EXTENSIONS}")
 
+    async def find_duplicate(self, db: AsyncSession, file_content: bytes) -> Document | None:
+        """Find a previously uploaded document with identical file content.
+
+        Args:
+            db: Database session.
+            file_content: Raw file bytes.
+
+        Returns:
+            The earliest matching Document, or None if the content is new.
+        """
+        file_hash = hashlib.sha256(file_content).hexdigest()
+        result = await db.execute(
+            select(Document)
+            .where(Document.content_hash == file_hash)
+            .order_by(Document.id)
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def retry_failed_duplicate(
+        self,
+        db: AsyncSession,
+        document: Document,
+        file_content: bytes,
+    ) -> Document:
+        """Reset a failed document that was uploaded again so it is processed again.
+
+        The upload has identical content, so it restores the stored file if
+        that was removed.
+
+        Args:
+            db: Database session.
+            document: Existing document whose processing failed.
+            file_content: Raw bytes of the new upload.
+
+        Returns:
+            The document, reset to pending status.
+        """
+        upload_path = Path(self._settings.upload_dir) / document.filename
+        if not upload_path.exists():
+            upload_path.parent.mkdir(parents=True, exist_ok=True)
+            upload_path.write_bytes(file_content)
+
+        document.processing_status = "pending"
+        document.error_message = None
+        document.chunk_count = None
+        document.processed_at = None
+        await db.commit()
+        await db.refresh(document)
+
+        logger.info("failed_duplicate_requeued", document_id=document.id)
+        return document
+
     async def save_upload(
         self,
         db: AsyncSession,
@@ -172,6 +209,11 @@ class DocumentService:
     ) -> Document:
         """Save uploaded file to disk and create database record.
 
+        Uploads are deduplicated by SHA-256 of the file content: uploading a
+        file that is already stored returns the existing document without
+        writing or processing it again. A duplicate whose processing failed
+        is reset to pending instead, so the caller processes it again.
+
         Args:
             db: Database session.
             file_content: Raw file bytes.
@@ -179,8 +221,20 @@ class DocumentService:
             mime_type: MIME type of the file.
 
         Returns:
-            Created Document instance with pending status.
+            Created Document instance with pending status, or the existing
+            Document if the same content was uploaded before.
         """
+        duplicate = await self.find_duplicate(db, file_content)
+        if duplicate is not None:
+            if duplicate.processing_status == "failed":
+                return await self.retry_failed_duplicate(db, duplicate, file_content)
+            logger.info(
+                "duplicate_upload_detected",
+                document_id=duplicate.id,
+                original_filename=filename,
+            )
+            return duplicate
+
         # Generate unique filename
         suffix = Path(filename).suffix.lower()
         unique_filename = f"{uuid.uuid4()}{suffix}"
@@ -197,6 +251,7 @@ class DocumentService:
             mime_type=mime_type,
             file_size=len(file_content),
             processing_status="pending",
+            content_hash=hashlib.sha256(file_content).hexdigest(),
         )
         db.add(document)
         await db.commit()
@@ -211,7 +266,10 @@ class DocumentService:
     ) -> None:
         """Process a document: extract text, chunk, and create embeddings.
 
-        This is typically called as a background task after upload.
+        This is typically called as a background task after upload. Chunks
+        are synced incrementally: on reprocessing only chunks whose content
+        changed are written, and chunks already embedded anywhere in the
+        corpus reuse their stored embedding.
 
         Args:
             document_id: ID of the document to process.
@@ -254,9 +312,9 @@ class DocumentService:
             # Process file
             result = await processor.process_file(file_path)
 
-            # Add to vector store if available
+            # Sync chunks to the vector store if available
             if self._vector_store:
-                await self._vector_store.add_document(
+                await self._vector_store.sync_document(
                     document_id=str(document_id),
                     chunks=result["chunks"],
                     source=file_path.name,
@@ -361,11 +419,8 @@ class DocumentService:
         if not document:
             return None
 
-        # Normalize tags: lowercase, strip whitespace, remove duplicates
-        normalized_tags = list({tag.strip().lower() for tag in tags if tag.strip()})
-
-        # Update tags
-        document.tags = json.dumps(normalized_tags)
+        # Normalize tags (lowercase, trimmed, de-duplicated) and index them
+        normalized_tags = await set_document_tags(db, document, tags)
         await db.commit()
         await db.refresh(document)
 
@@ -400,12 +455,7 @@ class DocumentService:
         if not file_path.exists():
             return None, "Document file not found on disk"
 
-        # Delete existing embeddings if any
-        if self._vector_store:
-            with contextlib.suppress(Exception):
-                await self._vector_store.delete_document(str(document_id))
-
-        # Reset status
+        # Reset status (existing embeddings are kept; processing rewrites changed chunks)
         document.processing_status = "pending"
         document.error_message = None
         document.chunk_count = None
@@ -453,12 +503,7 @@ class DocumentService:
                 )
                 continue
 
-            # Delete existing embeddings if any
-            if self._vector_store:
-                with contextlib.suppress(Exception):
-                    await self._vector_store.delete_document(str(document.id))
-
-            # Reset status to pending
+            # Reset status to pending (stored chunks are diffed on reprocessing)
             document.processing_status = "pending"
             document.error_message = None
             document.chunk_count = None
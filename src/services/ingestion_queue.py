@@ -0,0 +1,569 @@
+"""
+Ingestion Queue Service
+
+Durable, leased job queue for document processing.
+
+Each upload or reprocess request inserts a row into ``app.ingestion_jobs``.
+Workers in any API process claim queued jobs (or running jobs whose lease
+has expired because their worker died), renew the lease with a heartbeat,
+and store chunks in slices of ``checkpoint_chunks``. After every slice the
+job's ``chunks_done`` checkpoint is committed, so a resumed job only deletes
+the partially written tail and embeds the chunks that were never stored.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import structlog
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.database import Document, IngestionJob
+from src.utils.config import get_settings
+
+logger = structlog.get_logger()
+
+# Job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Window over which chunk throughput is reported
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+class LeaseLostError(Exception):
+    """Raised when a worker no longer holds the lease on its job."""
+
+
+@dataclass
+class IngestionMetrics:
+    """In-process ingestion metrics."""
+
+    jobs_completed: int = 0
+    jobs_failed: int = 0
+    jobs_retried: int = 0
+    jobs_resumed: int = 0
+    leases_lost: int = 0
+    chunks_embedded: int = 0
+    chunks_skipped: int = 0
+    _chunk_events: deque = field(default_factory=deque, repr=False)
+
+    def record_chunks(self, count: int) -> None:
+        """Record a stored slice of chunks for throughput reporting."""
+        now = time.monotonic()
+        self.chunks_embedded += count
+        self._chunk_events.append((now, count))
+        while self._chunk_events and now - self._chunk_events[0][0] > THROUGHPUT_WINDOW_SECONDS:
+            self._chunk_events.popleft()
+
+    def chunks_per_second(self) -> float:
+        """Chunks stored per second over the throughput window."""
+        now = time.monotonic()
+        recent = sum(
+            count for at, count in self._chunk_events if now - at <= THROUGHPUT_WINDOW_SECONDS
+        )
+        return recent / THROUGHPUT_WINDOW_SECONDS
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert metrics to dictionary."""
+        return {
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "jobs_retried": self.jobs_retried,
+            "jobs_resumed": self.jobs_resumed,
+            "leases_lost": self.leases_lost,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_skipped": self.chunks_skipped,
+            "chunks_per_second": round(self.chunks_per_second(), 2),
+        }
+
+
+class IngestionQueue:
+    """Service that processes documents from the durable ingestion queue."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        vector_store: Any,
+        processor: Any = None,
+        workers: int | None = None,
+        lease_seconds: int | None = None,
+        checkpoint_chunks: int | None = None,
+        max_attempts: int | None = None,
+        poll_interval_seconds: float | None = None,
+        upload_dir: str | None = None,
+    ):
+        """
+        Initialize the ingestion queue.
+
+        Args:
+            session_factory: Async context manager that yields database sessions
+            vector_store: Vector store receiving document chunks
+            processor: Document processor (defaults to the configured Docling processor)
+            workers: Number of jobs processed concurrently by this process
+            lease_seconds: Lease duration renewed by the worker heartbeat
+            checkpoint_chunks: Chunks stored between checkpoints
+            max_attempts: Attempts before a job is marked failed
+            poll_interval_seconds: Idle polling interval
+            upload_dir: Directory holding uploaded files
+        """
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.vector_store = vector_store
+        self._processor = processor
+        self.workers = max(1, workers or settings.ingestion_workers)
+        self.lease_seconds = lease_seconds or settings.ingestion_lease_seconds
+        self.checkpoint_chunks = max(1, checkpoint_chunks or settings.ingestion_checkpoint_chunks)
+        self.max_attempts = max(1, max_attempts or settings.ingestion_max_attempts)
+        self.poll_interval_seconds = (
+            poll_interval_seconds or settings.ingestion_poll_interval_seconds
+        )
+        self.upload_dir = Path(upload_dir or settings.upload_dir)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.metrics = IngestionMetrics()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._running = False
+        self._active_jobs = 0
+
+    @property
+    def processor(self) -> Any:
+        """Document processor, created on first use."""
+        if self._processor is None:
+            from src.rag.docling_processor import get_document_processor
+
+            settings = get_settings()
+            self._processor = get_document_processor(
+                chunk_size=settings.chunk_size,
+                chunk_overlap=settings.chunk_overlap,
+            )
+        return self._processor
+
+    async def start(self) -> None:
+        """Start the queue workers."""
+        if self._running:
+            logger.warning("ingestion_queue_already_running")
+            return
+
+        self._running = True
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"ingestion-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(
+            "ingestion_queue_started",
+            worker_id=self.worker_id,
+            workers=self.workers,
+            lease_seconds=self.lease_seconds,
+            checkpoint_chunks=self.checkpoint_chunks,
+        )
+
+    async def stop(self) -> None:
+        """Stop the queue workers. Interrupted jobs resume once their lease expires."""
+        if not self._running:
+            return
+
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("ingestion_queue_stopped", worker_id=self.worker_id)
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the workers are running."""
+        return self._running
+
+    async def enqueue(self, document_id: int, restart: bool = False) -> IngestionJob:
+        """
+        Queue a document for ingestion.
+
+        Enqueueing is idempotent: if the document already has a queued or
+        running job, that job is returned.
+
+        Args:
+            document_id: Document to process
+            restart: Cancel any active job and start over from the first chunk
+
+        Returns:
+            The active ingestion job for the document
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(IngestionJob)
+                .where(
+                    IngestionJob.document_id == document_id,
+                    IngestionJob.status.in_(ACTIVE_STATUSES),
+                )
+                .order_by(IngestionJob.id.desc())
+            )
+            active = result.scalars().first()
+
+            if active is not None and not restart:
+                return active
+
+            if active is not None:
+                await db.execute(
+                    update(IngestionJob)
+                    .where(
+                        IngestionJob.document_id == document_id,
+                        IngestionJob.status.in_(ACTIVE_STATUSES),
+                    )
+                    .values(status=JOB_CANCELLED, lease_owner=None, lease_expires_at=None)
+                )
+
+            job = IngestionJob(document_id=document_id, status=JOB_QUEUED, attempts=0)
+            db.add(job)
+            await db.commit()
+
+        logger.info("ingestion_job_enqueued", job_id=job.id, document_id=document_id)
+        self._wakeup.set()
+        return job
+
+    async def claim(self) -> IngestionJob | None:
+        """
+        Lease the next available job.
+
+        A job is available when it is queued, or running under an expired
+        lease (its worker stopped heartbeating). The lease is taken with a
+        conditional update, so concurrent workers never claim the same job.
+
+        Returns:
+            The claimed job, or None if the queue is empty
+        """
+        now = datetime.utcnow()
+        available = or_(
+            IngestionJob.status == JOB_QUEUED,
+            and_(IngestionJob.status == JOB_RUNNING, IngestionJob.lease_expires_at < now),
+        )
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(IngestionJob.id)
+                .where(available)
+                .order_by(IngestionJob.id)
+                .limit(self.workers)
+                .with_for_update(skip_locked=True)
+            )
+            candidates = list(result.scalars().all())
+
+            for job_id in candidates:
+                claimed = await db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.id == job_id, available)
+                    .values(
+                        status=JOB_RUNNING,
+                        lease_owner=self.worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        attempts=IngestionJob.attempts + 1,
+                        started_at=func.coalesce(IngestionJob.started_at, now),
+                    )
+                )
+                if claimed.rowcount == 1:
+                    await db.commit()
+                    return await db.get(IngestionJob, job_id, populate_existing=True)
+
+            await db.commit()
+        return None
+
+    async def run_job(self, job: IngestionJob) -> None:
+        """
+        Process a claimed job while renewing its lease.
+
+        Args:
+            job: Job leased by this worker
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, asyncio.current_task()))
+        self._active_jobs += 1
+        try:
+            await self._process(job)
+        except asyncio.CancelledError:
+            if heartbeat.done() and heartbeat.exception() is None:
+                # Lease was taken over by another worker; leave the job to it
+                self.metrics.leases_lost += 1
+                logger.warning("ingestion_lease_lost", job_id=job.id)
+                return
+            raise
+        except LeaseLostError:
+            self.metrics.leases_lost += 1
+            logger.warning("ingestion_lease_lost", job_id=job.id)
+        except Exception as e:
+            await self._fail(job, str(e)[:500])
+        finally:
+            self._active_jobs -= 1
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def get_stats(self) -> dict[str, Any]:
+        """
+        Get queue depth and throughput statistics.
+
+        Returns:
+            Job counts by status plus this process's worker metrics
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(IngestionJob.status, func.count()).group_by(IngestionJob.status)
+            )
+            counts = dict(result.all())
+
+        return {
+            "worker_id": self.worker_id,
+            "workers": self.workers,
+            "running": self._running,
+            "queued": counts.get(JOB_QUEUED, 0),
+            "in_progress": counts.get(JOB_RUNNING, 0),
+            "completed": counts.get(JOB_COMPLETED, 0),
+            "failed": counts.get(JOB_FAILED, 0),
+            "cancelled": counts.get(JOB_CANCELLED, 0),
+            **self.metrics.to_dict(),
+        }
+
+    async def _worker_loop(self) -> None:
+        """Claim and run jobs until stopped."""
+        while self._running:
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.error("ingestion_claim_failed", error=str(e))
+                job = None
+
+            if job is None:
+                if not self._active_jobs:
+                    await self._refresh_vector_index()
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval_seconds)
+                continue
+
+            await self.run_job(job)
+
+    async def _refresh_vector_index(self) -> None:
+        """Rebuild vector indexes dropped for writes once no job is running."""
+        try:
+            await self.vector_store.refresh_vector_index()
+        except Exception as e:
+            logger.warning("vector_index_refresh_failed", error=str(e))
+
+    async def _heartbeat(self, job_id: int, worker: asyncio.Task | None) -> None:
+        """Renew the lease periodically; cancel the worker if the lease is lost."""
+        interval = max(self.lease_seconds / 3, 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self._update_owned(
+                    job_id,
+                    lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds),
+                )
+            except Exception as e:
+                logger.warning("ingestion_heartbeat_failed", job_id=job_id, error=str(e))
+                continue
+            if not renewed:
+                if worker is not None:
+                    worker.cancel()
+                return
+
+    async def _update_owned(self, job_id: int, **values: Any) -> bool:
+        """Update a job only while this worker holds its lease."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(IngestionJob)
+                .where(
+                    IngestionJob.id == job_id,
+                    IngestionJob.lease_owner == self.worker_id,
+                    IngestionJob.status == JOB_RUNNING,
+                )
+                .values(**values)
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _process(self, job: IngestionJob) -> None:
+        """Embed the document's chunks, resuming from the job checkpoint."""
+        document_id = job.document_id
+        async with self.session_factory() as db:
+            doc = await db.get(Document, document_id)
+            if doc is None:
+                await self._update_owned(job.id, status=JOB_CANCELLED, lease_owner=None)
+                logger.warning("document_not_found", document_id=document_id)
+                return
+            doc.processing_status = "processing"
+            filename = doc.filename
+            tags = doc.tags
+            await db.commit()
+
+        result = await self.processor.process_file(self.upload_dir / filename)
+        chunks = result["chunks"]
+        total = len(chunks)
+
+        # Resume only when the checkpoint refers to the same chunking
+        start = job.chunks_done or 0
+        if start and job.chunks_total == total:
+            try:
+                await self.vector_store.delete_chunks_from(str(document_id), start)
+                self.metrics.jobs_resumed += 1
+                self.metrics.chunks_skipped += start
+                logger.info(
+                    "ingestion_job_resumed",
+                    job_id=job.id,
+                    document_id=document_id,
+                    chunks_done=start,
+                    chunks_total=total,
+                )
+            except NotImplementedError:
+                start = 0
+        else:
+            start = 0
+
+        existing: dict[int, str] | None = None
+        if start == 0:
+            try:
+                existing = await self.vector_store.get_chunk_hashes(str(document_id))
+            except NotImplementedError:
+                await self.vector_store.delete_document(str(document_id))
+
+        if not await self._update_owned(job.id, chunks_total=total, chunks_done=start):
+            raise LeaseLostError(job.id)
+
+        if existing:
+            await self._sync_changed_chunks(job, chunks, filename, result["metadata"], existing)
+            start = total
+
+        for offset in range(start, total, self.checkpoint_chunks):
+            batch = chunks[offset : offset + self.checkpoint_chunks]
+            await self.vector_store.add_document(
+                document_id=str(document_id),
+                chunks=batch,
+                source=filename,
+                source_type="document",
+                metadata=result["metadata"],
+                start_index=offset,
+            )
+            if not await self._update_owned(job.id, chunks_done=offset + len(batch)):
+                raise LeaseLostError(job.id)
+            self.metrics.record_chunks(len(batch))
+
+        # Reprocessed documents keep their tags; re-apply them to the new chunks
+        if tags:
+            with contextlib.suppress(json.JSONDecodeError, TypeError):
+                await self.vector_store.update_document_tags(str(document_id), json.loads(tags))
+
+        async with self.session_factory() as db:
+            doc = await db.get(Document, document_id)
+            if doc:
+                doc.chunk_count = total
+                doc.processing_status = "completed"
+                doc.error_message = None
+                doc.processed_at = datetime.utcnow()
+                await db.commit()
+
+        await self._update_owned(
+            job.id,
+            status=JOB_COMPLETED,
+            completed_at=datetime.utcnow(),
+            lease_owner=None,
+            lease_expires_at=None,
+            error_message=None,
+        )
+        self.metrics.jobs_completed += 1
+        logger.info("document_processed", document_id=document_id, chunks=total, job_id=job.id)
+
+    async def _sync_changed_chunks(
+        self,
+        job: IngestionJob,
+        chunks: list[str],
+        filename: str,
+        metadata: dict[str, Any],
+        existing: dict[int, str],
+    ) -> None:
+        """
+        Re-ingest an already stored document by writing only its changed chunks.
+
+        The diff is idempotent, so no checkpoint is recorded: a retried job
+        diffs again and skips every chunk the failed attempt already wrote.
+        """
+        written = 0
+
+        async def still_leased(inserted: int) -> None:
+            nonlocal written
+            if not await self._update_owned(job.id, updated_at=datetime.utcnow()):
+                raise LeaseLostError(job.id)
+            self.metrics.record_chunks(inserted - written)
+            written = inserted
+
+        counts = await self.vector_store.sync_document(
+            str(job.document_id),
+            chunks,
+            filename,
+            "document",
+            metadata,
+            existing_hashes=existing,
+            batch_size=self.checkpoint_chunks,
+            on_batch=still_leased,
+        )
+        self.metrics.chunks_skipped += counts["unchanged"]
+
+    async def _fail(self, job: IngestionJob, error_message: str) -> None:
+        """Requeue a failed job, or mark it and its document failed after max attempts."""
+        retry = job.attempts < self.max_attempts
+        logger.error(
+            "document_processing_failed",
+            document_id=job.document_id,
+            job_id=job.id,
+            attempt=job.attempts,
+            will_retry=retry,
+            error=error_message,
+        )
+        try:
+            if retry:
+                await self._update_owned(
+                    job.id,
+                    status=JOB_QUEUED,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    error_message=error_message,
+                )
+                self.metrics.jobs_retried += 1
+                return
+
+            owned = await self._update_owned(
+                job.id,
+                status=JOB_FAILED,
+                completed_at=datetime.utcnow(),
+                lease_owner=None,
+                lease_expires_at=None,
+                error_message=error_message,
+            )
+            if owned:
+                async with self.session_factory() as db:
+                    doc = await db.get(Document, job.document_id)
+                    if doc:
+                        doc.processing_status = "failed"
+                        doc.error_message = error_message or "Unknown error"
+                        await db.commit()
+            self.metrics.jobs_failed += 1
+        except Exception as e:
+            logger.error(
+                "ingestion_job_status_update_failed",
+                job_id=job.id,
+                original_error=error_message,
+                status_update_error=str(e),
+            )
@@ -0,0 +1,398 @@
+"""
+Metrics Rollup Service
+Phase 4.5: Observability - Query Performance Metrics Dashboard
+
+Incrementally folds query history and chat messages into hourly and daily
+summary rows (``app.metrics_rollups``) and extracts tool calls from message
+JSON into ``app.tool_calls``. The analytics endpoints read these instead of
+re-aggregating the full history on every dashboard load.
+
+Each run processes rows past a per-source watermark. The watermark is
+advanced with a conditional UPDATE before any rollup row is touched, so
+concurrent runs (several API processes) serialize on it and a row is never
+counted twice. Execution time percentiles are kept in mergeable quantile
+sketches stored with each bucket.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.database import (
+    Message,
+    MetricsRollup,
+    MetricsRollupWatermark,
+    QueryHistory,
+    ToolCallRecord,
+)
+from src.utils.config import get_settings
+from src.utils.sketch import QuantileSketch
+
+logger = structlog.get_logger()
+
+METRIC_QUERIES = "queries"
+METRIC_MESSAGES = "messages"
+GRANULARITIES = ("hour", "day")
+
+SOURCE_QUERY_HISTORY = "query_history"
+SOURCE_MESSAGES = "messages"
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its hour or day bucket."""
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def parse_tool_names(raw: str | None) -> list[str]:
+    """Extract tool names from a message's tool_calls JSON array."""
+    if not raw:
+        return []
+    try:
+        calls = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(calls, list):
+        return []
+    names = []
+    for call in calls:
+        if isinstance(call, dict):
+            name = call.get("name", call.get("tool_name", "unknown"))
+            names.append(str(name)[:255])
+    return names
+
+
+@dataclass
+class RollupSummary:
+    """Aggregate of one or more rollup buckets."""
+
+    event_count: int = 0
+    value_count: int = 0
+    value_sum: int = 0
+    value_min: int | None = None
+    value_max: int | None = None
+    rows_sum: int = 0
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    @classmethod
+    def from_row(cls, row: MetricsRollup) -> "RollupSummary":
+        """Load a summary from a stored rollup row."""
+        return cls(
+            event_count=row.event_count or 0,
+            value_count=row.value_count or 0,
+            value_sum=row.value_sum or 0,
+            value_min=row.value_min,
+            value_max=row.value_max,
+            rows_sum=row.rows_sum or 0,
+            sketch=QuantileSketch.from_json(row.sketch),
+        )
+
+    def add(self, value: int | None = None, rows: int | None = None) -> None:
+        """Record one event."""
+        self.event_count += 1
+        self.rows_sum += rows or 0
+        if value is not None:
+            self.value_count += 1
+            self.value_sum += value
+            self.value_min = value if self.value_min is None else min(self.value_min, value)
+            self.value_max = value if self.value_max is None else max(self.value_max, value)
+            self.sketch.add(value)
+
+    def merge(self, other: "RollupSummary") -> None:
+        """Fold another summary into this one."""
+        self.event_count += other.event_count
+        self.value_count += other.value_count
+        self.value_sum += other.value_sum
+        self.rows_sum += other.rows_sum
+        if other.value_min is not None:
+            self.value_min = (
+                other.value_min if self.value_min is None else min(self.value_min, other.value_min)
+            )
+        if other.value_max is not None:
+            self.value_max = (
+                other.value_max if self.value_max is None else max(self.value_max, other.value_max)
+            )
+        self.sketch.merge(other.sketch)
+
+    def write_to(self, row: MetricsRollup) -> None:
+        """Store this summary on a rollup row."""
+        row.event_count = self.event_count
+        row.value_count = self.value_count
+        row.value_sum = self.value_sum
+        row.value_min = self.value_min
+        row.value_max = self.value_max
+        row.rows_sum = self.rows_sum
+        row.sketch = self.sketch.to_json()
+
+    @property
+    def avg(self) -> float | None:
+        """Mean of the recorded values."""
+        return self.value_sum / self.value_count if self.value_count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Estimated quantile of the recorded values."""
+        return self.sketch.quantile(q)
+
+
+def summarize(rows: list[MetricsRollup]) -> RollupSummary:
+    """Merge rollup rows into a single summary."""
+    summary = RollupSummary()
+    for row in rows:
+        summary.merge(RollupSummary.from_row(row))
+    return summary
+
+
+async def load_rollups(
+    db: AsyncSession,
+    metric: str,
+    granularity: str,
+    since: datetime | None = None,
+) -> list[MetricsRollup]:
+    """
+    Load rollup rows for a metric, oldest first.
+
+    Args:
+        db: Database session
+        metric: Metric name (``queries`` or ``messages``)
+        granularity: ``hour`` or ``day``
+        since: Only buckets containing or following this time
+
+    Returns:
+        Rollup rows ordered by bucket start
+    """
+    query = select(MetricsRollup).where(
+        MetricsRollup.metric == metric, MetricsRollup.granularity == granularity
+    )
+    if since is not None:
+        query = query.where(MetricsRollup.bucket_start >= bucket_start(since, granularity))
+    result = await db.execute(query.order_by(MetricsRollup.bucket_start))
+    return list(result.scalars().all())
+
+
+class MetricsRollupService:
+    """Background job maintaining the analytics rollup tables."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval_seconds: int | None = None,
+        batch_size: int | None = None,
+        settle_seconds: int | None = None,
+    ):
+        """
+        Initialize the rollup service.
+
+        Args:
+            session_factory: Async context manager that yields database sessions
+            interval_seconds: Seconds between runs (0 disables the background job)
+            batch_size: Source rows folded per transaction
+            settle_seconds: Rows younger than this wait for the next run
+        """
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.interval_seconds = (
+            interval_seconds
+            if interval_seconds is not None
+            else settings.metrics_rollup_interval_seconds
+        )
+        self.batch_size = max(1, batch_size or settings.metrics_rollup_batch_size)
+        self.settle_seconds = (
+            settle_seconds if settle_seconds is not None else settings.metrics_rollup_settle_seconds
+        )
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def start(self) -> None:
+        """Start the periodic rollup job."""
+        if self._running or self.interval_seconds <= 0:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._loop(), name="metrics-rollup")
+        logger.info("metrics_rollup_started", interval_seconds=self.interval_seconds)
+
+    async def stop(self) -> None:
+        """Stop the periodic rollup job."""
+        if not self._running:
+            return
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("metrics_rollup_stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the job is running."""
+        return self._running
+
+    async def _loop(self) -> None:
+        """Run the rollup every interval until stopped."""
+        while self._running:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("metrics_rollup_failed", error=str(e))
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> dict[str, int]:
+        """
+        Fold all settled rows past the watermarks into the rollups.
+
+        Returns:
+            Number of source rows processed per source
+        """
+        processed: dict[str, int] = {}
+        for source in (SOURCE_QUERY_HISTORY, SOURCE_MESSAGES):
+            total = 0
+            while True:
+                count = await self._fold_batch(source)
+                total += count
+                if count < self.batch_size:
+                    break
+            processed[source] = total
+        if any(processed.values()):
+            logger.info("metrics_rollup_completed", **processed)
+        return processed
+
+    async def _fold_batch(self, source: str) -> int:
+        """Fold one batch of source rows in a single transaction."""
+        async with self.session_factory() as db:
+            watermark = await db.get(MetricsRollupWatermark, source)
+            last_id = watermark.last_id if watermark else 0
+            rows = await self._load_source_rows(db, source, last_id)
+            if not rows:
+                return 0
+
+            if not await self._advance_watermark(db, source, watermark, last_id, rows[-1].id):
+                await db.rollback()
+                return 0
+
+            deltas: dict[tuple[str, str, datetime], RollupSummary] = {}
+            skipped = 0
+            for row in rows:
+                if row.created_at is None:
+                    # No bucket to fold into; the watermark still moves past it
+                    skipped += 1
+                    continue
+                if source == SOURCE_QUERY_HISTORY:
+                    metric, value, result_rows = (
+                        METRIC_QUERIES,
+                        row.execution_time_ms,
+                        row.result_row_count,
+                    )
+                else:
+                    metric, value, result_rows = METRIC_MESSAGES, None, None
+                    db.add_all(
+                        ToolCallRecord(message_id=row.id, tool_name=name, created_at=row.created_at)
+                        for name in parse_tool_names(row.tool_calls)
+                    )
+                for granularity in GRANULARITIES:
+                    key = (metric, granularity, bucket_start(row.created_at, granularity))
+                    deltas.setdefault(key, RollupSummary()).add(value, result_rows)
+
+            await self._merge_deltas(db, deltas)
+            await db.commit()
+            if skipped:
+                logger.warning(
+                    "metrics_rollup_rows_without_timestamp", source=source, skipped=skipped
+                )
+            return len(rows)
+
+    async def _load_source_rows(self, db: AsyncSession, source: str, last_id: int) -> list[Any]:
+        """Load the next settled rows after the watermark, in id order."""
+        if source == SOURCE_QUERY_HISTORY:
+            query = select(
+                QueryHistory.id,
+                QueryHistory.created_at,
+                QueryHistory.execution_time_ms,
+                QueryHistory.result_row_count,
+            ).where(QueryHistory.id > last_id)
+            order = QueryHistory.id
+        else:
+            query = select(Message.id, Message.created_at, Message.tool_calls).where(
+                Message.id > last_id
+            )
+            order = Message.id
+        result = await db.execute(query.order_by(order).limit(self.batch_size))
+        rows = list(result.all())
+
+        # Stop at the first unsettled row: an older id may still be uncommitted.
+        # Rows without a timestamp can never settle, so they count as settled.
+        cutoff = datetime.utcnow() - timedelta(seconds=self.settle_seconds)
+        for i, row in enumerate(rows):
+            if row.created_at is not None and row.created_at >= cutoff:
+                return rows[:i]
+        return rows
+
+    async def _advance_watermark(
+        self,
+        db: AsyncSession,
+        source: str,
+        watermark: MetricsRollupWatermark | None,
+        last_id: int,
+        new_last_id: int,
+    ) -> bool:
+        """Claim the batch by moving the watermark; False if another run got there first."""
+        if watermark is None:
+            db.add(MetricsRollupWatermark(source=source, last_id=new_last_id))
+            try:
+                await db.flush()
+            except IntegrityError:
+                return False
+            return True
+
+        result = await db.execute(
+            update(MetricsRollupWatermark)
+            .where(
+                MetricsRollupWatermark.source == source,
+                MetricsRollupWatermark.last_id == last_id,
+            )
+            .values(last_id=new_last_id, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def _merge_deltas(
+        self,
+        db: AsyncSession,
+        deltas: dict[tuple[str, str, datetime], RollupSummary],
+    ) -> None:
+        """Merge per-bucket deltas into the stored rollup rows."""
+        for metric in {key[0] for key in deltas}:
+            for granularity in GRANULARITIES:
+                starts = [s for m, g, s in deltas if m == metric and g == granularity]
+                if not starts:
+                    continue
+                result = await db.execute(
+                    select(MetricsRollup).where(
+                        MetricsRollup.metric == metric,
+                        MetricsRollup.granularity == granularity,
+                        MetricsRollup.bucket_start.in_(starts),
+                    )
+                )
+                existing = {row.bucket_start: row for row in result.scalars().all()}
+                for start in starts:
+                    delta = deltas[(metric, granularity, start)]
+                    row = existing.get(start)
+                    if row is None:
+                        row = MetricsRollup(
+                            metric=metric, granularity=granularity, bucket_start=start
+                        )
+                        db.add(row)
+                        summary = delta
+                    else:
+                        summary = RollupSummary.from_row(row)
+                        summary.merge(delta)
+                    summary.write_to(row)
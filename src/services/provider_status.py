@@ -0,0 +1,151 @@
+"""
+Provider Status Service
+Phase 2.4: Enhanced provider and model configuration
+
+Availability of the LLM providers for the settings API and the UI. Providers
+are probed concurrently through the shared provider HTTP pool with a short
+response cache (``src.providers.http``), so polling clients cost at most one
+request per provider endpoint per TTL. While WebSocket clients are connected
+the service re-checks on an interval and pushes ``provider_status`` messages
+when availability changes, so the UI does not need to poll at all.
+"""
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import structlog
+
+from src.providers.http import get_json
+from src.utils.config import get_settings
+
+if TYPE_CHECKING:
+    from src.api.websocket.manager import WebSocketManager
+
+logger = structlog.get_logger()
+
+
+class ProviderStatusService:
+    """Checks provider availability and pushes changes over WebSocket."""
+
+    def __init__(
+        self,
+        websocket_manager: "WebSocketManager | None" = None,
+        poll_interval_seconds: float = 15.0,
+    ):
+        """
+        Initialize the provider status service.
+
+        Args:
+            websocket_manager: Manager used to push status changes
+            poll_interval_seconds: Interval between checks while clients are connected (0 = off)
+        """
+        self.websocket_manager = websocket_manager
+        self.poll_interval_seconds = poll_interval_seconds
+        self._task: asyncio.Task | None = None
+        # provider id -> latest status entry
+        self._statuses: dict[str, dict[str, Any]] = {}
+
+    async def start(self) -> None:
+        """Start the background status checks."""
+        if self._task is not None:
+            logger.warning("provider_status_service_already_running")
+            return
+        if self.poll_interval_seconds > 0 and self.websocket_manager is not None:
+            self._task = asyncio.create_task(self._poll_loop(), name="provider-status")
+        logger.info("provider_status_service_started", interval=self.poll_interval_seconds)
+
+    async def stop(self) -> None:
+        """Stop the background status checks."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        logger.info("provider_status_service_stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Check if background status checks are running."""
+        return self._task is not None and not self._task.done()
+
+    async def get_statuses(self) -> list[dict[str, Any]]:
+        """
+        Check all providers concurrently.
+
+        Results come from the shared response cache when fresh. Changes since
+        the previous check are pushed to WebSocket clients.
+
+        Returns:
+            Status entry per provider (``ProviderInfo`` fields)
+        """
+        statuses = await asyncio.gather(self._check_ollama(), self._check_foundry())
+        changed = [
+            status["id"] for status in statuses if self._statuses.get(status["id"]) != status
+        ]
+        self._statuses = {status["id"]: status for status in statuses}
+
+        if changed:
+            logger.info(
+                "provider_status_changed",
+                providers={s["id"]: s["available"] for s in statuses if s["id"] in changed},
+            )
+            await self._push(statuses, changed)
+        return list(statuses)
+
+    async def _check_ollama(self) -> dict[str, Any]:
+        status = _status_entry("ollama", "Ollama", "🦙")
+        try:
+            data = await get_json(f"{get_settings().ollama_host}/api/version", timeout=5.0)
+            status["available"] = True
+            status["version"] = data.get("version", "unknown")
+        except Exception as e:
+            status["error"] = str(e)[:100]
+        return status
+
+    async def _check_foundry(self) -> dict[str, Any]:
+        endpoint = get_settings().foundry_endpoint
+        status = _status_entry("foundry_local", "Foundry Local", "🔧")
+        try:
+            await get_json(f"{endpoint}/v1/models", timeout=5.0)
+            status["available"] = True
+            status["version"] = "local"
+        except httpx.ConnectError:
+            status["error"] = f"Not running at {endpoint}. Start with: foundry model run phi-4"
+        except Exception as e:
+            status["error"] = str(e)[:100]
+        return status
+
+    async def _push(self, statuses: list[dict[str, Any]], changed: list[str]) -> None:
+        if self.websocket_manager is None:
+            return
+        try:
+            await self.websocket_manager.broadcast(
+                {"type": "provider_status", "providers": statuses, "changed": changed}
+            )
+        except Exception as e:
+            logger.warning("provider_status_push_failed", error=str(e))
+
+    async def _poll_loop(self) -> None:
+        while True:
+            # Nobody to push to: leave the providers alone
+            if self.websocket_manager.get_connection_count() > 0:
+                try:
+                    await self.get_statuses()
+                except Exception as e:
+                    logger.warning("provider_status_check_failed", error=str(e))
+            await asyncio.sleep(self.poll_interval_seconds)
+
+
+def _status_entry(provider_id: str, display_name: str, icon: str) -> dict[str, Any]:
+    """Unavailable status entry for a provider."""
+    return {
+        "id": provider_id,
+        "name": provider_id,
+        "display_name": display_name,
+        "icon": icon,
+        "available": False,
+        "error": None,
+        "version": None,
+    }
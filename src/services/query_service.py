@@ -14,6 +14,7 @@ from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.models.database import QueryHistory, SavedQuery
+from src.api.pagination import CountMode, Page, paginate
 
 logger = structlog.get_logger()
 
@@ -46,32 +47,35 @@ class QueryService:
         skip: int = 0,
         limit: int = 50,
         favorites_only: bool = False,
-    ) -> tuple[list[QueryHistory], int]:
+        cursor: str | None = None,
+        count: CountMode = "exact",
+    ) -> Page:
         """List query history with optional filtering.
 
         Args:
             db: Database session.
-            skip: Number of queries to skip (pagination).
+            skip: Number of queries to skip (used when no cursor is given).
             limit: Maximum number of queries to return.
             favorites_only: If True, only return favorited queries.
+            cursor: Continuation token from a previous page.
+            count: Total counting mode ("exact" or "estimate").
 
         Returns:
-            Tuple of (list of query history items, total count).
+            Page of query history items, newest first.
         """
         query = select(QueryHistory)
         if favorites_only:
             query = query.where(QueryHistory.is_favorite == True)  # noqa: E712
 
-        # Get total count
-        count_result = await db.execute(query)
-        total = len(count_result.scalars().all())
-
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(QueryHistory.created_at.desc())
-        result = await db.execute(query)
-        queries = result.scalars().all()
-
-        return queries, total
+        return await paginate(
+            db,
+            query,
+            order_by=[(QueryHistory.created_at, True), (QueryHistory.id, True)],
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count=count,
+        )
 
     async def toggle_favorite(
         self,
@@ -161,29 +165,30 @@ class QueryService:
         db: AsyncSession,
         skip: int = 0,
         limit: int = 50,
-    ) -> tuple[list[SavedQuery], int]:
+        cursor: str | None = None,
+        count: CountMode = "exact",
+    ) -> Page:
         """List saved queries with pagination.
 
         Args:
             db: Database session.
-            skip: Number of queries to skip (pagination).
+            skip: Number of queries to skip (used when no cursor is given).
             limit: Maximum number of queries to return.
+            cursor: Continuation token from a previous page.
+            count: Total counting mode ("exact" or "estimate").
 
         Returns:
-            Tuple of (list of saved queries, total count).
+            Page of saved queries, newest first.
         """
-        query = select(SavedQuery)
-
-        # Get total count
-        count_result = await db.execute(query)
-        total = len(count_result.scalars().all())
-
-        # Get paginated results
-        query = query.offset(skip).limit(limit).order_by(SavedQuery.created_at.desc())
-        result = await db.execute(query)
-        queries = result.scalars().all()
-
-        return queries, total
+        return await paginate(
+            db,
+            select(SavedQuery),
+            order_by=[(SavedQuery.created_at, True), (SavedQuery.id, True)],
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            count=count,
+        )
 
     async def get_saved_query(
         self,
@@ -0,0 +1,414 @@
+"""
+Widget Refresh Service
+Phase 2.5: Advanced Features & Polish
+
+Server-side cache and shared refresh scheduler for dashboard widget data.
+Each widget query runs at most once per refresh interval no matter how many
+viewers have the dashboard open; fresh results are pushed to subscribed
+WebSocket connections.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.models.database import DashboardWidget
+from src.services.query_service import QueryService
+
+if TYPE_CHECKING:
+    from src.api.websocket.manager import WebSocketManager
+
+logger = structlog.get_logger()
+
+# Max age for widgets that have no refresh_interval configured
+DEFAULT_WIDGET_TTL_SECONDS = 60
+
+
+def widget_query_hash(query: str) -> str:
+    """Return a short stable hash of a widget query."""
+    return hashlib.sha256(query.strip().encode()).hexdigest()[:16]
+
+
+@dataclass
+class WidgetResult:
+    """Cached result of a single widget query execution."""
+
+    widget_id: int
+    query_hash: str
+    data: list[dict[str, Any]] = field(default_factory=list)
+    columns: list[str] = field(default_factory=list)
+    row_count: int = 0
+    execution_time_ms: int = 0
+    refreshed_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    error: str | None = None
+    _monotonic: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since this result was produced."""
+        return time.monotonic() - self._monotonic
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "widget_id": self.widget_id,
+            "query_hash": self.query_hash,
+            "data": jsonable_encoder(self.data),
+            "columns": self.columns,
+            "row_count": self.row_count,
+            "execution_time_ms": self.execution_time_ms,
+            "refreshed_at": self.refreshed_at.isoformat(),
+            "error": self.error,
+        }
+
+
+class WidgetRefreshService:
+    """Caches widget query results and refreshes them on a shared schedule."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        websocket_manager: "WebSocketManager | None" = None,
+        default_ttl_seconds: int = DEFAULT_WIDGET_TTL_SECONDS,
+    ):
+        """
+        Initialize the widget refresh service.
+
+        Args:
+            session_factory: Async context manager that yields database sessions
+            websocket_manager: Manager used to push refreshed results to viewers
+            default_ttl_seconds: Max cache age for widgets without a refresh interval
+        """
+        self.scheduler = AsyncIOScheduler()
+        self.session_factory = session_factory
+        self.websocket_manager = websocket_manager
+        self.default_ttl_seconds = default_ttl_seconds
+        self._query_service = QueryService()
+        self._running = False
+
+        # widget_id -> latest result (valid only while its query_hash matches)
+        self._results: dict[int, WidgetResult] = {}
+        # "widget_id:query_hash" -> in-flight execution shared by concurrent callers
+        self._inflight: dict[str, asyncio.Task[WidgetResult]] = {}
+        # dashboard_id -> subscribed WebSocket connection IDs
+        self._subscribers: dict[int, set[str]] = {}
+        # widget_id -> dashboard_id for widgets with a scheduled refresh job
+        self._scheduled: dict[int, int] = {}
+
+        # Stats
+        self._hits = 0
+        self._misses = 0
+        self._executions = 0
+
+    async def start(self) -> None:
+        """Start the refresh scheduler."""
+        if self._running:
+            logger.warning("widget_refresh_service_already_running")
+            return
+
+        self.scheduler.start()
+        self._running = True
+        logger.info("widget_refresh_service_started")
+
+    async def stop(self) -> None:
+        """Stop the refresh scheduler and cancel in-flight executions."""
+        if self._running:
+            self.scheduler.shutdown(wait=False)
+            self._running = False
+
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        self._scheduled.clear()
+        logger.info("widget_refresh_service_stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the scheduler is running."""
+        return self._running
+
+    # Cache access
+
+    def _max_age(self, widget: DashboardWidget) -> int:
+        """Get the maximum cache age for a widget in seconds."""
+        return widget.refresh_interval or self.default_ttl_seconds
+
+    def get_cached(self, widget: DashboardWidget) -> WidgetResult | None:
+        """
+        Get the cached result for a widget if it is still valid.
+
+        Args:
+            widget: Widget whose result to look up
+
+        Returns:
+            Cached WidgetResult or None if missing, stale, or the query changed
+        """
+        if not widget.query:
+            return None
+
+        cached = self._results.get(widget.id)
+        if cached is None or cached.query_hash != widget_query_hash(widget.query):
+            return None
+        if cached.age_seconds > self._max_age(widget):
+            return None
+        return cached
+
+    async def get_widget_data(self, widget: DashboardWidget) -> WidgetResult | None:
+        """
+        Get data for a widget, executing its query only on a cache miss.
+
+        Args:
+            widget: Widget to get data for
+
+        Returns:
+            WidgetResult, or None if the widget has no query
+        """
+        if not widget.query:
+            return None
+
+        cached = self.get_cached(widget)
+        if cached is not None:
+            self._hits += 1
+            return cached
+
+        self._misses += 1
+        return await self._execute(widget.id, widget.query)
+
+    async def get_dashboard_data(self, dashboard_id: int) -> list[WidgetResult]:
+        """
+        Get data for every widget of a dashboard.
+
+        Cache misses are executed concurrently.
+
+        Args:
+            dashboard_id: Dashboard to load
+
+        Returns:
+            List of WidgetResult for widgets that have a query
+        """
+        widgets = await self._load_dashboard_widgets(dashboard_id)
+        results = await asyncio.gather(*(self.get_widget_data(w) for w in widgets))
+        return [r for r in results if r is not None]
+
+    async def _execute(self, widget_id: int, query: str) -> WidgetResult:
+        """Execute a widget query, sharing one execution among concurrent callers."""
+        key = f"{widget_id}:{widget_query_hash(query)}"
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_query(widget_id, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _run_query(self, widget_id: int, query: str) -> WidgetResult:
+        """Run a widget query against the database and cache the result."""
+        self._executions += 1
+        async with self.session_factory() as db:
+            data, columns, row_count, extra = await self._query_service.execute_query(db, query)
+
+        if data is None:
+            result = WidgetResult(
+                widget_id=widget_id,
+                query_hash=widget_query_hash(query),
+                error=str(extra),
+            )
+        else:
+            result = WidgetResult(
+                widget_id=widget_id,
+                query_hash=widget_query_hash(query),
+                data=data,
+                columns=columns,
+                row_count=row_count,
+                execution_time_ms=extra,
+            )
+
+        self._results[widget_id] = result
+        logger.debug(
+            "widget_data_refreshed",
+            widget_id=widget_id,
+            row_count=result.row_count,
+            error=result.error,
+        )
+        return result
+
+    # Subscriptions
+
+    async def subscribe(self, dashboard_id: int, connection_id: str) -> list[WidgetResult]:
+        """
+        Subscribe a WebSocket connection to refreshes of a dashboard.
+
+        Args:
+            dashboard_id: Dashboard to follow
+            connection_id: WebSocket connection ID
+
+        Returns:
+            Current widget results for the dashboard (served from cache when fresh)
+        """
+        self._subscribers.setdefault(dashboard_id, set()).add(connection_id)
+
+        widgets = await self._load_dashboard_widgets(dashboard_id)
+        for widget in widgets:
+            self._schedule_widget(widget)
+
+        logger.info(
+            "widget_dashboard_subscribed",
+            dashboard_id=dashboard_id,
+            connection_id=connection_id,
+            viewers=len(self._subscribers[dashboard_id]),
+        )
+
+        results = await asyncio.gather(*(self.get_widget_data(w) for w in widgets))
+        return [r for r in results if r is not None]
+
+    def unsubscribe(self, dashboard_id: int, connection_id: str) -> None:
+        """
+        Remove a WebSocket connection from a dashboard's subscribers.
+
+        Refresh jobs for the dashboard stop once its last viewer leaves.
+
+        Args:
+            dashboard_id: Dashboard being followed
+            connection_id: WebSocket connection ID
+        """
+        viewers = self._subscribers.get(dashboard_id)
+        if viewers is None:
+            return
+
+        viewers.discard(connection_id)
+        if viewers:
+            return
+
+        del self._subscribers[dashboard_id]
+        for widget_id, widget_dashboard in list(self._scheduled.items()):
+            if widget_dashboard == dashboard_id:
+                self._unschedule_widget(widget_id)
+
+        logger.info("widget_dashboard_unwatched", dashboard_id=dashboard_id)
+
+    def get_subscriber_count(self, dashboard_id: int) -> int:
+        """Get the number of connections viewing a dashboard."""
+        return len(self._subscribers.get(dashboard_id, ()))
+
+    # Scheduling
+
+    def _schedule_widget(self, widget: DashboardWidget) -> None:
+        """Add (or replace) the refresh job for a widget with a refresh interval."""
+        if not self._running or not widget.query or not widget.refresh_interval:
+            return
+
+        self.scheduler.add_job(
+            self._refresh_widget,
+            IntervalTrigger(seconds=widget.refresh_interval),
+            args=[widget.id],
+            id=f"widget_refresh_{widget.id}",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+        self._scheduled[widget.id] = widget.dashboard_id
+        logger.debug(
+            "widget_refresh_job_added",
+            widget_id=widget.id,
+            interval=widget.refresh_interval,
+        )
+
+    def _unschedule_widget(self, widget_id: int) -> None:
+        """Remove the refresh job for a widget."""
+        self._scheduled.pop(widget_id, None)
+        try:
+            self.scheduler.remove_job(f"widget_refresh_{widget_id}")
+            logger.debug("widget_refresh_job_removed", widget_id=widget_id)
+        except Exception:
+            pass  # Job may not exist
+
+    async def _refresh_widget(self, widget_id: int) -> None:
+        """Scheduled job: re-run a widget query and push the result to viewers."""
+        async with self.session_factory() as db:
+            widget = await db.get(DashboardWidget, widget_id)
+
+        if widget is None or not widget.query:
+            self.invalidate_widget(widget_id)
+            return
+
+        try:
+            result = await self._execute(widget.id, widget.query)
+        except Exception as e:
+            logger.error("widget_refresh_error", widget_id=widget_id, error=str(e))
+            return
+
+        await self._push(widget.dashboard_id, result)
+
+    async def _push(self, dashboard_id: int, result: WidgetResult) -> int:
+        """Send a widget result to every connection viewing the dashboard."""
+        viewers = self._subscribers.get(dashboard_id)
+        if not viewers or self.websocket_manager is None:
+            return 0
+
+        message = {
+            "type": "widget_data",
+            "dashboard_id": dashboard_id,
+            "widget": result.to_dict(),
+        }
+        return await self.websocket_manager.send_to_connections(list(viewers), message)
+
+    # Invalidation
+
+    def widget_changed(self, widget: DashboardWidget) -> None:
+        """
+        Drop the cached result for a widget and reschedule it if it is being viewed.
+
+        Args:
+            widget: Widget that was created or updated
+        """
+        self._results.pop(widget.id, None)
+        self._unschedule_widget(widget.id)
+        if widget.dashboard_id in self._subscribers:
+            self._schedule_widget(widget)
+
+    def invalidate_widget(self, widget_id: int) -> None:
+        """
+        Drop the cached result and refresh job for a deleted widget.
+
+        Args:
+            widget_id: ID of the widget
+        """
+        self._results.pop(widget_id, None)
+        self._unschedule_widget(widget_id)
+
+    async def _load_dashboard_widgets(self, dashboard_id: int) -> list[DashboardWidget]:
+        """Load all widgets belonging to a dashboard."""
+        async with self.session_factory() as db:
+            query = select(DashboardWidget).where(DashboardWidget.dashboard_id == dashboard_id)
+            result = await db.execute(query)
+            return list(result.scalars().all())
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache and scheduler statistics.
+
+        Returns:
+            Dictionary with hit/miss counts, executions, and subscription counts
+        """
+        total = self._hits + self._misses
+        return {
+            "cached_widgets": len(self._results),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total > 0 else 0.0,
+            "executions": self._executions,
+            "in_flight": len(self._inflight),
+            "scheduled_widgets": len(self._scheduled),
+            "watched_dashboards": len(self._subscribers),
+            "viewers": sum(len(v) for v in self._subscribers.values()),
+        }
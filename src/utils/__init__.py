@@ -1,14 +1,38 @@
 """Utility modules for configuration and logging."""
 
-from src.utils.config import Settings, get_settings, reload_settings, settings
-from src.utils.health import (
-    ComponentHealth,
-    HealthStatus,
-    SystemHealth,
-    format_health_report,
-    run_health_checks,
+from typing import TYPE_CHECKING
+
+from src.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from src.utils.config import Settings, get_settings, reload_settings, settings
+    from src.utils.health import (
+        ComponentHealth,
+        HealthStatus,
+        SystemHealth,
+        format_health_report,
+        run_health_checks,
+    )
+    from src.utils.logger import get_logger, logger, setup_logging
+
+# Imported on first access so importing one utility does not load them all
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Settings": "src.utils.config",
+        "get_settings": "src.utils.config",
+        "reload_settings": "src.utils.config",
+        "settings": "src.utils.config",
+        "get_logger": "src.utils.logger",
+        "logger": "src.utils.logger",
+        "setup_logging": "src.utils.logger",
+        "ComponentHealth": "src.utils.health",
+        "HealthStatus": "src.utils.health",
+        "SystemHealth": "src.utils.health",
+        "format_health_report": "src.utils.health",
+        "run_health_checks": "src.utils.health",
+    },
 )
-from src.utils.logger import get_logger, logger, setup_logging
 
 __all__ = [
     "Settings",
@@ -7,6 +7,7 @@ max size and time-to-live settings.
 """
 
 import hashlib
+import threading
 import time
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -66,7 +67,7 @@ class ResponseCache(Generic[T]):
     - Configurable max size (number of entries)
     - Configurable TTL (time-to-live) for entries
     - LRU eviction when max size is reached
-    - Thread-safe for single-threaded async operations
+    - Thread-safe: entries and stats are guarded by a lock
     - Stats tracking for monitoring
 
     Usage:
@@ -100,6 +101,8 @@ class ResponseCache(Generic[T]):
         self._max_size = max(1, max_size)
         self._ttl_seconds = max(0, ttl_seconds)
         self._enabled = enabled
+        # OrderedDict reordering (move_to_end, eviction) is not atomic
+        self._lock = threading.Lock()
 
         # Stats
         self._hits = 0
@@ -149,23 +152,24 @@ class ResponseCache(Generic[T]):
             return None
 
         key = self._generate_key(query)
-        entry = self._cache.get(key)
-
-        if entry is None:
-            self._misses += 1
-            return None
-
-        # Check for expiration
-        if self._is_expired(entry):
-            self._cache.pop(key)
-            self._misses += 1
-            logger.debug("cache_expired", key=key[:16])
-            return None
-
-        # Cache hit - update stats and move to end (most recently used)
-        self._hits += 1
-        entry.hits += 1
-        self._cache.move_to_end(key)
+        with self._lock:
+            entry = self._cache.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            # Check for expiration
+            if self._is_expired(entry):
+                self._cache.pop(key)
+                self._misses += 1
+                logger.debug("cache_expired", key=key[:16])
+                return None
+
+            # Cache hit - update stats and move to end (most recently used)
+            self._hits += 1
+            entry.hits += 1
+            self._cache.move_to_end(key)
 
         logger.debug("cache_hit", key=key[:16], entry_hits=entry.hits)
         return entry.value
@@ -182,23 +186,24 @@ class ResponseCache(Generic[T]):
             return
 
         key = self._generate_key(query)
-
-        # If key exists, update it
-        if key in self._cache:
+        with self._lock:
+            # If key exists, update it
+            if key in self._cache:
+                self._cache[key] = CacheEntry(value=value, created_at=time.time())
+                self._cache.move_to_end(key)
+                return
+
+            # Evict oldest entry if at max size
+            while len(self._cache) >= self._max_size:
+                evicted_key = next(iter(self._cache))
+                self._cache.pop(evicted_key)
+                self._evictions += 1
+                logger.debug("cache_eviction", evicted_key=evicted_key[:16])
+
+            # Add new entry
             self._cache[key] = CacheEntry(value=value, created_at=time.time())
-            self._cache.move_to_end(key)
-            return
-
-        # Evict oldest entry if at max size
-        while len(self._cache) >= self._max_size:
-            evicted_key = next(iter(self._cache))
-            self._cache.pop(evicted_key)
-            self._evictions += 1
-            logger.debug("cache_eviction", evicted_key=evicted_key[:16])
-
-        # Add new entry
-        self._cache[key] = CacheEntry(value=value, created_at=time.time())
-        logger.debug("cache_set", key=key[:16], size=len(self._cache))
+            size = len(self._cache)
+        logger.debug("cache_set", key=key[:16], size=size)
 
     def invalidate(self, query: str) -> bool:
         """
@@ -211,11 +216,11 @@ class ResponseCache(Generic[T]):
             True if entry was found and removed
         """
         key = self._generate_key(query)
-        if key in self._cache:
-            self._cache.pop(key)
-            logger.debug("cache_invalidated", key=key[:16])
-            return True
-        return False
+        with self._lock:
+            if self._cache.pop(key, None) is None:
+                return False
+        logger.debug("cache_invalidated", key=key[:16])
+        return True
 
     def clear(self) -> int:
         """
@@ -224,8 +229,9 @@ class ResponseCache(Generic[T]):
         Returns:
             Number of entries cleared
         """
-        count = len(self._cache)
-        self._cache.clear()
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
         logger.info("cache_cleared", entries_cleared=count)
         return count
 
@@ -240,14 +246,15 @@ class ResponseCache(Generic[T]):
             return 0  # No expiration configured
 
         current_time = time.time()
-        expired_keys = [
-            key
-            for key, entry in self._cache.items()
-            if (current_time - entry.created_at) > self._ttl_seconds
-        ]
+        with self._lock:
+            expired_keys = [
+                key
+                for key, entry in self._cache.items()
+                if (current_time - entry.created_at) > self._ttl_seconds
+            ]
 
-        for key in expired_keys:
-            self._cache.pop(key)
+            for key in expired_keys:
+                self._cache.pop(key)
 
         if expired_keys:
             logger.info("cache_cleanup", entries_removed=len(expired_keys))
@@ -256,20 +263,22 @@ class ResponseCache(Generic[T]):
 
     def get_stats(self) -> CacheStats:
         """Get current cache statistics."""
-        return CacheStats(
-            hits=self._hits,
-            misses=self._misses,
-            evictions=self._evictions,
-            size=len(self._cache),
-            max_size=self._max_size,
-            ttl_seconds=self._ttl_seconds,
-        )
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._cache),
+                max_size=self._max_size,
+                ttl_seconds=self._ttl_seconds,
+            )
 
     def reset_stats(self) -> None:
         """Reset hit/miss/eviction counters."""
-        self._hits = 0
-        self._misses = 0
-        self._evictions = 0
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
         logger.info("cache_stats_reset")
 
     def __len__(self) -> int:
@@ -279,7 +288,8 @@ class ResponseCache(Generic[T]):
     def __contains__(self, query: str) -> bool:
         """Check if a query is in the cache (without updating stats)."""
         key = self._generate_key(query)
-        entry = self._cache.get(key)
+        with self._lock:
+            entry = self._cache.get(key)
         if entry is None:
             return False
         return not self._is_expired(entry)
@@ -388,7 +398,7 @@ class RedisCacheBackend:
         logger.debug("embedding_cached", key=key[:30])
 
     async def get_search_results(
-        self, query: str, top_k: int, source_type: str | None
+        self, query: str, top_k: int, source_type: str | None, variant: str = ""
     ) -> list[dict] | None:
         """
         Get cached search results.
@@ -397,6 +407,7 @@ class RedisCacheBackend:
             query: Search query
             top_k: Number of results
             source_type: Optional source type filter
+            variant: Extra key material (search mode, filters, corpus version)
 
         Returns:
             Cached search results or None if not found
@@ -404,6 +415,8 @@ class RedisCacheBackend:
         import json
 
         cache_key = f"{query}:{top_k}:{source_type or 'all'}"
+        if variant:
+            cache_key = f"{cache_key}:{variant}"
         key = self._make_key("search", self._hash_content(cache_key))
         data = await self.redis.get(key)
         if data:
@@ -418,6 +431,7 @@ class RedisCacheBackend:
         source_type: str | None,
         results: list[dict],
         ttl: int = 3600,  # 1 hour
+        variant: str = "",
     ) -> None:
         """
         Cache search results.
@@ -428,14 +442,40 @@ class RedisCacheBackend:
             source_type: Optional source type filter
             results: Search results to cache
             ttl: Time-to-live in seconds (default: 1 hour)
+            variant: Extra key material (search mode, filters, corpus version)
         """
         import json
 
         cache_key = f"{query}:{top_k}:{source_type or 'all'}"
+        if variant:
+            cache_key = f"{cache_key}:{variant}"
         key = self._make_key("search", self._hash_content(cache_key))
-        await self.redis.setex(key, ttl, json.dumps(results))
+        await self.redis.setex(key, ttl, json.dumps(results, default=str))
         logger.debug("search_cached", query=query[:30])
 
+    async def get_corpus_version(self) -> int:
+        """
+        Get the corpus version counter.
+
+        Returns:
+            Current version (0 if never incremented)
+        """
+        value = await self.redis.get(self._make_key("meta", "corpus_version"))
+        return int(value) if value else 0
+
+    async def increment_corpus_version(self) -> int:
+        """
+        Increment the corpus version after the indexed content changes.
+
+        Search results are cached under the version they were computed at,
+        so incrementing it invalidates every cached result at once, across
+        all processes sharing this Redis.
+
+        Returns:
+            New version
+        """
+        return await self.redis.incr(self._make_key("meta", "corpus_version"))
+
     async def invalidate_document(self, document_id: str) -> int:
         """
         Invalidate all cache entries for a document.
@@ -20,12 +20,6 @@ from pydantic_settings import BaseSettings
 _env_path = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(_env_path)
 
-# Import ConfigService for future migration
-try:
-    from src.services.config_service import get_config as get_config_service
-except ImportError:
-    get_config_service = None  # type: ignore
-
 
 class SqlAuthType(str, Enum):
     """SQL Server authentication types."""
@@ -43,7 +37,8 @@ class Settings(BaseSettings):
 
     # LLM Provider Selection
     llm_provider: str = Field(
-        default="ollama", description="LLM provider to use: 'ollama' or 'foundry_local'"
+        default="ollama",
+        description="LLM provider to use: 'ollama', 'foundry_local' or 'fake' (load testing)",
     )
 
     # Ollama Configuration
@@ -65,6 +60,40 @@ class Settings(BaseSettings):
         default=False, description="Auto-start Foundry Local using SDK"
     )
 
+    # Provider Status (shared by the CLI, API settings routes and WebSocket push)
+    provider_status_ttl_seconds: float = Field(
+        default=5.0, ge=0, description="Cache provider version/model list responses this long"
+    )
+    provider_status_poll_seconds: float = Field(
+        default=15.0,
+        ge=0,
+        description="Interval of API provider status checks pushed over WebSocket (0 = disabled)",
+    )
+    provider_http_max_connections: int = Field(
+        default=4, ge=1, description="Connection pool size for provider status requests"
+    )
+
+    # Fake LLM Configuration (load testing; see src/providers/fake.py)
+    fake_llm_model: str = Field(default="fake-llm", description="Fake provider model name")
+    fake_llm_ttft_ms: float = Field(
+        default=300.0, ge=0, description="Fake provider mean time to first token"
+    )
+    fake_llm_tokens_per_second: float = Field(
+        default=40.0, ge=0, description="Fake provider decode speed (0 = no inter-token delay)"
+    )
+    fake_llm_jitter: float = Field(
+        default=0.2, ge=0, le=1, description="Fake provider relative latency variation"
+    )
+    fake_llm_response_tokens: int = Field(
+        default=80, ge=1, description="Fake provider generated response length in tokens"
+    )
+    fake_llm_tool_call: str = Field(
+        default="", description="Tool the fake provider calls first in each turn when offered"
+    )
+    fake_llm_script_path: str = Field(
+        default="", description="JSON script of fake provider responses (overrides tool call)"
+    )
+
     # SQL Server Configuration
     sql_server_host: str = Field(default="localhost", description="SQL Server hostname")
     sql_server_port: int = Field(default=1433, description="SQL Server port")
@@ -116,6 +145,65 @@ class Settings(BaseSettings):
     cache_ttl_seconds: int = Field(
         default=3600, description="Cache time-to-live in seconds (0 = no expiration)"
     )
+    widget_cache_ttl_seconds: int = Field(
+        default=60,
+        description="Max age of cached dashboard widget data for widgets without a refresh interval",
+    )
+
+    # Analytics Rollups
+    metrics_rollup_interval_seconds: int = Field(
+        default=60, description="Interval between analytics rollup runs (0 disables the job)"
+    )
+    metrics_rollup_batch_size: int = Field(
+        default=5000, description="Source rows folded into the rollups per transaction"
+    )
+    metrics_rollup_settle_seconds: int = Field(
+        default=30,
+        description="Rows younger than this are left for the next run so late commits are not skipped",
+    )
+
+    # Database Query Profiling
+    db_profiling_enabled: bool = Field(
+        default=True, description="Time every SQL statement on the sample and backend engines"
+    )
+    db_slow_query_threshold_ms: int = Field(
+        default=100, description="Statements slower than this are logged as slow queries"
+    )
+    db_slow_query_log_size: int = Field(
+        default=100, description="Number of recent slow queries kept in memory"
+    )
+    db_profile_max_fingerprints: int = Field(
+        default=500,
+        description="Distinct statement fingerprints tracked per database before folding into 'other'",
+    )
+    db_profile_prometheus_enabled: bool = Field(
+        default=False, description="Expose query latency histograms in Prometheus text format"
+    )
+    db_profile_capture_parameters: bool = Field(
+        default=False,
+        description="Keep raw slow statements and bind parameters (may contain user data)",
+    )
+
+    # Request Tracing
+    tracing_enabled: bool = Field(
+        default=True, description="Record per-turn span timings for agent requests"
+    )
+    tracing_max_traces: int = Field(
+        default=200, description="Number of recent traces kept in memory for the waterfall view"
+    )
+    tracing_export_path: str = Field(
+        default="",
+        description="Append finished traces to this file as OTLP/JSON lines (empty disables)",
+    )
+
+    # Conversation History Configuration
+    history_token_budget: int = Field(
+        default=4000,
+        description="Estimated token budget for conversation history sent with each turn",
+    )
+    history_summary_max_tokens: int = Field(
+        default=400, description="Estimated token budget for the summary of evicted turns"
+    )
 
     # Rate Limiting Configuration
     rate_limit_enabled: bool = Field(
@@ -126,6 +214,23 @@ class Settings(BaseSettings):
         default=10, description="Maximum burst size (requests allowed before throttling)"
     )
 
+    # Alert Evaluation
+    alert_max_concurrency: int = Field(
+        default=10, description="Maximum number of alert queries evaluated concurrently"
+    )
+    alert_query_timeout_seconds: float = Field(
+        default=30.0, description="Timeout for a single alert query in seconds"
+    )
+
+    # WebSocket Fan-out
+    websocket_send_queue_size: int = Field(
+        default=256, description="Outbound message queue size per WebSocket connection"
+    )
+    websocket_slow_consumer_policy: str = Field(
+        default="drop_oldest",
+        description="Action when a WebSocket send queue is full: drop_oldest, drop_newest, disconnect",
+    )
+
     # Docker/SA Password (for docker-compose compatibility)
     mssql_sa_password: str = Field(
         default="", description="SQL Server SA password (used by docker-compose)"
@@ -149,14 +254,62 @@ class Settings(BaseSettings):
         default=True, description="Trust self-signed certificates for backend"
     )
 
+    # Connection pool (shared engines for sample and backend databases)
+    db_pool_size: int = Field(default=10, description="Persistent connections per engine pool")
+    db_max_overflow: int = Field(
+        default=20, description="Extra connections allowed beyond the pool size under load"
+    )
+    db_pool_timeout: int = Field(
+        default=30, description="Seconds to wait for a pooled connection before failing"
+    )
+    db_pool_recycle: int = Field(
+        default=1800, description="Recycle pooled connections older than this many seconds"
+    )
+
     # Vector Store Configuration
     vector_store_type: str = Field(
         default="mssql",
-        description="Vector store type: 'mssql' (SQL Server 2025) or 'redis'",
+        description="Vector store type: 'mssql' (SQL Server 2025), 'redis', or 'local' (on-disk)",
     )
     vector_dimensions: int = Field(
         default=768, description="Embedding dimensions (768 for nomic-embed-text)"
     )
+    vector_encoding: str = Field(
+        default="float32",
+        description="Vector element type for storage/transport: 'float32' or 'float16'",
+    )
+    vector_filter_metadata_keys: str = Field(
+        default="extension",
+        description="Comma-separated chunk metadata keys indexed for search filters",
+    )
+    vector_index_mode: str = Field(
+        default="exact",
+        description="MSSQL vector search mode: 'exact' (VECTOR_DISTANCE) or 'diskann' (ANN index)",
+    )
+    vector_ann_min_rows: int = Field(
+        default=100000, description="Minimum chunk count before a DiskANN index is built"
+    )
+    vector_ann_recall_sample_rate: float = Field(
+        default=0.01, description="Fraction of ANN queries re-run exactly to measure recall"
+    )
+    vector_ann_rebuild_delay_seconds: float = Field(
+        default=30.0,
+        description="Quiet period after chunk writes before the dropped DiskANN index is rebuilt",
+    )
+
+    # Local vector store (memory-mapped, no external server)
+    local_vector_store_path: str = Field(
+        default="./data/vectors", description="Directory of the local vector store files"
+    )
+    local_vector_compaction_ratio: float = Field(
+        default=0.25, description="Deleted-row fraction that triggers local store compaction"
+    )
+    local_vector_ivf_min_rows: int = Field(
+        default=200000, description="Live rows before the local store uses an IVF index (0=never)"
+    )
+    local_vector_ivf_nprobe: int = Field(
+        default=8, description="IVF buckets scanned per local vector search"
+    )
 
     # Redis (for caching, optional vector fallback)
     redis_url: str = Field(default="redis://localhost:6379", description="Redis connection URL")
@@ -165,6 +318,19 @@ class Settings(BaseSettings):
     embedding_model: str = Field(
         default="nomic-embed-text", description="Ollama model for generating embeddings"
     )
+    embedding_initial_concurrency: int = Field(
+        default=4, description="Starting process-wide limit of concurrent embedding requests"
+    )
+    embedding_min_concurrency: int = Field(
+        default=1, description="Lowest concurrency the embedding scheduler backs off to"
+    )
+    embedding_max_concurrency: int = Field(
+        default=16, description="Highest concurrency the embedding scheduler grows to"
+    )
+    embedding_latency_target_ms: float = Field(
+        default=2000.0,
+        description="Embedding request latency above which concurrency is reduced",
+    )
 
     # Storage
     upload_dir: str = Field(
@@ -172,10 +338,44 @@ class Settings(BaseSettings):
     )
     max_upload_size_mb: int = Field(default=100, description="Maximum file upload size in MB")
 
+    # Document ingestion queue
+    ingestion_workers: int = Field(
+        default=2, description="Concurrent ingestion jobs processed by each API process"
+    )
+    ingestion_lease_seconds: int = Field(
+        default=300, description="Lease a worker holds on an ingestion job between heartbeats"
+    )
+    ingestion_checkpoint_chunks: int = Field(
+        default=64, description="Chunks embedded and stored between ingestion checkpoints"
+    )
+    ingestion_max_attempts: int = Field(
+        default=3, description="Attempts before an ingestion job is marked failed"
+    )
+    ingestion_poll_interval_seconds: float = Field(
+        default=2.0, description="Idle ingestion workers poll the queue at this interval"
+    )
+
     # RAG
     chunk_size: int = Field(default=500, description="Document chunk size for RAG")
     chunk_overlap: int = Field(default=50, description="Overlap between document chunks")
     rag_top_k: int = Field(default=5, description="Number of chunks to retrieve for RAG")
+    rag_candidate_count: int = Field(
+        default=50,
+        description="Candidates taken from each of the vector and full-text legs before fusion",
+    )
+    rag_rrf_k: int = Field(default=60, description="Reciprocal rank fusion constant")
+    rag_cache_enabled: bool = Field(
+        default=True, description="Cache query embeddings and vector search results"
+    )
+    rag_cache_max_entries: int = Field(
+        default=1000, description="Maximum entries per in-memory RAG cache (without Redis)"
+    )
+    rag_cache_results_ttl_seconds: int = Field(
+        default=3600, description="Time-to-live of cached vector search results"
+    )
+    rag_cache_embedding_ttl_seconds: int = Field(
+        default=604800, description="Time-to-live of cached query embeddings"
+    )
 
     # Hybrid Search (combines semantic + keyword search)
     rag_hybrid_enabled: bool = Field(
@@ -189,6 +389,13 @@ class Settings(BaseSettings):
     # API
     api_host: str = Field(default="0.0.0.0", description="API server bind address")
     api_port: int = Field(default=8000, description="API server port")
+    startup_step_timeout_seconds: float = Field(
+        default=15.0, description="Upper bound on each service initialization step at startup"
+    )
+    startup_defer_background: bool = Field(
+        default=True,
+        description="Start vector store, schedulers and theme seeding after the API accepts traffic",
+    )
 
     # Host Agent (for Docker service management)
     host_agent_url: str = Field(
@@ -4,9 +4,20 @@ Query History Persistence
 Provides functionality to persist and recall conversation sessions
 using JSON file storage. Enables users to review and continue
 previous conversations.
+
+Session metadata and turn content are indexed in a SQLite database
+(with an FTS5 full-text table when available) alongside the JSON files,
+so listing and searching never parse full session files. JSON files
+without an index entry, or modified outside the manager, are indexed
+lazily on the next list or search.
 """
 
+import hashlib
 import json
+import os
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from uuid import uuid4
@@ -21,6 +32,12 @@ logger = get_logger(__name__)
 # Default history directory
 DEFAULT_HISTORY_DIR = Path.home() / ".local-llm-agent" / "history"
 
+# Index database file name (inside the history directory)
+INDEX_FILENAME = "sessions.db"
+
+# Bumped when the index schema changes; the index is rebuilt from JSON files
+INDEX_SCHEMA_VERSION = 1
+
 
 class SessionMetadata(BaseModel):
     """Metadata for a conversation session."""
@@ -111,11 +128,376 @@ class SessionData(BaseModel):
         return conversation
 
 
+def _turns_digest(turns: list[dict], previous: str = "") -> str:
+    """
+    Compute a rolling digest over turn content.
+
+    Args:
+        turns: Turn dicts to fold into the digest
+        previous: Digest of the turns preceding ``turns``
+
+    Returns:
+        Hex digest identifying the turn sequence
+    """
+    digest = previous
+    for turn in turns:
+        h = hashlib.sha1(digest.encode("utf-8"))
+        h.update(turn.get("user_message", "").encode("utf-8"))
+        h.update(b"\x00")
+        h.update(turn.get("assistant_message", "").encode("utf-8"))
+        digest = h.hexdigest()
+    return digest
+
+
+def _fts_query(query: str) -> str:
+    """Build an FTS5 prefix query matching all words of the user query."""
+    words = ["".join(ch for ch in word if ch.isalnum()) for word in query.split()]
+    return " ".join(f'"{word}"*' for word in words if word)
+
+
+class SessionIndex:
+    """
+    SQLite index of session metadata and turn content.
+
+    Titles and turns are stored in an indexed table backing an FTS5
+    external-content index for ranked full-text search; if the SQLite
+    build lacks FTS5, search falls back to LIKE matching.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Open (and create if needed) the session index.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.fts_enabled = True
+        self._batch_depth = 0
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create index tables if they don't exist."""
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_SCHEMA_VERSION:
+            # The index only holds data derived from the JSON files
+            with self._conn:
+                # Virtual tables first; dropping them also drops their shadow tables
+                for virtual_first in (True, False):
+                    for row in self._conn.execute(
+                        "SELECT name, sql FROM sqlite_master "
+                        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                    ).fetchall():
+                        if (row["sql"] or "").upper().startswith("CREATE VIRTUAL") == virtual_first:
+                            self._conn.execute(f'DROP TABLE IF EXISTS "{row["name"]}"')
+                self._conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            logger.info("session_index_reset", path=str(self.db_path))
+
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    turn_count INTEGER NOT NULL DEFAULT 0,
+                    total_duration_ms REAL NOT NULL DEFAULT 0,
+                    provider TEXT NOT NULL DEFAULT '',
+                    model TEXT NOT NULL DEFAULT '',
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    turns_digest TEXT NOT NULL DEFAULT '',
+                    file_mtime_ns INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_sessions_updated_at ON sessions (updated_at)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_tags (
+                    session_id TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (tag, session_id)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS session_text (
+                    id INTEGER PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    turn_index INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    content TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_session_text_session ON session_text (session_id)"
+            )
+            try:
+                # External-content FTS index kept in sync by triggers
+                self._conn.execute(
+                    """
+                    CREATE VIRTUAL TABLE IF NOT EXISTS session_fts USING fts5(
+                        content, content='session_text', content_rowid='id'
+                    )
+                    """
+                )
+            except sqlite3.OperationalError:
+                self.fts_enabled = False
+                return
+            self._conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS session_text_ai AFTER INSERT ON session_text BEGIN
+                    INSERT INTO session_fts (rowid, content) VALUES (new.id, new.content);
+                END
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS session_text_ad AFTER DELETE ON session_text BEGIN
+                    INSERT INTO session_fts (session_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END
+                """
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group index writes into a single transaction."""
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            return
+
+        self._batch_depth = 1
+        try:
+            with self._conn:
+                yield
+        finally:
+            self._batch_depth = 0
+
+    def get_indexed_files(self) -> dict[str, int]:
+        """Get indexed session IDs mapped to the file mtime they were indexed at."""
+        rows = self._conn.execute("SELECT session_id, file_mtime_ns FROM sessions")
+        return {row["session_id"]: row["file_mtime_ns"] for row in rows}
+
+    def get_created_at(self, session_id: str) -> datetime | None:
+        """Get the creation time of an indexed session."""
+        row = self._conn.execute(
+            "SELECT created_at FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return datetime.fromisoformat(row["created_at"]) if row else None
+
+    def upsert(self, metadata: SessionMetadata, turns: list[dict], file_mtime_ns: int = 0) -> None:
+        """
+        Index a session, appending only turns not already indexed.
+
+        Args:
+            metadata: Session metadata
+            turns: All turns of the session
+            file_mtime_ns: Modification time of the session's JSON file
+        """
+        session_id = metadata.session_id
+        row = self._conn.execute(
+            "SELECT turn_count, turns_digest, title FROM sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+
+        # Reuse indexed turns when they are a prefix of the new ones
+        start = 0
+        digest = ""
+        if row is not None and row["turn_count"] <= len(turns):
+            prefix_digest = _turns_digest(turns[: row["turn_count"]])
+            if prefix_digest == row["turns_digest"]:
+                start = row["turn_count"]
+                digest = prefix_digest
+        digest = _turns_digest(turns[start:], digest)
+
+        with self.batch():
+            if start == 0:
+                self._conn.execute("DELETE FROM session_text WHERE session_id = ?", (session_id,))
+            elif row["title"] != metadata.title:
+                self._conn.execute(
+                    "DELETE FROM session_text WHERE session_id = ? AND kind = 'title'",
+                    (session_id,),
+                )
+            if start == 0 or row["title"] != metadata.title:
+                self._conn.execute(
+                    "INSERT INTO session_text (session_id, turn_index, kind, content) "
+                    "VALUES (?, -1, 'title', ?)",
+                    (session_id, metadata.title),
+                )
+            self._conn.executemany(
+                "INSERT INTO session_text (session_id, turn_index, kind, content) "
+                "VALUES (?, ?, 'turn', ?)",
+                [
+                    (
+                        session_id,
+                        index,
+                        f"{turn.get('user_message', '')}\n{turn.get('assistant_message', '')}",
+                    )
+                    for index, turn in enumerate(turns[start:], start=start)
+                ],
+            )
+            self._conn.execute(
+                """
+                INSERT INTO sessions (
+                    session_id, title, created_at, updated_at, turn_count, total_duration_ms,
+                    provider, model, tags, turns_digest, file_mtime_ns
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (session_id) DO UPDATE SET
+                    title = excluded.title,
+                    created_at = excluded.created_at,
+                    updated_at = excluded.updated_at,
+                    turn_count = excluded.turn_count,
+                    total_duration_ms = excluded.total_duration_ms,
+                    provider = excluded.provider,
+                    model = excluded.model,
+                    tags = excluded.tags,
+                    turns_digest = excluded.turns_digest,
+                    file_mtime_ns = excluded.file_mtime_ns
+                """,
+                (
+                    session_id,
+                    metadata.title,
+                    metadata.created_at.isoformat(),
+                    metadata.updated_at.isoformat(),
+                    metadata.turn_count,
+                    metadata.total_duration_ms,
+                    metadata.provider,
+                    metadata.model,
+                    json.dumps(metadata.tags),
+                    digest,
+                    file_mtime_ns,
+                ),
+            )
+            self._conn.execute("DELETE FROM session_tags WHERE session_id = ?", (session_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO session_tags (session_id, tag) VALUES (?, ?)",
+                [(session_id, tag) for tag in metadata.tags],
+            )
+
+    def delete(self, session_ids: list[str]) -> None:
+        """Remove sessions from the index."""
+        with self.batch():
+            for table in ("sessions", "session_tags", "session_text"):
+                self._conn.executemany(
+                    f"DELETE FROM {table} WHERE session_id = ?",
+                    [(session_id,) for session_id in session_ids],
+                )
+
+    def clear(self) -> None:
+        """Remove all sessions from the index."""
+        with self.batch():
+            for table in ("sessions", "session_tags", "session_text"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    @staticmethod
+    def _row_to_metadata(row: sqlite3.Row) -> SessionMetadata:
+        """Convert a sessions row to SessionMetadata."""
+        return SessionMetadata(
+            session_id=row["session_id"],
+            title=row["title"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            turn_count=row["turn_count"],
+            total_duration_ms=row["total_duration_ms"],
+            provider=row["provider"],
+            model=row["model"],
+            tags=json.loads(row["tags"]),
+        )
+
+    def list_sessions(
+        self, limit: int | None = None, offset: int = 0, tags: list[str] | None = None
+    ) -> list[SessionMetadata]:
+        """
+        List indexed sessions, most recently updated first.
+
+        Args:
+            limit: Maximum number of sessions to return
+            offset: Number of sessions to skip
+            tags: Filter by tags (any match)
+
+        Returns:
+            List of session metadata
+        """
+        sql = "SELECT * FROM sessions s"
+        params: list = []
+        if tags:
+            placeholders = ", ".join("?" for _ in tags)
+            sql += (
+                " WHERE EXISTS (SELECT 1 FROM session_tags t"
+                f" WHERE t.session_id = s.session_id AND t.tag IN ({placeholders}))"
+            )
+            params.extend(tags)
+        sql += " ORDER BY s.updated_at DESC, s.rowid DESC LIMIT ? OFFSET ?"
+        params.extend([limit if limit else -1, offset])
+        return [self._row_to_metadata(row) for row in self._conn.execute(sql, params)]
+
+    def search_sessions(
+        self, query: str, limit: int = 10, offset: int = 0
+    ) -> list[SessionMetadata]:
+        """
+        Search session titles and turn content.
+
+        Title matches rank first, then full-text relevance, then recency.
+
+        Args:
+            query: Search query
+            limit: Maximum results
+            offset: Number of results to skip
+
+        Returns:
+            List of matching session metadata
+        """
+        if self.fts_enabled:
+            match = _fts_query(query)
+            if not match:
+                return []
+            hits = """
+                SELECT t.session_id, MAX(t.kind = 'title') AS title_hit, MIN(f.rank) AS score
+                FROM session_fts f JOIN session_text t ON t.id = f.rowid
+                WHERE session_fts MATCH ?
+                GROUP BY t.session_id
+            """
+        else:
+            match = f"%{query.lower()}%"
+            hits = """
+                SELECT session_id, MAX(kind = 'title') AS title_hit, 0 AS score
+                FROM session_text WHERE lower(content) LIKE ?
+                GROUP BY session_id
+            """
+        sql = f"""
+            SELECT s.* FROM ({hits}) h JOIN sessions s ON s.session_id = h.session_id
+            ORDER BY h.title_hit DESC, h.score ASC, s.updated_at DESC
+            LIMIT ? OFFSET ?
+        """
+        rows = self._conn.execute(sql, (match, limit if limit else -1, offset))
+        return [self._row_to_metadata(row) for row in rows]
+
+
 class HistoryManager:
     """
     Manages conversation history persistence.
 
-    Stores sessions as JSON files in a configurable directory.
+    Stores sessions as JSON files in a configurable directory, indexed
+    in SQLite for fast listing and full-text search.
     Supports listing, loading, saving, and deleting sessions.
 
     Usage:
@@ -143,6 +525,7 @@ class HistoryManager:
         """
         self.history_dir = Path(history_dir) if history_dir else DEFAULT_HISTORY_DIR
         self._ensure_directory()
+        self._index = SessionIndex(self.history_dir / INDEX_FILENAME)
 
     def _ensure_directory(self) -> None:
         """Ensure the history directory exists."""
@@ -153,6 +536,39 @@ class HistoryManager:
         """Get the file path for a session."""
         return self.history_dir / f"{session_id}.json"
 
+    def _sync_index(self) -> None:
+        """
+        Index session files that are new or changed since they were indexed.
+
+        Only file names and modification times are compared; a session file
+        is parsed only when it needs (re)indexing. Index entries whose file
+        was removed are dropped.
+        """
+        indexed = self._index.get_indexed_files()
+        seen: set[str] = set()
+
+        with os.scandir(self.history_dir) as entries, self._index.batch():
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                session_id = entry.name[: -len(".json")]
+                seen.add(session_id)
+                mtime_ns = entry.stat().st_mtime_ns
+                if indexed.get(session_id) == mtime_ns:
+                    continue
+                try:
+                    data = json.loads(Path(entry.path).read_text(encoding="utf-8"))
+                    metadata = SessionMetadata.from_dict(data.get("metadata", {}))
+                    metadata.session_id = session_id
+                    self._index.upsert(metadata, data.get("turns", []), mtime_ns)
+                    logger.debug("session_indexed", session_id=session_id)
+                except Exception as e:
+                    logger.warning("session_list_error", filepath=entry.path, error=str(e))
+
+        removed = [session_id for session_id in indexed if session_id not in seen]
+        if removed:
+            self._index.delete(removed)
+
     def _generate_title(self, conversation: Conversation) -> str:
         """Generate a title from the first user message."""
         if conversation.turns:
@@ -214,7 +630,10 @@ class HistoryManager:
 
         # Check if updating existing session
         existing_path = self._get_session_path(session_id)
-        if existing_path.exists():
+        created_at = self._index.get_created_at(session_id)
+        if created_at is not None:
+            metadata.created_at = created_at
+        elif existing_path.exists():
             try:
                 existing_data = json.loads(existing_path.read_text(encoding="utf-8"))
                 metadata.created_at = datetime.fromisoformat(
@@ -233,6 +652,9 @@ class HistoryManager:
             encoding="utf-8",
         )
 
+        # Index metadata and any turns not indexed yet
+        self._index.upsert(metadata, turns, filepath.stat().st_mtime_ns)
+
         logger.info("session_saved", session_id=session_id, turns=len(turns))
         return session_id
 
@@ -264,6 +686,7 @@ class HistoryManager:
         self,
         limit: int | None = None,
         tags: list[str] | None = None,
+        offset: int = 0,
     ) -> list[SessionMetadata]:
         """
         List all available sessions.
@@ -271,32 +694,13 @@ class HistoryManager:
         Args:
             limit: Maximum number of sessions to return
             tags: Filter by tags (any match)
+            offset: Number of sessions to skip (for pagination)
 
         Returns:
             List of session metadata, sorted by updated_at descending
         """
-        sessions = []
-
-        for filepath in self.history_dir.glob("*.json"):
-            try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                metadata = SessionMetadata.from_dict(data.get("metadata", {}))
-
-                # Filter by tags if specified
-                if tags and not any(tag in metadata.tags for tag in tags):
-                    continue
-
-                sessions.append(metadata)
-            except Exception as e:
-                logger.warning("session_list_error", filepath=str(filepath), error=str(e))
-
-        # Sort by updated_at descending
-        sessions.sort(key=lambda s: s.updated_at, reverse=True)
-
-        if limit:
-            sessions = sessions[:limit]
-
-        return sessions
+        self._sync_index()
+        return self._index.list_sessions(limit=limit, offset=offset, tags=tags)
 
     def delete_session(self, session_id: str) -> bool:
         """
@@ -311,6 +715,7 @@ class HistoryManager:
         filepath = self._get_session_path(session_id)
         if filepath.exists():
             filepath.unlink()
+            self._index.delete([session_id])
             logger.info("session_deleted", session_id=session_id)
             return True
         return False
@@ -326,50 +731,28 @@ class HistoryManager:
         for filepath in self.history_dir.glob("*.json"):
             filepath.unlink()
             count += 1
+        self._index.clear()
 
         logger.info("all_sessions_cleared", count=count)
         return count
 
-    def search_sessions(self, query: str, limit: int = 10) -> list[SessionMetadata]:
+    def search_sessions(
+        self, query: str, limit: int = 10, offset: int = 0
+    ) -> list[SessionMetadata]:
         """
         Search sessions by title or content.
 
         Args:
             query: Search query
             limit: Maximum results
+            offset: Number of results to skip (for pagination)
 
         Returns:
-            List of matching session metadata
+            List of matching session metadata, title matches first, then by
+            full-text relevance and date
         """
-        query_lower = query.lower()
-        results = []
-
-        for filepath in self.history_dir.glob("*.json"):
-            try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
-                metadata = SessionMetadata.from_dict(data.get("metadata", {}))
-
-                # Search in title
-                if query_lower in metadata.title.lower():
-                    results.append(metadata)
-                    continue
-
-                # Search in turn content
-                for turn in data.get("turns", []):
-                    if query_lower in turn.get("user_message", "").lower():
-                        results.append(metadata)
-                        break
-                    if query_lower in turn.get("assistant_message", "").lower():
-                        results.append(metadata)
-                        break
-
-            except Exception:
-                continue
-
-        # Sort by relevance (title match first) and then by date
-        results.sort(key=lambda s: (query_lower in s.title.lower(), s.updated_at), reverse=True)
-
-        return results[:limit]
+        self._sync_index()
+        return self._index.search_sessions(query, limit=limit, offset=offset)
 
 
 # Singleton instance
@@ -0,0 +1,50 @@
+"""
+Lazy Imports
+
+Helpers for package ``__init__`` modules that re-export heavy submodules.
+Names are imported on first attribute access (PEP 562) instead of when the
+package is imported, so e.g. ``import src.rag`` or the CLI's ``--help`` does
+not pay for Pydantic AI, Docling, Redis or SQLAlchemy until they are used.
+"""
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    module_name: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a module with lazy exports.
+
+    Usage in a package ``__init__``::
+
+        __getattr__, __dir__ = lazy_exports(__name__, {"RedisVectorStore": "src.rag.redis_vector_store"})
+
+    Imported values are cached in the module's globals, so only the first
+    access goes through ``__getattr__`` (and ``unittest.mock.patch`` works as
+    with a regular import).
+
+    Args:
+        module_name: ``__name__`` of the module defining the exports
+        exports: Exported name -> module to import it from
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign at module level
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            source = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(source), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
@@ -3,19 +3,121 @@ Query Profiler
 Phase 2.1: Backend Infrastructure & RAG Pipeline
 
 SQLAlchemy query performance profiler using event listeners.
-Logs slow queries and provides aggregate statistics.
+
+Every statement is timed per execution (the start time travels on the
+execution context, so concurrent statements on one connection or across
+connections never overwrite each other) and aggregated by fingerprint: the
+SQL text with literals and bind markers replaced by ``?``. Each fingerprint
+keeps a cumulative latency histogram and a quantile sketch, slow statements
+go into a fixed-size ring buffer, and the whole state can be rendered in
+the Prometheus text exposition format.
+
+Slow queries are kept as their normalized text without bind parameters
+unless raw capture is enabled, so the profile never holds user data.
 """
 
-import logging
+import hashlib
+import re
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from typing import Any
 
+import structlog
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
-logger = logging.getLogger(__name__)
+from src.utils.sketch import QuantileSketch
+from src.utils.tracing import record_span
+
+logger = structlog.get_logger()
+
+# Cumulative latency histogram bounds (milliseconds), Prometheus style
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Fingerprints beyond the cap are folded into this entry to bound memory
+OVERFLOW_FINGERPRINT = "other"
+
+_START_ATTR = "_profiler_start_time"
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w@$.])-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+_BIND_MARKER = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|@P\d+|\$\d+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Normalize SQL into its fingerprint text.
+
+    String and numeric literals and every bind-marker style become ``?``,
+    ``IN (?, ?, ?)`` lists collapse to ``(?)`` and whitespace is collapsed,
+    so executions differing only in values share a fingerprint.
+
+    Args:
+        statement: SQL statement text
+
+    Returns:
+        Normalized statement
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_MARKER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(statement: str) -> str:
+    """Short stable id of a normalized statement."""
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:12]
+
+
+@dataclass
+class FingerprintStats:
+    """Latency statistics for one statement fingerprint."""
+
+    fingerprint: str
+    database: str
+    statement: str
+    count: int = 0
+    total_time_ms: float = 0.0
+    min_time_ms: float = float("inf")
+    max_time_ms: float = 0.0
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_MS))
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def record(self, execution_time_ms: float) -> None:
+        """Record one execution."""
+        self.count += 1
+        self.total_time_ms += execution_time_ms
+        self.min_time_ms = min(self.min_time_ms, execution_time_ms)
+        self.max_time_ms = max(self.max_time_ms, execution_time_ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if execution_time_ms <= bound:
+                self.bucket_counts[i] += 1
+        self.sketch.add(execution_time_ms)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "fingerprint": self.fingerprint,
+            "database": self.database,
+            "statement": self.statement,
+            "count": self.count,
+            "total_time_ms": round(self.total_time_ms, 2),
+            "avg_time_ms": round(self.total_time_ms / self.count, 2) if self.count else 0.0,
+            "min_time_ms": round(self.min_time_ms, 2) if self.count else 0.0,
+            "max_time_ms": round(self.max_time_ms, 2),
+            "p50_ms": _round(self.sketch.quantile(0.5)),
+            "p95_ms": _round(self.sketch.quantile(0.95)),
+            "p99_ms": _round(self.sketch.quantile(0.99)),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
 
 
 @dataclass
@@ -29,48 +131,86 @@ class QueryStats:
     min_time_ms: float = float("inf")
     max_time_ms: float = 0.0
     queries_by_table: dict[str, int] = field(default_factory=lambda: defaultdict(int))
-    slow_query_log: list[dict[str, Any]] = field(default_factory=list)
+    slow_query_log: deque[dict[str, Any]] = field(default_factory=deque)
+    fingerprints: dict[tuple[str, str], FingerprintStats] = field(default_factory=dict)
 
 
 class QueryProfiler:
-    """SQLAlchemy query profiler with slow query detection."""
+    """SQLAlchemy query profiler with slow query detection and fingerprint histograms."""
 
-    def __init__(self, slow_query_threshold_ms: int = 100, max_slow_queries: int = 100):
+    def __init__(
+        self,
+        slow_query_threshold_ms: int = 100,
+        max_slow_queries: int = 100,
+        max_fingerprints: int = 500,
+        capture_parameters: bool = False,
+    ):
         """
         Initialize query profiler.
 
         Args:
             slow_query_threshold_ms: Queries slower than this are logged (default: 100ms)
             max_slow_queries: Maximum number of slow queries to retain (default: 100)
+            max_fingerprints: Distinct fingerprints tracked per database before
+                new ones are folded into an "other" entry (default: 500)
+            capture_parameters: Keep raw statements and bind parameters of slow
+                queries instead of their normalized text (default: False)
         """
         self.slow_query_threshold_ms = slow_query_threshold_ms
         self.max_slow_queries = max_slow_queries
-        self.stats = QueryStats()
-        self._query_start_times: dict[Any, float] = {}
+        self.max_fingerprints = max_fingerprints
+        self.capture_parameters = capture_parameters
+        self.stats = self._new_stats()
+        self._lock = threading.Lock()
+        self._listeners: dict[int, tuple[Engine, Any, Any]] = {}
+
+    def _new_stats(self) -> QueryStats:
+        return QueryStats(slow_query_log=deque(maxlen=self.max_slow_queries))
 
-    def enable(self, engine: Engine) -> None:
+    def enable(self, engine: Any, database: str = "default") -> None:
         """
         Enable query profiling on a SQLAlchemy engine.
 
         Args:
-            engine: SQLAlchemy engine to profile
+            engine: SQLAlchemy engine (sync or async) to profile
+            database: Label reported with this engine's statements
         """
-        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
-        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        target = getattr(engine, "sync_engine", engine)
+        if id(target) in self._listeners:
+            return
+
+        def before(conn, cursor, statement, parameters, context, executemany):
+            self._before_cursor_execute(conn, cursor, statement, parameters, context, executemany)
+
+        def after(conn, cursor, statement, parameters, context, executemany):
+            self._after_cursor_execute(
+                conn, cursor, statement, parameters, context, executemany, database=database
+            )
+
+        event.listen(target, "before_cursor_execute", before)
+        event.listen(target, "after_cursor_execute", after)
+        self._listeners[id(target)] = (target, before, after)
         logger.info(
-            f"Query profiler enabled (slow query threshold: {self.slow_query_threshold_ms}ms)"
+            "query_profiler_enabled",
+            database=database,
+            slow_query_threshold_ms=self.slow_query_threshold_ms,
         )
 
-    def disable(self, engine: Engine) -> None:
+    def disable(self, engine: Any) -> None:
         """
         Disable query profiling on a SQLAlchemy engine.
 
         Args:
             engine: SQLAlchemy engine to stop profiling
         """
-        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
-        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
-        logger.info("Query profiler disabled")
+        target = getattr(engine, "sync_engine", engine)
+        listeners = self._listeners.pop(id(target), None)
+        if listeners is None:
+            return
+        _, before, after = listeners
+        event.remove(target, "before_cursor_execute", before)
+        event.remove(target, "after_cursor_execute", after)
+        logger.info("query_profiler_disabled")
 
     def _before_cursor_execute(
         self,
@@ -82,8 +222,11 @@ class QueryProfiler:
         executemany: bool,
     ) -> None:
         """Event listener: Called before query execution."""
-        conn_id = id(conn)
-        self._query_start_times[conn_id] = time.perf_counter()
+        now = time.perf_counter()
+        if context is not None:
+            setattr(context, _START_ATTR, now)
+        else:
+            conn.info.setdefault(_START_ATTR, []).append(now)
 
     def _after_cursor_execute(
         self,
@@ -93,31 +236,95 @@ class QueryProfiler:
         parameters: Any,
         context: Any,
         executemany: bool,
+        database: str = "default",
     ) -> None:
         """Event listener: Called after query execution."""
-        conn_id = id(conn)
-        start_time = self._query_start_times.pop(conn_id, None)
+        if context is not None:
+            start_time = getattr(context, _START_ATTR, None)
+        else:
+            starts = conn.info.get(_START_ATTR)
+            start_time = starts.pop() if starts else None
 
         if start_time is None:
             return
 
-        # Calculate execution time
-        execution_time = time.perf_counter() - start_time
-        execution_time_ms = execution_time * 1000
-
-        # Update statistics
-        self.stats.total_queries += 1
-        self.stats.total_time_ms += execution_time_ms
-        self.stats.avg_time_ms = self.stats.total_time_ms / self.stats.total_queries
-        self.stats.min_time_ms = min(self.stats.min_time_ms, execution_time_ms)
-        self.stats.max_time_ms = max(self.stats.max_time_ms, execution_time_ms)
+        execution_time_ms = (time.perf_counter() - start_time) * 1000
+        self.record(statement, execution_time_ms, parameters=parameters, database=database)
 
-        # Track queries by table (simple heuristic)
-        self._track_table_usage(statement)
+    def record(
+        self,
+        statement: str,
+        execution_time_ms: float,
+        parameters: Any = None,
+        database: str = "default",
+    ) -> None:
+        """
+        Record one statement execution.
 
-        # Log slow queries
-        if execution_time_ms >= self.slow_query_threshold_ms:
-            self._log_slow_query(statement, parameters, execution_time_ms)
+        Args:
+            statement: SQL statement text
+            execution_time_ms: Execution time in milliseconds
+            parameters: Bound parameters (kept only for slow queries, and only
+                when parameter capture is enabled)
+            database: Database label
+        """
+        normalized = normalize_statement(statement)
+        key_fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+        # Literals and bind values may be user data: only the fingerprint text by default
+        logged_statement = statement if self.capture_parameters else normalized
+        if not self.capture_parameters:
+            parameters = None
+
+        with self._lock:
+            stats = self.stats
+            stats.total_queries += 1
+            stats.total_time_ms += execution_time_ms
+            stats.avg_time_ms = stats.total_time_ms / stats.total_queries
+            stats.min_time_ms = min(stats.min_time_ms, execution_time_ms)
+            stats.max_time_ms = max(stats.max_time_ms, execution_time_ms)
+
+            entry = stats.fingerprints.get((database, key_fingerprint))
+            if entry is None:
+                tracked = sum(1 for db, _ in stats.fingerprints if db == database)
+                if tracked >= self.max_fingerprints:
+                    key_fingerprint, normalized = OVERFLOW_FINGERPRINT, OVERFLOW_FINGERPRINT
+                    entry = stats.fingerprints.get((database, key_fingerprint))
+                if entry is None:
+                    entry = FingerprintStats(
+                        fingerprint=key_fingerprint, database=database, statement=normalized
+                    )
+                    stats.fingerprints[(database, key_fingerprint)] = entry
+            entry.record(execution_time_ms)
+
+            # Track queries by table (simple heuristic)
+            self._track_table_usage(statement)
+
+            is_slow = execution_time_ms >= self.slow_query_threshold_ms
+            if is_slow:
+                stats.slow_queries += 1
+                # Ring buffer: the deque drops the oldest entry in O(1)
+                stats.slow_query_log.append(
+                    {
+                        "statement": logged_statement,
+                        "fingerprint": key_fingerprint,
+                        "database": database,
+                        "parameters": str(parameters) if parameters else None,
+                        "execution_time_ms": round(execution_time_ms, 2),
+                        "timestamp": time.time(),
+                    }
+                )
+
+        # Attach the statement to the active request trace, if any
+        record_span("db.query", execution_time_ms, database=database, fingerprint=key_fingerprint)
+
+        if is_slow:
+            logger.warning(
+                "slow_query_detected",
+                database=database,
+                fingerprint=key_fingerprint,
+                execution_time_ms=round(execution_time_ms, 2),
+                statement=logged_statement[:200],
+            )
 
     def _track_table_usage(self, statement: str) -> None:
         """Track which tables are being queried (simple heuristic)."""
@@ -129,32 +336,14 @@ class QueryProfiler:
                 parts = statement_upper.split(keyword)
                 if len(parts) > 1:
                     # Extract table name (first word after keyword)
-                    table_part = parts[1].strip().split()[0]
+                    words = parts[1].strip().split()
+                    if not words:
+                        continue
                     # Clean up table name
-                    table_name = table_part.strip("(),[]").lower()
+                    table_name = words[0].strip("(),[]").lower()
                     if table_name and not table_name.startswith("("):
                         self.stats.queries_by_table[table_name] += 1
 
-    def _log_slow_query(self, statement: str, parameters: Any, execution_time_ms: float) -> None:
-        """Log a slow query."""
-        self.stats.slow_queries += 1
-
-        # Create slow query record
-        slow_query = {
-            "statement": statement,
-            "parameters": str(parameters) if parameters else None,
-            "execution_time_ms": round(execution_time_ms, 2),
-            "timestamp": time.time(),
-        }
-
-        # Add to slow query log (keep only most recent)
-        self.stats.slow_query_log.append(slow_query)
-        if len(self.stats.slow_query_log) > self.max_slow_queries:
-            self.stats.slow_query_log.pop(0)
-
-        # Log warning
-        logger.warning(f"Slow query detected ({execution_time_ms:.2f}ms): {statement[:200]}")
-
     def get_stats(self) -> dict[str, Any]:
         """
         Get current profiling statistics.
@@ -162,21 +351,42 @@ class QueryProfiler:
         Returns:
             Dictionary with profiling statistics
         """
-        return {
-            "total_queries": self.stats.total_queries,
-            "total_time_ms": round(self.stats.total_time_ms, 2),
-            "avg_time_ms": round(self.stats.avg_time_ms, 2),
-            "min_time_ms": round(self.stats.min_time_ms, 2)
-            if self.stats.min_time_ms != float("inf")
-            else 0.0,
-            "max_time_ms": round(self.stats.max_time_ms, 2),
-            "slow_queries": self.stats.slow_queries,
-            "slow_query_threshold_ms": self.slow_query_threshold_ms,
-            "queries_by_table": dict(self.stats.queries_by_table),
-            "top_tables": sorted(
-                self.stats.queries_by_table.items(), key=lambda x: x[1], reverse=True
-            )[:10],
-        }
+        with self._lock:
+            stats = self.stats
+            return {
+                "total_queries": stats.total_queries,
+                "total_time_ms": round(stats.total_time_ms, 2),
+                "avg_time_ms": round(stats.avg_time_ms, 2),
+                "min_time_ms": round(stats.min_time_ms, 2)
+                if stats.min_time_ms != float("inf")
+                else 0.0,
+                "max_time_ms": round(stats.max_time_ms, 2),
+                "slow_queries": stats.slow_queries,
+                "slow_query_threshold_ms": self.slow_query_threshold_ms,
+                "fingerprint_count": len(stats.fingerprints),
+                "queries_by_table": dict(stats.queries_by_table),
+                "top_tables": sorted(
+                    stats.queries_by_table.items(), key=lambda x: x[1], reverse=True
+                )[:10],
+            }
+
+    def get_fingerprints(
+        self, limit: int = 20, sort_by: str = "total_time_ms"
+    ) -> list[dict[str, Any]]:
+        """
+        Get per-fingerprint latency statistics.
+
+        Args:
+            limit: Maximum number of fingerprints to return
+            sort_by: Field to sort by, descending (total_time_ms, count, p95_ms, max_time_ms)
+
+        Returns:
+            List of fingerprint statistics
+        """
+        with self._lock:
+            entries = [entry.to_dict() for entry in self.stats.fingerprints.values()]
+        entries.sort(key=lambda e: e.get(sort_by) or 0, reverse=True)
+        return entries[:limit]
 
     def get_slow_queries(self, limit: int = 20) -> list[dict[str, Any]]:
         """
@@ -186,28 +396,70 @@ class QueryProfiler:
             limit: Maximum number of slow queries to return
 
         Returns:
-            List of slow query records
+            List of slow query records, oldest first
+        """
+        with self._lock:
+            return list(self.stats.slow_query_log)[-limit:]
+
+    def render_prometheus(self) -> str:
         """
-        return self.stats.slow_query_log[-limit:]
+        Render statistics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text with a per-fingerprint latency histogram and slow query counter
+        """
+        lines = [
+            "# HELP db_query_duration_seconds Database statement latency by fingerprint.",
+            "# TYPE db_query_duration_seconds histogram",
+        ]
+        with self._lock:
+            entries = list(self.stats.fingerprints.values())
+            slow_queries = self.stats.slow_queries
+            for entry in entries:
+                labels = f'database="{entry.database}",fingerprint="{entry.fingerprint}"'
+                for bound, count in zip(LATENCY_BUCKETS_MS, entry.bucket_counts, strict=True):
+                    lines.append(
+                        f'db_query_duration_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {count}'
+                    )
+                lines.append(
+                    f'db_query_duration_seconds_bucket{{{labels},le="+Inf"}} {entry.count}'
+                )
+                lines.append(
+                    f"db_query_duration_seconds_sum{{{labels}}} {entry.total_time_ms / 1000:.6f}"
+                )
+                lines.append(f"db_query_duration_seconds_count{{{labels}}} {entry.count}")
+        lines += [
+            "# HELP db_slow_queries_total Statements slower than the slow query threshold.",
+            "# TYPE db_slow_queries_total counter",
+            f"db_slow_queries_total {slow_queries}",
+        ]
+        return "\n".join(lines) + "\n"
 
     def reset(self) -> None:
         """Reset all profiling statistics."""
-        self.stats = QueryStats()
-        self._query_start_times.clear()
-        logger.info("Query profiler statistics reset")
+        with self._lock:
+            self.stats = self._new_stats()
+        logger.info("query_profiler_reset")
 
 
 # Global profiler instance
 _profiler: QueryProfiler | None = None
 
 
-def get_profiler(slow_query_threshold_ms: int = 100, max_slow_queries: int = 100) -> QueryProfiler:
+def get_profiler(
+    slow_query_threshold_ms: int = 100,
+    max_slow_queries: int = 100,
+    max_fingerprints: int = 500,
+    capture_parameters: bool = False,
+) -> QueryProfiler:
     """
     Get or create the global query profiler instance.
 
     Args:
         slow_query_threshold_ms: Threshold for slow query logging
         max_slow_queries: Maximum number of slow queries to retain
+        max_fingerprints: Distinct fingerprints tracked per database
+        capture_parameters: Keep raw slow statements and their bind parameters
 
     Returns:
         QueryProfiler instance
@@ -217,23 +469,28 @@ def get_profiler(slow_query_threshold_ms: int = 100, max_slow_queries: int = 100
         _profiler = QueryProfiler(
             slow_query_threshold_ms=slow_query_threshold_ms,
             max_slow_queries=max_slow_queries,
+            max_fingerprints=max_fingerprints,
+            capture_parameters=capture_parameters,
         )
     return _profiler
 
 
-def enable_profiling(engine: Engine, slow_query_threshold_ms: int = 100) -> None:
+def enable_profiling(
+    engine: Any, slow_query_threshold_ms: int = 100, database: str = "default"
+) -> None:
     """
     Enable query profiling on an engine.
 
     Args:
-        engine: SQLAlchemy engine
+        engine: SQLAlchemy engine (sync or async)
         slow_query_threshold_ms: Threshold for slow query logging
+        database: Label reported with this engine's statements
     """
     profiler = get_profiler(slow_query_threshold_ms=slow_query_threshold_ms)
-    profiler.enable(engine)
+    profiler.enable(engine, database=database)
 
 
-def disable_profiling(engine: Engine) -> None:
+def disable_profiling(engine: Any) -> None:
     """
     Disable query profiling on an engine.
 
@@ -0,0 +1,206 @@
+"""
+Shared Resource Registry
+
+Process-wide registry for expensive, connection-holding resources:
+SQLAlchemy engines and session factories, the Ollama embedder, and vector
+stores. The API, the research agent, and RAG tools all draw from it so a
+process holds one tuned connection pool per database instead of building
+a fresh engine (and leaking its pool) for every agent.
+"""
+
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.utils.config import get_settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Registry names of the application databases
+SAMPLE_DATABASE = "sample"  # ResearchAnalytics
+BACKEND_DATABASE = "backend"  # LLM_BackEnd (app state + vectors)
+
+
+class ResourceRegistry:
+    """
+    Registry of shared engines, session factories, embedders and vector stores.
+
+    Usage:
+        registry = get_resource_registry()
+        session_factory = registry.get_backend_session_factory()
+        embedder = registry.get_embedder()
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._engines: dict[str, AsyncEngine] = {}
+        self._session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+        self._resources: dict[str, Any] = {}
+
+    def get_engine(self, name: str, url: str | None = None) -> AsyncEngine:
+        """
+        Get or create a named async engine with the configured pool settings.
+
+        Args:
+            name: Registry name of the database
+            url: Async database URL (required the first time a name is used)
+
+        Returns:
+            Shared AsyncEngine
+
+        Raises:
+            KeyError: If the engine does not exist and no URL was given
+        """
+        engine = self._engines.get(name)
+        if engine is not None:
+            return engine
+        if url is None:
+            raise KeyError(f"No engine registered for '{name}'")
+
+        settings = get_settings()
+        engine = create_async_engine(
+            url,
+            echo=settings.debug,
+            pool_pre_ping=True,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+        self._engines[name] = engine
+        logger.info(
+            "database_engine_created",
+            database=name,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+        )
+        return engine
+
+    def get_session_factory(
+        self, name: str, url: str | None = None
+    ) -> async_sessionmaker[AsyncSession]:
+        """
+        Get or create the session factory for a named engine.
+
+        Args:
+            name: Registry name of the database
+            url: Async database URL (required the first time a name is used)
+
+        Returns:
+            Shared async session factory
+        """
+        factory = self._session_factories.get(name)
+        if factory is None:
+            factory = async_sessionmaker(self.get_engine(name, url), expire_on_commit=False)
+            self._session_factories[name] = factory
+        return factory
+
+    def get_sample_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        """Get the session factory for the sample database (ResearchAnalytics)."""
+        return self.get_session_factory(SAMPLE_DATABASE, get_settings().database_url_async)
+
+    def get_backend_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        """Get the session factory for the backend database (LLM_BackEnd)."""
+        return self.get_session_factory(BACKEND_DATABASE, get_settings().backend_database_url_async)
+
+    def get_or_create(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Get a shared resource, creating it on first use.
+
+        Args:
+            key: Resource key (e.g. 'embedder', 'vector_store:mssql')
+            factory: Zero-argument callable building the resource
+
+        Returns:
+            The shared resource
+        """
+        if key not in self._resources:
+            self._resources[key] = factory()
+        return self._resources[key]
+
+    def register(self, key: str, resource: Any) -> None:
+        """
+        Register (or replace) a shared resource.
+
+        Args:
+            key: Resource key
+            resource: Resource instance
+        """
+        self._resources[key] = resource
+
+    def get(self, key: str) -> Any | None:
+        """Get a registered resource or None."""
+        return self._resources.get(key)
+
+    def get_embedder(self):
+        """Get the shared Ollama embedder configured from settings."""
+
+        def create():
+            from src.rag.embedder import OllamaEmbedder
+
+            settings = get_settings()
+            return OllamaEmbedder(base_url=settings.ollama_host, model=settings.embedding_model)
+
+        return self.get_or_create("embedder", create)
+
+    def get_pool_stats(self) -> dict[str, dict]:
+        """
+        Get connection pool metrics for every registered engine.
+
+        Returns:
+            Dict of database name to pool metrics
+        """
+        stats = {}
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            entry: dict[str, Any] = {"status": pool.status()}
+            for metric in ("size", "checkedin", "checkedout", "overflow"):
+                method = getattr(pool, metric, None)
+                if callable(method):
+                    entry[metric] = method()
+            stats[name] = entry
+        return stats
+
+    async def dispose(self) -> None:
+        """Dispose all engines and forget every registered resource."""
+        for name, engine in list(self._engines.items()):
+            try:
+                await engine.dispose()
+                logger.info("database_engine_disposed", database=name)
+            except Exception as e:
+                logger.error("database_engine_dispose_error", database=name, error=str(e))
+        self._engines.clear()
+        self._session_factories.clear()
+        self._resources.clear()
+
+
+# Singleton instance
+_resource_registry: ResourceRegistry | None = None
+
+
+def get_resource_registry() -> ResourceRegistry:
+    """
+    Get or create the process-wide resource registry.
+
+    Returns:
+        ResourceRegistry instance
+    """
+    global _resource_registry
+    if _resource_registry is None:
+        _resource_registry = ResourceRegistry()
+    return _resource_registry
+
+
+def reset_resource_registry() -> None:
+    """Reset the singleton resource registry (does not dispose engines)."""
+    global _resource_registry
+    _resource_registry = None
@@ -0,0 +1,104 @@
+"""
+Quantile Sketch
+Phase 4.5: Observability - Query Performance Metrics Dashboard
+
+Mergeable quantile sketch with bounded relative error, in the style of
+DDSketch: positive values fall into logarithmic buckets whose width grows
+with the value, so any quantile is answered within ``relative_accuracy`` of
+the true value. Sketches of hourly or daily buckets merge by adding bucket
+counts, which lets percentiles be maintained incrementally in rollup tables.
+"""
+
+import json
+import math
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Log-bucketed histogram answering quantiles with relative error guarantees."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a non-negative value (negative values are clamped to zero)."""
+        if count <= 0:
+            return
+        self.count += count
+        if value <= 0:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch with the same accuracy into this one."""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1] (0.5 for the median)
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Bucket midpoint (in relative terms) of (gamma^(key-1), gamma^key]
+                return 2 * self._gamma**key / (1 + self._gamma)
+        return 2 * self._gamma ** max(self.bins) / (1 + self._gamma)
+
+    def to_json(self) -> str:
+        """Serialize the sketch for storage."""
+        return json.dumps(
+            {
+                "a": self.relative_accuracy,
+                "z": self.zero_count,
+                "b": {str(key): count for key, count in self.bins.items()},
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> "QuantileSketch":
+        """Deserialize a stored sketch (empty for None or malformed input)."""
+        if not raw:
+            return cls()
+        try:
+            payload = json.loads(raw)
+            sketch = cls(payload.get("a", DEFAULT_RELATIVE_ACCURACY))
+            sketch.zero_count = int(payload.get("z", 0))
+            sketch.bins = {int(key): int(count) for key, count in payload.get("b", {}).items()}
+        except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+            return cls()
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
@@ -0,0 +1,438 @@
+"""
+Request Tracing
+Phase 4.5: Observability - Query Performance Metrics Dashboard
+
+Lightweight span tracing for agent turns. A turn opens a trace with
+``start_trace``; code along the request path (RAG embedding, vector search,
+model requests, MCP tool calls, SQL statements) opens child spans with
+``span`` or ``@traced``. The active span lives in a context variable, so
+spans follow the request through ``await`` and ``asyncio`` tasks, and
+instrumented code costs a single lookup when no trace is active.
+
+Finished traces go to the ``TraceCollector``, which keeps recent traces for
+the waterfall view, per-span-name latency sketches for percentile
+dashboards, and can append each trace to a local file in the OpenTelemetry
+OTLP/JSON format (readable by the collector's ``otlpjsonfile`` receiver).
+"""
+
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from src.utils.config import get_settings
+from src.utils.sketch import QuantileSketch
+
+logger = structlog.get_logger()
+
+SERVICE_NAME = "local-llm-research-agent"
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace: "Trace" = field(repr=False)
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_span_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: int = STATUS_UNSET
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute (ignored when the value is None)."""
+        if value is not None:
+            self.attributes[key] = value
+
+    def end(self) -> None:
+        """Mark the span finished."""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration so far (up to now for an open span)."""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1_000_000
+
+
+@dataclass
+class Trace:
+    """All spans recorded for one request."""
+
+    trace_id: str = field(default_factory=lambda: secrets.token_hex(16))
+    spans: list[Span] = field(default_factory=list)
+
+    @property
+    def root(self) -> Span | None:
+        """The span that opened the trace."""
+        return self.spans[0] if self.spans else None
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration of the root span."""
+        return self.root.duration_ms if self.root else 0.0
+
+    def waterfall(self) -> list[dict[str, Any]]:
+        """
+        Spans in start order with offsets relative to the root.
+
+        Returns:
+            One entry per span with name, ids, depth, offset_ms and duration_ms
+        """
+        if not self.spans:
+            return []
+        origin = self.root.start_ns
+        depths: dict[str, int] = {}
+        entries = []
+        for s in sorted(self.spans, key=lambda s: s.start_ns):
+            depth = depths.get(s.parent_span_id, -1) + 1 if s.parent_span_id else 0
+            depths[s.span_id] = depth
+            entries.append(
+                {
+                    "name": s.name,
+                    "span_id": s.span_id,
+                    "parent_span_id": s.parent_span_id,
+                    "depth": depth,
+                    "offset_ms": round((s.start_ns - origin) / 1_000_000, 2),
+                    "duration_ms": round(s.duration_ms, 2),
+                    "status": "error" if s.status == STATUS_ERROR else "ok",
+                    "attributes": s.attributes,
+                }
+            )
+        return entries
+
+    def breakdown(self) -> dict[str, float]:
+        """Total milliseconds per span name, excluding the root."""
+        totals: dict[str, float] = {}
+        for s in self.spans[1:]:
+            totals[s.name] = totals.get(s.name, 0.0) + s.duration_ms
+        return {name: round(ms, 2) for name, ms in totals.items()}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Per-turn timing summary for API and WebSocket responses."""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name if self.root else None,
+            "duration_ms": round(self.duration_ms, 2),
+            "breakdown_ms": self.breakdown(),
+            "spans": self.waterfall(),
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Render the trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(self.trace_id, s) for s in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(trace_id: str, s: Span) -> dict[str, Any]:
+    otlp = {
+        "traceId": trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns or time.time_ns()),
+        "attributes": _otlp_attributes(s.attributes),
+        "status": {"code": s.status, **({"message": s.error} if s.error else {})},
+    }
+    if s.parent_span_id:
+        otlp["parentSpanId"] = s.parent_span_id
+    return otlp
+
+
+def current_span() -> Span | None:
+    """The active span, or None outside a trace."""
+    return _current_span.get()
+
+
+def current_trace() -> Trace | None:
+    """The active trace, or None."""
+    active = _current_span.get()
+    return active.trace if active else None
+
+
+@contextmanager
+def _enter(s: Span) -> Iterator[Span]:
+    s.trace.spans.append(s)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = STATUS_ERROR
+        s.error = str(e) or type(e).__name__
+        raise
+    finally:
+        s.end()
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Record a child span of the active span.
+
+    Does nothing (yields None) when no trace is active.
+
+    Args:
+        name: Span name, e.g. ``rag.embed``
+        **attributes: Span attributes (None values are dropped)
+
+    Yields:
+        The span, or None outside a trace
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    s = Span(name=name, trace=parent.trace, parent_span_id=parent.span_id)
+    for key, value in attributes.items():
+        s.set_attribute(key, value)
+    with _enter(s):
+        yield s
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace | None]:
+    """
+    Open a trace for a request, or a child span if one is already active.
+
+    The trace is handed to the collector when the outermost block exits.
+    Yields None when tracing is disabled.
+
+    Args:
+        name: Root span name, e.g. ``chat.turn``
+        **attributes: Root span attributes
+
+    Yields:
+        The active trace, or None when tracing is disabled
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        with span(name, **attributes):
+            yield parent.trace
+        return
+
+    collector = get_trace_collector()
+    if not collector.enabled:
+        yield None
+        return
+
+    trace = Trace()
+    root = Span(name=name, trace=trace)
+    for key, value in attributes.items():
+        root.set_attribute(key, value)
+    try:
+        with _enter(root):
+            yield trace
+    finally:
+        collector.record(trace)
+
+
+def record_span(name: str, duration_ms: float, **attributes: Any) -> None:
+    """
+    Record an already finished operation as a child of the active span.
+
+    For timings measured elsewhere (e.g. by SQLAlchemy event listeners).
+
+    Args:
+        name: Span name
+        duration_ms: How long the operation took, ending now
+        **attributes: Span attributes
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    end_ns = time.time_ns()
+    s = Span(
+        name=name,
+        trace=parent.trace,
+        parent_span_id=parent.span_id,
+        start_ns=end_ns - int(duration_ms * 1_000_000),
+        end_ns=end_ns,
+    )
+    for key, value in attributes.items():
+        s.set_attribute(key, value)
+    parent.trace.spans.append(s)
+
+
+def traced(name: str, **attributes: Any) -> Callable:
+    """
+    Decorator recording each call of an async function as a span.
+
+    Args:
+        name: Span name
+        **attributes: Span attributes (the function's qualified name is added)
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            with span(name, function=func.__qualname__, **attributes):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@dataclass
+class SpanStats:
+    """Latency statistics for one span name."""
+
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def to_dict(self, name: str) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "name": name,
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": _round(self.sketch.quantile(0.5)),
+            "p95_ms": _round(self.sketch.quantile(0.95)),
+            "p99_ms": _round(self.sketch.quantile(0.99)),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+class TraceCollector:
+    """Keeps recent traces, aggregates span latencies and exports OTLP/JSON."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_traces: int = 200,
+        export_path: str | None = None,
+    ):
+        """
+        Initialize the collector.
+
+        Args:
+            enabled: Record traces at all
+            max_traces: Number of recent traces kept in memory
+            export_path: File that finished traces are appended to as OTLP/JSON
+                lines (no export when empty)
+        """
+        self.enabled = enabled
+        self.export_path = Path(export_path) if export_path else None
+        self._traces: deque[Trace] = deque(maxlen=max_traces)
+        self._span_stats: dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, trace: Trace) -> None:
+        """Store a finished trace and fold its spans into the aggregates."""
+        with self._lock:
+            self._traces.append(trace)
+            for s in trace.spans:
+                stats = self._span_stats.setdefault(s.name, SpanStats())
+                stats.count += 1
+                stats.total_ms += s.duration_ms
+                stats.errors += s.status == STATUS_ERROR
+                stats.sketch.add(s.duration_ms)
+        if self.export_path is not None:
+            self._export(trace)
+
+    def _export(self, trace: Trace) -> None:
+        """Append the trace to the export file."""
+        try:
+            self.export_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_otlp(), default=str) + os.linesep)
+        except OSError as e:
+            logger.warning("trace_export_failed", path=str(self.export_path), error=str(e))
+
+    def get_span_stats(self) -> list[dict[str, Any]]:
+        """Latency percentiles per span name, slowest total first."""
+        with self._lock:
+            items = list(self._span_stats.items())
+        items.sort(key=lambda item: item[1].total_ms, reverse=True)
+        return [stats.to_dict(name) for name, stats in items]
+
+    def get_recent(self, limit: int = 20) -> list[Trace]:
+        """Most recent traces, newest first."""
+        with self._lock:
+            return list(self._traces)[::-1][:limit]
+
+    def get_trace(self, trace_id: str) -> Trace | None:
+        """Find a recent trace by id."""
+        with self._lock:
+            return next((t for t in self._traces if t.trace_id == trace_id), None)
+
+    def reset(self) -> None:
+        """Drop recent traces and aggregates."""
+        with self._lock:
+            self._traces.clear()
+            self._span_stats.clear()
+
+
+_collector: TraceCollector | None = None
+
+
+def get_trace_collector() -> TraceCollector:
+    """Get or create the global trace collector from settings."""
+    global _collector
+    if _collector is None:
+        settings = get_settings()
+        _collector = TraceCollector(
+            enabled=settings.tracing_enabled,
+            max_traces=settings.tracing_max_traces,
+            export_path=settings.tracing_export_path,
+        )
+    return _collector
@@ -4,9 +4,11 @@ Pytest Configuration and Fixtures
 Shared fixtures for testing the research agent components.
 """
 
+import asyncio
 import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 # Set test environment before imports
@@ -191,3 +193,41 @@ def temp_mcp_config(tmp_path):
     config_file = tmp_path / "mcp_config.json"
     config_file.write_text(config_content)
     return config_file
+
+
+@pytest.fixture
+def provider_http():
+    """
+    Serve provider HTTP requests (status checks, model lists) from canned JSON.
+
+    Call with a mapping of URL path -> JSON body; returns the list of
+    requested paths. The provider response cache is cleared around the test.
+    """
+    from src.providers.http import clear_cache
+
+    patches = []
+    clear_cache()
+
+    def serve(routes: dict, error: Exception | None = None, delay: float = 0.0) -> list[str]:
+        requested = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            if delay:
+                await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+            if request.url.path not in routes:
+                return httpx.Response(404)
+            return httpx.Response(200, json=routes[request.url.path])
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        patcher = patch("src.providers.http.get_http_client", return_value=client)
+        patcher.start()
+        patches.append(patcher)
+        return requested
+
+    yield serve
+    for patcher in patches:
+        patcher.stop()
+    clear_cache()
@@ -0,0 +1,477 @@
+"""
+Offline benchmark suite for the RAG, cache, export and analytics hot paths.
+
+Runs on a laptop with no external services: embeddings go to a stub Ollama
+server on localhost, analytics run against a temporary SQLite database and
+everything else is in-memory. Results are written as JSON so regressions
+can be tracked commit-over-commit.
+
+Run with:
+    python -m tests.performance.benchmarks --output benchmark-results.json
+    python -m tests.performance.benchmarks --filter rag --rounds 5
+    python -m tests.performance.benchmarks --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import structlog
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.models.database import (
+    Base,
+    Conversation,
+    Message,
+    MetricsRollup,
+    MetricsRollupWatermark,
+    QueryHistory,
+    ToolCallRecord,
+)
+from src.api.routes.analytics import get_query_performance_timeline
+from src.models.chat import ChatMessage, ConversationTurn
+from src.models.chat import Conversation as ChatConversation
+from src.rag.docling_processor import DoclingDocumentProcessor
+from src.rag.document_processor import DocumentProcessor
+from src.rag.embedder import OllamaEmbedder
+from src.rag.embedding_scheduler import EmbeddingScheduler
+from src.rag.redis_vector_store import fuse_rankings
+from src.services.metrics_rollup import (
+    METRIC_QUERIES,
+    MetricsRollupService,
+    load_rollups,
+    summarize,
+)
+from src.utils.cache import ResponseCache
+from src.utils.export import (
+    export_to_csv,
+    export_to_json,
+    export_to_markdown,
+    extract_table_from_response,
+)
+from src.utils.sketch import QuantileSketch
+from tests.performance.harness import (
+    REGISTRY,
+    BenchmarkResult,
+    benchmark,
+    build_report,
+    compare_reports,
+    run_all,
+)
+from tests.performance.stub_ollama import stub_ollama
+
+WORDS = [
+    "revenue",
+    "region",
+    "quarter",
+    "customer",
+    "product",
+    "analysis",
+    "growth",
+    "margin",
+    "forecast",
+    "inventory",
+    "supplier",
+    "research",
+    "vector",
+    "embedding",
+    "query",
+    "latency",
+    "database",
+    "index",
+]
+
+
+def make_corpus(length: int, seed: int = 42) -> str:
+    """Deterministic prose of roughly ``length`` characters."""
+    rng = random.Random(seed)
+    sentences = []
+    size = 0
+    while size < length:
+        sentence = " ".join(rng.choices(WORDS, k=rng.randint(6, 24))).capitalize()
+        sentence += rng.choice([". ", ".\n", "? ", "! "])
+        sentences.append(sentence)
+        size += len(sentence)
+    return "".join(sentences)
+
+
+def make_rows(count: int, seed: int = 7) -> list[dict]:
+    """Deterministic tabular query results."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "region": rng.choice(["North", "South", "East", "West"]),
+            "product": rng.choice(WORDS),
+            "revenue": round(rng.uniform(100, 100_000), 2),
+            "units": rng.randint(1, 500),
+            "updated_at": (datetime(2026, 1, 1) + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+# ============================================================================
+# RAG
+# ============================================================================
+
+
+@benchmark("rag.chunk_text", group="rag")
+@asynccontextmanager
+async def chunk_text():
+    """DocumentProcessor._chunk_text on ~200 KB of prose."""
+    processor = DocumentProcessor(chunk_size=500, chunk_overlap=50)
+    text = make_corpus(200_000)
+    yield lambda: processor._chunk_text(text)
+
+
+@benchmark("rag.fallback_chunk_text", group="rag")
+@asynccontextmanager
+async def fallback_chunk_text():
+    """DoclingDocumentProcessor._fallback_chunk_text on ~200 KB of prose."""
+    processor = DoclingDocumentProcessor(chunk_size=500, chunk_overlap=50, use_ocr=False)
+    text = make_corpus(200_000, seed=43)
+    yield lambda: processor._fallback_chunk_text(text)
+
+
+@benchmark("rag.embed_batch", group="rag", rounds=5)
+@asynccontextmanager
+async def embed_batch():
+    """OllamaEmbedder.embed_batch of 64 chunks against a stub Ollama server."""
+    texts = DocumentProcessor(chunk_size=500, chunk_overlap=50)._chunk_text(make_corpus(40_000))
+    async with stub_ollama(dimensions=768) as url:
+        embedder = OllamaEmbedder(
+            base_url=url,
+            scheduler=EmbeddingScheduler(initial_limit=8, min_limit=1, max_limit=8),
+        )
+        yield lambda: embedder.embed_batch(texts[:64])
+
+
+@benchmark("rag.rrf_fusion", group="rag", iterations=50)
+@asynccontextmanager
+async def rrf_fusion():
+    """Redis hybrid search RRF fusion of two 150-result legs."""
+    rng = random.Random(3)
+
+    def data(i: int) -> dict:
+        return {"content": f"chunk {i}", "document_id": str(i // 10), "chunk_index": str(i % 10)}
+
+    vector_ranks = {
+        f"doc:{i}": {"rank": rank, "data": data(i), "distance": rank / 1000}
+        for rank, i in enumerate(rng.sample(range(300), 150), 1)
+    }
+    keyword_ranks = {
+        f"doc:{i}": {"rank": rank, "data": data(i)}
+        for rank, i in enumerate(rng.sample(range(300), 150), 1)
+    }
+    yield lambda: fuse_rankings(vector_ranks, keyword_ranks, alpha=0.5, top_k=10)
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+@benchmark("cache.response_cache_get_hit", group="cache", iterations=1000)
+@asynccontextmanager
+async def response_cache_get_hit():
+    """ResponseCache.get on a warm key."""
+    cache: ResponseCache[str] = ResponseCache(max_size=256, ttl_seconds=3600)
+    cache.set("What tables are available?", "answer")
+    yield lambda: cache.get("What tables are available?")
+
+
+class CacheContention:
+    """Mixed get/set traffic on one ResponseCache from several threads."""
+
+    def __init__(self, threads: int = 8, ops_per_thread: int = 2000, keyspace: int = 512):
+        self.cache: ResponseCache[str] = ResponseCache(max_size=256, ttl_seconds=3600)
+        self.threads = threads
+        self.ops_per_thread = ops_per_thread
+        self.keys = [f"query {i}" for i in range(keyspace)]
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.extra = {"threads": threads, "ops": threads * ops_per_thread, "errors": 0}
+
+    def _worker(self, seed: int) -> int:
+        rng = random.Random(seed)
+        errors = 0
+        for _ in range(self.ops_per_thread):
+            key = rng.choice(self.keys)
+            try:
+                if rng.random() < 0.8:
+                    self.cache.get(key)
+                else:
+                    self.cache.set(key, key)
+            except (KeyError, RuntimeError):
+                errors += 1
+        return errors
+
+    def __call__(self) -> None:
+        futures = [self.executor.submit(self._worker, seed) for seed in range(self.threads)]
+        self.extra["errors"] += sum(f.result() for f in futures)
+
+
+@benchmark("cache.response_cache_contention", group="cache", rounds=10)
+@asynccontextmanager
+async def response_cache_contention():
+    """8 threads x 2000 mixed get/set (80/20) on a 256-entry ResponseCache."""
+    operation = CacheContention()
+    try:
+        yield operation
+    finally:
+        operation.executor.shutdown()
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+
+@benchmark("export.json", group="export")
+@asynccontextmanager
+async def export_json():
+    """export_to_json of 5000 result rows."""
+    rows = make_rows(5000)
+    yield lambda: export_to_json(rows)
+
+
+@benchmark("export.csv", group="export")
+@asynccontextmanager
+async def export_csv():
+    """export_to_csv of 5000 result rows."""
+    rows = make_rows(5000)
+    yield lambda: export_to_csv(rows)
+
+
+@benchmark("export.markdown", group="export")
+@asynccontextmanager
+async def export_markdown():
+    """export_to_markdown of a 200-turn conversation."""
+    conversation = ChatConversation()
+    corpus = make_corpus(200 * 800, seed=11)
+    for i in range(200):
+        conversation.add_turn(
+            ConversationTurn(
+                user_message=ChatMessage.user(f"Question {i}: {corpus[i * 800 : i * 800 + 120]}"),
+                assistant_message=ChatMessage.assistant(corpus[i * 800 : (i + 1) * 800]),
+                duration_ms=1200.0,
+            )
+        )
+    yield lambda: export_to_markdown(conversation)
+
+
+@benchmark("export.extract_table", group="export")
+@asynccontextmanager
+async def extract_table():
+    """extract_table_from_response on a response with a 1000-row markdown table."""
+    rows = make_rows(1000)
+    header = "| id | region | product | revenue | units |"
+    lines = [header, "|---|---|---|---|---|"]
+    lines += [
+        f"| {r['id']} | {r['region']} | {r['product']} | {r['revenue']} | {r['units']} |"
+        for r in rows
+    ]
+    response = "Here are the results:\n\n" + "\n".join(lines) + "\n\nLet me know if you need more."
+    yield lambda: extract_table_from_response(response)
+
+
+# ============================================================================
+# Analytics
+# ============================================================================
+
+
+@asynccontextmanager
+async def analytics_database(query_count: int = 20_000, days: int = 30):
+    """Temporary SQLite backend with query history spread over ``days``."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'backend.db'}",
+            execution_options={"schema_translate_map": {"app": None}},
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[
+                    Conversation.__table__,
+                    Message.__table__,
+                    QueryHistory.__table__,
+                    MetricsRollup.__table__,
+                    MetricsRollupWatermark.__table__,
+                    ToolCallRecord.__table__,
+                ],
+            )
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        rng = random.Random(5)
+        start = datetime.utcnow() - timedelta(days=days)
+        async with session_factory() as db:
+            db.add_all(
+                QueryHistory(
+                    natural_language="q",
+                    execution_time_ms=int(rng.lognormvariate(5, 1)),
+                    result_row_count=rng.randint(0, 1000),
+                    created_at=start + timedelta(seconds=i * days * 86400 / query_count),
+                )
+                for i in range(query_count)
+            )
+            await db.commit()
+        try:
+            yield session_factory
+        finally:
+            await engine.dispose()
+
+
+async def reset_rollups(session_factory) -> None:
+    """Drop rollups and watermarks so the next run starts from scratch."""
+    async with session_factory() as db:
+        await db.execute(delete(MetricsRollup))
+        await db.execute(delete(MetricsRollupWatermark))
+        await db.commit()
+
+
+@benchmark("analytics.rollup_full_rebuild", group="analytics", rounds=5)
+@asynccontextmanager
+async def rollup_full_rebuild():
+    """MetricsRollupService.run_once folding 20k query history rows (incl. reset)."""
+    async with analytics_database() as session_factory:
+        service = MetricsRollupService(
+            session_factory=session_factory, interval_seconds=0, settle_seconds=0
+        )
+
+        async def operation():
+            await reset_rollups(session_factory)
+            await service.run_once()
+
+        yield operation
+
+
+@benchmark("analytics.performance_timeline", group="analytics")
+@asynccontextmanager
+async def performance_timeline():
+    """get_query_performance_timeline over 30 days of daily rollups."""
+    async with analytics_database() as session_factory:
+        await MetricsRollupService(
+            session_factory=session_factory, interval_seconds=0, settle_seconds=0
+        ).run_once()
+
+        async def operation():
+            async with session_factory() as db:
+                return await get_query_performance_timeline(period="day", db=db)
+
+        yield operation
+
+
+@benchmark("analytics.summarize_hourly_rollups", group="analytics")
+@asynccontextmanager
+async def summarize_hourly_rollups():
+    """load_rollups + summarize over 30 days of hourly rollups (p50/p95/p99)."""
+    async with analytics_database() as session_factory:
+        await MetricsRollupService(
+            session_factory=session_factory, interval_seconds=0, settle_seconds=0
+        ).run_once()
+
+        async def operation():
+            async with session_factory() as db:
+                summary = summarize(await load_rollups(db, METRIC_QUERIES, "hour"))
+            return [summary.quantile(q) for q in (0.5, 0.95, 0.99)]
+
+        yield operation
+
+
+@benchmark("analytics.quantile_sketch", group="analytics")
+@asynccontextmanager
+async def quantile_sketch():
+    """QuantileSketch.add of 10k latencies, then p50/p95/p99."""
+    rng = random.Random(9)
+    values = [rng.lognormvariate(5, 1) for _ in range(10_000)]
+
+    def operation():
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        return [sketch.quantile(q) for q in (0.5, 0.95, 0.99)]
+
+    yield operation
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """One human-readable summary line."""
+    extra = f"  {result.extra}" if result.extra else ""
+    return (
+        f"{result.name:<40} median {result.median_ms:>10.4f} ms"
+        f"  p95 {result.p95_ms:>10.4f} ms  {result.ops_per_sec:>12.2f} ops/s{extra}"
+    )
+
+
+async def run(filters: list[str] | None, rounds: int | None) -> list[BenchmarkResult]:
+    """Run the selected benchmarks, printing progress to stderr."""
+    results = []
+    async for result in run_all(filters, rounds=rounds):
+        print(format_result(result), file=sys.stderr)
+        results.append(result)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+    parser.add_argument(
+        "--filter", "-k", action="append", help="Only benchmarks whose name contains this"
+    )
+    parser.add_argument("--rounds", type=int, help="Override the number of timed rounds")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    parser.add_argument("--compare", help="Baseline report to check for regressions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative median slowdown counted as a regression (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in REGISTRY.values():
+            print(f"{case.name:<40} {case.group}")
+        return 0
+
+    # Keep application logging out of the report and the timings
+    logging.disable(logging.WARNING)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+    report = build_report(asyncio.run(run(args.filter, args.rounds)))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, threshold=args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['name']}: {regression['baseline_median_ms']} ms -> "
+                f"{regression['median_ms']} ms ({regression['change']:+.0%})",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Benchmark harness for the offline performance suite.
+
+Benchmarks are registered with ``@benchmark`` as async context managers
+that set up their fixtures and yield the operation to time (a plain or
+async callable). The runner times ``rounds`` rounds of ``iterations`` calls
+each after a warmup, and reports per-call statistics as JSON so results
+can be compared commit-over-commit.
+"""
+
+import inspect
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+SCHEMA_VERSION = 1
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark case."""
+
+    name: str
+    group: str
+    factory: Callable[[], AbstractAsyncContextManager[Callable[[], Any]]]
+    rounds: int = 20
+    iterations: int = 1
+    warmup: int = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-call timing statistics of one benchmark."""
+
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+    stdev_ms: float
+    ops_per_sec: float
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, rounds: int = 20, iterations: int = 1, warmup: int = 1):
+    """
+    Register a benchmark case.
+
+    The decorated function must be an async context manager factory (e.g.
+    ``@asynccontextmanager``) yielding the zero-argument operation to time.
+    The operation may return an awaitable; it is awaited inside the timing.
+
+    Args:
+        name: Unique dotted name, e.g. ``rag.chunk_text``
+        group: Group used for filtering and reporting
+        rounds: Timed rounds
+        iterations: Calls per round (use >1 for microsecond-scale operations)
+        warmup: Untimed rounds before measuring
+    """
+
+    def decorator(factory):
+        if name in REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        REGISTRY[name] = Benchmark(name, group, factory, rounds, iterations, warmup)
+        return factory
+
+    return decorator
+
+
+async def _call(operation: Callable[[], Any]) -> Any:
+    result = operation()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _time_round(operation: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await _call(operation)
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def run_benchmark(case: Benchmark, rounds: int | None = None) -> BenchmarkResult:
+    """
+    Run one benchmark case.
+
+    Args:
+        case: Registered benchmark
+        rounds: Override the case's round count
+
+    Returns:
+        Timing statistics; ``extra`` holds anything the operation exposes as
+        an ``extra`` attribute (e.g. error counts)
+    """
+    rounds = rounds or case.rounds
+    async with case.factory() as operation:
+        for _ in range(case.warmup):
+            await _time_round(operation, case.iterations)
+        timings = [await _time_round(operation, case.iterations) for _ in range(rounds)]
+        extra = dict(getattr(operation, "extra", {}) or {})
+
+    mean = statistics.fmean(timings)
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        rounds=rounds,
+        iterations=case.iterations,
+        min_ms=round(min(timings), 4),
+        median_ms=round(statistics.median(timings), 4),
+        mean_ms=round(mean, 4),
+        p95_ms=round(_percentile(timings, 0.95), 4),
+        stdev_ms=round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        ops_per_sec=round(1000 / mean, 2) if mean > 0 else 0.0,
+        extra=extra,
+    )
+
+
+async def run_all(
+    filters: list[str] | None = None, rounds: int | None = None
+) -> AsyncIterator[BenchmarkResult]:
+    """
+    Run every registered benchmark whose name or group matches a filter.
+
+    Args:
+        filters: Substrings to match (all benchmarks when empty)
+        rounds: Override every case's round count
+
+    Yields:
+        Results in registration order
+    """
+    for case in REGISTRY.values():
+        if filters and not any(f in case.name or f == case.group for f in filters):
+            continue
+        yield await run_benchmark(case, rounds=rounds)
+
+
+def _git_revision() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def build_report(results: list[BenchmarkResult]) -> dict[str, Any]:
+    """Wrap results with environment metadata."""
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "suite": "offline",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "git": _git_revision(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.2
+) -> list[dict[str, Any]]:
+    """
+    Find benchmarks whose median got slower than the baseline.
+
+    Args:
+        baseline: Earlier report
+        current: New report
+        threshold: Allowed relative slowdown (0.2 = 20%)
+
+    Returns:
+        One entry per regression with both medians and the relative change
+    """
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        before = previous.get(result["name"])
+        if not before or before["median_ms"] <= 0:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1
+        if change > threshold:
+            regressions.append(
+                {
+                    "name": result["name"],
+                    "baseline_median_ms": before["median_ms"],
+                    "median_ms": result["median_ms"],
+                    "change": round(change, 4),
+                }
+            )
+    return regressions
@@ -0,0 +1,71 @@
+"""
+Stub Ollama server for offline benchmarks.
+
+A minimal HTTP/1.1 server on localhost answering ``POST /api/embeddings``
+with a deterministic vector, so the real ``OllamaEmbedder`` (client
+creation, request encoding, scheduler admission, batching) can be timed
+without a model.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+
+def stub_embedding(text: str, dimensions: int) -> list[float]:
+    """Deterministic pseudo-embedding of a text."""
+    seed = hashlib.sha256(text.encode()).digest()
+    return [seed[i % len(seed)] / 255.0 for i in range(dimensions)]
+
+
+@asynccontextmanager
+async def stub_ollama(dimensions: int = 768, latency_ms: float = 0.0) -> AsyncIterator[str]:
+    """
+    Run a stub Ollama embeddings server.
+
+    Args:
+        dimensions: Length of returned embeddings
+        latency_ms: Artificial per-request model latency
+
+    Yields:
+        Base URL of the server
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if latency_ms:
+                    await asyncio.sleep(latency_ms / 1000)
+                prompt = json.loads(body or b"{}").get("prompt", "")
+                payload = json.dumps({"embedding": stub_embedding(prompt, dimensions)}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,479 @@
+"""
+WebSocket chat load test.
+
+Drives ``/ws/agent/{conversation_id}`` with many concurrent chat sessions
+and reports time-to-first-chunk, turn latency, messages/sec and the API
+server's CPU and memory. Run the API with the fake LLM provider
+(``LLM_PROVIDER=fake``) so the API, WebSocket and MCP layers are measured
+instead of model latency; ``--spawn`` does that for you.
+
+Run with:
+    # Start a fake-provider API worker, run 200 sessions x 3 messages
+    python -m tests.performance.ws_load --spawn --sessions 200 --messages 3
+
+    # Against a running server (pass its PID for CPU/memory)
+    python -m tests.performance.ws_load --url http://localhost:8000 --server-pid 1234
+
+    # Exercise the MCP layer with a scripted tool call per turn
+    python -m tests.performance.ws_load --spawn --mcp-server mssql --tool-call list_tables
+
+A spawned worker runs in a temporary directory with only the ``--mcp-server``
+servers of ``mcp_config.json`` enabled (none by default).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import websockets
+
+from tests.performance.harness import build_report
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class LoadTestConfig:
+    """Load test parameters."""
+
+    url: str = "http://127.0.0.1:8000"
+    sessions: int = 100
+    messages: int = 3
+    ramp_up_seconds: float = 5.0
+    think_time_seconds: float = 0.0
+    message: str = "What were total sales by region last quarter?"
+    provider: str | None = "fake"
+    model: str | None = None
+    mcp_servers: list[str] = field(default_factory=list)
+    rag_enabled: bool = False
+    turn_timeout_seconds: float = 120.0
+
+
+@dataclass
+class TurnResult:
+    """Timings of one chat message round-trip."""
+
+    ttft_ms: float | None
+    turn_ms: float
+    chunks: int
+    error: str | None = None
+
+
+@dataclass
+class SessionResult:
+    """One WebSocket session."""
+
+    connect_ms: float | None = None
+    turns: list[TurnResult] = field(default_factory=list)
+    error: str | None = None
+
+
+class ProcessSampler:
+    """
+    Samples CPU and resident memory of a process.
+
+    Reads ``/proc`` on Linux and falls back to ``psutil`` when installed.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[dict[str, float]] = []
+        self._task: asyncio.Task | None = None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._psutil_process = None
+        if not Path(f"/proc/{pid}/stat").exists():
+            try:
+                import psutil
+
+                self._psutil_process = psutil.Process(pid)
+            except ImportError:
+                pass
+
+    @property
+    def available(self) -> bool:
+        """Whether the process can be sampled on this platform."""
+        return self._psutil_process is not None or Path(f"/proc/{self.pid}/stat").exists()
+
+    def _read(self) -> tuple[float, float]:
+        """CPU seconds used so far and resident memory in MB."""
+        if self._psutil_process is not None:
+            times = self._psutil_process.cpu_times()
+            return times.user + times.system, self._psutil_process.memory_info().rss / 2**20
+        stat = Path(f"/proc/{self.pid}/stat").read_text()
+        # Fields after the parenthesised command name; utime and stime are 14th and 15th
+        fields = stat[stat.rindex(")") + 2 :].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+        rss_kb = next(
+            int(line.split()[1])
+            for line in Path(f"/proc/{self.pid}/status").read_text().splitlines()
+            if line.startswith("VmRSS:")
+        )
+        return cpu_seconds, rss_kb / 1024
+
+    async def _run(self) -> None:
+        last_cpu, _ = self._read()
+        last_time = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                cpu, rss_mb = self._read()
+            except (OSError, StopIteration, ValueError):
+                return
+            now = time.perf_counter()
+            self.samples.append(
+                {"cpu_percent": 100 * (cpu - last_cpu) / (now - last_time), "rss_mb": rss_mb}
+            )
+            last_cpu, last_time = cpu, now
+
+    def start(self) -> None:
+        """Start sampling in the background."""
+        if self.available:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict[str, Any] | None:
+        """Stop sampling and summarise."""
+        if self._task is None:
+            return None
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        if not self.samples:
+            return None
+        cpu = [s["cpu_percent"] for s in self.samples]
+        rss = [s["rss_mb"] for s in self.samples]
+        return {
+            "pid": self.pid,
+            "samples": len(self.samples),
+            "cpu_percent_mean": round(sum(cpu) / len(cpu), 1),
+            "cpu_percent_max": round(max(cpu), 1),
+            "rss_mb_start": round(rss[0], 1),
+            "rss_mb_max": round(max(rss), 1),
+            "rss_mb_end": round(rss[-1], 1),
+        }
+
+
+def websocket_url(base_url: str, conversation_id: int) -> str:
+    """Agent WebSocket URL for a conversation."""
+    base = base_url.rstrip("/").replace("https://", "wss://").replace("http://", "ws://")
+    return f"{base}/ws/agent/{conversation_id}"
+
+
+async def run_turn(ws, config: LoadTestConfig) -> TurnResult:
+    """Send one message and wait for the complete (or error) event."""
+    payload: dict[str, Any] = {
+        "type": "message",
+        "content": config.message,
+        "mcp_servers": config.mcp_servers,
+        "rag_enabled": config.rag_enabled,
+    }
+    if config.provider:
+        payload["provider"] = config.provider
+    if config.model:
+        payload["model"] = config.model
+
+    start = time.perf_counter()
+    ttft_ms = None
+    chunks = 0
+    await ws.send(json.dumps(payload))
+    while True:
+        event = json.loads(await ws.recv())
+        event_type = event.get("type")
+        if event_type == "chunk":
+            chunks += 1
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - start) * 1000
+        elif event_type in ("complete", "error"):
+            return TurnResult(
+                ttft_ms=ttft_ms,
+                turn_ms=(time.perf_counter() - start) * 1000,
+                chunks=chunks,
+                error=event.get("error") if event_type == "error" else None,
+            )
+
+
+async def run_session(conversation_id: int, delay: float, config: LoadTestConfig) -> SessionResult:
+    """One user: connect, send ``config.messages`` messages, disconnect."""
+    result = SessionResult()
+    await asyncio.sleep(delay)
+    start = time.perf_counter()
+    try:
+        async with websockets.connect(
+            websocket_url(config.url, conversation_id), max_size=None, open_timeout=30
+        ) as ws:
+            result.connect_ms = (time.perf_counter() - start) * 1000
+            for i in range(config.messages):
+                if i and config.think_time_seconds:
+                    await asyncio.sleep(config.think_time_seconds)
+                result.turns.append(
+                    await asyncio.wait_for(run_turn(ws, config), config.turn_timeout_seconds)
+                )
+    except (OSError, TimeoutError, websockets.WebSocketException) as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _distribution(values: list[float]) -> dict[str, float | None]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 2)}
+
+
+def summarize(
+    config: LoadTestConfig,
+    sessions: list[SessionResult],
+    duration: float,
+    server: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Aggregate session results into the load test report."""
+    turns = [turn for session in sessions for turn in session.turns]
+    completed = [turn for turn in turns if turn.error is None]
+    turn_errors: dict[str, int] = {}
+    for turn in turns:
+        if turn.error is not None:
+            turn_errors[turn.error] = turn_errors.get(turn.error, 0) + 1
+    return {
+        "config": asdict(config),
+        "duration_s": round(duration, 2),
+        "sessions": len(sessions),
+        "session_errors": sum(1 for session in sessions if session.error),
+        "turns": len(turns),
+        "turns_completed": len(completed),
+        "turn_errors": turn_errors,
+        "messages_per_sec": round(len(completed) / duration, 2) if duration else 0.0,
+        "chunks_per_sec": round(sum(t.chunks for t in completed) / duration, 2)
+        if duration
+        else 0.0,
+        "connect_ms": _distribution([s.connect_ms for s in sessions if s.connect_ms is not None]),
+        "ttft_ms": _distribution([t.ttft_ms for t in completed if t.ttft_ms is not None]),
+        "turn_ms": _distribution([t.turn_ms for t in completed]),
+        "server": server,
+    }
+
+
+async def run_load_test(config: LoadTestConfig, server_pid: int | None = None) -> dict[str, Any]:
+    """
+    Run the load test.
+
+    Sessions are started evenly over the ramp-up period, each on its own
+    conversation ID.
+
+    Args:
+        config: Load test parameters
+        server_pid: API worker process to sample (skipped when None)
+
+    Returns:
+        Report with latency distributions, throughput and server resources
+    """
+    sampler = ProcessSampler(server_pid) if server_pid else None
+    if sampler:
+        sampler.start()
+
+    base_id = int(time.time()) % 1_000_000 * 1000
+    step = config.ramp_up_seconds / config.sessions if config.sessions else 0
+    start = time.perf_counter()
+    sessions = await asyncio.gather(
+        *(run_session(base_id + i, i * step, config) for i in range(config.sessions))
+    )
+    duration = time.perf_counter() - start
+
+    server = await sampler.stop() if sampler else None
+    return summarize(config, list(sessions), duration, server)
+
+
+def write_mcp_config(directory: Path, servers: list[str]) -> Path:
+    """
+    Write a copy of the project MCP config with only ``servers`` enabled.
+
+    The spawned worker runs in ``directory`` so it picks this file up
+    instead of the project's ``mcp_config.json``.
+    """
+    source = PROJECT_ROOT / "mcp_config.json"
+    config = json.loads(source.read_text(encoding="utf-8")) if source.exists() else {}
+    config["mcpServers"] = {
+        name: server for name, server in config.get("mcpServers", {}).items() if name in servers
+    }
+    unknown = set(servers) - set(config["mcpServers"])
+    if unknown:
+        raise ValueError(f"MCP servers not in {source}: {sorted(unknown)}")
+    path = directory / "mcp_config.json"
+    path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+    return path
+
+
+def spawn_server(port: int, env: dict[str, str], cwd: Path) -> subprocess.Popen:
+    """Start a single uvicorn API worker on localhost."""
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.api.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT), **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_live(url: str, timeout: float = 60.0) -> None:
+    """Wait for the API liveness probe to answer."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/api/health/live")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"API at {url} did not become live within {timeout}s")
+
+
+def format_summary(report: dict[str, Any]) -> str:
+    """Human-readable summary of a load test report."""
+    lines = [
+        f"sessions         {report['sessions']} ({report['session_errors']} failed)",
+        f"turns            {report['turns_completed']}/{report['turns']} completed",
+        f"duration         {report['duration_s']} s",
+        f"messages/sec     {report['messages_per_sec']}",
+        f"chunks/sec       {report['chunks_per_sec']}",
+    ]
+    for key in ("connect_ms", "ttft_ms", "turn_ms"):
+        dist = report[key]
+        lines.append(
+            f"{key:<16} p50 {dist['p50']}  p95 {dist['p95']}  p99 {dist['p99']}  max {dist['max']}"
+        )
+    if report["server"]:
+        server = report["server"]
+        lines.append(
+            f"server cpu       mean {server['cpu_percent_mean']}%  max {server['cpu_percent_max']}%"
+        )
+        lines.append(
+            f"server rss       {server['rss_mb_start']} -> {server['rss_mb_end']} MB"
+            f" (max {server['rss_mb_max']})"
+        )
+    for error, count in report["turn_errors"].items():
+        lines.append(f"error x{count}: {error[:120]}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--sessions", type=int, default=100, help="Concurrent chat sessions")
+    parser.add_argument("--messages", type=int, default=3, help="Messages per session")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds to start all sessions")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between messages")
+    parser.add_argument("--message", default=LoadTestConfig.message, help="Message to send")
+    parser.add_argument(
+        "--provider", default="fake", help="Provider per message ('' = server default)"
+    )
+    parser.add_argument("--model", help="Model per message")
+    parser.add_argument(
+        "--mcp-server",
+        action="append",
+        default=[],
+        help="MCP server from mcp_config.json to enable in the spawned worker (repeatable)",
+    )
+    parser.add_argument("--rag", action="store_true", help="Enable RAG context per message")
+    parser.add_argument("--server-pid", type=int, help="API worker PID to sample CPU/memory")
+    parser.add_argument("--output", "-o", help="Write the JSON report here (default: stdout)")
+
+    spawn = parser.add_argument_group("spawned server")
+    spawn.add_argument(
+        "--spawn", action="store_true", help="Start a fake-provider API worker for the test"
+    )
+    spawn.add_argument("--port", type=int, default=8765, help="Port of the spawned worker")
+    spawn.add_argument("--ttft-ms", type=float, default=300.0, help="Fake time to first token")
+    spawn.add_argument("--tokens-per-second", type=float, default=40.0, help="Fake decode speed")
+    spawn.add_argument("--response-tokens", type=int, default=80, help="Fake response length")
+    spawn.add_argument("--tool-call", default="", help="Tool the fake model calls each turn")
+    spawn.add_argument("--script", default="", help="Fake response script (JSON)")
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig(
+        url=f"http://127.0.0.1:{args.port}" if args.spawn else args.url,
+        sessions=args.sessions,
+        messages=args.messages,
+        ramp_up_seconds=args.ramp_up,
+        think_time_seconds=args.think_time,
+        message=args.message,
+        provider=args.provider or None,
+        model=args.model,
+        mcp_servers=args.mcp_server,
+        rag_enabled=args.rag,
+    )
+
+    process = None
+    server_pid = args.server_pid
+    workdir = tempfile.TemporaryDirectory(prefix="ws-load-")
+    if args.spawn:
+        write_mcp_config(Path(workdir.name), args.mcp_server)
+        process = spawn_server(
+            args.port,
+            {
+                "LLM_PROVIDER": "fake",
+                "FAKE_LLM_TTFT_MS": str(args.ttft_ms),
+                "FAKE_LLM_TOKENS_PER_SECOND": str(args.tokens_per_second),
+                "FAKE_LLM_RESPONSE_TOKENS": str(args.response_tokens),
+                "FAKE_LLM_TOOL_CALL": args.tool_call,
+                "FAKE_LLM_SCRIPT_PATH": args.script,
+                "RATE_LIMIT_ENABLED": "false",
+                "CACHE_ENABLED": "false",
+            },
+            cwd=Path(workdir.name),
+        )
+        server_pid = process.pid
+
+    try:
+        if process:
+            asyncio.run(wait_until_live(config.url))
+        report = build_report([])
+        del report["results"]
+        report["suite"] = "ws_load"
+        report["load_test"] = asyncio.run(run_load_test(config, server_pid))
+    finally:
+        if process:
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        workdir.cleanup()
+
+    print(format_summary(report["load_test"]), file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -128,7 +128,7 @@ class TestResearchAgentChat:
         response = await agent.chat("What tables exist?")
 
         assert response == "Found 3 tables."
-        mock_agent_instance.run.assert_called_once_with("What tables exist?")
+        mock_agent_instance.run.assert_called_once_with("What tables exist?", message_history=[])
 
     @pytest.mark.asyncio
     @patch("src.agent.core.MCPClientManager")
@@ -214,3 +214,28 @@ class TestConversationHistory:
         history = agent.get_history()
 
         assert history == []
+
+    @patch("src.agent.core.MCPClientManager")
+    @patch("src.agent.core.create_provider")
+    @patch("src.agent.core.Agent")
+    def test_load_history(self, mock_agent_cls, mock_create_provider, mock_mcp_cls):
+        """Test seeding history from earlier exchanges."""
+        mock_mcp = MagicMock()
+        mock_mcp.get_active_toolsets.return_value = []
+        mock_mcp.get_enabled_server_names.return_value = []
+        mock_mcp_cls.return_value = mock_mcp
+
+        # Mock provider
+        mock_provider = MagicMock()
+        mock_provider.get_model.return_value = MagicMock()
+        mock_provider.model_name = "qwen2.5:7b-instruct"
+        mock_provider.endpoint = "http://localhost:11434/v1"
+        mock_provider.provider_type = MagicMock()
+        mock_provider.provider_type.value = "ollama"
+        mock_create_provider.return_value = mock_provider
+
+        agent = ResearchAgent()
+        agent.load_history([("Hi", "Hello"), ("How many rows?", "42")])
+
+        assert agent.turn_count == 2
+        assert agent.get_history_stats()["turns_in_window"] == 2
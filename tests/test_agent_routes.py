@@ -0,0 +1,153 @@
+"""
+Tests for Agent API Routes
+
+Tests for the WebSocket chat handler's conversation history.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.api.models.database import Base, Conversation, Message
+from src.api.routes import agent as agent_routes
+
+
+class FakeAgent:
+    """Research agent stand-in that records the history it was seeded with."""
+
+    tool_warning = None
+
+    def __init__(self):
+        self.loaded: list[tuple[str, str]] = []
+        self.messages: list[str] = []
+
+    def load_history(self, exchanges):
+        self.loaded = list(exchanges)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def chat_stream(self, message):
+        self.messages.append(message)
+        yield f"answer {len(self.messages)}"
+
+    def get_last_response_stats(self):
+        return {"token_usage": None}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """SQLite backend with one conversation and stored messages."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}"
+    options = {"schema_translate_map": {"app": None}}
+
+    async def seed():
+        engine = create_async_engine(url, execution_options=options)
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[Conversation.__table__, Message.__table__],
+            )
+        async with async_sessionmaker(engine)() as db:
+            db.add(Conversation(id=1, title="c"))
+            db.add_all(
+                Message(conversation_id=1, role=role, content=content)
+                for role, content in [
+                    ("user", "stored question"),
+                    ("assistant", "stored answer"),
+                    ("user", "unanswered"),
+                ]
+            )
+            await db.commit()
+        await engine.dispose()
+
+    asyncio.run(seed())
+    # NullPool: the test client serves the app on its own event loop
+    engine = create_async_engine(url, execution_options=options, poolclass=NullPool)
+    return async_sessionmaker(engine)
+
+
+@pytest.fixture
+def client(session_factory):
+    """Test client for the agent router with a fake agent factory."""
+    app = FastAPI()
+    app.include_router(agent_routes.router, prefix="/api/agent")
+    created: list[FakeAgent] = []
+
+    async def create_agent(**kwargs):
+        created.append(FakeAgent())
+        return created[-1]
+
+    with (
+        patch.object(agent_routes, "create_research_agent", create_agent),
+        patch.object(agent_routes, "get_backend_session_factory", return_value=session_factory),
+        patch("src.api.deps.get_websocket_manager_optional", return_value=None),
+    ):
+        yield TestClient(app), created
+
+
+def chat(ws, content, **settings):
+    """Send a message and wait for its completion."""
+    ws.send_json({"type": "message", "content": content, **settings})
+    while True:
+        message = ws.receive_json()
+        if message["type"] in ("complete", "error"):
+            return message
+
+
+class TestWebSocketHistory:
+    """Tests for the history the WebSocket chat handler gives the agent."""
+
+    def test_agent_is_seeded_from_stored_messages(self, client):
+        test_client, created = client
+
+        with test_client.websocket_connect("/api/agent/ws/1") as ws:
+            complete = chat(ws, "first")
+
+        assert complete["message"]["content"] == "answer 1"
+        assert len(created) == 1
+        assert created[0].loaded == [("stored question", "stored answer")]
+
+    def test_agent_is_reused_across_messages(self, client):
+        test_client, created = client
+
+        with test_client.websocket_connect("/api/agent/ws/1") as ws:
+            chat(ws, "first")
+            chat(ws, "second")
+
+        assert len(created) == 1
+        assert created[0].messages == ["first", "second"]
+
+    def test_new_model_keeps_connection_turns(self, client):
+        test_client, created = client
+
+        with test_client.websocket_connect("/api/agent/ws/1") as ws:
+            chat(ws, "first")
+            chat(ws, "second", model="other-model")
+
+        assert len(created) == 2
+        assert created[1].loaded == [
+            ("stored question", "stored answer"),
+            ("first", "answer 1"),
+        ]
+
+    def test_history_load_failure_starts_empty(self, client):
+        test_client, created = client
+        broken = MagicMock(side_effect=RuntimeError("database down"))
+
+        with (
+            patch.object(agent_routes, "get_backend_session_factory", return_value=broken),
+            test_client.websocket_connect("/api/agent/ws/1") as ws,
+        ):
+            complete = chat(ws, "first")
+
+        assert complete["type"] == "complete"
+        assert created[0].loaded == []
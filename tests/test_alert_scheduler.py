@@ -0,0 +1,189 @@
+"""
+Tests for Alert Scheduler
+
+Tests for concurrent, bounded alert evaluation.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.services.alert_scheduler import AlertScheduler, evaluate_condition
+
+
+def make_alert(alert_id, query="SELECT 5", condition="greater_than", threshold=1, last=None):
+    """Create a lightweight alert stand-in."""
+    alert = MagicMock()
+    alert.id = alert_id
+    alert.name = f"alert-{alert_id}"
+    alert.query = query
+    alert.condition = condition
+    alert.threshold = threshold
+    alert.last_value = last
+    return alert
+
+
+class FakeDatabase:
+    """Records executed statements and simulates query latency."""
+
+    def __init__(self, alerts, delays=None, values=None):
+        self.alerts = alerts
+        self.delays = delays or {}
+        self.values = values or {}
+        self.executed: list[str] = []
+        self.bulk_updates: list[list[dict]] = []
+        self.commits = 0
+        self.active = 0
+        self.max_active = 0
+
+    def session_factory(self):
+        fake = self
+
+        @asynccontextmanager
+        async def factory():
+            session = MagicMock()
+
+            async def execute(statement, params=None):
+                if params is not None:
+                    fake.bulk_updates.append(params)
+                    return MagicMock()
+
+                sql = str(statement)
+                if "data_alerts" in sql:
+                    result = MagicMock()
+                    result.scalars.return_value.all.return_value = fake.alerts
+                    return result
+
+                fake.executed.append(sql)
+                fake.active += 1
+                fake.max_active = max(fake.max_active, fake.active)
+                try:
+                    await asyncio.sleep(fake.delays.get(sql, 0.01))
+                finally:
+                    fake.active -= 1
+                result = MagicMock()
+                result.fetchone.return_value = (fake.values.get(sql, 5),)
+                return result
+
+            async def commit():
+                fake.commits += 1
+
+            session.execute = execute
+            session.commit = commit
+            yield session
+
+        return factory
+
+
+@pytest.fixture
+def notify():
+    """Patch the notification service."""
+    with patch("src.services.notification_service.notification_service") as mock:
+        mock.send_alert = AsyncMock()
+        yield mock
+
+
+class TestEvaluateCondition:
+    """Tests for condition evaluation."""
+
+    def test_greater_than(self):
+        assert evaluate_condition("greater_than", 1, 2, None) is True
+        assert evaluate_condition("greater_than", 3, 2, None) is False
+
+    def test_less_than(self):
+        assert evaluate_condition("less_than", 3, 2, None) is True
+
+    def test_equals(self):
+        assert evaluate_condition("equals", 2, 2.0001, None) is True
+
+    def test_changes(self):
+        assert evaluate_condition("changes", 0, 2, "1.0") is True
+        assert evaluate_condition("changes", 0, 2, "2.0") is False
+        assert evaluate_condition("changes", 0, 2, None) is False
+
+
+class TestAlertCycle:
+    """Tests for the concurrent evaluation cycle."""
+
+    @pytest.mark.asyncio
+    async def test_identical_queries_run_once(self, notify):
+        """Test that alerts sharing a query are grouped."""
+        alerts = [make_alert(i, query="SELECT 5") for i in range(20)]
+        fake = FakeDatabase(alerts)
+        scheduler = AlertScheduler(fake.session_factory())
+
+        await scheduler._check_alerts()
+
+        assert fake.executed == ["SELECT 5"]
+        assert scheduler.metrics.queries_deduplicated == 19
+        assert scheduler.metrics.alerts_evaluated == 20
+
+    @pytest.mark.asyncio
+    async def test_single_batched_write(self, notify):
+        """Test that all status updates are written in one commit."""
+        alerts = [make_alert(i, query=f"SELECT {i}") for i in range(5)]
+        fake = FakeDatabase(alerts)
+        scheduler = AlertScheduler(fake.session_factory())
+
+        await scheduler._check_alerts()
+
+        assert fake.commits == 1
+        assert len(fake.bulk_updates) == 1
+        assert {row["id"] for row in fake.bulk_updates[0]} == set(range(5))
+        assert all("last_triggered_at" in row for row in fake.bulk_updates[0])
+        assert notify.send_alert.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_parallelism_is_bounded(self, notify):
+        """Test that no more than max_concurrency queries run at once."""
+        alerts = [make_alert(i, query=f"SELECT {i}") for i in range(12)]
+        fake = FakeDatabase(alerts)
+        scheduler = AlertScheduler(fake.session_factory(), max_concurrency=3)
+
+        await scheduler._check_alerts()
+
+        assert len(fake.executed) == 12
+        assert fake.max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_slow_query_times_out_without_blocking_others(self, notify):
+        """Test that a slow alert query is abandoned at its timeout."""
+        alerts = [make_alert(1, query="SELECT slow"), make_alert(2, query="SELECT fast")]
+        fake = FakeDatabase(alerts, delays={"SELECT slow": 5})
+        scheduler = AlertScheduler(fake.session_factory(), query_timeout_seconds=0.05)
+
+        await scheduler._check_alerts()
+
+        assert scheduler.metrics.timeouts == 1
+        assert [row["id"] for row in fake.bulk_updates[0]] == [2]
+        assert scheduler.metrics.last_cycle_duration_ms < 1000
+
+    @pytest.mark.asyncio
+    async def test_untriggered_alert_only_updates_check_fields(self, notify):
+        """Test that non-triggered alerts record value and check time only."""
+        alerts = [make_alert(1, threshold=100)]
+        fake = FakeDatabase(alerts)
+        scheduler = AlertScheduler(fake.session_factory())
+
+        await scheduler._check_alerts()
+
+        row = fake.bulk_updates[0][0]
+        assert row["last_value"] == "5.0"
+        assert "last_triggered_at" not in row
+        notify.send_alert.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_metrics_reported(self, notify):
+        """Test that cycle metrics are exposed."""
+        fake = FakeDatabase([make_alert(1)])
+        scheduler = AlertScheduler(fake.session_factory())
+
+        await scheduler._check_alerts()
+        metrics = scheduler.get_metrics()
+
+        assert metrics["cycles"] == 1
+        assert metrics["queries_executed"] == 1
+        assert metrics["last_cycle_started_at"] is not None
+        assert metrics["max_concurrency"] == 10
@@ -0,0 +1,52 @@
+"""
+Tests for the Offline Benchmark Suite
+
+Smoke-runs every registered benchmark once and checks report comparison.
+"""
+
+import pytest
+
+from tests.performance import benchmarks  # noqa: F401 - registers the benchmarks
+from tests.performance.harness import REGISTRY, build_report, compare_reports, run_benchmark
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(REGISTRY))
+async def test_benchmark_runs(name):
+    """Every benchmark sets up, runs and tears down without external services."""
+    result = await run_benchmark(REGISTRY[name], rounds=1)
+
+    assert result.name == name
+    assert result.median_ms > 0
+    assert result.ops_per_sec > 0
+
+
+@pytest.mark.asyncio
+async def test_cache_contention_reports_errors():
+    """The contention benchmark runs without thread-safety errors."""
+    result = await run_benchmark(REGISTRY["cache.response_cache_contention"], rounds=1)
+
+    # ResponseCache is locked, so racing threads never corrupt the LRU order
+    assert result.extra["threads"] == 8
+    assert result.extra["errors"] == 0
+
+
+def test_report_and_regressions():
+    """Reports carry metadata and regressions are flagged above the threshold."""
+    report = build_report([])
+    assert report["schema_version"] == 1
+    assert "python" in report["environment"]
+
+    baseline = {"results": [{"name": "a", "median_ms": 10.0}, {"name": "b", "median_ms": 10.0}]}
+    current = {
+        "results": [
+            {"name": "a", "median_ms": 11.0},
+            {"name": "b", "median_ms": 13.0},
+            {"name": "new", "median_ms": 99.0},
+        ]
+    }
+
+    regressions = compare_reports(baseline, current, threshold=0.2)
+
+    assert [r["name"] for r in regressions] == ["b"]
+    assert regressions[0]["change"] == pytest.approx(0.3)
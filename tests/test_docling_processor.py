@@ -414,6 +414,15 @@ class TestChunking:
             # Most chunks should end with a sentence terminator
             assert chunk.rstrip().endswith((".", "!", "?")) or len(chunk) >= 40
 
+    def test_fallback_chunk_text_boundary_inside_overlap_terminates(self):
+        """Test a sentence boundary inside the overlap still moves forward."""
+        processor = DoclingDocumentProcessor(chunk_size=100, chunk_overlap=50)
+
+        chunks = processor._fallback_chunk_text("Short. " + "x" * 300)
+
+        assert chunks[0] == "Short."
+        assert "".join(chunks).count("x") >= 300
+
 
 class TestGetDocumentProcessor:
     """Test the factory function."""
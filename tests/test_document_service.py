@@ -0,0 +1,71 @@
+"""
+Tests for Document Service
+
+Tests for duplicate upload detection by file content hash.
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.models.database import Base, Document
+from src.services.document_service import DocumentService
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """SQLite database with the documents table."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}",
+        execution_options={"schema_translate_map": {"app": None}},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Document.__table__])
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestDuplicateUploads:
+    """Tests for content-hash deduplication in save_upload."""
+
+    @pytest.mark.asyncio
+    async def test_identical_upload_returns_existing_document(
+        self, session_factory, tmp_path, monkeypatch
+    ):
+        service = DocumentService(session_factory=session_factory)
+        monkeypatch.setattr(service._settings, "upload_dir", str(tmp_path / "uploads"))
+
+        async with session_factory() as db:
+            first = await service.save_upload(db, b"quarterly report", "q3.pdf", None)
+            second = await service.save_upload(db, b"quarterly report", "copy.pdf", None)
+            third = await service.save_upload(db, b"annual report", "fy.pdf", None)
+            count = await db.scalar(select(func.count()).select_from(Document))
+
+        assert second.id == first.id
+        assert third.id != first.id
+        assert count == 2
+        assert len(list((tmp_path / "uploads").iterdir())) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_duplicate_is_reset_for_processing(
+        self, session_factory, tmp_path, monkeypatch
+    ):
+        service = DocumentService(session_factory=session_factory)
+        monkeypatch.setattr(service._settings, "upload_dir", str(tmp_path / "uploads"))
+
+        async with session_factory() as db:
+            first = await service.save_upload(db, b"quarterly report", "q3.pdf", None)
+            first.processing_status = "failed"
+            first.error_message = "docling crashed"
+            await db.commit()
+            (tmp_path / "uploads" / first.filename).unlink()
+
+            second = await service.save_upload(db, b"quarterly report", "copy.pdf", None)
+            count = await db.scalar(select(func.count()).select_from(Document))
+
+        assert second.id == first.id
+        assert second.processing_status == "pending"
+        assert second.error_message is None
+        assert count == 1
+        # The missing file is restored from the identical upload
+        assert (tmp_path / "uploads" / first.filename).read_bytes() == b"quarterly report"
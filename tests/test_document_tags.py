@@ -0,0 +1,132 @@
+"""
+Tests for Document Tags
+
+Tests for normalized tag storage, indexed tag filters and tag facets.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.document_tags import (
+    normalize_tags,
+    parse_tags,
+    set_document_tags,
+    tag_facets,
+    tag_filter,
+)
+from src.api.models.database import Base, Document, DocumentTag
+from src.api.routes.documents import get_all_tags, list_documents
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """SQLite database with the document and tag tables."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}",
+        execution_options={"schema_translate_map": {"app": None}},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[Document.__table__, DocumentTag.__table__]
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_tagged_documents(session_factory, tag_sets: dict[str, list[str]]) -> None:
+    async with session_factory() as db:
+        for filename, tags in tag_sets.items():
+            doc = Document(
+                filename=filename,
+                original_filename=filename,
+                file_size=1,
+                processing_status="completed",
+            )
+            db.add(doc)
+            await db.flush()
+            await set_document_tags(db, doc, tags)
+        await db.commit()
+
+
+class TestNormalization:
+    """Tests for tag normalization and parsing."""
+
+    def test_normalize_trims_lowercases_and_dedupes(self):
+        assert normalize_tags([" Finance", "finance", "", "Q3 "]) == ["finance", "q3"]
+
+    def test_parse_tolerates_malformed_json(self):
+        assert parse_tags('["a", "b"]') == ["a", "b"]
+        assert parse_tags("not json") == []
+        assert parse_tags('{"a": 1}') == []
+        assert parse_tags(None) == []
+
+
+class TestTagStorage:
+    """Tests for the document_tags table."""
+
+    @pytest.mark.asyncio
+    async def test_set_tags_replaces_rows_and_json(self, session_factory):
+        await add_tagged_documents(session_factory, {"a.pdf": ["Finance", "q3"]})
+
+        async with session_factory() as db:
+            doc = (await db.execute(select(Document))).scalars().one()
+            await set_document_tags(db, doc, ["q4", "FINANCE"])
+            await db.commit()
+            rows = (await db.execute(select(DocumentTag.tag))).scalars().all()
+
+        assert sorted(rows) == ["finance", "q4"]
+        assert json.loads(doc.tags) == ["q4", "finance"]
+
+    @pytest.mark.asyncio
+    async def test_filter_any_and_all(self, session_factory):
+        await add_tagged_documents(
+            session_factory,
+            {"a.pdf": ["finance", "q3"], "b.pdf": ["finance"], "c.pdf": ["legal"]},
+        )
+
+        async with session_factory() as db:
+            any_match = await db.execute(
+                select(Document.filename).where(tag_filter(["Finance", "legal"]))
+            )
+            all_match = await db.execute(
+                select(Document.filename).where(tag_filter(["finance", "q3"], match_all=True))
+            )
+
+        assert sorted(any_match.scalars().all()) == ["a.pdf", "b.pdf", "c.pdf"]
+        assert all_match.scalars().all() == ["a.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_facets_count_documents_per_tag(self, session_factory):
+        await add_tagged_documents(
+            session_factory,
+            {"a.pdf": ["finance", "q3"], "b.pdf": ["finance"], "c.pdf": []},
+        )
+
+        async with session_factory() as db:
+            facets = await tag_facets(db)
+            response = await get_all_tags(db=db)
+
+        assert facets == [("finance", 2), ("q3", 1)]
+        assert response.tags == ["finance", "q3"]
+        assert response.facets[0].count == 2
+
+
+class TestListDocumentsByTag:
+    """Tests for tag-filtered document listing."""
+
+    @pytest.mark.asyncio
+    async def test_list_filters_on_tag_table(self, session_factory):
+        await add_tagged_documents(
+            session_factory,
+            {"a.pdf": ["finance"], "b.pdf": ["finance_2"], "c.pdf": []},
+        )
+
+        async with session_factory() as db:
+            result = await list_documents(skip=0, limit=10, tag="FINANCE", db=db)
+
+        assert result.total == 1
+        assert [doc.filename for doc in result.documents] == ["a.pdf"]
+        assert result.documents[0].tags == ["finance"]
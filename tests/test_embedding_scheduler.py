@@ -0,0 +1,184 @@
+"""
+Tests for Embedding Scheduler
+
+Tests for the global AIMD concurrency limit and priority admission.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from src.rag.embedder import OllamaEmbedder
+from src.rag.embedding_scheduler import (
+    EmbeddingPriority,
+    EmbeddingScheduler,
+    is_overload_error,
+)
+
+
+def make_scheduler(**kwargs):
+    """Create a scheduler with test-friendly defaults."""
+    kwargs.setdefault("initial_limit", 2)
+    kwargs.setdefault("min_limit", 1)
+    kwargs.setdefault("max_limit", 8)
+    kwargs.setdefault("latency_target_ms", 1000)
+    return EmbeddingScheduler(**kwargs)
+
+
+class TestConcurrencyLimit:
+    """Tests for the global limit."""
+
+    @pytest.mark.asyncio
+    async def test_limit_bounds_in_flight_requests(self):
+        scheduler = make_scheduler(max_limit=2)
+        in_flight = peak = 0
+
+        async def request():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 1
+
+        results = await asyncio.gather(*(scheduler.run(request) for _ in range(20)))
+
+        assert sum(results) == 20
+        assert peak == 2
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_on_fast_requests(self):
+        scheduler = make_scheduler()
+
+        async def request():
+            return None
+
+        for _ in range(10):
+            await scheduler.run(request)
+
+        assert scheduler.limit > 2
+
+    @pytest.mark.asyncio
+    async def test_multiplicative_decrease_on_overload(self):
+        scheduler = make_scheduler(initial_limit=8)
+
+        async def overloaded():
+            raise httpx.TimeoutException("slow")
+
+        with pytest.raises(httpx.TimeoutException):
+            await scheduler.run(overloaded)
+        with pytest.raises(httpx.TimeoutException):
+            await scheduler.run(overloaded)
+
+        assert scheduler.limit == 4  # Second signal falls in the same window
+        assert scheduler.get_stats()["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_success_decreases(self):
+        scheduler = make_scheduler(initial_limit=4, latency_target_ms=5)
+
+        async def slow():
+            await asyncio.sleep(0.02)
+
+        await scheduler.run(slow)
+
+        assert scheduler.limit == 2
+
+    def test_overload_classification(self):
+        response = MagicMock(status_code=503)
+        server_error = httpx.HTTPStatusError("busy", request=MagicMock(), response=response)
+        response_404 = MagicMock(status_code=404)
+        not_found = httpx.HTTPStatusError("missing", request=MagicMock(), response=response_404)
+
+        assert is_overload_error(server_error)
+        assert not is_overload_error(not_found)
+        assert not is_overload_error(ValueError("bad input"))
+
+
+class TestPriority:
+    """Tests for priority admission."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_queued_bulk(self):
+        scheduler = make_scheduler(initial_limit=1, max_limit=1)
+        release = asyncio.Event()
+        order = []
+
+        async def blocker():
+            await release.wait()
+
+        def request(name):
+            async def run():
+                order.append(name)
+
+            return run
+
+        first = asyncio.create_task(scheduler.run(blocker, EmbeddingPriority.BULK))
+        await asyncio.sleep(0)
+        bulk = [
+            asyncio.create_task(scheduler.run(request(f"bulk{i}"), EmbeddingPriority.BULK))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        query = asyncio.create_task(scheduler.run(request("query")))
+        await asyncio.sleep(0)
+        assert scheduler.queued(EmbeddingPriority.BULK) == 3
+
+        release.set()
+        await asyncio.gather(first, query, *bulk)
+
+        assert order[0] == "query"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        scheduler = make_scheduler(initial_limit=1, max_limit=1)
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        running = asyncio.create_task(scheduler.run(blocker))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.run(blocker))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await running
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert scheduler.active == 0
+        assert scheduler.queued() == 0
+
+
+class TestEmbedderIntegration:
+    """Tests that the embedder routes requests through the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_bulk_priority(self):
+        scheduler = make_scheduler()
+        embedder = OllamaEmbedder(scheduler=scheduler)
+        priorities = []
+        original_run = scheduler.run
+
+        async def run(request, priority=EmbeddingPriority.INTERACTIVE):
+            priorities.append(priority)
+            return await original_run(request, priority)
+
+        async def fake_request(text):
+            return [0.1, 0.2]
+
+        scheduler.run = run
+        embedder._request_embedding = fake_request
+
+        await embedder.embed("query")
+        await embedder.embed_batch(["a", "b"])
+
+        assert priorities == [
+            EmbeddingPriority.INTERACTIVE,
+            EmbeddingPriority.BULK,
+            EmbeddingPriority.BULK,
+        ]
@@ -4,6 +4,7 @@ Tests for Query History Persistence
 Tests the history persistence functionality for conversation sessions.
 """
 
+import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -12,6 +13,7 @@ import pytest
 
 from src.models.chat import ChatMessage, Conversation, ConversationTurn
 from src.utils.history import (
+    INDEX_FILENAME,
     HistoryManager,
     SessionData,
     SessionMetadata,
@@ -258,6 +260,98 @@ class TestHistoryManager:
         assert results[0].title == "Tagged"
 
 
+class TestSessionIndex:
+    """Tests for the indexed session store."""
+
+    def test_list_does_not_parse_indexed_files(
+        self, history_manager, sample_conversation, monkeypatch
+    ):
+        """Test that listing indexed sessions reads metadata from the index only."""
+        history_manager.save_session(sample_conversation, title="Indexed")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("session file parsed")
+
+        monkeypatch.setattr(Path, "read_text", fail)
+        sessions = history_manager.list_sessions()
+
+        assert [s.title for s in sessions] == ["Indexed"]
+
+    def test_legacy_json_files_migrated_lazily(self, temp_history_dir):
+        """Test that JSON files without an index entry are indexed on first list."""
+        legacy = {
+            "metadata": {
+                "session_id": "legacy01",
+                "title": "Legacy session",
+                "created_at": "2024-01-01T12:00:00",
+                "updated_at": "2024-01-01T12:30:00",
+                "turn_count": 1,
+                "tags": ["old"],
+            },
+            "turns": [
+                {
+                    "user_message": "How many invoices were overdue?",
+                    "assistant_message": "There were 42 overdue invoices.",
+                    "timestamp": "2024-01-01T12:00:00",
+                    "duration_ms": 10,
+                }
+            ],
+        }
+        (temp_history_dir / "legacy01.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        manager = HistoryManager(temp_history_dir)
+
+        assert (temp_history_dir / INDEX_FILENAME).exists()
+        assert [s.session_id for s in manager.list_sessions(tags=["old"])] == ["legacy01"]
+        assert manager.search_sessions("invoices")[0].session_id == "legacy01"
+
+    def test_removed_files_dropped_from_index(self, history_manager, sample_conversation):
+        """Test that sessions whose files were removed externally are not listed."""
+        session_id = history_manager.save_session(sample_conversation, title="Gone")
+        (history_manager.history_dir / f"{session_id}.json").unlink()
+
+        assert history_manager.list_sessions() == []
+
+    def test_paginated_listing(self, history_manager, sample_conversation):
+        """Test listing sessions with limit and offset."""
+        for i in range(5):
+            history_manager.save_session(sample_conversation, title=f"Session {i}")
+
+        first = history_manager.list_sessions(limit=2)
+        second = history_manager.list_sessions(limit=2, offset=2)
+        rest = history_manager.list_sessions(offset=4)
+
+        assert [s.title for s in first] == ["Session 4", "Session 3"]
+        assert [s.title for s in second] == ["Session 2", "Session 1"]
+        assert [s.title for s in rest] == ["Session 0"]
+
+    def test_incremental_save_indexes_new_turns(self, history_manager, sample_conversation):
+        """Test that re-saving a growing session makes new turns searchable."""
+        session_id = history_manager.save_session(sample_conversation, title="Growing")
+        assert history_manager.search_sessions("quarterly") == []
+
+        sample_conversation.add_turn(
+            ConversationTurn(
+                user_message=ChatMessage.user("Summarize quarterly revenue"),
+                assistant_message=ChatMessage.assistant("Revenue grew 12%."),
+            )
+        )
+        history_manager.save_session(sample_conversation, session_id=session_id, title="Growing")
+
+        results = history_manager.search_sessions("quarterly")
+        assert [s.session_id for s in results] == [session_id]
+        assert results[0].turn_count == 3
+
+    def test_search_ranks_title_matches_first(self, history_manager, sample_conversation):
+        """Test that title matches rank above content matches."""
+        history_manager.save_session(sample_conversation, title="Something else")
+        history_manager.save_session(sample_conversation, title="Tables overview")
+
+        results = history_manager.search_sessions("tables")
+
+        assert [s.title for s in results] == ["Tables overview", "Something else"]
+
+
 class TestSingletonManager:
     """Tests for singleton history manager."""
 
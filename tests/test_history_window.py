@@ -0,0 +1,153 @@
+"""
+Tests for the token-budgeted history window.
+
+Tests token accounting, block compaction, summary bounds, and prefix
+stability of the rendered message list.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, SystemPromptPart, UserPromptPart
+
+from src.agent.history import HistoryWindow
+from src.agent.research_agent import ResearchAgent
+from src.models.chat import estimate_tokens
+
+
+def fill(window: HistoryWindow, turns: int, size: int = 400) -> None:
+    """Add numbered exchanges of roughly ``size`` characters per side."""
+    for i in range(turns):
+        window.add_exchange(f"Q{i} " + "q" * size, f"A{i} " + "a" * size)
+
+
+class TestEstimateTokens:
+    """Tests for token estimation."""
+
+    def test_scales_with_length(self):
+        assert estimate_tokens("x" * 400) > estimate_tokens("x" * 40)
+
+    def test_includes_message_overhead(self):
+        assert estimate_tokens("") > 0
+
+
+class TestHistoryWindow:
+    """Tests for HistoryWindow."""
+
+    def test_empty_window_renders_nothing(self):
+        window = HistoryWindow(system_prompt="You are helpful.")
+        assert window.get_messages() == []
+
+    def test_system_prompt_leads_history(self):
+        window = HistoryWindow(system_prompt="You are helpful.")
+        window.add_exchange("Hi", "Hello")
+
+        messages = window.get_messages()
+
+        assert isinstance(messages[0], ModelRequest)
+        assert isinstance(messages[0].parts[0], SystemPromptPart)
+        assert messages[0].parts[0].content == "You are helpful."
+        assert isinstance(messages[1].parts[0], UserPromptPart)
+        assert isinstance(messages[2], ModelResponse)
+
+    def test_stays_within_budget(self):
+        window = HistoryWindow(system_prompt="sys", token_budget=2000, summary_max_tokens=200)
+
+        fill(window, 30)
+
+        assert window.prompt_tokens <= 2000
+        assert window.compactions > 0
+        assert window.turns_summarized + window.turn_count == 30
+        assert "Summary of earlier conversation turns" in window.summary
+
+    def test_turn_30_prompt_matches_turn_3(self):
+        """Test that prompt size stays bounded as the conversation grows."""
+        window = HistoryWindow(system_prompt="sys", token_budget=2000, summary_max_tokens=200)
+        sizes = []
+        for _ in range(30):
+            fill(window, 1)
+            sizes.append(window.prompt_tokens)
+
+        assert max(sizes[10:]) <= 2000
+        assert max(sizes[10:]) < sizes[2] * 5
+
+    def test_prefix_stable_between_compactions(self):
+        """Test that new turns only append to the rendered history."""
+        window = HistoryWindow(system_prompt="sys", token_budget=100_000)
+        fill(window, 3)
+        before = window.get_messages()
+
+        fill(window, 1)
+        after = window.get_messages()
+
+        assert after[: len(before)] == before
+        assert len(after) == len(before) + 2
+        assert window.renders == 1
+
+    def test_compaction_is_blockwise(self):
+        """Test that compaction frees room for several turns at once."""
+        window = HistoryWindow(system_prompt="sys", token_budget=2000, summary_max_tokens=200)
+        fill(window, 30)
+
+        # Far fewer compactions than turns means the prefix is stable most of the time
+        assert window.compactions <= 30 // 3
+
+    def test_summary_is_bounded(self):
+        window = HistoryWindow(token_budget=1000, summary_max_tokens=100)
+        fill(window, 50)
+
+        assert estimate_tokens(window.summary) <= 100
+
+    def test_oversized_turn_is_kept(self):
+        window = HistoryWindow(token_budget=200, summary_max_tokens=50)
+        window.add_exchange("q" * 4000, "a" * 4000)
+
+        assert window.turn_count == 1
+
+    def test_clear(self):
+        window = HistoryWindow(system_prompt="sys", token_budget=1000, summary_max_tokens=100)
+        fill(window, 20)
+
+        window.clear()
+
+        assert window.get_messages() == []
+        assert window.get_history() == []
+
+
+class TestAgentHistory:
+    """Tests for history wiring in ResearchAgent."""
+
+    @pytest.mark.asyncio
+    @patch("src.agent.core.MCPClientManager")
+    @patch("src.agent.core.create_provider")
+    @patch("src.agent.core.Agent")
+    async def test_history_sent_on_followup(
+        self, mock_agent_cls, mock_create_provider, mock_mcp_cls
+    ):
+        """Test that follow-up turns send the prior exchange to the model."""
+        mock_mcp = MagicMock()
+        mock_mcp.list_servers.return_value = []
+        mock_mcp_cls.return_value = mock_mcp
+
+        mock_provider = MagicMock()
+        mock_provider.model_name = "qwen2.5:7b-instruct"
+        mock_provider.provider_type.value = "ollama"
+        mock_create_provider.return_value = mock_provider
+
+        mock_result = MagicMock()
+        mock_result.output = "Answer"
+        mock_agent_instance = MagicMock()
+        mock_agent_instance.run = AsyncMock(return_value=mock_result)
+        mock_agent_cls.return_value = mock_agent_instance
+
+        agent = ResearchAgent(cache_enabled=False)
+        await agent.chat("First question")
+        await agent.chat("Follow-up")
+
+        history = mock_agent_instance.run.call_args.kwargs["message_history"]
+        assert isinstance(history[0].parts[0], SystemPromptPart)
+        assert history[1].parts[0].content == "First question"
+        assert agent.get_history_stats()["turns_in_window"] == 2
+
+        agent.clear_history()
+        assert agent.get_history_stats()["turns_in_window"] == 0
@@ -0,0 +1,344 @@
+"""
+Tests for Ingestion Queue
+
+Tests for durable job leasing, checkpoint resume and retries.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.models.database import Base, Document, IngestionJob
+from src.rag.vector_store_base import VectorStoreBase
+from src.services.ingestion_queue import IngestionQueue
+
+
+class FakeProcessor:
+    """Processor returning a fixed list of chunks."""
+
+    def __init__(self, chunks, fail_times=0):
+        self.chunks = chunks
+        self.fail_times = fail_times
+        self.calls = 0
+
+    async def process_file(self, file_path):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise RuntimeError("docling crashed")
+        return {"chunks": list(self.chunks), "metadata": {"pages": 1}}
+
+
+class FakeEmbedder:
+    """Embedder counting embedded texts."""
+
+    def __init__(self):
+        self.texts = []
+
+    async def embed_batch(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class FakeStore(VectorStoreBase):
+    """Vector store recording chunk indexes."""
+
+    def __init__(self, fail_at=None):
+        super().__init__(embedder=FakeEmbedder(), dimensions=2)
+        self.chunks: dict[int, str] = {}
+        self.embedded = 0
+        self.fail_at = fail_at
+        self.truncated_from = None
+        self.tags = None
+        self.refreshed_with: list[int] = []
+
+    async def create_index(self, overwrite=False):
+        pass
+
+    async def search(self, query, top_k=5, source_type=None, filters=None):
+        return []
+
+    async def get_stats(self):
+        return {}
+
+    async def add_document(
+        self,
+        document_id,
+        chunks,
+        source,
+        source_type="document",
+        metadata=None,
+        start_index=0,
+        embeddings=None,
+    ):
+        if self.fail_at is not None and start_index >= self.fail_at:
+            raise ConnectionError("worker died")
+        if embeddings is None:
+            await self.embed_chunks(chunks)
+        for i, chunk in enumerate(chunks):
+            self.chunks[start_index + i] = chunk
+        self.embedded += len(chunks)
+        return [f"{document_id}:{start_index + i}" for i in range(len(chunks))]
+
+    async def delete_chunks_from(self, document_id, start_index):
+        self.truncated_from = start_index
+        stale = [i for i in self.chunks if i >= start_index]
+        for i in stale:
+            del self.chunks[i]
+        return len(stale)
+
+    async def get_chunk_hashes(self, document_id):
+        return {i: self.chunk_hash(chunk) for i, chunk in self.chunks.items()}
+
+    async def delete_chunks(self, document_id, chunk_indexes):
+        for i in chunk_indexes:
+            del self.chunks[i]
+        return len(chunk_indexes)
+
+    async def delete_document(self, document_id):
+        count = len(self.chunks)
+        self.chunks.clear()
+        return count
+
+    async def update_document_tags(self, document_id, tags):
+        self.tags = tags
+        return len(self.chunks)
+
+    async def refresh_vector_index(self):
+        self.refreshed_with.append(len(self.chunks))
+        return True
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """SQLite database with the document and job tables."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}",
+        execution_options={"schema_translate_map": {"app": None}},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[Document.__table__, IngestionJob.__table__]
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_document(session_factory, tags=None) -> int:
+    async with session_factory() as db:
+        doc = Document(filename="report.pdf", processing_status="pending", tags=tags)
+        db.add(doc)
+        await db.commit()
+        return doc.id
+
+
+def make_queue(session_factory, store, processor, **kwargs):
+    kwargs.setdefault("checkpoint_chunks", 2)
+    kwargs.setdefault("max_attempts", 2)
+    kwargs.setdefault("lease_seconds", 60)
+    return IngestionQueue(
+        session_factory=session_factory,
+        vector_store=store,
+        processor=processor,
+        workers=1,
+        upload_dir="/tmp",
+        **kwargs,
+    )
+
+
+class TestEnqueueAndClaim:
+    """Tests for job creation and leasing."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_is_idempotent(self, session_factory):
+        queue = make_queue(session_factory, FakeStore(), FakeProcessor([]))
+        doc_id = await add_document(session_factory)
+
+        first = await queue.enqueue(doc_id)
+        second = await queue.enqueue(doc_id)
+        restarted = await queue.enqueue(doc_id, restart=True)
+
+        assert first.id == second.id
+        assert restarted.id != first.id
+        async with session_factory() as db:
+            cancelled = await db.get(IngestionJob, first.id)
+            assert cancelled.status == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_claim_leases_job_once(self, session_factory):
+        queue_a = make_queue(session_factory, FakeStore(), FakeProcessor([]))
+        queue_b = make_queue(session_factory, FakeStore(), FakeProcessor([]))
+        await queue_a.enqueue(await add_document(session_factory))
+
+        job = await queue_a.claim()
+
+        assert job.status == "running"
+        assert job.lease_owner == queue_a.worker_id
+        assert job.attempts == 1
+        assert await queue_b.claim() is None
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, session_factory):
+        queue_a = make_queue(session_factory, FakeStore(), FakeProcessor([]))
+        queue_b = make_queue(session_factory, FakeStore(), FakeProcessor([]))
+        await queue_a.enqueue(await add_document(session_factory))
+        job = await queue_a.claim()
+
+        async with session_factory() as db:
+            await db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id == job.id)
+                .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+            await db.commit()
+        reclaimed = await queue_b.claim()
+
+        assert reclaimed.id == job.id
+        assert reclaimed.lease_owner == queue_b.worker_id
+        assert reclaimed.attempts == 2
+
+
+class TestProcessing:
+    """Tests for checkpointed processing."""
+
+    @pytest.mark.asyncio
+    async def test_completes_document_and_reapplies_tags(self, session_factory):
+        store = FakeStore()
+        queue = make_queue(session_factory, store, FakeProcessor(["a", "b", "c"]))
+        doc_id = await add_document(session_factory, tags='["q3"]')
+        await queue.enqueue(doc_id)
+
+        await queue.run_job(await queue.claim())
+
+        async with session_factory() as db:
+            doc = await db.get(Document, doc_id)
+            job = (await db.execute(select(IngestionJob))).scalars().one()
+        assert doc.processing_status == "completed"
+        assert doc.chunk_count == 3
+        assert job.status == "completed"
+        assert job.chunks_done == 3
+        assert store.chunks == {0: "a", 1: "b", 2: "c"}
+        assert store.tags == ["q3"]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_checkpointed_chunks(self, session_factory):
+        chunks = ["a", "b", "c", "d", "e"]
+        store = FakeStore(fail_at=2)
+        queue = make_queue(session_factory, store, FakeProcessor(chunks))
+        doc_id = await add_document(session_factory)
+        await queue.enqueue(doc_id)
+
+        await queue.run_job(await queue.claim())  # Fails after the first checkpoint
+        store.fail_at = None
+        store.chunks[2] = "partial"  # Uncommitted tail written before the crash
+        await queue.run_job(await queue.claim())
+
+        assert store.truncated_from == 2
+        assert store.embedded == 2 + 3
+        assert [store.chunks[i] for i in range(5)] == chunks
+        assert queue.metrics.jobs_resumed == 1
+        assert queue.metrics.chunks_skipped == 2
+
+    @pytest.mark.asyncio
+    async def test_reprocess_writes_only_changed_chunks(self, session_factory):
+        store = FakeStore()
+        processor = FakeProcessor(["a", "b", "c", "d"])
+        queue = make_queue(session_factory, store, processor)
+        doc_id = await add_document(session_factory)
+        await queue.enqueue(doc_id)
+        await queue.run_job(await queue.claim())
+
+        processor.chunks = ["a", "B", "c", "d", "e"]
+        store.embedded = 0
+        await queue.enqueue(doc_id, restart=True)
+        await queue.run_job(await queue.claim())
+
+        assert [store.chunks[i] for i in range(5)] == ["a", "B", "c", "d", "e"]
+        assert store.embedded == 2  # Positions 1 and 4
+        assert store.embedder.texts == ["a", "b", "c", "d", "B", "e"]
+        assert queue.metrics.chunks_skipped == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_then_marks_failed(self, session_factory):
+        processor = FakeProcessor(["a"], fail_times=5)
+        queue = make_queue(session_factory, FakeStore(), processor)
+        doc_id = await add_document(session_factory)
+        await queue.enqueue(doc_id)
+
+        await queue.run_job(await queue.claim())
+        await queue.run_job(await queue.claim())
+
+        assert await queue.claim() is None
+        async with session_factory() as db:
+            doc = await db.get(Document, doc_id)
+            job = (await db.execute(select(IngestionJob))).scalars().one()
+        assert processor.calls == 2
+        assert job.status == "failed"
+        assert doc.processing_status == "failed"
+        assert "docling crashed" in doc.error_message
+
+    @pytest.mark.asyncio
+    async def test_stats_report_depth_and_throughput(self, session_factory):
+        queue = make_queue(session_factory, FakeStore(), FakeProcessor(["a", "b"]))
+        await queue.enqueue(await add_document(session_factory))
+        await queue.enqueue(await add_document(session_factory))
+        await queue.run_job(await queue.claim())
+
+        stats = await queue.get_stats()
+
+        assert stats["queued"] == 1
+        assert stats["completed"] == 1
+        assert stats["chunks_embedded"] == 2
+        assert stats["chunks_per_second"] > 0
+
+
+class TestWorkers:
+    """Tests for the background worker loop."""
+
+    @pytest.mark.asyncio
+    async def test_workers_drain_queue(self, session_factory):
+        store = FakeStore()
+        queue = make_queue(
+            session_factory, store, FakeProcessor(["a", "b"]), poll_interval_seconds=0.01
+        )
+        doc_id = await add_document(session_factory)
+
+        await queue.start()
+        try:
+            await queue.enqueue(doc_id)
+            for _ in range(200):
+                async with session_factory() as db:
+                    doc = await db.get(Document, doc_id)
+                if doc.processing_status == "completed":
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+
+        assert doc.processing_status == "completed"
+        assert not queue.is_running
+
+    @pytest.mark.asyncio
+    async def test_idle_workers_refresh_vector_index(self, session_factory):
+        """Indexes dropped for writes are rebuilt once the queue is idle."""
+        store = FakeStore()
+        queue = make_queue(
+            session_factory, store, FakeProcessor(["a", "b", "c"]), poll_interval_seconds=0.01
+        )
+        doc_id = await add_document(session_factory)
+
+        await queue.enqueue(doc_id)
+        await queue.start()
+        try:
+            for _ in range(200):
+                if 3 in store.refreshed_with:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+
+        # Never refreshed mid-job, i.e. with only part of the document written
+        assert store.refreshed_with[-1] == 3
+        assert set(store.refreshed_with) <= {0, 3}
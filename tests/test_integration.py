@@ -201,7 +201,7 @@ class TestConversationManagement:
         ]
         response_idx = 0
 
-        def get_response(message):
+        def get_response(message, message_history=None):
             nonlocal response_idx
             result = MagicMock()
             result.output = responses[min(response_idx, len(responses) - 1)]
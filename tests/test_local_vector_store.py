@@ -0,0 +1,283 @@
+"""
+Tests for Local Vector Store
+
+Tests for the memory-mapped on-disk vector store.
+"""
+
+import asyncio
+import zlib
+
+import numpy as np
+import pytest
+
+from src.rag import local_vector_store
+from src.rag.local_vector_store import VECTORS_FILENAME, IVFIndex, LocalVectorStore
+from src.rag.vector_store_factory import VectorStoreFactory
+
+DIMS = 8
+
+
+class FakeEmbedder:
+    """Deterministic embedder: text 'v<i>' maps near basis vector i."""
+
+    def _vector(self, text: str) -> list[float]:
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        vector = rng.normal(0, 0.01, DIMS)
+        if text.startswith("v"):
+            vector[int(text[1:].split()[0]) % DIMS] += 1.0
+        return vector.tolist()
+
+    async def embed(self, text: str) -> list[float]:
+        return self._vector(text)
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self._vector(t) for t in texts]
+
+
+@pytest.fixture
+async def store(tmp_path):
+    """Create an opened local store."""
+    local = LocalVectorStore(
+        path=tmp_path / "vectors", embedder=FakeEmbedder(), dimensions=DIMS, ivf_min_rows=0
+    )
+    await local.create_index()
+    yield local
+    await local.close()
+
+
+class TestLocalVectorStore:
+    """Tests for add, search, delete and compaction."""
+
+    @pytest.mark.asyncio
+    async def test_search_returns_nearest(self, store):
+        await store.add_document("1", ["v0 alpha", "v1 beta"], source="a.txt")
+        await store.add_document("2", ["v2 gamma"], source="b.txt")
+
+        results = await store.search("v1", top_k=2)
+
+        assert results[0]["content"] == "v1 beta"
+        assert results[0]["document_id"] == "1"
+        assert results[0]["chunk_index"] == 1
+        assert results[0]["score"] < results[1]["score"]
+
+    @pytest.mark.asyncio
+    async def test_source_type_filter(self, store):
+        await store.add_document("1", ["v0 doc"], source="a.txt")
+        await store.add_document("2", ["v0 schema"], source="db", source_type="schema")
+
+        results = await store.search("v0", top_k=5, source_type="schema")
+
+        assert [r["content"] for r in results] == ["v0 schema"]
+        assert await store.search("v0", source_type="web") == []
+
+    @pytest.mark.asyncio
+    async def test_delete_tombstones_then_compacts(self, store):
+        store.compaction_ratio = 0.5
+        await store.add_document("1", ["v0 a", "v1 a"], source="a.txt")
+        await store.add_document("2", ["v2 b"], source="b.txt")
+        await store.add_document("3", ["v3 c", "v4 c", "v5 c"], source="c.txt")
+
+        assert await store.delete_document("2") == 1
+        stats = await store.get_stats()
+        assert stats["tombstones"] == 1
+        assert stats["compactions"] == 0
+        assert all(r["document_id"] != "2" for r in await store.search("v2", top_k=10))
+
+        assert await store.delete_document("1") == 2
+        stats = await store.get_stats()
+        assert stats["compactions"] == 1
+        assert stats["tombstones"] == 0
+        assert stats["num_chunks"] == 3
+        assert (store.path / VECTORS_FILENAME).stat().st_size == 3 * DIMS * 4
+
+        results = await store.search("v4", top_k=1)
+        assert results[0]["content"] == "v4 c"
+
+    @pytest.mark.asyncio
+    async def test_persists_across_reopen(self, store):
+        await store.add_document("1", ["v0 a", "v3 b"], source="a.txt", metadata={"k": 1})
+        await store.close()
+
+        reopened = LocalVectorStore(path=store.path, embedder=FakeEmbedder(), dimensions=DIMS)
+        await reopened.create_index()
+        results = await reopened.search("v3", top_k=1)
+        await reopened.close()
+
+        assert results[0]["content"] == "v3 b"
+        assert results[0]["metadata"] == {"k": 1}
+
+    @pytest.mark.asyncio
+    async def test_interrupted_append_is_truncated(self, store):
+        await store.add_document("1", ["v0 a"], source="a.txt")
+        await store.close()
+        with open(store.path / VECTORS_FILENAME, "ab") as f:
+            f.write(b"\0" * DIMS * 4)
+
+        await store.create_index()
+
+        assert (await store.get_stats())["num_chunks"] == 1
+        assert (store.path / VECTORS_FILENAME).stat().st_size == DIMS * 4
+
+    @pytest.mark.asyncio
+    async def test_ivf_index_matches_flat_search(self, store):
+        chunks = [f"v{i % DIMS} chunk {i}" for i in range(64)]
+        await store.add_document("1", chunks, source="a.txt")
+        flat = await store.search("v5", top_k=5)
+
+        store.ivf_min_rows = 10
+        store.ivf_nprobe = 64  # Probe every list: results must equal the flat scan
+        ivf = await store.search("v5", top_k=5)
+
+        assert (await store.get_stats())["index"] == "ivf"
+        assert [r["id"] for r in ivf] == [r["id"] for r in flat]
+
+        # Rows added after the index is built are assigned incrementally
+        await store.add_document("2", ["v5 late"], source="b.txt")
+        assert any(r["content"] == "v5 late" for r in await store.search("v5", top_k=10))
+
+    @pytest.mark.asyncio
+    async def test_compaction_interrupted_before_swap_recovers(self, store, monkeypatch):
+        store.compaction_ratio = 0.5
+        await store.add_document("1", ["v0 a", "v1 a"], source="a.txt")
+        await store.add_document("2", ["v2 b", "v3 b"], source="b.txt")
+
+        def crash(src, dst):
+            raise OSError("simulated crash")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(local_vector_store.os, "replace", crash)
+            with pytest.raises(OSError):
+                await store.delete_document("1")
+        await store.close()
+
+        # Metadata committed the renumbering: reopening swaps in the compacted file
+        await store.create_index()
+        results = await store.search("v3", top_k=1)
+        assert results[0]["content"] == "v3 b"
+        assert (store.path / VECTORS_FILENAME).stat().st_size == 2 * DIMS * 4
+        assert not list(store.path.glob(VECTORS_FILENAME + ".compact-*"))
+
+    @pytest.mark.asyncio
+    async def test_uncommitted_compaction_file_is_discarded(self, store):
+        await store.add_document("1", ["v0 a", "v1 a"], source="a.txt")
+        await store.close()
+        (store.path / f"{VECTORS_FILENAME}.compact-1").write_bytes(b"\0" * DIMS * 4)
+
+        await store.create_index()
+
+        results = await store.search("v1", top_k=1)
+        assert results[0]["content"] == "v1 a"
+        assert not (store.path / f"{VECTORS_FILENAME}.compact-1").exists()
+
+    @pytest.mark.asyncio
+    async def test_search_retries_when_compaction_renumbers_rows(self, store, monkeypatch):
+        store.compaction_ratio = 0.5
+        await store.add_document("1", ["v0 a", "v1 a", "v2 a"], source="a.txt")
+        await store.add_document("2", ["v5 b"], source="b.txt")
+        loop = asyncio.get_running_loop()
+        search_rows = store._search_rows
+        calls = []
+
+        def compact_after_scoring(*args):
+            hits = search_rows(*args)
+            if not calls:
+                # Row 3 ("v5 b") becomes row 0 before the metadata is fetched
+                future = asyncio.run_coroutine_threadsafe(store.delete_document("1"), loop)
+                future.result()
+            calls.append(hits)
+            return hits
+
+        monkeypatch.setattr(store, "_search_rows", compact_after_scoring)
+        results = await store.search("v5", top_k=1)
+
+        assert len(calls) == 2
+        assert results[0]["content"] == "v5 b"
+        assert results[0]["id"] == 0
+
+    @pytest.mark.asyncio
+    async def test_ivf_is_built_outside_the_state_lock(self, store, monkeypatch):
+        await store.add_document("1", [f"v{i % DIMS} chunk {i}" for i in range(32)], source="a")
+        store.ivf_min_rows = 10
+        build = IVFIndex.build
+        locked = []
+
+        def checked_build(*args):
+            locked.append(store._db_lock.locked())
+            return build(*args)
+
+        monkeypatch.setattr(IVFIndex, "build", checked_build)
+        await store.search("v2", top_k=3)
+        await store.search("v2", top_k=3)
+
+        assert locked == [False]  # Built once, without blocking lookups
+        assert (await store.get_stats())["index"] == "ivf"
+
+    @pytest.mark.asyncio
+    async def test_clear_all(self, store):
+        await store.add_document("1", ["v0 a", "v1 b"], source="a.txt")
+
+        assert await store.clear_all() == {"chunks_deleted": 2}
+        assert await store.search("v0") == []
+
+
+class TestContentAddressing:
+    """Tests for embedding reuse and incremental document sync."""
+
+    @pytest.mark.asyncio
+    async def test_identical_chunks_reuse_stored_embeddings(self, store):
+        await store.add_document("1", ["v0 shared", "v1 a"], source="a.txt")
+
+        await store.add_document("2", ["v0 shared", "v2 b", "v2 b"], source="b.txt")
+
+        assert store.chunks_embedded == 3  # "v0 shared" and the repeated "v2 b" reused
+        assert store.chunks_reused == 2
+        results = await store.search("v0", top_k=2)
+        assert {r["document_id"] for r in results} == {"1", "2"}
+
+    @pytest.mark.asyncio
+    async def test_embedding_model_change_is_a_miss(self, store):
+        await store.sync_document("1", ["v0 a", "v1 b"], source="a.txt")
+        embedded = store.chunks_embedded
+
+        store.embedder.model = "other-embed"
+        counts = await store.sync_document("1", ["v0 a", "v1 b"], source="a.txt")
+        await store.add_document("2", ["v0 a"], source="b.txt")
+
+        # Nothing unchanged or reused: every chunk is embedded by the new model
+        assert counts == {"unchanged": 0, "inserted": 2, "deleted": 2}
+        assert store.chunks_embedded == embedded + 2
+        assert store.chunks_reused == 1  # "v0 a" from the re-synced document
+
+    @pytest.mark.asyncio
+    async def test_sync_writes_only_changed_chunks(self, store):
+        await store.sync_document("1", ["v0 a", "v1 b", "v2 c", "v3 d"], source="a.txt")
+        embedded = store.chunks_embedded
+
+        counts = await store.sync_document("1", ["v0 a", "v3 d", "v2 c"], source="a.txt")
+
+        assert counts == {"unchanged": 2, "inserted": 1, "deleted": 2}
+        assert store.chunks_embedded == embedded  # "v3 d" moved; its embedding is reused
+        assert await store.get_chunk_hashes("1") == {
+            0: store.chunk_hash("v0 a"),
+            1: store.chunk_hash("v3 d"),
+            2: store.chunk_hash("v2 c"),
+        }
+        results = await store.search("v3", top_k=1)
+        assert results[0]["chunk_index"] == 1
+
+
+class TestLocalFactory:
+    """Tests for factory creation."""
+
+    @pytest.mark.asyncio
+    async def test_factory_creates_local_store(self, tmp_path):
+        store = await VectorStoreFactory.create(
+            store_type="local",
+            embedder=FakeEmbedder(),
+            dimensions=DIMS,
+            local_path=str(tmp_path / "store"),
+        )
+
+        assert isinstance(store, LocalVectorStore)
+        assert (tmp_path / "store" / VECTORS_FILENAME).exists()
+        await store.close()
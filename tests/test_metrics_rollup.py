@@ -0,0 +1,234 @@
+"""
+Tests for Metrics Rollups
+
+Tests for the quantile sketch, incremental rollup job and the analytics
+endpoints reading the rollups.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.models.database import (
+    Base,
+    Conversation,
+    Message,
+    MetricsRollup,
+    MetricsRollupWatermark,
+    QueryHistory,
+    ToolCallRecord,
+)
+from src.api.routes.analytics import get_query_performance_timeline, get_tool_usage_stats
+from src.services.metrics_rollup import (
+    METRIC_QUERIES,
+    MetricsRollupService,
+    load_rollups,
+    summarize,
+)
+from src.utils.sketch import QuantileSketch
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """SQLite database with the history, message and rollup tables."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}",
+        execution_options={"schema_translate_map": {"app": None}},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                Conversation.__table__,
+                Message.__table__,
+                QueryHistory.__table__,
+                MetricsRollup.__table__,
+                MetricsRollupWatermark.__table__,
+                ToolCallRecord.__table__,
+            ],
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_queries(session_factory, timings: list[int], created_at: datetime) -> None:
+    async with session_factory() as db:
+        db.add_all(
+            QueryHistory(
+                natural_language="q",
+                execution_time_ms=ms,
+                result_row_count=10,
+                created_at=created_at,
+            )
+            for ms in timings
+        )
+        await db.commit()
+
+
+def make_service(session_factory, **kwargs):
+    kwargs.setdefault("settle_seconds", 0)
+    return MetricsRollupService(session_factory=session_factory, interval_seconds=0, **kwargs)
+
+
+class TestQuantileSketch:
+    """Tests for the mergeable quantile sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(5, 1) for _ in range(5000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_merge_and_round_trip(self):
+        left, right = QuantileSketch(), QuantileSketch()
+        for value in range(1, 51):
+            left.add(value)
+        for value in range(51, 101):
+            right.add(value)
+        left.merge(right)
+
+        restored = QuantileSketch.from_json(left.to_json())
+
+        assert restored.count == 100
+        assert restored.quantile(0.5) == pytest.approx(50, rel=0.02)
+        assert QuantileSketch.from_json("garbage").count == 0
+
+
+class TestRollupJob:
+    """Tests for incremental rollups."""
+
+    @pytest.mark.asyncio
+    async def test_folds_queries_into_hourly_and_daily_buckets(self, session_factory):
+        stamp = datetime(2026, 3, 1, 9, 15)
+        await add_queries(session_factory, [100, 200, 300], stamp)
+        await add_queries(session_factory, [400], stamp + timedelta(hours=2))
+
+        processed = await make_service(session_factory).run_once()
+
+        async with session_factory() as db:
+            hourly = await load_rollups(db, METRIC_QUERIES, "hour")
+            daily = await load_rollups(db, METRIC_QUERIES, "day")
+        assert processed["query_history"] == 4
+        assert [row.event_count for row in hourly] == [3, 1]
+        summary = summarize(daily)
+        assert summary.event_count == 4
+        assert summary.avg == 250
+        assert (summary.value_min, summary.value_max) == (100, 400)
+        assert summary.rows_sum == 40
+        assert summary.quantile(0.5) == pytest.approx(200, rel=0.02)
+
+    @pytest.mark.asyncio
+    async def test_second_run_only_adds_new_rows(self, session_factory):
+        stamp = datetime(2026, 3, 1, 9)
+        service = make_service(session_factory, batch_size=2)
+        await add_queries(session_factory, [10, 20, 30], stamp)
+        await service.run_once()
+        await add_queries(session_factory, [40], stamp)
+
+        processed = await service.run_once()
+        await make_service(session_factory).run_once()  # Another process: nothing left
+
+        async with session_factory() as db:
+            daily = await load_rollups(db, METRIC_QUERIES, "day")
+        assert processed["query_history"] == 1
+        assert summarize(daily).event_count == 4
+        assert summarize(daily).value_sum == 100
+
+    @pytest.mark.asyncio
+    async def test_unsettled_rows_wait_for_next_run(self, session_factory):
+        await add_queries(session_factory, [10], datetime.utcnow() - timedelta(minutes=5))
+        await add_queries(session_factory, [20], datetime.utcnow())
+
+        processed = await make_service(session_factory, settle_seconds=60).run_once()
+
+        assert processed["query_history"] == 1
+
+    @pytest.mark.asyncio
+    async def test_row_without_timestamp_does_not_stall_watermark(self, session_factory):
+        stamp = datetime(2026, 3, 1, 9)
+        await add_queries(session_factory, [10, 20, 30], stamp)
+        async with session_factory() as db:
+            await db.execute(
+                update(QueryHistory).where(QueryHistory.id == 2).values(created_at=None)
+            )
+            await db.commit()
+
+        processed = await make_service(session_factory).run_once()
+
+        async with session_factory() as db:
+            watermark = await db.get(MetricsRollupWatermark, "query_history")
+            daily = await load_rollups(db, METRIC_QUERIES, "day")
+        assert processed["query_history"] == 3
+        assert watermark.last_id == 3
+        assert summarize(daily).event_count == 2
+        assert summarize(daily).value_sum == 40
+
+    @pytest.mark.asyncio
+    async def test_extracts_tool_calls_from_messages(self, session_factory):
+        stamp = datetime.utcnow() - timedelta(days=1)
+        async with session_factory() as db:
+            conv = Conversation(title="c")
+            db.add(conv)
+            await db.flush()
+            calls = [{"name": "list_tables"}, {"tool_name": "read_data"}, {"name": "list_tables"}]
+            db.add_all(
+                [
+                    Message(conversation_id=conv.id, role="user", content="hi", created_at=stamp),
+                    Message(
+                        conversation_id=conv.id,
+                        role="assistant",
+                        content="ok",
+                        tool_calls=json.dumps(calls),
+                        created_at=stamp,
+                    ),
+                    Message(
+                        conversation_id=conv.id,
+                        role="assistant",
+                        content="bad",
+                        tool_calls="not json",
+                        created_at=stamp,
+                    ),
+                ]
+            )
+            await db.commit()
+
+        processed = await make_service(session_factory).run_once()
+
+        async with session_factory() as db:
+            stored = await db.scalar(select(func.count()).select_from(ToolCallRecord))
+            usage = await get_tool_usage_stats(days=30, db=db)
+        assert processed["messages"] == 3
+        assert stored == 3
+        assert usage.total_tool_calls == 3
+        assert [(t.tool_name, t.usage_count) for t in usage.tools] == [
+            ("list_tables", 2),
+            ("read_data", 1),
+        ]
+
+
+class TestAnalyticsEndpoints:
+    """Tests for endpoints reading the rollups."""
+
+    @pytest.mark.asyncio
+    async def test_performance_timeline_reads_daily_rollups(self, session_factory):
+        today = datetime.utcnow().replace(hour=1, minute=0, second=0, microsecond=0)
+        await add_queries(session_factory, [100, 300], today - timedelta(days=1))
+        await add_queries(session_factory, [50], today - timedelta(days=2))
+        await make_service(session_factory).run_once()
+
+        async with session_factory() as db:
+            timeline = await get_query_performance_timeline(period="day", db=db)
+
+        assert [point.value for point in timeline.data] == [50.0, 200.0]
+        assert timeline.data[1].timestamp == (today - timedelta(days=1)).date().isoformat()
+        assert timeline.avg_execution_time == pytest.approx(150.0)
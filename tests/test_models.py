@@ -206,6 +206,23 @@ class TestConversation:
         assert len(limited) == 4  # 2 turns * 2 messages
         assert limited[0]["content"] == "Q3"  # Most recent 2 turns
 
+    def test_get_history_for_context_token_budget(self):
+        """Test that a token budget keeps only the most recent turns that fit."""
+        conv = Conversation()
+
+        for i in range(5):
+            turn = ConversationTurn(
+                user_message=ChatMessage.user(f"Q{i} " + "x" * 400),
+                assistant_message=ChatMessage.assistant(f"A{i} " + "y" * 400),
+            )
+            conv.add_turn(turn)
+
+        budget = conv.turns[0].token_estimate * 2
+        history = conv.get_history_for_context(max_turns=10, max_tokens=budget)
+
+        assert len(history) == 4
+        assert history[0]["content"].startswith("Q3")
+
     def test_total_tool_calls(self):
         """Test counting total tool calls across turns."""
         conv = Conversation()
@@ -0,0 +1,306 @@
+"""
+Tests for MSSQL Vector Store index modes
+
+Tests for DiskANN index management, ANN/exact routing and search stats.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.rag.mssql_vector_store import DISKANN_INDEX_NAME, MSSQLVectorStore
+
+
+def make_row(row_id, distance=0.1):
+    """Create a search result row stand-in."""
+    return SimpleNamespace(
+        id=row_id,
+        content=f"chunk {row_id}",
+        source="guide.pdf",
+        source_type="document",
+        document_id=1,
+        chunk_index=row_id,
+        metadata=None,
+        distance=distance,
+    )
+
+
+class FakeDatabase:
+    """Records executed SQL and answers by statement type."""
+
+    def __init__(self, chunk_count=0, index_exists=False, ann_error=None):
+        self.chunk_count = chunk_count
+        self.index_exists = index_exists
+        self.ann_error = ann_error
+        # sp_getapplock return code for exclusive requests (< 0 = not granted)
+        self.exclusive_lock_result = 0
+        self.ann_rows = [make_row(1), make_row(2), make_row(3)]
+        self.exact_rows = [make_row(1), make_row(2), make_row(4)]
+        self.executed: list[str] = []
+
+    def session_factory(self):
+        fake = self
+
+        @asynccontextmanager
+        async def factory():
+            session = MagicMock()
+
+            async def execute(statement, params=None):
+                sql = str(statement)
+                fake.executed.append(sql)
+                result = MagicMock()
+                if "INFORMATION_SCHEMA.TABLES" in sql:
+                    result.fetchone.return_value = (2,)
+                elif "sp_getapplock" in sql:
+                    exclusive = params["mode"] == "Exclusive"
+                    result.scalar.return_value = fake.exclusive_lock_result if exclusive else 0
+                elif "DROP INDEX" in sql:
+                    fake.index_exists = False
+                elif "CREATE VECTOR INDEX" in sql:
+                    fake.index_exists = True
+                elif "INSERT INTO" in sql or "DELETE FROM" in sql:
+                    if fake.index_exists:
+                        raise Exception("Table with a vector index is read-only")
+                    result.rowcount = 1
+                elif "sys.indexes" in sql:
+                    result.fetchone.return_value = SimpleNamespace(
+                        chunk_count=fake.chunk_count, index_count=int(fake.index_exists)
+                    )
+                elif "VECTOR_SEARCH" in sql:
+                    if fake.ann_error:
+                        raise fake.ann_error
+                    result.fetchall.return_value = fake.ann_rows
+                elif "HybridSearchDocuments" in sql:
+                    result.fetchall.return_value = [
+                        SimpleNamespace(**vars(row), rrf_score=0.5, search_type="hybrid")
+                        for row in fake.exact_rows
+                    ]
+                elif "SearchDocuments" in sql:
+                    result.fetchall.return_value = fake.exact_rows
+                return result
+
+            session.execute = execute
+            session.commit = AsyncMock()
+            session.rollback = AsyncMock()
+            yield session
+
+        return factory
+
+    def count(self, fragment):
+        return sum(fragment in sql for sql in self.executed)
+
+
+def make_store(fake, **kwargs):
+    """Create a DiskANN-mode store over the fake database."""
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(return_value=[0.1, 0.2])
+    kwargs.setdefault("index_mode", "diskann")
+    kwargs.setdefault("ann_min_rows", 1000)
+    kwargs.setdefault("recall_sample_rate", 0.0)
+    kwargs.setdefault("ann_rebuild_delay_seconds", 0.01)
+    return MSSQLVectorStore(session_factory=fake.session_factory(), embedder=embedder, **kwargs)
+
+
+class TestVectorIndexManagement:
+    """Tests for DiskANN index creation."""
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError, match="Invalid vector index mode"):
+            MSSQLVectorStore(session_factory=MagicMock(), embedder=MagicMock(), index_mode="hnsw")
+
+    @pytest.mark.asyncio
+    async def test_index_created_for_large_corpus(self):
+        fake = FakeDatabase(chunk_count=5000)
+        store = make_store(fake)
+
+        await store.create_index()
+
+        assert fake.count("CREATE VECTOR INDEX") == 1
+        assert DISKANN_INDEX_NAME in fake.executed[-1]
+        assert store.get_search_stats()["ann_index_ready"] is True
+
+    @pytest.mark.asyncio
+    async def test_small_corpus_stays_exact(self):
+        fake = FakeDatabase(chunk_count=10)
+        store = make_store(fake)
+
+        await store.create_index()
+
+        assert fake.count("CREATE VECTOR INDEX") == 0
+        await store.search("query")
+        assert fake.count("VECTOR_SEARCH") == 0
+        assert fake.count("SearchDocuments") == 1
+
+    @pytest.mark.asyncio
+    async def test_overwrite_rebuilds_index(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake)
+
+        await store.create_index(overwrite=True)
+
+        assert fake.count("DROP INDEX") == 1
+        assert fake.count("CREATE VECTOR INDEX") == 1
+
+    @pytest.mark.asyncio
+    async def test_exact_mode_never_touches_index(self):
+        fake = FakeDatabase(chunk_count=5000)
+        store = make_store(fake, index_mode="exact")
+
+        await store.create_index()
+
+        assert fake.count("AS chunk_count") == 0
+
+
+class TestSearchRouting:
+    """Tests for ANN vs exact query routing."""
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_search_uses_ann(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake)
+        await store.create_index()
+
+        results = await store.search("query", top_k=3)
+
+        assert [r["id"] for r in results] == [1, 2, 3]
+        assert fake.count("VECTOR_SEARCH") == 1
+        assert store.get_search_stats()["search_latency"]["ann"]["queries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_filtered_search_is_exact(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake)
+        await store.create_index()
+
+        await store.search("query", source_type="document")
+
+        assert fake.count("VECTOR_SEARCH") == 0
+        assert fake.count("SearchDocuments") == 1
+
+    @pytest.mark.asyncio
+    async def test_ann_failure_falls_back_to_exact(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True, ann_error=Exception("no index"))
+        store = make_store(fake)
+        await store.create_index()
+
+        results = await store.search("query", top_k=3)
+
+        assert [r["id"] for r in results] == [1, 2, 4]
+        assert store.get_search_stats()["ann_index_ready"] is False
+
+    @pytest.mark.asyncio
+    async def test_recall_sampled_against_exact(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake, recall_sample_rate=1.0)
+        await store.create_index()
+
+        await store.search("query", top_k=3)
+        await asyncio.gather(*store._recall_tasks)
+
+        recall = store.get_search_stats()["ann_recall"]
+        assert recall["samples"] == 1
+        assert recall["mean_recall"] == pytest.approx(2 / 3, abs=1e-4)
+
+    @pytest.mark.asyncio
+    async def test_ann_hybrid_failure_falls_back_to_exact(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True, ann_error=Exception("no index"))
+        store = make_store(fake)
+        await store.create_index()
+
+        results = await store.hybrid_search("query", top_k=3)
+
+        assert [r["id"] for r in results] == [1, 2, 4]
+        assert store.get_search_stats()["ann_index_ready"] is False
+
+
+class TestWritesWithIndex:
+    """Tests for writes while a DiskANN index (which makes the table read-only) exists."""
+
+    @pytest.mark.asyncio
+    async def test_write_drops_index_and_rebuilds_after_writes(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake)
+        await store.create_index()
+
+        await store.add_document("1", ["new chunk"], "guide.pdf", embeddings=[[0.1, 0.2]])
+        await store.delete_document("2")
+
+        assert fake.count("DROP INDEX") == 2
+        assert fake.count("sp_releaseapplock") == 2
+        assert store.get_search_stats()["ann_index_ready"] is False
+        await store.search("query")
+        assert fake.count("VECTOR_SEARCH") == 0
+
+        # Rebuilt once writes have been quiet for the debounce delay
+        await asyncio.sleep(0.05)
+        assert fake.count("CREATE VECTOR INDEX") == 1
+        assert store.get_search_stats()["ann_index_ready"] is True
+        await store.search("query")
+        assert fake.count("VECTOR_SEARCH") == 1
+
+    @pytest.mark.asyncio
+    async def test_rebuild_waits_for_writes(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake)
+        await store.create_index()
+
+        async with store._chunk_writes():
+            assert await store.refresh_vector_index() is False
+            await asyncio.sleep(0.05)
+            assert not fake.index_exists
+
+        await asyncio.sleep(0.05)
+        assert fake.index_exists
+        # Nothing written since: no further rebuild
+        await store.refresh_vector_index()
+        assert fake.count("CREATE VECTOR INDEX") == 1
+
+    @pytest.mark.asyncio
+    async def test_busy_lock_keeps_index_stale_and_retries(self):
+        """Writes in another process hold the lock: the build is retried later."""
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake)
+        await store.create_index()
+        fake.exclusive_lock_result = -1
+
+        await store.delete_document("1")
+        await asyncio.sleep(0.05)
+
+        assert fake.count("CREATE VECTOR INDEX") == 0
+        assert store._index_stale is True
+
+        fake.exclusive_lock_result = 0
+        await asyncio.sleep(0.05)
+        assert fake.count("CREATE VECTOR INDEX") == 1
+        assert store._index_stale is False
+
+    @pytest.mark.asyncio
+    async def test_failed_build_stays_stale(self):
+        fake = FakeDatabase(chunk_count=5000, index_exists=True)
+        store = make_store(fake, ann_rebuild_delay_seconds=3600)
+        await store.create_index()
+        await store.delete_document("1")
+        store._refresh_task.cancel()
+
+        with patch.object(
+            store, "_get_index_lock", AsyncMock(side_effect=ConnectionError("dropped"))
+        ):
+            assert await store.ensure_vector_index() is False
+
+        assert store._index_stale is True
+        assert await store.refresh_vector_index() is True
+
+    @pytest.mark.asyncio
+    async def test_exact_mode_writes_leave_indexes_alone(self):
+        fake = FakeDatabase(chunk_count=5000)
+        store = make_store(fake, index_mode="exact")
+
+        await store.delete_document("1")
+        await store.refresh_vector_index()
+
+        assert fake.count("DROP INDEX") == 0
+        assert fake.count("sp_getapplock") == 0
+        assert fake.count("CREATE VECTOR INDEX") == 0
@@ -0,0 +1,152 @@
+"""
+Tests for Pagination
+
+Tests for SQL-side counting, keyset cursors and aggregated child counts.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.models.database import Base, Conversation, Document, Message
+from src.api.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from src.api.routes.conversations import list_conversations
+from src.api.routes.documents import list_documents
+
+ORDER = [(Conversation.updated_at, True), (Conversation.id, True)]
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """SQLite database with conversation, message and document tables."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'backend.db'}",
+        execution_options={"schema_translate_map": {"app": None}},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[Conversation.__table__, Message.__table__, Document.__table__],
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_conversations(session_factory, count: int) -> None:
+    """Add conversations sharing timestamps in pairs to exercise tie-breaking."""
+    base = datetime(2026, 1, 1)
+    async with session_factory() as db:
+        for i in range(count):
+            stamp = base + timedelta(minutes=i // 2)
+            conv = Conversation(title=f"c{i}", created_at=stamp, updated_at=stamp)
+            db.add(conv)
+            await db.flush()
+            for _ in range(i % 3):
+                db.add(Message(conversation_id=conv.id, role="user", content="hi"))
+        await db.commit()
+
+
+class TestCursorEncoding:
+    """Tests for opaque continuation tokens."""
+
+    def test_round_trip_restores_datetimes(self):
+        stamp = datetime(2026, 5, 1, 12, 30, 15, 250000)
+
+        token = encode_cursor(ORDER, [stamp, 42])
+
+        assert decode_cursor(ORDER, token) == [stamp, 42]
+
+    def test_rejects_garbage_and_foreign_cursors(self):
+        foreign = encode_cursor([(Document.created_at, True), (Document.id, True)], [None, 1])
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(ORDER, "not-a-cursor!")
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(ORDER, foreign)
+
+
+class TestPaginate:
+    """Tests for keyset pagination and counting."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_walk_visits_every_row_once(self, session_factory):
+        await add_conversations(session_factory, 7)
+
+        seen, cursor = [], None
+        async with session_factory() as db:
+            while True:
+                page = await paginate(db, select(Conversation), ORDER, limit=3, cursor=cursor)
+                assert page.total == 7
+                seen.extend(conv.title for conv in page.items)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+
+        assert seen == ["c6", "c5", "c4", "c3", "c2", "c1", "c0"]
+
+    @pytest.mark.asyncio
+    async def test_skip_matches_cursor_pages(self, session_factory):
+        await add_conversations(session_factory, 5)
+
+        async with session_factory() as db:
+            first = await paginate(db, select(Conversation), ORDER, limit=2)
+            by_cursor = await paginate(
+                db, select(Conversation), ORDER, limit=2, cursor=first.next_cursor
+            )
+            by_offset = await paginate(db, select(Conversation), ORDER, limit=2, skip=2)
+
+        assert [c.id for c in by_cursor.items] == [c.id for c in by_offset.items]
+
+    @pytest.mark.asyncio
+    async def test_estimate_falls_back_to_exact_count(self, session_factory):
+        await add_conversations(session_factory, 4)
+
+        async with session_factory() as db:
+            page = await paginate(db, select(Conversation), ORDER, limit=2, count="estimate")
+
+        assert page.total == 4
+
+
+class TestListRoutes:
+    """Tests for list endpoints built on the pagination helpers."""
+
+    @pytest.mark.asyncio
+    async def test_conversation_message_counts_are_aggregated(self, session_factory):
+        await add_conversations(session_factory, 4)
+
+        async with session_factory() as db:
+            result = await list_conversations(skip=0, limit=10, db=db)
+
+        counts = {conv.title: conv.message_count for conv in result.conversations}
+        assert counts == {"c0": 0, "c1": 1, "c2": 2, "c3": 0}
+        assert result.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_document_pages_chain_through_cursor(self, session_factory):
+        async with session_factory() as db:
+            db.add_all(
+                Document(
+                    filename=f"{i}.pdf",
+                    original_filename=f"{i}.pdf",
+                    file_size=1,
+                    processing_status="completed",
+                    created_at=datetime(2026, 1, 1) + timedelta(hours=i),
+                )
+                for i in range(3)
+            )
+            await db.commit()
+
+            first = await list_documents(skip=0, limit=2, db=db)
+            second = await list_documents(limit=2, cursor=first.next_cursor, db=db)
+
+        assert [doc.filename for doc in first.documents] == ["2.pdf", "1.pdf"]
+        assert [doc.filename for doc in second.documents] == ["0.pdf"]
+        assert second.total == 3
+        assert second.next_cursor is None
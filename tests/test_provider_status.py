@@ -0,0 +1,150 @@
+"""
+Tests for Provider Status
+
+Tests for the shared provider HTTP client, response caching, concurrent
+probing and WebSocket push of provider status changes.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.providers import get_available_providers
+from src.providers.http import clear_cache, get_http_client, get_json
+from src.services.provider_status import ProviderStatusService
+
+OLLAMA_ROUTES = {
+    "/api/version": {"version": "0.5.0"},
+    "/api/tags": {"models": [{"name": "qwen2.5:7b-instruct"}]},
+    "/v1/models": {"data": [{"id": "phi-4-mini"}]},
+}
+
+
+@pytest.mark.unit
+class TestProviderHttp:
+    """Tests for the shared client and response cache."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared_per_loop(self):
+        """Status checks reuse one client (and its connection pool)."""
+        client = get_http_client()
+
+        assert get_http_client() is client
+        await client.aclose()
+        assert get_http_client() is not client
+
+    @pytest.mark.asyncio
+    async def test_responses_are_cached(self, provider_http):
+        """Repeated requests within the TTL are served from the cache."""
+        requested = provider_http(OLLAMA_ROUTES)
+
+        first = await get_json("http://ollama/api/tags", ttl=60)
+        second = await get_json("http://ollama/api/tags", ttl=60)
+        await get_json("http://ollama/api/tags", ttl=0)
+
+        assert first == second == OLLAMA_ROUTES["/api/tags"]
+        assert requested == ["/api/tags", "/api/tags"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_shared(self, provider_http):
+        """Concurrent callers for the same URL share one request."""
+        requested = provider_http(OLLAMA_ROUTES, delay=0.05)
+
+        results = await asyncio.gather(
+            *(get_json("http://ollama/api/version", ttl=60) for _ in range(5))
+        )
+
+        assert all(result == {"version": "0.5.0"} for result in results)
+        assert requested == ["/api/version"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, provider_http):
+        """A failed request is retried on the next call."""
+        requested = provider_http({})
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await get_json("http://ollama/api/version", ttl=60)
+
+        assert len(requested) == 2
+
+    @pytest.mark.asyncio
+    async def test_providers_are_probed_concurrently(self, provider_http):
+        """Checking all providers takes as long as the slowest one."""
+        provider_http(OLLAMA_ROUTES, delay=0.2)
+
+        start = time.perf_counter()
+        statuses = await get_available_providers()
+
+        assert time.perf_counter() - start < 0.35
+        assert [status.available for status in statuses] == [True, True]
+
+
+@pytest.mark.unit
+class TestProviderStatusService:
+    """Tests for ProviderStatusService."""
+
+    @pytest.fixture
+    def ws_manager(self):
+        manager = MagicMock()
+        manager.broadcast = AsyncMock(return_value=1)
+        manager.get_connection_count.return_value = 1
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_get_statuses(self, provider_http):
+        """Statuses use the settings API provider shape."""
+        provider_http(OLLAMA_ROUTES)
+
+        statuses = await ProviderStatusService().get_statuses()
+
+        ollama, foundry = statuses
+        assert ollama["id"] == "ollama"
+        assert ollama["available"] is True
+        assert ollama["version"] == "0.5.0"
+        assert foundry["id"] == "foundry_local"
+        assert foundry["available"] is True
+
+    @pytest.mark.asyncio
+    async def test_pushes_only_changes(self, provider_http, ws_manager):
+        """Status is pushed when it changes, not on every check."""
+        provider_http(OLLAMA_ROUTES)
+        service = ProviderStatusService(websocket_manager=ws_manager)
+
+        await service.get_statuses()
+        await service.get_statuses()
+
+        ws_manager.broadcast.assert_awaited_once()
+        message = ws_manager.broadcast.await_args.args[0]
+        assert message["type"] == "provider_status"
+        assert message["changed"] == ["ollama", "foundry_local"]
+
+        # Ollama goes away (after the cached responses expire)
+        clear_cache()
+        provider_http({"/v1/models": OLLAMA_ROUTES["/v1/models"]})
+        statuses = await service.get_statuses()
+
+        assert statuses[0]["available"] is False
+        assert ws_manager.broadcast.await_count == 2
+        assert ws_manager.broadcast.await_args.args[0]["changed"] == ["ollama"]
+
+    @pytest.mark.asyncio
+    async def test_poll_skips_without_connections(self, provider_http, ws_manager):
+        """Background checks only run while WebSocket clients are connected."""
+        requested = provider_http(OLLAMA_ROUTES)
+        ws_manager.get_connection_count.return_value = 0
+        service = ProviderStatusService(websocket_manager=ws_manager, poll_interval_seconds=0.01)
+
+        await service.start()
+        await asyncio.sleep(0.05)
+        assert requested == []
+
+        ws_manager.get_connection_count.return_value = 1
+        await asyncio.sleep(0.05)
+        await service.stop()
+
+        assert requested
+        assert not service.is_running
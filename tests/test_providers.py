@@ -1,14 +1,20 @@
 """
 Tests for LLM Providers
 
-Tests for Ollama, Foundry Local, and provider factory.
+Tests for Ollama, Foundry Local, the fake load-testing provider and provider factory.
 """
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from fastapi import WebSocketDisconnect
+from pydantic_ai import Agent
 
 from src.providers import LLMProvider, ProviderType, create_provider, get_available_providers
+from src.providers.factory import auto_select_provider
+from src.providers.fake import FakeOpenAIServer, FakeProvider, LatencyModel, load_script
 from src.providers.foundry import FoundryLocalProvider
 from src.providers.ollama import OllamaProvider
 
@@ -61,37 +67,14 @@ class TestOllamaProvider:
         assert model is not None
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_check_connection_success(self, mock_client_cls):
+    async def test_check_connection_success(self, provider_http):
         """Test successful connection check."""
-        # Setup mock client
-        mock_client = MagicMock()
-        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
-
-        # Mock version response
-        version_response = MagicMock()
-        version_response.status_code = 200
-        version_response.raise_for_status = MagicMock()
-        version_response.json.return_value = {"version": "0.3.0"}
-
-        # Mock models response
-        models_response = MagicMock()
-        models_response.status_code = 200
-        models_response.raise_for_status = MagicMock()
-        models_response.json.return_value = {
-            "models": [{"name": "qwen2.5:7b-instruct"}, {"name": "llama3.1:8b"}]
-        }
-
-        # Setup get to return different responses based on URL
-        async def mock_get(url):
-            if "version" in url:
-                return version_response
-            elif "tags" in url:
-                return models_response
-            return MagicMock()
-
-        mock_client.get = mock_get
+        provider_http(
+            {
+                "/api/version": {"version": "0.3.0"},
+                "/api/tags": {"models": [{"name": "qwen2.5:7b-instruct"}, {"name": "llama3.1:8b"}]},
+            }
+        )
 
         provider = OllamaProvider()
         status = await provider.check_connection()
@@ -100,30 +83,22 @@ class TestOllamaProvider:
         assert status.version == "0.3.0"
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient.get")
-    async def test_check_connection_failure(self, mock_get):
+    async def test_check_connection_failure(self, provider_http):
         """Test failed connection check."""
-        mock_get.side_effect = Exception("Connection refused")
+        provider_http({}, error=httpx.ConnectError("Connection refused"))
 
         provider = OllamaProvider()
         status = await provider.check_connection()
 
         assert status.available is False
-        assert "Connection refused" in status.error
+        assert "Cannot connect" in status.error
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient.get")
-    async def test_list_models(self, mock_get):
+    async def test_list_models(self, provider_http):
         """Test listing available models."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "models": [
-                {"name": "qwen2.5:7b-instruct"},
-                {"name": "llama3.1:8b"},
-            ]
-        }
-        mock_get.return_value = mock_response
+        provider_http(
+            {"/api/tags": {"models": [{"name": "qwen2.5:7b-instruct"}, {"name": "llama3.1:8b"}]}}
+        )
 
         provider = OllamaProvider()
         models = await provider.list_models()
@@ -163,19 +138,9 @@ class TestFoundryLocalProvider:
         assert model is not None
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_check_connection_success(self, mock_client_cls):
+    async def test_check_connection_success(self, provider_http):
         """Test successful connection check."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.json.return_value = {"data": [{"id": "phi-4"}]}
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client_cls.return_value = mock_client
+        provider_http({"/v1/models": {"data": [{"id": "phi-4"}]}})
 
         provider = FoundryLocalProvider()
         status = await provider.check_connection()
@@ -183,14 +148,9 @@ class TestFoundryLocalProvider:
         assert status.available is True
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_check_connection_failure(self, mock_client_cls):
+    async def test_check_connection_failure(self, provider_http):
         """Test failed connection check."""
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(side_effect=Exception("Connection refused"))
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client_cls.return_value = mock_client
+        provider_http({}, error=Exception("Connection refused"))
 
         provider = FoundryLocalProvider()
         status = await provider.check_connection()
@@ -198,24 +158,9 @@ class TestFoundryLocalProvider:
         assert status.available is False
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_list_models(self, mock_client_cls):
+    async def test_list_models(self, provider_http):
         """Test listing available models."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_response.json.return_value = {
-            "data": [
-                {"id": "phi-4"},
-                {"id": "phi-3-mini"},
-            ]
-        }
-
-        mock_client = AsyncMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client_cls.return_value = mock_client
+        provider_http({"/v1/models": {"data": [{"id": "phi-4"}, {"id": "phi-3-mini"}]}})
 
         provider = FoundryLocalProvider()
         models = await provider.list_models()
@@ -354,3 +299,110 @@ class TestProviderAbstraction:
         assert hasattr(foundry, "get_model")
         assert hasattr(foundry, "check_connection")
         assert hasattr(foundry, "list_models")
+
+
+def list_tables() -> str:
+    """List tables."""
+    return "users, orders"
+
+
+@pytest.mark.unit
+class TestFakeProvider:
+    """Tests for the fake load-testing provider."""
+
+    def test_create_provider_fake(self):
+        """Test creating the fake provider via factory."""
+        provider = create_provider(provider_type="fake")
+
+        assert isinstance(provider, FakeProvider)
+        assert provider.provider_type == ProviderType.FAKE
+        assert provider.supports_tool_calling()
+
+    @pytest.mark.asyncio
+    async def test_never_auto_selected(self):
+        """Test auto-selection does not fall back to the fake provider."""
+        unavailable = MagicMock(available=False)
+        with (
+            patch.object(OllamaProvider, "check_connection", AsyncMock(return_value=unavailable)),
+            patch.object(
+                FoundryLocalProvider, "check_connection", AsyncMock(return_value=unavailable)
+            ),
+            patch("src.providers.factory.settings") as mock_settings,
+        ):
+            mock_settings.llm_provider = "ollama"
+            assert await auto_select_provider() is None
+
+    @pytest.mark.asyncio
+    async def test_tool_call_then_streamed_text(self):
+        """Test a configured tool call runs before the generated answer."""
+        provider = FakeProvider(
+            model_name="fake-tools", ttft_ms=0, tokens_per_second=0, tool_call="list_tables"
+        )
+        agent = Agent(provider.get_model(), tools=[list_tables])
+
+        result = await agent.run("What tables exist?")
+
+        assert result.output.startswith("Fake response to: What tables exist?")
+        assert result.usage().tool_calls == 1
+        assert result.usage().output_tokens > 0
+
+        async with agent.run_stream("Hello") as stream:
+            chunks = [chunk async for chunk in stream.stream_text(delta=True)]
+        assert "".join(chunks).startswith("Fake response to: Hello")
+
+    @pytest.mark.asyncio
+    async def test_script_and_unknown_tools(self, tmp_path):
+        """Test scripted responses, falling back to text for tools not offered."""
+        script = tmp_path / "script.json"
+        script.write_text(
+            json.dumps(
+                [
+                    {"tool_calls": [{"name": "list_tables", "arguments": {"schema": "dbo"}}]},
+                    {"content": "Two tables."},
+                ]
+            )
+        )
+        server = FakeOpenAIServer(
+            latency=LatencyModel(ttft_ms=0, tokens_per_second=0), script=load_script(script)
+        )
+        tools = [{"type": "function", "function": {"name": "list_tables"}}]
+        user = {"role": "user", "content": "Tables?"}
+
+        first = await server.complete({"messages": [user], "tools": tools})
+        call = first["choices"][0]["message"]["tool_calls"][0]
+        assert json.loads(call["function"]["arguments"]) == {"schema": "dbo"}
+        assert first["choices"][0]["finish_reason"] == "tool_calls"
+
+        second = await server.complete(
+            {"messages": [user, {"role": "assistant", "content": None}], "tools": tools}
+        )
+        assert second["choices"][0]["message"]["content"] == "Two tables."
+
+        untooled = await server.complete({"messages": [user]})
+        assert untooled["choices"][0]["message"]["content"].startswith("Fake response to")
+
+    @pytest.mark.asyncio
+    async def test_websocket_turn(self):
+        """Test a WebSocket chat turn end to end against the fake provider."""
+        from src.api.routes.agent import agent_websocket
+
+        websocket = MagicMock()
+        websocket.accept = AsyncMock()
+        websocket.send_json = AsyncMock()
+        websocket.receive_json = AsyncMock(
+            side_effect=[
+                {"type": "message", "content": "Hi", "provider": "fake"},
+                WebSocketDisconnect(),
+            ]
+        )
+
+        with (
+            patch("src.api.deps.get_websocket_manager_optional", return_value=None),
+            patch("src.mcp.client.MCPClientManager.get_active_toolsets", return_value=[]),
+        ):
+            await agent_websocket(websocket, conversation_id=1)
+
+        events = [call.args[0] for call in websocket.send_json.call_args_list]
+        assert events[0]["type"] == "chunk"
+        assert events[-1]["type"] == "complete"
+        assert events[-1]["message"]["content"].startswith("Fake response to: Hi")
@@ -5,15 +5,20 @@ Phase 2.1: Backend Infrastructure & RAG Pipeline
 Tests for SQLAlchemy query profiler functionality.
 """
 
+from types import SimpleNamespace
+
 import pytest
 from sqlalchemy import Column, Integer, String, create_engine, select
 from sqlalchemy.orm import DeclarativeBase, Session
 
 from src.utils.query_profiler import (
+    OVERFLOW_FINGERPRINT,
     QueryProfiler,
     disable_profiling,
     enable_profiling,
+    fingerprint,
     get_stats,
+    normalize_statement,
     reset_stats,
 )
 
@@ -226,3 +231,146 @@ def test_profiler_stats_aggregation(test_engine, profiler):
     assert stats["min_time_ms"] <= stats["avg_time_ms"] <= stats["max_time_ms"]
 
     profiler.disable(test_engine)
+
+
+@pytest.mark.unit
+def test_normalize_statement_strips_literals():
+    """Test that statements differing only in values share a fingerprint."""
+    first = "SELECT * FROM app.documents WHERE id = 42 AND name = 'a''b'  AND tag IN (1, 2, 3)"
+    second = "SELECT * FROM app.documents WHERE id = 7 AND name = 'x' AND tag IN (9)"
+
+    assert normalize_statement(first) == (
+        "SELECT * FROM app.documents WHERE id = ? AND name = ? AND tag IN (?)"
+    )
+    assert fingerprint(first) == fingerprint(second)
+    assert normalize_statement("SELECT a FROM t WHERE x = :x AND y = @P1 AND z = %(z)s") == (
+        "SELECT a FROM t WHERE x = ? AND y = ? AND z = ?"
+    )
+    assert normalize_statement("SELECT col1 FROM table2") == "SELECT col1 FROM table2"
+
+
+@pytest.mark.unit
+def test_fingerprint_histograms(profiler):
+    """Test per-fingerprint counts, histogram buckets and percentiles."""
+    for ms in (2, 4, 30, 400):
+        profiler.record(f"SELECT * FROM t WHERE id = {ms}", ms, database="backend")
+    profiler.record("DELETE FROM t", 1, database="sample")
+
+    fingerprints = profiler.get_fingerprints(sort_by="count")
+    top = fingerprints[0]
+
+    assert len(fingerprints) == 2
+    assert (top["database"], top["count"], top["max_time_ms"]) == ("backend", 4, 400)
+    assert top["statement"] == "SELECT * FROM t WHERE id = ?"
+    assert top["p50_ms"] == pytest.approx(4, rel=0.02)
+
+    metrics = profiler.render_prometheus()
+    labels = f'database="backend",fingerprint="{top["fingerprint"]}"'
+    assert f'db_query_duration_seconds_bucket{{{labels},le="0.005"}} 2' in metrics
+    assert f'db_query_duration_seconds_bucket{{{labels},le="0.25"}} 3' in metrics
+    assert f'db_query_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in metrics
+    assert f"db_query_duration_seconds_count{{{labels}}} 4" in metrics
+    assert "db_slow_queries_total 1" in metrics
+
+
+@pytest.mark.unit
+def test_fingerprint_cap_overflows_to_other():
+    """Test that fingerprints beyond the cap fold into a single entry."""
+    profiler = QueryProfiler(max_fingerprints=2)
+    for table in ("a", "b", "c", "d"):
+        profiler.record(f"SELECT * FROM {table}", 1)
+
+    fingerprints = {fp["fingerprint"]: fp for fp in profiler.get_fingerprints()}
+
+    assert len(fingerprints) == 3
+    assert fingerprints[OVERFLOW_FINGERPRINT]["count"] == 2
+
+
+@pytest.mark.unit
+def test_slow_query_ring_buffer_keeps_newest():
+    """Test that the slow query log drops the oldest entries."""
+    profiler = QueryProfiler(slow_query_threshold_ms=0, max_slow_queries=3)
+    for i in range(5):
+        profiler.record(f"SELECT * FROM t{i}", float(i))
+
+    slow = profiler.get_slow_queries()
+
+    assert [q["statement"] for q in slow] == [
+        "SELECT * FROM t2",
+        "SELECT * FROM t3",
+        "SELECT * FROM t4",
+    ]
+    assert profiler.stats.slow_queries == 5
+
+
+@pytest.mark.unit
+def test_slow_queries_redact_literals_and_parameters():
+    """Test that slow queries keep only normalized text unless capture is enabled."""
+    statement = "SELECT * FROM users WHERE email = 'a@example.com' AND id = :id"
+
+    redacted = QueryProfiler(slow_query_threshold_ms=0)
+    redacted.record(statement, 1.0, parameters={"id": 42})
+    captured = QueryProfiler(slow_query_threshold_ms=0, capture_parameters=True)
+    captured.record(statement, 1.0, parameters={"id": 42})
+
+    assert redacted.get_slow_queries()[0]["statement"] == (
+        "SELECT * FROM users WHERE email = ? AND id = ?"
+    )
+    assert redacted.get_slow_queries()[0]["parameters"] is None
+    assert captured.get_slow_queries()[0]["statement"] == statement
+    assert captured.get_slow_queries()[0]["parameters"] == "{'id': 42}"
+
+
+@pytest.mark.unit
+def test_interleaved_executions_timed_per_context(profiler, monkeypatch):
+    """Test that overlapping statements on one connection keep their own start times."""
+    clock = iter([0.0, 0.010, 0.011, 0.500])
+    monkeypatch.setattr("src.utils.query_profiler.time.perf_counter", lambda: next(clock))
+    conn = SimpleNamespace(info={})
+    slow_ctx, fast_ctx = SimpleNamespace(), SimpleNamespace()
+
+    profiler._before_cursor_execute(conn, None, "SELECT slow", None, slow_ctx, False)
+    profiler._before_cursor_execute(conn, None, "SELECT fast", None, fast_ctx, False)
+    profiler._after_cursor_execute(conn, None, "SELECT fast", None, fast_ctx, False)
+    profiler._after_cursor_execute(conn, None, "SELECT slow", None, slow_ctx, False)
+
+    timings = {fp["statement"]: fp["max_time_ms"] for fp in profiler.get_fingerprints()}
+    assert timings == {"SELECT fast": pytest.approx(1), "SELECT slow": pytest.approx(500)}
+
+
+@pytest.mark.unit
+def test_enable_on_async_engine_attaches_to_sync_engine(test_engine, profiler):
+    """Test that async engines are profiled through their sync engine, once."""
+    async_like = SimpleNamespace(sync_engine=test_engine)
+    profiler.enable(async_like, database="backend")
+    profiler.enable(async_like, database="backend")
+
+    with Session(test_engine) as session:
+        session.execute(select(TestModel))
+
+    assert profiler.stats.total_queries == 1
+    assert profiler.get_fingerprints()[0]["database"] == "backend"
+
+    profiler.disable(async_like)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_db_profile_endpoints(monkeypatch):
+    """Test the analytics endpoints exposing the global profiler."""
+    from fastapi import HTTPException
+
+    from src.api.routes import analytics
+
+    profiler = QueryProfiler(slow_query_threshold_ms=10)
+    profiler.record("SELECT * FROM app.documents WHERE id = 1", 25, database="backend")
+    monkeypatch.setattr(analytics, "get_profiler", lambda: profiler)
+
+    profile = await analytics.get_db_profile(limit=5, sort_by="total_time_ms")
+
+    assert profile.total_queries == 1
+    assert profile.fingerprints[0].statement == "SELECT * FROM app.documents WHERE id = ?"
+    assert profile.recent_slow_queries[0].execution_time_ms == 25
+    with pytest.raises(HTTPException) as exc:
+        await analytics.get_db_profile_metrics()
+    assert exc.value.status_code == 404
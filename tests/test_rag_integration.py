@@ -48,6 +48,14 @@ class TestDocumentProcessing:
         chunks = processor._chunk_text("")
         assert chunks == []
 
+    def test_chunk_text_boundary_inside_overlap_terminates(self):
+        """Test a sentence boundary inside the overlap still moves forward."""
+        processor = DocumentProcessor(chunk_size=100, chunk_overlap=50)
+        text = "Short. " + "x" * 300
+        chunks = processor._chunk_text(text)
+        assert chunks[0] == "Short."
+        assert "".join(chunks).count("x") >= 300
+
     def test_chunk_text_single_chunk(self):
         """Test text that fits in a single chunk."""
         processor = DocumentProcessor(chunk_size=500)
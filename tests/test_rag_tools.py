@@ -0,0 +1,167 @@
+"""
+Tests for RAG Agent Tools
+
+Tests for the full-text + vector knowledge base search with RRF fusion.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.agent.tools import RAGTools, build_fulltext_query, build_knowledge_search_sql
+
+
+def make_row(doc_id=1, chunk=0, rrf_score=0.0, vector_score=0.8, text_rank=None):
+    """Create a search result row stand-in."""
+    return SimpleNamespace(
+        document_id=doc_id,
+        chunk_index=chunk,
+        chunk_text=f"chunk {doc_id}-{chunk}",
+        source="guide.pdf",
+        source_type="document",
+        metadata=None,
+        vector_score=vector_score,
+        text_rank=text_rank,
+        rrf_score=rrf_score,
+    )
+
+
+@pytest.fixture
+def session():
+    """Create a mock database session."""
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
+    return db
+
+
+@pytest.fixture
+def tools(session):
+    """Create RAGTools over the mock session."""
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(return_value=[0.1, 0.2, 0.3])
+    return RAGTools(session_factory=factory, embedder=embedder, candidate_count=40, rrf_k=60)
+
+
+class TestFulltextQuery:
+    """Tests for CONTAINSTABLE search condition building."""
+
+    def test_terms_are_quoted_prefix_terms(self):
+        assert build_fulltext_query("Vector search") == '"vector*" OR "search*"'
+
+    def test_operators_and_quotes_are_stripped(self):
+        query = build_fulltext_query('index" OR NEAR(a, b) AND ~x')
+        assert query == '"index*" OR "or*" OR "near*" OR "and*"'
+
+    def test_duplicates_removed(self):
+        assert build_fulltext_query("sql SQL sql") == '"sql*"'
+
+    def test_no_searchable_words(self):
+        assert build_fulltext_query("?! -") is None
+
+
+class TestSearchSql:
+    """Tests for the generated search statement."""
+
+    def test_keyword_leg_uses_fulltext(self):
+        sql = build_knowledge_search_sql(keyword_leg=True)
+        assert "CONTAINSTABLE" in sql
+        assert "LIKE" not in sql
+        assert "FULL OUTER JOIN" in sql
+        assert "TOP (:candidates)" in sql
+        assert "ORDER BY f.rrf_score DESC" in sql
+
+    def test_source_filter_applies_to_both_legs(self):
+        sql = build_knowledge_search_sql(keyword_leg=True, source_filter=True)
+        assert sql.count("dc.source = :source_name") == 2
+
+    def test_vector_only(self):
+        sql = build_knowledge_search_sql(keyword_leg=False)
+        assert "CONTAINSTABLE" not in sql
+        assert ":text_weight" not in sql
+
+
+class TestSearchKnowledgeBase:
+    """Tests for fused knowledge base search."""
+
+    @pytest.mark.asyncio
+    async def test_fused_results_are_normalized(self, tools, session):
+        best = (0.7 + 0.3) / 61
+        session.execute.return_value.fetchall.return_value = [
+            make_row(1, rrf_score=best, text_rank=500),
+            make_row(2, rrf_score=0.7 / 62),
+        ]
+
+        results = await tools.search_knowledge_base("vector search", top_k=2)
+
+        sql, params = session.execute.call_args[0]
+        assert "CONTAINSTABLE" in str(sql)
+        assert params["fulltext_query"] == '"vector*" OR "search*"'
+        assert params["candidates"] == 40
+        assert params["top_k"] == 2
+        assert results[0].relevance_score == 1.0
+        assert results[0].text_score == 0.5
+        assert results[1].relevance_score < results[0].relevance_score
+        assert results[1].text_score == 0.0
+
+    @pytest.mark.asyncio
+    async def test_candidates_cover_top_k(self, tools, session):
+        session.execute.return_value.fetchall.return_value = []
+
+        await tools.search_knowledge_base("vector", top_k=100)
+
+        assert session.execute.call_args[0][1]["candidates"] == 100
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_vector_ranking(self, tools, session):
+        vector_only = MagicMock()
+        vector_only.fetchall.return_value = [make_row(1, rrf_score=0.7 / 61)]
+        session.execute.side_effect = [
+            Exception(
+                "[42000] [SQL Server]Cannot use a CONTAINS or FREETEXT predicate on table "
+                "'vectors.document_chunks' because it is not full-text indexed. (7601)"
+            ),
+            vector_only,
+        ]
+
+        results = await tools.search_knowledge_base("vector search")
+
+        assert results[0].relevance_score == 1.0
+        sql, params = session.execute.call_args[0]
+        assert "CONTAINSTABLE" not in str(sql)
+        assert "fulltext_query" not in params
+
+        # Later searches skip the unavailable keyword leg
+        session.execute.side_effect = None
+        session.execute.return_value = MagicMock()
+        session.execute.return_value.fetchall.return_value = []
+        await tools.search_knowledge_base("vector search")
+        assert session.execute.await_count == 3
+        assert "CONTAINSTABLE" not in str(session.execute.call_args[0][0])
+
+    @pytest.mark.asyncio
+    async def test_transient_error_falls_back_for_one_search(self, tools, session):
+        vector_only = MagicMock()
+        vector_only.fetchall.return_value = [make_row(1, rrf_score=0.7 / 61)]
+        session.execute.side_effect = [
+            Exception("[08S01] Communication link failure (10054)"),
+            vector_only,
+        ]
+
+        results = await tools.search_knowledge_base("vector search")
+
+        assert results[0].relevance_score == 1.0
+        assert "CONTAINSTABLE" not in str(session.execute.call_args[0][0])
+
+        # The keyword leg is tried again on the next search
+        session.execute.side_effect = None
+        session.execute.return_value = MagicMock()
+        session.execute.return_value.fetchall.return_value = []
+        await tools.search_knowledge_base("vector search")
+        assert "CONTAINSTABLE" in str(session.execute.call_args[0][0])
@@ -0,0 +1,136 @@
+"""
+Tests for the Shared Resource Registry
+
+Tests that engines, session factories, embedders and vector stores are
+shared process-wide and that pool metrics are reported.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils.resources import (
+    BACKEND_DATABASE,
+    ResourceRegistry,
+    get_resource_registry,
+    reset_resource_registry,
+)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Create a registry with a file-backed SQLite backend engine."""
+    registry = ResourceRegistry()
+    registry.get_session_factory(BACKEND_DATABASE, f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    return registry
+
+
+@pytest.fixture
+def shared_registry(registry):
+    """Install the registry as the process-wide singleton."""
+    reset_resource_registry()
+    with patch("src.utils.resources._resource_registry", registry):
+        yield registry
+    reset_resource_registry()
+
+
+class TestResourceRegistry:
+    """Tests for ResourceRegistry."""
+
+    def test_engine_is_shared(self, registry):
+        """Test that a named engine is created once."""
+        assert registry.get_engine(BACKEND_DATABASE) is registry.get_engine(BACKEND_DATABASE)
+        assert registry.get_backend_session_factory() is registry.get_session_factory(
+            BACKEND_DATABASE
+        )
+
+    def test_unknown_engine_requires_url(self, registry):
+        """Test that an unregistered engine without URL raises."""
+        with pytest.raises(KeyError):
+            registry.get_engine("missing")
+
+    def test_get_or_create(self, registry):
+        """Test that factories run once per key."""
+        factory = MagicMock(side_effect=lambda: object())
+
+        first = registry.get_or_create("thing", factory)
+        second = registry.get_or_create("thing", factory)
+
+        assert first is second
+        factory.assert_called_once()
+
+    def test_embedder_is_shared(self, registry):
+        """Test that the embedder is built once from settings."""
+        assert registry.get_embedder() is registry.get_embedder()
+
+    @pytest.mark.asyncio
+    async def test_pool_stats(self, registry):
+        """Test that pool metrics are reported per engine."""
+        from sqlalchemy import text
+
+        async with registry.get_backend_session_factory()() as session:
+            await session.execute(text("SELECT 1"))
+            stats = registry.get_pool_stats()
+
+        assert stats[BACKEND_DATABASE]["checkedout"] == 1
+        assert "status" in stats[BACKEND_DATABASE]
+
+    @pytest.mark.asyncio
+    async def test_dispose_clears(self, registry):
+        """Test that dispose forgets engines and resources."""
+        registry.register("vector_store:mssql", object())
+
+        await registry.dispose()
+
+        assert registry.get_pool_stats() == {}
+        assert registry.get("vector_store:mssql") is None
+
+    def test_singleton(self):
+        """Test the process-wide singleton accessors."""
+        reset_resource_registry()
+        assert get_resource_registry() is get_resource_registry()
+        reset_resource_registry()
+
+
+class TestSharedConsumers:
+    """Tests that agents and RAG tools draw from the registry."""
+
+    def test_rag_tools_share_embedder_and_vector_store(self, shared_registry):
+        """Test that RAG tools reuse the registry's embedder and vector store."""
+        from src.agent.tools import RAGTools
+
+        factory = shared_registry.get_backend_session_factory()
+        tools_a = RAGTools(session_factory=factory)
+        tools_b = RAGTools(session_factory=factory)
+
+        assert tools_a._embedder is shared_registry.get_embedder()
+        assert tools_b._embedder is tools_a._embedder
+
+    @pytest.mark.asyncio
+    async def test_rag_tools_share_vector_store(self, shared_registry):
+        """Test that RAG tools reuse one MSSQL vector store."""
+        from src.agent.tools import RAGTools
+
+        factory = shared_registry.get_backend_session_factory()
+        store_a = await RAGTools(session_factory=factory)._get_vector_store()
+        store_b = await RAGTools(session_factory=factory)._get_vector_store()
+
+        assert store_a is store_b
+
+    @patch("src.agent.core.MCPClientManager")
+    @patch("src.agent.core.create_provider")
+    @patch("src.agent.core.Agent")
+    def test_agents_share_backend_engine(
+        self, mock_agent_cls, mock_create_provider, mock_mcp_cls, shared_registry
+    ):
+        """Test that RAG-enabled agents do not create their own engines."""
+        from src.agent.research_agent import ResearchAgent
+
+        mock_mcp_cls.return_value.list_servers.return_value = []
+        mock_create_provider.return_value.provider_type.value = "ollama"
+
+        agent_a = ResearchAgent(rag_enabled=True)
+        agent_b = ResearchAgent(rag_enabled=True)
+
+        assert agent_a._rag_tools._session_factory is agent_b._rag_tools._session_factory
+        assert list(shared_registry.get_pool_stats()) == [BACKEND_DATABASE]
@@ -0,0 +1,156 @@
+"""
+Tests for Search Cache
+
+Tests for query-embedding and search-result caching around vector stores.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.rag.search_cache import CachedVectorStore, SearchCache
+from src.rag.search_filter import SearchFilter
+from src.rag.vector_store_base import VectorStoreBase
+
+
+class FakeStore(VectorStoreBase):
+    """Vector store that embeds through its embedder and counts searches."""
+
+    def __init__(self, embedder):
+        super().__init__(embedder=embedder, dimensions=2)
+        self.searches = 0
+
+    async def create_index(self, overwrite: bool = False) -> None:
+        pass
+
+    async def add_document(
+        self,
+        document_id,
+        chunks,
+        source,
+        source_type="document",
+        metadata=None,
+        start_index=0,
+        embeddings=None,
+    ):
+        await self.embedder.embed_batch(chunks)
+
+    async def search(self, query, top_k=5, source_type=None, filters=None):
+        self.searches += 1
+        await self.embedder.embed(query)
+        return [{"content": f"{query} #{self.searches}", "score": 0.1}]
+
+    async def delete_document(self, document_id: str) -> int:
+        return 1
+
+    async def get_stats(self):
+        return {"store_type": "fake"}
+
+    def search_schema(self):
+        return "schema"
+
+
+class FakeRedis:
+    """Minimal async Redis with GET/SETEX/INCR."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.fixture
+def embedder():
+    """Create a mock embedder."""
+    mock = MagicMock()
+    mock.model = "nomic-embed-text"
+    mock.embed = AsyncMock(return_value=[0.1, 0.2])
+    mock.embed_batch = AsyncMock(return_value=[[0.1, 0.2]])
+    return mock
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cached_store(request, embedder):
+    """Create a cached fake store on each cache backend."""
+    redis = FakeRedis() if request.param == "redis" else None
+    return CachedVectorStore(FakeStore(embedder), SearchCache(redis_client=redis))
+
+
+class TestCachedVectorStore:
+    """Tests for result caching and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_served_from_cache(self, cached_store, embedder):
+        first = await cached_store.search("revenue", top_k=3)
+        first[0]["content"] = "mutated by caller"
+        second = await cached_store.search("revenue", top_k=3)
+
+        assert cached_store.store.searches == 1
+        assert second[0]["content"] == "revenue #1"
+        assert embedder.embed.await_count == 1
+        assert cached_store.cache.get_stats()["result_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_options_are_part_of_key(self, cached_store):
+        await cached_store.search("revenue", top_k=3)
+        await cached_store.search("revenue", top_k=5)
+        await cached_store.search("revenue", top_k=3, filters=SearchFilter(tags=["q3"]))
+        await cached_store.hybrid_search("revenue", top_k=3, alpha=0.3)
+
+        assert cached_store.store.searches == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("write", ["add", "delete", "tags"])
+    async def test_writes_invalidate_results_not_embeddings(self, cached_store, embedder, write):
+        await cached_store.search("revenue")
+
+        if write == "add":
+            await cached_store.add_document("1", ["new chunk"], source="a.txt")
+        elif write == "delete":
+            await cached_store.delete_document("1")
+        else:
+            await cached_store.update_document_tags("1", ["q3"])
+        results = await cached_store.search("revenue")
+
+        assert results[0]["content"] == "revenue #2"
+        assert embedder.embed.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_version_shared_through_redis(self, embedder):
+        redis = FakeRedis()
+        worker_a = CachedVectorStore(FakeStore(embedder), SearchCache(redis_client=redis))
+        worker_b = CachedVectorStore(FakeStore(embedder), SearchCache(redis_client=redis))
+
+        await worker_a.search("revenue")
+        await worker_b.delete_document("1")
+        await worker_a.search("revenue")
+
+        assert worker_a.store.searches == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_through(self, embedder):
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        store = CachedVectorStore(FakeStore(embedder), SearchCache(redis_client=redis))
+
+        results = await store.search("revenue")
+
+        assert results[0]["content"] == "revenue #1"
+
+    @pytest.mark.asyncio
+    async def test_delegates_store_specific_methods_and_stats(self, cached_store):
+        await cached_store.search("revenue")
+
+        stats = await cached_store.get_stats()
+
+        assert cached_store.search_schema() == "schema"
+        assert stats["store_type"] == "fake"
+        assert stats["search_cache"]["result_misses"] == 1
@@ -0,0 +1,151 @@
+"""
+Tests for Search Filters
+
+Tests for filter validation, per-store translation and filtered search.
+"""
+
+import zlib
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from src.rag.local_vector_store import LocalVectorStore
+from src.rag.mssql_vector_store import MSSQLVectorStore
+from src.rag.search_filter import SearchFilter, build_mssql_filter, build_redis_filter
+
+DIMS = 8
+
+
+class FakeEmbedder:
+    """Deterministic embedder: text 'v<i>' maps near basis vector i."""
+
+    def _vector(self, text: str) -> list[float]:
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        vector = rng.normal(0, 0.01, DIMS)
+        if text.startswith("v"):
+            vector[int(text[1:].split()[0]) % DIMS] += 1.0
+        return vector.tolist()
+
+    async def embed(self, text: str) -> list[float]:
+        return self._vector(text)
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self._vector(t) for t in texts]
+
+
+class TestSearchFilter:
+    """Tests for the filter model."""
+
+    def test_tags_normalized(self):
+        search_filter = SearchFilter(tags=[" Finance ", "finance", "Q3", ""])
+
+        assert search_filter.tags == ["finance", "q3"]
+
+    def test_invalid_metadata_key(self):
+        with pytest.raises(ValidationError):
+            SearchFilter(metadata={"a'; DROP TABLE x; --": "pdf"})
+
+    def test_matches(self):
+        now = datetime(2026, 1, 15)
+        search_filter = SearchFilter(
+            tags=["finance", "q3"],
+            created_after=now - timedelta(days=1),
+            metadata={"extension": ".pdf"},
+        )
+
+        assert search_filter.matches(["Q3"], now, {"extension": ".pdf"})
+        assert not search_filter.matches(["hr"], now, {"extension": ".pdf"})
+        assert not search_filter.matches(["q3"], now - timedelta(days=2), {"extension": ".pdf"})
+        assert not search_filter.matches(["q3"], now, {"extension": ".docx"})
+        assert not search_filter.model_copy(update={"match_all_tags": True}).matches(
+            ["q3"], now, {"extension": ".pdf"}
+        )
+
+
+class TestFilterTranslation:
+    """Tests for SQL Server and Redis filter translation."""
+
+    def test_empty_filter_has_no_predicates(self):
+        assert build_mssql_filter(SearchFilter()) == ("", {})
+        assert build_redis_filter(None) is None
+
+    def test_mssql_predicates_are_parameterized(self):
+        sql, params = build_mssql_filter(
+            SearchFilter(
+                tags=["finance", "q3"],
+                match_all_tags=True,
+                created_before=datetime(2026, 1, 1),
+                metadata={"extension": ".pdf", "page_count": 3},
+            )
+        )
+
+        assert "FROM app.document_tags dt WHERE dt.tag IN" in sql
+        assert "dc.created_at < :filter_created_before" in sql
+        assert "JSON_VALUE(dc.metadata, '$.extension') = :filter_meta0" in sql
+        assert params["filter_tag_required"] == 2
+        assert params["filter_meta0"] == ".pdf"
+        assert params["filter_meta1"] == "3"
+        assert "finance" not in sql
+
+    def test_redis_expression(self):
+        expression = build_redis_filter(
+            SearchFilter(tags=["finance"], metadata={"extension": ".pdf"}),
+            source_type="document",
+            indexed_keys=["extension"],
+        )
+
+        assert "@source_type:{document}" in expression
+        assert "@tags:{finance}" in expression
+        assert "@meta_extension:{\\.pdf}" in expression
+
+    def test_redis_rejects_unindexed_key(self):
+        with pytest.raises(ValueError, match="not indexed"):
+            build_redis_filter(SearchFilter(metadata={"author": "x"}), indexed_keys=["extension"])
+
+
+class TestFilteredSearch:
+    """Tests for filtered search in the stores."""
+
+    @pytest.mark.asyncio
+    async def test_mssql_filtered_search_uses_inline_sql(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.fetchall.return_value = []
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        embedder = MagicMock()
+        embedder.embed = AsyncMock(return_value=[0.1, 0.2])
+        store = MSSQLVectorStore(session_factory=factory, embedder=embedder, index_mode="exact")
+
+        await store.search("query", filters=SearchFilter(metadata={"extension": ".pdf"}))
+
+        sql = str(session.execute.call_args[0][0])
+        params = session.execute.call_args[0][1]
+        assert "JSON_VALUE(dc.metadata, '$.extension')" in sql
+        assert "SearchDocuments" not in sql
+        assert params["filter_meta0"] == ".pdf"
+
+    @pytest.mark.asyncio
+    async def test_local_store_filters_by_tags_and_metadata(self, tmp_path):
+        store = LocalVectorStore(path=tmp_path, embedder=FakeEmbedder(), dimensions=DIMS)
+        await store.create_index()
+        await store.add_document("1", ["v0 report"], source="a.pdf", metadata={"extension": ".pdf"})
+        await store.add_document("2", ["v0 notes"], source="b.txt", metadata={"extension": ".txt"})
+        assert await store.update_document_tags("1", ["finance"]) == 1
+
+        by_tag = await store.search("v0", top_k=5, filters=SearchFilter(tags=["Finance"]))
+        by_meta = await store.search(
+            "v0", top_k=5, filters=SearchFilter(metadata={"extension": ".txt"})
+        )
+        future = await store.search(
+            "v0", filters=SearchFilter(created_after=datetime.now() + timedelta(days=1))
+        )
+        await store.close()
+
+        assert [r["document_id"] for r in by_tag] == ["1"]
+        assert [r["document_id"] for r in by_meta] == ["2"]
+        assert future == []
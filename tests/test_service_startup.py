@@ -0,0 +1,185 @@
+"""
+Tests for Service Startup
+
+Tests for the service initialization graph: concurrency, dependency order,
+failure isolation, background steps and readiness reporting.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.deps import build_startup_graph
+from src.api.routes import health
+from src.api.startup import SkipStep, StartupGraph, StepStatus
+
+
+def sleeper(seconds: float, log: list[str] | None = None, name: str = ""):
+    """Step function sleeping for a while and recording when it finished."""
+
+    async def step():
+        await asyncio.sleep(seconds)
+        if log is not None:
+            log.append(name)
+
+    return step
+
+
+@pytest.mark.unit
+class TestStartupGraph:
+    """Tests for StartupGraph."""
+
+    async def test_independent_steps_run_concurrently(self):
+        """Start time is bounded by the slowest step, not the sum."""
+        graph = StartupGraph()
+        for name in ("a", "b", "c"):
+            graph.add(name, sleeper(0.2))
+
+        start = time.perf_counter()
+        await graph.run_critical()
+
+        assert time.perf_counter() - start < 0.5
+        assert all(step.status == StepStatus.READY for step in graph.steps.values())
+
+    async def test_dependencies_run_first(self):
+        """A step waits for the steps it depends on."""
+        log = []
+        graph = StartupGraph()
+        graph.add("database", sleeper(0.05, log, "database"))
+        graph.add("cache", sleeper(0.0, log, "cache"), depends_on=("database",))
+
+        await graph.run_critical()
+
+        assert log == ["database", "cache"]
+
+    async def test_failures_and_skips_are_recorded(self):
+        """A failing step does not stop its dependents."""
+        log = []
+
+        async def fail():
+            raise ConnectionError("refused")
+
+        async def skip():
+            raise SkipStep("not configured")
+
+        graph = StartupGraph()
+        graph.add("redis", fail)
+        graph.add("feature", skip)
+        graph.add("store", sleeper(0.0, log, "store"), depends_on=("redis", "feature"))
+
+        await graph.run_critical()
+
+        assert graph.steps["redis"].status == StepStatus.FAILED
+        assert graph.steps["redis"].message == "refused"
+        assert graph.steps["feature"].status == StepStatus.SKIPPED
+        assert log == ["store"]
+        assert graph.ready
+
+    async def test_step_timeout(self):
+        """Slow steps are bounded by the step timeout."""
+        graph = StartupGraph(step_timeout_seconds=0.05)
+        graph.add("slow", sleeper(5))
+
+        start = time.perf_counter()
+        await graph.run_critical()
+
+        assert time.perf_counter() - start < 1
+        assert graph.steps["slow"].status == StepStatus.FAILED
+        assert "Timed out" in graph.steps["slow"].message
+
+    async def test_background_steps_do_not_block_readiness(self):
+        """Background steps run after the critical phase without delaying it."""
+        graph = StartupGraph()
+        graph.add("database", sleeper(0.0))
+        graph.add("themes", sleeper(0.1), depends_on=("database",), critical=False)
+
+        assert not graph.ready
+        await graph.run_critical()
+        graph.start_background()
+
+        assert graph.ready
+        assert not graph.background_complete
+        await graph.wait_background()
+        assert graph.background_complete
+        assert graph.steps["themes"].status == StepStatus.READY
+
+    async def test_drain_cancels_background(self):
+        """Draining reports not-ready and cancels unfinished background steps."""
+        graph = StartupGraph()
+        graph.add("database", sleeper(0.0))
+        graph.add("index", sleeper(10), critical=False)
+        await graph.run_critical()
+        graph.start_background()
+        await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(graph.drain(), timeout=1)
+
+        assert not graph.ready
+        assert not graph.background_complete
+
+    def test_add_validates_dependencies(self):
+        """Unknown, duplicate and critical-on-background dependencies are rejected."""
+        graph = StartupGraph()
+        graph.add("themes", sleeper(0.0), critical=False)
+
+        with pytest.raises(ValueError, match="unknown"):
+            graph.add("store", sleeper(0.0), depends_on=("missing",))
+        with pytest.raises(ValueError, match="Duplicate"):
+            graph.add("themes", sleeper(0.0))
+        with pytest.raises(ValueError, match="background"):
+            graph.add("api", sleeper(0.0), depends_on=("themes",))
+
+    def test_service_graph_defers_background_services(self):
+        """Index checks, schedulers and theme seeding are not on the critical path."""
+        graph = build_startup_graph()
+
+        background = {name for name, step in graph.steps.items() if not step.critical}
+        assert background == {
+            "vector_store",
+            "schedulers",
+            "widget_refresh",
+            "ingestion_queue",
+            "metrics_rollup",
+            "preset_themes",
+            "provider_status",
+        }
+        assert {"backend_database", "redis", "embedder"} <= set(
+            graph.steps["vector_store"].depends_on
+        )
+
+
+@pytest.mark.unit
+class TestReadinessEndpoint:
+    """Tests for readiness vs. liveness."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(health.router, prefix="/api/health")
+        return TestClient(app)
+
+    def test_not_ready_before_startup(self, client):
+        """Readiness fails until services are initialized; liveness does not."""
+        with patch.object(health, "get_startup_graph", return_value=None):
+            assert client.get("/api/health/ready").status_code == 503
+            assert client.get("/api/health/live").status_code == 200
+
+    async def test_ready_while_background_runs(self, client):
+        """Readiness passes once critical steps finish and reports background progress."""
+        graph = StartupGraph()
+        graph.add("database", sleeper(0.0))
+        graph.add("themes", sleeper(0.0), critical=False)
+        await graph.run_critical()
+
+        with patch.object(health, "get_startup_graph", return_value=graph):
+            response = client.get("/api/health/ready")
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["status"] == "ready"
+        assert body["background_complete"] is False
+        assert body["steps"]["themes"]["status"] == "pending"
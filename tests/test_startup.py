@@ -0,0 +1,123 @@
+"""
+Tests for CLI Startup
+
+Guards the CLI's cold-start cost: importing ``src.cli.chat`` (and running
+simple subcommands like ``--help``) must not load the agent, RAG, database or
+MCP stacks, which are only imported once a chat actually starts.
+
+The relative check (CLI import vs. full agent import) holds regardless of
+machine speed. The absolute budget defaults to 1000 ms, calibrated for CI
+runners (a bare interpreter plus pydantic-settings already costs ~300 ms
+there); set ``CLI_IMPORT_BUDGET_MS`` to tighten it on faster machines.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Default import budget in milliseconds (override with CLI_IMPORT_BUDGET_MS)
+CLI_IMPORT_BUDGET_MS = 1000
+
+# Modules that must stay out of a bare CLI import
+HEAVY_MODULES = (
+    "pydantic_ai",
+    "openai",
+    "mcp",
+    "sqlalchemy",
+    "docling",
+    "redis",
+    "prompt_toolkit",
+    "src.agent.core",
+    "src.rag.redis_vector_store",
+    "src.services.database_manager",
+)
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """
+    Run a statement in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        statement: Python code to execute
+
+    Returns:
+        Module name -> cumulative import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_import_ms(module: str, rounds: int = 3) -> float:
+    """Fastest cumulative import time of a module over several fresh interpreters."""
+    return min(import_times(f"import {module}")[module] for _ in range(rounds)) / 1000
+
+
+def loaded_modules(statement: str) -> set[str]:
+    """Modules (and their parent packages) loaded by a statement in a fresh interpreter."""
+    return set(import_times(statement))
+
+
+@pytest.mark.unit
+class TestCliStartup:
+    """Tests for lazy imports on the CLI path."""
+
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import src.cli.chat",
+            "import src.agent, src.rag, src.services, src.utils",
+        ],
+    )
+    def test_import_skips_heavy_modules(self, statement):
+        """Importing the CLI or package namespaces does not load heavy subsystems."""
+        loaded = loaded_modules(statement)
+        assert sorted(name for name in HEAVY_MODULES if name in loaded) == []
+
+    def test_help_skips_heavy_modules(self):
+        """``--help`` only needs the command definitions."""
+        statement = (
+            "from src.cli.chat import app\n"
+            "try:\n"
+            "    app(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+        )
+        loaded = loaded_modules(statement)
+        assert sorted(name for name in HEAVY_MODULES if name in loaded) == []
+
+    def test_lazy_exports_resolve(self):
+        """Package re-exports still resolve on first access."""
+        import src.rag
+        import src.utils
+
+        assert "RedisVectorStore" in dir(src.rag)
+        assert src.utils.get_logger.__module__ == "src.utils.logger"
+        with pytest.raises(AttributeError):
+            src.rag.DoesNotExist  # noqa: B018
+
+    def test_cli_import_time_budget(self):
+        """Importing the CLI fits the startup budget."""
+        budget_ms = float(os.environ.get("CLI_IMPORT_BUDGET_MS", CLI_IMPORT_BUDGET_MS))
+        cli_ms = best_import_ms("src.cli.chat")
+        agent_ms = best_import_ms("src.agent.core")
+
+        # Machine-independent: the CLI must cost a fraction of the agent stack
+        assert cli_ms < agent_ms * 0.5, f"CLI import {cli_ms:.0f} ms vs agent {agent_ms:.0f} ms"
+        assert cli_ms <= budget_ms, f"CLI import {cli_ms:.0f} ms exceeds {budget_ms:.0f} ms"
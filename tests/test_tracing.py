@@ -0,0 +1,165 @@
+"""
+Tests for Request Tracing
+
+Tests for span recording, the trace collector and the agent instrumentation.
+"""
+
+import asyncio
+import json
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.toolsets import FunctionToolset
+
+from src.agent.tracing import TracingModel, TracingToolset
+from src.utils import tracing
+from src.utils.query_profiler import QueryProfiler
+from src.utils.tracing import (
+    TraceCollector,
+    current_trace,
+    record_span,
+    span,
+    start_trace,
+    traced,
+)
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    """Fresh global trace collector."""
+    collector = TraceCollector(max_traces=10)
+    monkeypatch.setattr(tracing, "_collector", collector)
+    return collector
+
+
+@traced("rag.embed")
+async def fake_embed(delay: float) -> str:
+    await asyncio.sleep(delay)
+    return "ok"
+
+
+class TestSpans:
+    """Tests for span recording."""
+
+    def test_span_is_noop_outside_trace(self, collector):
+        with span("rag.embed") as s:
+            assert s is None
+        assert current_trace() is None
+        assert collector.get_recent() == []
+
+    @pytest.mark.asyncio
+    async def test_nested_spans_build_waterfall(self, collector):
+        with start_trace("chat.turn", conversation_id=7) as trace:
+            with span("rag.vector_search"):
+                await fake_embed(0.01)
+            # A nested trace becomes a child span
+            with start_trace("agent.chat_stream"), span("llm.request", model="m"):
+                await asyncio.sleep(0.02)
+
+        waterfall = {entry["name"]: entry for entry in trace.waterfall()}
+
+        assert [(name, entry["depth"]) for name, entry in waterfall.items()] == [
+            ("chat.turn", 0),
+            ("rag.vector_search", 1),
+            ("rag.embed", 2),
+            ("agent.chat_stream", 1),
+            ("llm.request", 2),
+        ]
+        assert waterfall["chat.turn"]["attributes"] == {"conversation_id": 7}
+        assert waterfall["rag.embed"]["attributes"]["function"] == "fake_embed"
+        assert waterfall["llm.request"]["offset_ms"] >= waterfall["rag.embed"]["duration_ms"]
+        assert trace.breakdown()["llm.request"] >= 20
+        assert collector.get_recent() == [trace]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_attach_to_their_parent(self, collector):
+        with start_trace("chat.turn") as trace, span("rag.retrieve") as parent:
+            await asyncio.gather(fake_embed(0.01), fake_embed(0.01))
+
+        embeds = [s for s in trace.spans if s.name == "rag.embed"]
+        assert len(embeds) == 2
+        assert {s.parent_span_id for s in embeds} == {parent.span_id}
+
+    def test_errors_mark_span_and_still_record(self, collector):
+        with pytest.raises(ValueError), start_trace("chat.turn"), span("tool.call"):
+            raise ValueError("boom")
+
+        trace = collector.get_recent()[0]
+        assert [s.status for s in trace.spans] == [tracing.STATUS_ERROR] * 2
+        assert collector.get_span_stats()[0]["errors"] == 1
+
+    def test_profiler_statements_become_spans(self, collector):
+        profiler = QueryProfiler()
+        with start_trace("chat.turn") as trace:
+            profiler.record("SELECT * FROM t WHERE id = 1", 5.0, database="backend")
+
+        db_span = trace.spans[1]
+        assert db_span.name == "db.query"
+        assert db_span.attributes["database"] == "backend"
+        assert db_span.duration_ms == pytest.approx(5.0, abs=0.01)
+
+    def test_record_span_outside_trace_is_ignored(self, collector):
+        record_span("db.query", 5.0)
+        assert collector.get_recent() == []
+
+
+class TestCollector:
+    """Tests for aggregation and export."""
+
+    def test_disabled_collector_yields_no_trace(self, monkeypatch):
+        monkeypatch.setattr(tracing, "_collector", TraceCollector(enabled=False))
+        with start_trace("chat.turn") as trace:
+            assert trace is None
+            with span("llm.request") as s:
+                assert s is None
+
+    def test_span_percentiles(self, collector):
+        for _ in range(20):
+            with start_trace("chat.turn"), span("llm.request"):
+                pass
+
+        stats = {entry["name"]: entry for entry in collector.get_span_stats()}
+
+        assert stats["llm.request"]["count"] == 20
+        assert stats["llm.request"]["p95_ms"] is not None
+        assert len(collector.get_recent(limit=50)) == 10  # Bounded by max_traces
+
+    def test_exports_otlp_json_lines(self, collector, tmp_path):
+        path = tmp_path / "traces" / "traces.jsonl"
+        exporter = TraceCollector(export_path=str(path))
+
+        with start_trace("chat.turn") as trace, span("tool.call", tool="list_tables", attempt=1):
+            pass
+        exporter.record(trace)
+
+        payload = json.loads(path.read_text().splitlines()[0])
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[0]["traceId"] == trace.trace_id
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert {"key": "tool", "value": {"stringValue": "list_tables"}} in spans[1]["attributes"]
+        assert {"key": "attempt", "value": {"intValue": "1"}} in spans[1]["attributes"]
+
+
+class TestAgentInstrumentation:
+    """Tests for the Pydantic AI model and toolset wrappers."""
+
+    @pytest.mark.asyncio
+    async def test_model_requests_and_tool_calls_are_traced(self, collector):
+        def list_tables() -> str:
+            """List tables."""
+            return "users"
+
+        toolset = FunctionToolset(tools=[list_tables])
+        agent = Agent(TracingModel(TestModel()), toolsets=[TracingToolset(toolset)])
+
+        with start_trace("chat.turn") as trace:
+            await agent.run("What tables exist?")
+
+        names = [entry["name"] for entry in trace.waterfall()]
+        assert names == ["chat.turn", "llm.request", "tool.call", "llm.request"]
+        tool_span = next(s for s in trace.spans if s.name == "tool.call")
+        assert tool_span.attributes["tool"] == "list_tables"
+        llm_span = trace.spans[1]
+        assert llm_span.attributes["model"] == "test"
+        assert llm_span.attributes["input_tokens"] > 0
@@ -0,0 +1,90 @@
+"""
+Tests for Vector Codec
+
+Tests for binary packing and compact SQL Server VECTOR literals.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from src.rag.mssql_vector_store import MSSQLVectorStore
+from src.rag.redis_vector_store import RedisVectorStore
+from src.rag.vector_codec import VectorCodec, VectorEncoding
+
+
+@pytest.fixture
+def embedding():
+    """Create a realistic float32 embedding."""
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 0.05, 768).astype(np.float32).tolist()
+
+
+class TestVectorCodec:
+    """Tests for encoding and decoding."""
+
+    def test_float32_sql_literal_round_trips(self, embedding):
+        literal = VectorCodec("float32").to_sql(embedding)
+
+        decoded = np.array(json.loads(literal), dtype=np.float32)
+
+        assert np.array_equal(decoded, np.array(embedding, dtype=np.float32))
+
+    def test_sql_literal_smaller_than_json(self, embedding):
+        literal = VectorCodec("float32").to_sql(embedding)
+
+        assert len(literal) < 0.7 * len(json.dumps(embedding))
+
+    def test_float16_sql_literal_round_trips(self, embedding):
+        codec = VectorCodec(VectorEncoding.FLOAT16)
+        literal = codec.to_sql(embedding)
+
+        decoded = np.array(json.loads(literal), dtype=np.float16)
+
+        assert np.array_equal(decoded, np.array(embedding, dtype=np.float16))
+        assert len(literal) < len(VectorCodec("float32").to_sql(embedding))
+
+    @pytest.mark.parametrize("encoding,size", [("float32", 768 * 4), ("float16", 768 * 2)])
+    def test_bytes_round_trip(self, embedding, encoding, size):
+        codec = VectorCodec(encoding)
+
+        payload = codec.to_bytes(embedding)
+
+        assert len(payload) == size
+        assert np.allclose(codec.from_bytes(payload), embedding, atol=1e-3)
+
+    def test_invalid_encoding(self):
+        with pytest.raises(ValueError):
+            VectorCodec("int8")
+
+
+class TestCodecIntegration:
+    """Tests that the vector stores serialize through the codec."""
+
+    @pytest.mark.asyncio
+    async def test_mssql_search_sends_compact_literal(self, embedding):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.fetchall.return_value = []
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        embedder = MagicMock()
+        embedder.embed = AsyncMock(return_value=embedding)
+        store = MSSQLVectorStore(session_factory=factory, embedder=embedder, index_mode="exact")
+
+        await store.search("query")
+
+        params = session.execute.call_args[0][1]
+        assert params["embedding"] == VectorCodec("float32").to_sql(embedding)
+
+    def test_redis_schema_uses_codec_datatype(self):
+        store = RedisVectorStore(
+            redis_client=MagicMock(), embedder=MagicMock(), codec=VectorCodec("float16")
+        )
+
+        vector_field = store._get_schema()["fields"][-1]
+
+        assert vector_field["attrs"]["datatype"] == "float16"
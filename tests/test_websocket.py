@@ -6,12 +6,13 @@ Tests for WebSocketManager, WebSocketConnection, and HeartbeatManager.
 """
 
 import asyncio
+import json
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.api.websocket import WebSocketConnection, WebSocketManager
+from src.api.websocket import SlowConsumerPolicy, WebSocketConnection, WebSocketManager
 from src.api.websocket.heartbeat import HeartbeatManager
 
 
@@ -173,11 +174,13 @@ class TestWebSocketManager:
         ws1 = MagicMock()
         ws1.accept = AsyncMock()
         ws1.send_json = AsyncMock()
+        ws1.send_text = AsyncMock()
         ws1.close = AsyncMock()
 
         ws2 = MagicMock()
         ws2.accept = AsyncMock()
         ws2.send_json = AsyncMock()
+        ws2.send_text = AsyncMock()
         ws2.close = AsyncMock()
 
         # Connect two clients to same conversation
@@ -185,10 +188,12 @@ class TestWebSocketManager:
         await websocket_manager.connect(ws2, "conn-2", conversation_id=1)
 
         sent_count = await websocket_manager.send_to_conversation(1, {"type": "test"})
+        for connection in websocket_manager.get_all_connections():
+            await connection.drain(timeout=1)
 
         assert sent_count == 2
-        ws1.send_json.assert_called_once()
-        ws2.send_json.assert_called_once()
+        ws1.send_text.assert_called_once_with('{"type":"test"}')
+        ws2.send_text.assert_called_once_with('{"type":"test"}')
 
     @pytest.mark.asyncio
     async def test_send_to_empty_conversation(self, websocket_manager):
@@ -203,21 +208,27 @@ class TestWebSocketManager:
         ws1 = MagicMock()
         ws1.accept = AsyncMock()
         ws1.send_json = AsyncMock()
+        ws1.send_text = AsyncMock()
         ws1.close = AsyncMock()
 
         ws2 = MagicMock()
         ws2.accept = AsyncMock()
         ws2.send_json = AsyncMock()
+        ws2.send_text = AsyncMock()
         ws2.close = AsyncMock()
 
         await websocket_manager.connect(ws1, "conn-1")
         await websocket_manager.connect(ws2, "conn-2")
 
         sent_count = await websocket_manager.broadcast({"type": "broadcast"})
+        for connection in websocket_manager.get_all_connections():
+            await connection.drain(timeout=1)
 
         assert sent_count == 2
-        ws1.send_json.assert_called_once()
-        ws2.send_json.assert_called_once()
+        ws1.send_text.assert_called_once()
+        ws2.send_text.assert_called_once()
+        # Serialized once, same payload object handed to every connection
+        assert ws1.send_text.call_args[0][0] is ws2.send_text.call_args[0][0]
 
     @pytest.mark.asyncio
     async def test_broadcast_with_exclusion(self, websocket_manager):
@@ -225,11 +236,13 @@ class TestWebSocketManager:
         ws1 = MagicMock()
         ws1.accept = AsyncMock()
         ws1.send_json = AsyncMock()
+        ws1.send_text = AsyncMock()
         ws1.close = AsyncMock()
 
         ws2 = MagicMock()
         ws2.accept = AsyncMock()
         ws2.send_json = AsyncMock()
+        ws2.send_text = AsyncMock()
         ws2.close = AsyncMock()
 
         await websocket_manager.connect(ws1, "conn-1")
@@ -238,10 +251,11 @@ class TestWebSocketManager:
         sent_count = await websocket_manager.broadcast(
             {"type": "broadcast"}, exclude_connections={"conn-1"}
         )
+        await websocket_manager.get_connection("conn-2").drain(timeout=1)
 
         assert sent_count == 1
-        ws1.send_json.assert_not_called()
-        ws2.send_json.assert_called_once()
+        ws1.send_text.assert_not_called()
+        ws2.send_text.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_connection(self, websocket_manager, mock_websocket):
@@ -351,6 +365,117 @@ class TestWebSocketManager:
         ws2.close.assert_called_once()
 
 
+class TestSendQueues:
+    """Tests for per-connection outbound queues and slow consumer policies."""
+
+    @staticmethod
+    def _blocked_websocket():
+        """Create a WebSocket whose sends never complete."""
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.close = AsyncMock()
+
+        async def never_completes(_text):
+            await asyncio.Event().wait()
+
+        ws.send_text = AsyncMock(side_effect=never_completes)
+        return ws
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_stall_others(self):
+        """Test that a stalled client does not delay delivery to others."""
+        manager = WebSocketManager(max_queue_size=4)
+        slow = self._blocked_websocket()
+        fast = MagicMock()
+        fast.accept = AsyncMock()
+        fast.close = AsyncMock()
+        fast.send_text = AsyncMock()
+
+        await manager.connect(slow, "slow")
+        await manager.connect(fast, "fast")
+
+        for i in range(3):
+            await manager.broadcast({"type": "tick", "n": i})
+        assert await manager.get_connection("fast").drain(timeout=1)
+
+        assert fast.send_text.call_count == 3
+        assert manager.get_connection("slow").backlog == 2  # one in flight
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """Test that the oldest queued message is discarded when full."""
+        connection = WebSocketConnection(
+            self._blocked_websocket(),
+            "slow",
+            max_queue_size=2,
+            slow_consumer_policy=SlowConsumerPolicy.DROP_OLDEST,
+        )
+        connection.enqueue_text("0")
+        await asyncio.sleep(0)  # writer takes "0" and blocks
+
+        for text in ("1", "2", "3"):
+            assert connection.enqueue_text(text) is True
+
+        assert connection.backlog == 2
+        assert connection.messages_dropped == 1
+        assert list(connection._queue._queue) == ["2", "3"]
+        await connection.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_policy(self):
+        """Test that new messages are rejected when full."""
+        connection = WebSocketConnection(
+            self._blocked_websocket(),
+            "slow",
+            max_queue_size=1,
+            slow_consumer_policy=SlowConsumerPolicy.DROP_NEWEST,
+        )
+        connection.enqueue_text("0")
+        await asyncio.sleep(0)
+        connection.enqueue_text("1")
+
+        assert connection.enqueue_text("2") is False
+        assert connection.messages_dropped == 1
+        assert connection.needs_disconnect is False
+        await connection.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy(self):
+        """Test that slow consumers are disconnected by the manager."""
+        manager = WebSocketManager(
+            max_queue_size=1, slow_consumer_policy=SlowConsumerPolicy.DISCONNECT
+        )
+        slow = self._blocked_websocket()
+        await manager.connect(slow, "slow")
+
+        await manager.broadcast({"n": 0})
+        await asyncio.sleep(0)
+        await manager.broadcast({"n": 1})
+        sent = await manager.broadcast({"n": 2})
+
+        assert sent == 0
+        assert manager.get_connection_count() == 0
+        slow.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_backlog_stats(self):
+        """Test that backlog metrics are reported."""
+        manager = WebSocketManager(max_queue_size=8)
+        await manager.connect(self._blocked_websocket(), "slow")
+
+        for i in range(4):
+            await manager.broadcast({"n": i})
+        await asyncio.sleep(0)
+        stats = manager.get_stats()
+
+        assert stats["connections"] == 1
+        assert stats["total_backlog"] == 3
+        assert stats["top_backlogs"][0]["connection_id"] == "slow"
+        assert stats["top_backlogs"][0]["max_backlog"] == 4
+        await manager.shutdown()
+
+
 class TestHeartbeatManager:
     """Tests for HeartbeatManager class."""
 
@@ -371,16 +496,18 @@ class TestHeartbeatManager:
         ws = MagicMock()
         ws.accept = AsyncMock()
         ws.send_json = AsyncMock()
+        ws.send_text = AsyncMock()
         ws.close = AsyncMock()
 
         await websocket_manager.connect(ws, "conn-1")
 
         heartbeat = HeartbeatManager(websocket_manager)
         await heartbeat._send_pings()
+        await websocket_manager.get_connection("conn-1").drain(timeout=1)
 
         # Should send ping message
-        ws.send_json.assert_called_once()
-        call_args = ws.send_json.call_args[0][0]
+        ws.send_text.assert_called_once()
+        call_args = json.loads(ws.send_text.call_args[0][0])
         assert call_args["type"] == "ping"
 
     @pytest.mark.asyncio
@@ -0,0 +1,194 @@
+"""
+Tests for Widget Refresh Service
+
+Tests for the server-side widget data cache and shared refresh scheduler.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.widget_refresh import WidgetRefreshService, widget_query_hash
+
+
+def make_widget(widget_id=1, dashboard_id=1, query="SELECT 1 AS value", refresh_interval=30):
+    """Create a lightweight widget stand-in."""
+    widget = MagicMock()
+    widget.id = widget_id
+    widget.dashboard_id = dashboard_id
+    widget.query = query
+    widget.refresh_interval = refresh_interval
+    return widget
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    db = MagicMock()
+    db.get = AsyncMock()
+    db.execute = AsyncMock()
+    return db
+
+
+@pytest.fixture
+def session_factory(mock_db):
+    """Session factory yielding the mock session."""
+
+    @asynccontextmanager
+    async def factory():
+        yield mock_db
+
+    return factory
+
+
+@pytest.fixture
+def service(session_factory):
+    """Create a WidgetRefreshService with a stubbed query executor."""
+    svc = WidgetRefreshService(session_factory=session_factory, websocket_manager=AsyncMock())
+
+    async def execute_query(db, query):
+        await asyncio.sleep(0.01)
+        return [{"value": 1}], ["value"], 1, 5
+
+    svc._query_service.execute_query = AsyncMock(side_effect=execute_query)
+    return svc
+
+
+class TestWidgetCache:
+    """Tests for widget result caching."""
+
+    @pytest.mark.asyncio
+    async def test_second_request_served_from_cache(self, service):
+        """Test that a fresh cached result is reused."""
+        widget = make_widget()
+
+        first = await service.get_widget_data(widget)
+        second = await service.get_widget_data(widget)
+
+        assert first is second
+        assert service._query_service.execute_query.await_count == 1
+        stats = service.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_viewers_share_one_execution(self, service):
+        """Test that concurrent cache misses run the query once."""
+        widget = make_widget()
+
+        results = await asyncio.gather(*(service.get_widget_data(widget) for _ in range(50)))
+
+        assert all(r.row_count == 1 for r in results)
+        assert service._query_service.execute_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_query_change_misses_cache(self, service):
+        """Test that cache entries are keyed by query hash."""
+        widget = make_widget()
+        await service.get_widget_data(widget)
+
+        widget.query = "SELECT 2 AS value"
+        result = await service.get_widget_data(widget)
+
+        assert result.query_hash == widget_query_hash("SELECT 2 AS value")
+        assert service._query_service.execute_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_result_is_refreshed(self, service):
+        """Test that results older than the refresh interval are re-executed."""
+        widget = make_widget(refresh_interval=1)
+        result = await service.get_widget_data(widget)
+        result._monotonic -= 5
+
+        await service.get_widget_data(widget)
+
+        assert service._query_service.execute_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_query_error_is_cached(self, service):
+        """Test that failed executions return an error result."""
+        service._query_service.execute_query = AsyncMock(
+            return_value=(None, None, None, "Invalid object name")
+        )
+        widget = make_widget()
+
+        result = await service.get_widget_data(widget)
+
+        assert result.error == "Invalid object name"
+        assert result.data == []
+
+    @pytest.mark.asyncio
+    async def test_widget_without_query(self, service):
+        """Test that widgets with no query return None."""
+        assert await service.get_widget_data(make_widget(query=None)) is None
+
+    @pytest.mark.asyncio
+    async def test_widget_changed_invalidates(self, service):
+        """Test that updating a widget drops its cached result."""
+        widget = make_widget()
+        await service.get_widget_data(widget)
+
+        service.widget_changed(widget)
+
+        assert service.get_cached(widget) is None
+
+
+class TestWidgetSubscriptions:
+    """Tests for dashboard subscriptions and pushes."""
+
+    @pytest.mark.asyncio
+    async def test_subscribe_schedules_and_returns_snapshot(self, service, mock_db):
+        """Test that subscribing schedules refresh jobs once per widget."""
+        widgets = [make_widget(1), make_widget(2, refresh_interval=None)]
+        scalars = MagicMock()
+        scalars.all.return_value = widgets
+        mock_db.execute.return_value = MagicMock(scalars=MagicMock(return_value=scalars))
+
+        await service.start()
+        try:
+            snapshot = await service.subscribe(1, "conn-a")
+            await service.subscribe(1, "conn-b")
+
+            assert len(snapshot) == 2
+            assert service.get_subscriber_count(1) == 2
+            assert service.scheduler.get_job("widget_refresh_1") is not None
+            assert service.scheduler.get_job("widget_refresh_2") is None
+            assert service._query_service.execute_query.await_count == 2
+
+            service.unsubscribe(1, "conn-a")
+            assert service.scheduler.get_job("widget_refresh_1") is not None
+
+            service.unsubscribe(1, "conn-b")
+            assert service.scheduler.get_job("widget_refresh_1") is None
+        finally:
+            await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_refresh_pushes_to_all_viewers(self, service, mock_db):
+        """Test that a scheduled refresh runs once and reaches every viewer."""
+        widget = make_widget()
+        mock_db.get.return_value = widget
+        service.websocket_manager.send_to_connections = AsyncMock(return_value=3)
+        service._subscribers[1] = {"conn-a", "conn-b", "conn-c"}
+
+        await service._refresh_widget(widget.id)
+
+        assert service._query_service.execute_query.await_count == 1
+        service.websocket_manager.send_to_connections.assert_awaited_once()
+        targets, message = service.websocket_manager.send_to_connections.call_args[0]
+        assert set(targets) == {"conn-a", "conn-b", "conn-c"}
+        assert message["type"] == "widget_data"
+        assert message["widget"]["widget_id"] == widget.id
+
+    @pytest.mark.asyncio
+    async def test_refresh_of_deleted_widget_unschedules(self, service, mock_db):
+        """Test that refreshing a removed widget drops it."""
+        mock_db.get.return_value = None
+        service._scheduled[9] = 1
+
+        await service._refresh_widget(9)
+
+        assert 9 not in service._scheduled
+        service._query_service.execute_query.assert_not_awaited()